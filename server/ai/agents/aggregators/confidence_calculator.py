@@ -5,6 +5,10 @@ Resume 검증 결과를 반영한 Confidence 재계산 (Rule-based)
 
 from typing import Dict, List
 
+import numpy as np
+
+from .segment_table import STRENGTH_CODES, SegmentTable
+
 
 class ConfidenceCalculator:
     """
@@ -96,25 +100,36 @@ class ConfidenceCalculator:
         Returns:
             confidence_v2가 추가된 Segment 평가 목록
         """
-        updated = []
+        # 필요한 열(interview_confidence, strength)만 추출
+        table = SegmentTable(segment_evaluations)
+        confidences = ConfidenceCalculator.confidence_v2_column(table.interview_confidence, table.strength)
         
-        for seg_eval in segment_evaluations:
-            interview_conf = seg_eval.get("interview_confidence", 0.5)
-            
-            # ✅ Resume 검증 정보 올바르게 추출
-            resume_verification = seg_eval.get("resume_verification", {})
-            verification_strength = resume_verification.get("strength", "none")
-            
-            confidence_v2 = ConfidenceCalculator.calculate_confidence_v2(
-                interview_conf,
-                verification_strength
-            )
-            
-            # 기존 dict에 추가
-            updated_eval = {**seg_eval, "confidence_v2": confidence_v2}
-            updated.append(updated_eval)
+        # 기존 dict에 추가 (반올림은 calculate_confidence_v2와 같은 round 사용)
+        return [
+            {**seg_eval, "confidence_v2": round(confidence_v2, 2)}
+            for seg_eval, confidence_v2 in zip(segment_evaluations, confidences.tolist())
+        ]
+    
+    
+    @staticmethod
+    def confidence_v2_column(
+        interview_confidence: np.ndarray,
+        strength: np.ndarray
+    ) -> np.ndarray:
+        """
+        calculate_confidence_v2의 열 버전 (반올림 전 값)
         
-        return updated
+        Args:
+            interview_confidence: 행별 Interview Confidence
+            strength: 행별 Resume 검증 강도 코드 (STRENGTH_CODES, 알 수 없는 값은 -1)
+        """
+        boost = np.zeros(len(STRENGTH_CODES) + 1)
+        for name, code in STRENGTH_CODES.items():
+            boost[code] = ConfidenceCalculator.RESUME_BOOST_MAP.get(name, 0.0)
+        # 알 수 없는 강도(-1)는 마지막 칸(0.0) → Boost 없이 조합
+        combined = interview_confidence * 0.60 + boost[strength] * 0.40
+        confidence_v2 = np.where(strength == STRENGTH_CODES["none"], interview_confidence, combined)
+        return np.clip(confidence_v2, 0.3, 0.98)
     
     
     @staticmethod
@@ -0,0 +1,133 @@
+"""
+Incremental Resume Verifier
+Stage 1 결과가 도착하는 대로 Resume 검증 + Confidence V2를 micro-batch로 실행
+
+기존에는 batch_evaluation이 10개 역량을 모두 끝낸 뒤 aggregator가 Resume 검증(AI 1회)을
+시작했기 때문에, 검증 호출 시간이 그대로 end-to-end 경로 끝에 더해졌습니다.
+Resume 검증은 역량별 evidence_details segment만 필요하므로, 역량을 고정된 묶음(micro-batch)으로
+나누고 묶음의 결과가 모두 도착하면 바로 검증을 시작합니다.
+Stage 1이 끝난 뒤에는 마지막 묶음의 검증만 기다리면 됩니다.
+
+묶음 구성은 COMPETENCY_CONFIGS 순서로 고정되어 있어, 도착 순서와 무관하게 같은 프롬프트가
+만들어지므로 LLM 캐시 재사용이 유지됩니다.
+"""
+
+import asyncio
+import time
+from typing import Dict, List, Optional
+
+from .resume_verifier import ResumeVerifier
+from .confidence_calculator import ConfidenceCalculator
+from ai.utils.llm_usage import LLMUsageRecorder, llm_usage_scope
+from ai.utils.tracing import span
+
+
+def build_micro_batches(names: List[str], batch_size: int) -> List[List[str]]:
+    """역량 이름 목록을 batch_size개씩 고정 묶음으로 분할"""
+    batch_size = max(1, batch_size)
+    return [names[i:i + batch_size] for i in range(0, len(names), batch_size)]
+
+
+class IncrementalResumeVerifier:
+    """
+    역량 결과 스트림 → micro-batch Resume 검증 + Confidence V2
+
+    사용:
+        incremental = IncrementalResumeVerifier(client, resume_data, batches)
+        await evaluate_all_competencies(..., on_result=incremental.add)
+        segments = await incremental.finish(all_results)
+    """
+
+    def __init__(
+        self,
+        openai_client,
+        resume_data: Optional[Dict],
+        micro_batches: List[List[str]],
+        llm_usage: Optional[LLMUsageRecorder] = None
+    ):
+        self.verifier = ResumeVerifier(openai_client)
+        self.resume_data = resume_data
+        self.micro_batches = micro_batches
+        self.llm_usage = llm_usage if llm_usage is not None else LLMUsageRecorder("aggregator")
+        self._results: Dict[str, Dict] = {}
+        self._tasks: Dict[int, asyncio.Task] = {}
+        self._batch_of = {name: index for index, batch in enumerate(micro_batches) for name in batch}
+        self._started = time.monotonic()
+        self._stage1_done_at: Optional[float] = None
+        self._batch_timings: List[Dict] = []
+
+    def add(self, name: str, result: Dict) -> None:
+        """역량 결과 수신 (묶음이 완성되면 검증 시작)"""
+        self._results[name] = result
+        index = self._batch_of.get(name)
+        if index is None or index in self._tasks:
+            return
+        if all(member in self._results for member in self.micro_batches[index]):
+            self._start(index)
+
+    def _start(self, index: int) -> None:
+        members = [name for name in self.micro_batches[index] if name in self._results]
+        print(f"[Stage 2 파이프라인] micro-batch {index + 1}/{len(self.micro_batches)} 검증 시작: {members}")
+        self._tasks[index] = asyncio.ensure_future(self._verify(index, members))
+
+    async def _verify(self, index: int, members: List[str]) -> List[Dict]:
+        started = time.monotonic()
+        with llm_usage_scope("aggregator", self.llm_usage), \
+                span("resume_verification", "substep", batch=index, competencies=members):
+            verified = await self.verifier.verify_batch(
+                {name: self._results[name] for name in members},
+                self.resume_data
+            )
+        with span("confidence_v2", "substep", batch=index, segments=len(verified)):
+            segments = ConfidenceCalculator.calculate_for_segments(verified)
+        self._batch_timings.append({
+            "batch": index,
+            "competencies": members,
+            "segments": len(segments),
+            "started_offset_seconds": round(started - self._started, 2),
+            "duration_seconds": round(time.monotonic() - started, 2),
+        })
+        return segments
+
+    async def finish(self, all_results: Dict[str, Dict]) -> List[Dict]:
+        """
+        Stage 1 종료 후 남은 묶음을 검증하고 전체 segment를 all_results 순서로 반환
+
+        Returns:
+            resume_verification + confidence_v2가 추가된 Segment 평가 목록
+        """
+        self._stage1_done_at = time.monotonic()
+        # on_result를 거치지 않은 결과(묶음 밖 역량 포함)도 반영
+        for name, result in all_results.items():
+            self._results.setdefault(name, result)
+        for index in range(len(self.micro_batches)):
+            if index not in self._tasks:
+                self._start(index)
+        unbatched = [name for name in all_results if name not in self._batch_of]
+        if unbatched:
+            self.micro_batches.append(unbatched)
+            self._start(len(self.micro_batches) - 1)
+
+        try:
+            batch_segments = await asyncio.gather(*self._tasks.values())
+        except BaseException:
+            for task in self._tasks.values():
+                task.cancel()
+            raise
+
+        by_competency: Dict[str, List[Dict]] = {}
+        for segments in batch_segments:
+            for seg in segments:
+                by_competency.setdefault(seg["competency"], []).append(seg)
+        return [seg for name in all_results for seg in by_competency.get(name, [])]
+
+    def summary(self) -> Dict:
+        """execution_logs 기록용 (Stage 1 종료 후 추가로 기다린 시간 포함)"""
+        tail_wait = None
+        if self._stage1_done_at is not None:
+            tail_wait = round(time.monotonic() - self._stage1_done_at, 2)
+        return {
+            "micro_batches": len(self.micro_batches),
+            "batches": sorted(self._batch_timings, key=lambda t: t["batch"]),
+            "tail_wait_seconds": tail_wait,
+        }
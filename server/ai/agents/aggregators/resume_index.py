@@ -0,0 +1,236 @@
+"""
+Resume Index
+Resume 원문 항목의 로컬 검색 색인 (BM25 + 한글 문자 n-gram)
+
+Resume 검증에서 LLM 없이 판정 가능한 Segment를 미리 걸러냅니다.
+    - verified: 수치/날짜/회사명 등 고유 표현이 Resume의 같은 항목과 일치하고, 인용문 대부분이 그 항목에 포함됨
+    - rejected: 인용문과 Resume 사이에 겹치는 단어/n-gram이 없음
+    - ambiguous: 나머지 (LLM 검증 대상)
+
+한국어는 조사/어미가 붙어 단어 단위 일치가 약하므로, 조사를 떼어낸 단어와
+한글 문자 2-gram을 함께 색인합니다.
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.config import (
+    RESUME_INDEX_MIN_ANCHORS,
+    RESUME_INDEX_REJECT_COVERAGE,
+    RESUME_INDEX_VERIFY_COVERAGE,
+)
+
+
+# 지원자 식별 정보 / 평가자 메모는 검증 근거에서 제외
+SKIPPED_KEYS = {
+    "applicant_id", "applicant_name", "email", "phone", "birth_year", "gender",
+    "portfolio_s3_url", "created_at", "notes",
+}
+
+# 뒤에서부터 떼어낼 조사/어미 (긴 것 먼저)
+KOREAN_SUFFIXES = sorted([
+    "했습니다", "하였습니다", "었습니다", "았습니다", "였습니다", "습니다", "입니다", "합니다", "됩니다",
+    "으로서", "으로", "에서는", "에서", "에게", "까지", "부터", "처럼", "보다", "하고", "하여", "해서",
+    "했고", "했던", "하는", "하며", "이라는", "라는", "이고", "과는", "와는", "은", "는", "이", "가",
+    "을", "를", "에", "의", "와", "과", "도", "로", "만",
+], key=len, reverse=True)
+
+TOKEN_PATTERN = re.compile(r"\d+(?::\d+)+|\d+(?:[.,]\d+)*%?p?|[A-Za-z][A-Za-z0-9+#]*|[가-힣]+")
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?다])\s+")
+
+# 고유명사로 취급할 항목 필드 (회사/학교/발급기관)
+NAME_FIELDS = {"company", "school", "issuer", "organization"}
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+
+def _strip_suffix(word: str) -> str:
+    for suffix in KOREAN_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 2:
+            return word[:-len(suffix)]
+    return word
+
+
+def _is_anchor(token: str, names: set) -> bool:
+    """고유 표현 (수치/날짜, 영문 고유명사, Resume의 회사/학교/프로젝트명)"""
+    if token in names:
+        return True
+    if token[0].isdigit():
+        # 한 자리 정수("2", "5")는 흔해서 근거로 쓰지 않음
+        return len(token) >= 2 or not token.isdigit()
+    return token.isascii() and len(token) >= 2
+
+
+def tokenize(text: str) -> Tuple[List[str], List[str]]:
+    """
+    텍스트 → (단어 토큰, 한글 문자 2-gram)
+
+    단어 토큰: 소문자 영문 / 숫자(소수점, %, %p 포함) / 조사를 뗀 한글 단어
+    """
+    words: List[str] = []
+    grams: List[str] = []
+    for raw in TOKEN_PATTERN.findall(text or ""):
+        if raw[0] >= "가":
+            word = _strip_suffix(raw)
+            words.append(word)
+            grams.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            words.append(raw.lower().replace(",", ""))
+    return words, grams
+
+
+def _flatten(section: str, value: Any, header: str, entries: List[Dict], names: set) -> None:
+    if isinstance(value, dict):
+        for key in NAME_FIELDS & value.keys():
+            if isinstance(value[key], str):
+                names.update(w for w in tokenize(value[key])[0] if len(w) >= 2)
+        scalars = [str(v) for v in value.values() if isinstance(v, (str, int, float)) and not isinstance(v, bool)]
+        # 항목 머리말 (회사/학교/프로젝트명 등 앞쪽 문자열)로 하위 문장을 묶음
+        title = " ".join(str(v) for v in value.values() if isinstance(v, str))[:40]
+        if scalars:
+            entries.append({"section": section, "header": "", "text": " | ".join(scalars)})
+        for key, child in value.items():
+            if isinstance(child, (dict, list)):
+                _flatten(section, child, title or header, entries, names)
+    elif isinstance(value, list):
+        for child in value:
+            _flatten(section, child, header, entries, names)
+    elif isinstance(value, str):
+        for sentence in SENTENCE_SPLIT.split(value.strip()):
+            if sentence:
+                entries.append({"section": section, "header": header, "text": sentence})
+
+
+def flatten_resume(resume_data: Dict, names: Optional[set] = None) -> List[Dict]:
+    """
+    Resume JSON → 검색 항목 목록 [{"section", "header", "text"}]
+
+    header는 하위 문장이 속한 항목의 머리말 (표시용, 색인에는 text만 사용)
+
+    names가 주어지면 회사/학교/프로젝트명 등의 단어를 모음
+    """
+    entries: List[Dict] = []
+    names = names if names is not None else set()
+    for section, value in resume_data.items():
+        if section in SKIPPED_KEYS or value in (None, "", [], {}):
+            continue
+        if isinstance(value, dict) and not any(isinstance(v, (str, int, float)) for v in value.values()):
+            # skills처럼 하위 분류만 있는 섹션은 "skills.data_analysis" 단위로
+            for key, child in value.items():
+                _flatten(f"{section}.{key}", child, "", entries, names)
+        else:
+            _flatten(section, value, "", entries, names)
+    return entries
+
+
+class ResumeIndex:
+    """
+    Resume 항목 색인
+
+    사용:
+        index = ResumeIndex(resume_data)
+        match = index.classify(quote_text)
+        match["decision"]  # "verified" / "rejected" / "ambiguous"
+    """
+
+    def __init__(self, resume_data: Dict):
+        self.names: set = set()
+        self.entries = flatten_resume(resume_data, self.names)
+        self._terms: List[Counter] = []
+        self._words: List[set] = []
+        self._grams: List[set] = []
+        self._df: Counter = Counter()
+        for entry in self.entries:
+            words, grams = tokenize(entry["text"])
+            terms = Counter(words) + Counter(grams)
+            self._terms.append(terms)
+            self._words.append(set(words))
+            self._grams.append(set(grams))
+            self._df.update(terms.keys())
+        self._vocabulary = set(self._df)
+        lengths = [sum(terms.values()) for terms in self._terms]
+        self._lengths = lengths
+        self._avg_length = (sum(lengths) / len(lengths)) if lengths else 0.0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def matched_content(self, index: int) -> str:
+        entry = self.entries[index]
+        return f"{entry['header']} | {entry['text']}" if entry["header"] else entry["text"]
+
+    def _idf(self, term: str) -> float:
+        n = len(self.entries)
+        df = self._df.get(term, 0)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def search(self, text: str, top_k: int = 3) -> List[Tuple[int, float]]:
+        """BM25 상위 항목 [(항목 번호, 점수)]"""
+        words, grams = tokenize(text)
+        query = set(words) | set(grams)
+        scores = []
+        for index, terms in enumerate(self._terms):
+            score = 0.0
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * self._lengths[index] / (self._avg_length or 1))
+            for term in query:
+                tf = terms.get(term)
+                if tf:
+                    score += self._idf(term) * tf * (BM25_K1 + 1) / (tf + norm)
+            if score > 0:
+                scores.append((index, score))
+        scores.sort(key=lambda item: -item[1])
+        return scores[:top_k]
+
+    def classify(self, text: str) -> Dict:
+        """
+        인용문 판정
+
+        Returns:
+            {
+                "decision": "verified" / "rejected" / "ambiguous",
+                "coverage": 최상위 항목이 포함하는 인용문 단어/2-gram 비율,
+                "anchors": 최상위 항목과 일치한 고유 표현,
+                "missing_anchors": Resume 어디에도 없는 고유 표현,
+                "matches": [{"resume_section", "matched_content", "score"}]
+            }
+        """
+        words, grams = tokenize(text)
+        query = set(words) | set(grams)
+        result = {"decision": "ambiguous", "coverage": 0.0, "anchors": [], "missing_anchors": [], "matches": []}
+
+        if not query or not (query & self._vocabulary):
+            result["decision"] = "rejected"
+            return result
+
+        overall = len(query & self._vocabulary) / len(query)
+        hits = self.search(text)
+        result["matches"] = [
+            {
+                "resume_section": self.entries[index]["section"],
+                "matched_content": self.matched_content(index),
+                "score": round(score, 3),
+            }
+            for index, score in hits
+        ]
+        if overall < RESUME_INDEX_REJECT_COVERAGE or not hits:
+            result["decision"] = "rejected"
+            return result
+
+        best = hits[0][0]
+        best_terms = self._words[best] | self._grams[best]
+        anchors = sorted({w for w in words if _is_anchor(w, self.names)})
+        result["coverage"] = round(len(query & best_terms) / len(query), 3)
+        result["anchors"] = [a for a in anchors if a in self._words[best]]
+        # 인용문의 수치가 Resume에 없으면 불일치 가능성 → LLM 판단
+        result["missing_anchors"] = [a for a in anchors if a not in self._vocabulary]
+
+        if (
+            not result["missing_anchors"]
+            and len(result["anchors"]) >= RESUME_INDEX_MIN_ANCHORS
+            and result["coverage"] >= RESUME_INDEX_VERIFY_COVERAGE
+        ):
+            result["decision"] = "verified"
+        return result
@@ -1,12 +1,26 @@
 """
 Resume Verifier
-10개 Agent의 모든 Segment 평가를 Resume와 비교 (AI 1회 Batch)
+10개 Agent의 모든 Segment 평가를 Resume와 비교
+
+로컬 Resume 색인(ResumeIndex)으로 확실한 일치는 자동 검증, 겹침이 없는 평가는 자동 기각하고
+판단이 필요한 나머지만 AI에 보냅니다 (RESUME_VERIFY_BATCH_SIZE개씩 묶어 동시 호출).
 """
 
+import asyncio
 import json
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 from openai import AsyncOpenAI
 
+from ai.utils.llm_cache import build_cache_key, get_llm_cache
+from ai.utils.model_router import (
+    RoutingValidationError,
+    get_model_router,
+    parse_json_response,
+    routed_chat_completion,
+)
+from ai.utils.tracing import span
+from .resume_index import ResumeIndex
+
 
 class ResumeVerifier:
     """
@@ -14,15 +28,33 @@ class ResumeVerifier:
     
     역할:
         - 10개 Agent의 모든 Segment 평가를 Resume와 비교
-        - AI 1회 호출로 Batch 처리
+        - 로컬 색인 사전 판정 → 애매한 평가만 AI 묶음 호출 (묶음끼리 동시)
         - 각 Segment 평가에 Resume 검증 결과 추가:
             * resume_verified: bool
             * verification_strength: "high"/"medium"/"low"/"none"
             * resume_evidence: List[str]
     """
     
-    def __init__(self, openai_client: AsyncOpenAI):
+    PROMPT_VERSION = "v2"
+    TASK = "verification"
+    
+    def __init__(
+        self,
+        openai_client: AsyncOpenAI,
+        cache=None,
+        batch_size: Optional[int] = None,
+        use_index: Optional[bool] = None
+    ):
         self.client = openai_client
+        self.router = get_model_router()
+        self.temperature = 0.3
+        self.cache = cache if cache is not None else get_llm_cache()
+        from core.config import RESUME_INDEX_ENABLED, RESUME_VERIFY_BATCH_SIZE
+        self.batch_size = max(1, batch_size if batch_size is not None else RESUME_VERIFY_BATCH_SIZE)
+        self.use_index = RESUME_INDEX_ENABLED if use_index is None else use_index
+        # 같은 Resume로 여러 번 호출되므로 (micro-batch 검증) 색인은 Resume 객체당 1회 생성
+        self._index: Optional[ResumeIndex] = None
+        self._indexed_resume: Optional[Dict] = None
     
     
     async def verify_batch(
@@ -70,57 +102,180 @@ class ResumeVerifier:
         
         print(f"\n[Resume Verifier] Segment 평가 추출: {len(segment_evaluations)}개")
         
+        # 검증할 Segment가 없으면 AI 호출 생략 (예: 파이프라인 micro-batch의 역량이 모두 실패)
+        if not segment_evaluations:
+            return []
+        
         # Resume 데이터 없으면 검증 스킵
         if not resume_data:
             print("  Resume 데이터 없음 - 검증 스킵")
             return self._add_empty_verification(segment_evaluations)
         
         
-        # 2. AI 프롬프트 생성
-        prompt = self._build_verification_prompt(segment_evaluations, resume_data)
+        # 2. 로컬 색인 사전 판정 (자동 검증 / 자동 기각 / 애매)
+        with span("resume_index_prefilter", "substep", segments=len(segment_evaluations)) as prefilter:
+            verified_list, ambiguous = self._prefilter(segment_evaluations, resume_data)
+            if prefilter is not None:
+                prefilter.set(ambiguous=len(ambiguous))
+        print(
+            f"[Resume Verifier] 사전 판정: 자동 검증/기각 {len(verified_list)}개, "
+            f"AI 검증 {len(ambiguous)}개"
+        )
         
         
-        # 3. AI 호출 (1회)
-        print("[Resume Verifier] AI 호출 시작 (Batch)...")
+        # 3. 애매한 평가만 batch_size개씩 묶어 동시 호출
+        if ambiguous:
+            batches = [ambiguous[i:i + self.batch_size] for i in range(0, len(ambiguous), self.batch_size)]
+            print(f"[Resume Verifier] AI 호출 {len(batches)}회 (동시)")
+            if len(batches) == 1:
+                # 묶음이 하나면 Task 생성 없이 바로 호출
+                results = [await self._verify_chunk(0, batches[0], resume_data)]
+            else:
+                results = await asyncio.gather(*(
+                    self._verify_chunk(index, batch, resume_data)
+                    for index, batch in enumerate(batches)
+                ))
+            for batch_verifications in results:
+                verified_list.extend(batch_verifications)
         
-        response = await self.client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a resume verification expert. Verify if interview segment evaluations are supported by the candidate's resume."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
+        print(f"[Resume Verifier] 검증 완료: {len(verified_list)}개")
+        
+        # 원본 Segment 평가와 병합
+        return self._merge_verification_results(segment_evaluations, verified_list)
+    
+    
+    def _get_index(self, resume_data: Dict) -> ResumeIndex:
+        if self._index is None or self._indexed_resume is not resume_data:
+            self._index = ResumeIndex(resume_data)
+            self._indexed_resume = resume_data
+        return self._index
+    
+    
+    def _prefilter(
+        self,
+        segment_evaluations: List[Dict],
+        resume_data: Dict
+    ) -> Tuple[List[Dict], List[Dict]]:
+        """
+        로컬 색인 판정
+        
+        Returns:
+            (판정된 검증 결과 목록, AI 검증이 필요한 Segment 평가 목록)
+        """
+        if not self.use_index:
+            return [], list(segment_evaluations)
+        
+        index = self._get_index(resume_data)
+        decided, ambiguous = [], []
+        for seg in segment_evaluations:
+            match = index.classify(seg.get("quote_text", ""))
+            if match["decision"] == "verified":
+                decided.append(self._lexical_verification(seg, match, verified=True))
+            elif match["decision"] == "rejected":
+                decided.append(self._lexical_verification(seg, match, verified=False))
+            else:
+                ambiguous.append(seg)
+        return decided, ambiguous
+    
+    
+    def _lexical_verification(self, seg: Dict, match: Dict, verified: bool) -> Dict:
+        """색인 판정 → AI 응답과 같은 구조의 검증 결과"""
+        base = {"competency": seg.get("competency"), "segment_id": seg.get("segment_id")}
+        if not verified:
+            return {
+                **base,
+                "resume_verified": False,
+                "verification_strength": "none",
+                "reasoning": "Resume에 면접 답변과 겹치는 내용이 없음 (로컬 색인 자동 판정)",
+                "resume_matches": [],
+                "confidence_factors": {
+                    "direct_evidence": False,
+                    "multiple_sources": False,
+                    "time_consistency": False,
+                    "detail_level": "none"
                 }
-            ],
-            temperature=0.3,
-            response_format={"type": "json_object"}
-        )
+            }
+        
+        top = match["matches"][0]
+        sections = {m["resume_section"] for m in match["matches"]}
+        return {
+            **base,
+            "resume_verified": True,
+            "verification_strength": "high",
+            "reasoning": (
+                f"Resume '{top['resume_section']}' 항목에 면접 답변의 고유 표현({', '.join(match['anchors'])})이 "
+                f"그대로 명시됨 (답변 표현 {match['coverage']:.0%} 일치, 로컬 색인 자동 판정)"
+            ),
+            "resume_matches": [{
+                "resume_section": top["resume_section"],
+                "matched_content": top["matched_content"],
+                "relevance": f"일치 표현: {', '.join(match['anchors'])}"
+            }],
+            "confidence_factors": {
+                "direct_evidence": True,
+                "multiple_sources": len(sections) > 1,
+                "time_consistency": True,
+                "detail_level": "high"
+            }
+        }
+    
+    
+    async def _verify_chunk(
+        self,
+        index: int,
+        segment_evaluations: List[Dict],
+        resume_data: Dict
+    ) -> List[Dict]:
+        """
+        Segment 평가 묶음 1회 호출
         
-        result_text = response.choices[0].message.content
-        print(f"[Resume Verifier] AI 응답 길이: {len(result_text)} chars")
+        Returns:
+            AI 검증 결과 목록 (실패 시 빈 목록 → 병합 시 검증 실패로 처리)
+        """
+        prompt = self._build_verification_prompt(segment_evaluations, resume_data)
         
+        messages = [
+            {
+                "role": "system",
+                "content": "You are a resume verification expert. Verify if interview segment evaluations are supported by the candidate's resume."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+        cache_key = build_cache_key(
+            "resume_verifier", self.router.route_key(self.TASK), self.temperature, messages,
+            prompt_version=self.PROMPT_VERSION
+        )
+        cached = await self.cache.aget(cache_key)
+        if cached is not None:
+            print(f"[Resume Verifier] 묶음 {index} 캐시 히트 - AI 호출 생략")
+            return cached.get("verifications", [])
         
-        # 4. 결과 파싱
+        # 결과 파싱 (JSON 검증 실패 시 라우터가 상위 모델로 승급)
         try:
-            verification_results = json.loads(result_text)
-            verified_list = verification_results.get("verifications", [])
-            
-            print(f"[Resume Verifier] 검증 완료: {len(verified_list)}개")
-            
-            # 원본 Segment 평가와 병합
-            merged = self._merge_verification_results(
-                segment_evaluations,
-                verified_list
+            verification_results, model = await routed_chat_completion(
+                self.client,
+                self.TASK,
+                messages,
+                validate=parse_json_response,
+                span_label=f"resume_verification:batch{index}",
+                temperature=self.temperature,
+                response_format={"type": "json_object"}
             )
-            
-            return merged
+        except RoutingValidationError as e:
+            print(f"  묶음 {index} JSON 파싱 실패: {e}")
+            return []
+        except Exception as e:
+            # 한 묶음의 호출 실패가 gather로 다른 묶음 결과까지 버리지 않도록 빈 목록 반환
+            print(f"  묶음 {index} AI 호출 실패 - 검증 실패로 처리: {e}")
+            return []
         
-        except json.JSONDecodeError as e:
-            print(f"  JSON 파싱 실패: {e}")
-            return self._add_empty_verification(segment_evaluations)
+        print(f"[Resume Verifier] 묶음 {index} AI 응답 완료 (model={model})")
+        verified_list = verification_results.get("verifications", [])
+        await self.cache.aset(cache_key, {"verifications": verified_list})
+        return verified_list
     
     
     def _extract_segment_evaluations(
@@ -147,6 +302,10 @@ class ResumeVerifier:
         for comp_name, comp_result in all_competency_results.items():
             if not comp_result:
                 continue
+            if not isinstance(comp_result, dict):
+                # 예외 객체 등 평가 결과가 아닌 값은 검증 대상에서 제외 (다른 역량 검증은 계속)
+                print(f"  [Resume Verifier] {comp_name}: 평가 결과가 아님 ({type(comp_result).__name__}) - 제외")
+                continue
             
             # Evidence details에서 Segment 평가 추출
             perspectives = comp_result.get("perspectives", {})
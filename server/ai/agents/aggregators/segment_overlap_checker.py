@@ -3,10 +3,16 @@ Segment Overlap Checker
 같은 Segment를 여러 Agent가 평가한 경우 점수 차이 조정
 """
 
+import asyncio
 import json
-from typing import Dict, List, Tuple, Optional
+from typing import Any, Dict, List, Tuple, Optional
 from openai import AsyncOpenAI
-from collections import defaultdict
+
+import numpy as np
+
+from ai.utils.llm_cache import build_cache_key, get_llm_cache
+from ai.utils.model_router import get_model_router, parse_json_response, routed_chat_completion
+from .segment_table import SegmentTable
 
 
 class SegmentOverlapChecker:
@@ -18,19 +24,32 @@ class SegmentOverlapChecker:
         2. 점수 격차 > 1.5 (5점 척도 기준 30점) → 조정 필요
         3. Confidence 차이 > 0.2 → Rule-based 조정 (높은 Confidence 기준)
         4. Confidence 차이 < 0.2 → AI 호출 (판단 필요)
+    
+    1~3은 SegmentTable 열 배열로 한 번에 계산하고, 4는 Segment를 묶어
+    (SEGMENT_OVERLAP_MEDIATION_BATCH_SIZE개씩) 묶음별 1회 호출을 동시에 보냅니다.
     """
     
     # Threshold
     SCORE_GAP_THRESHOLD = 1.5  # 5점 척도 기준 (100점 환산 시 30점)
     CONFIDENCE_GAP_THRESHOLD = 0.2
+    PROMPT_VERSION = "v2"
+    TASK = "mediation"
     
-    def __init__(self, openai_client: AsyncOpenAI):
+    def __init__(self, openai_client: AsyncOpenAI, cache=None, batch_size: Optional[int] = None):
         self.client = openai_client
+        self.router = get_model_router()
+        self.temperature = 0.3
+        self.cache = cache if cache is not None else get_llm_cache()
+        if batch_size is None:
+            from core.config import SEGMENT_OVERLAP_MEDIATION_BATCH_SIZE
+            batch_size = SEGMENT_OVERLAP_MEDIATION_BATCH_SIZE
+        self.batch_size = max(1, batch_size)
     
     
     async def check_and_adjust(
         self,
-        segment_evaluations: List[Dict]
+        segment_evaluations: List[Dict],
+        table: Optional[SegmentTable] = None
     ) -> Tuple[List[Dict], List[Dict]]:
         """
         Segment Overlap 체크 및 조정
@@ -47,6 +66,8 @@ class SegmentOverlapChecker:
                     },
                     ...
                 ]
+            table: segment_evaluations의 SegmentTable (없으면 생성).
+                주어지면 조정된 행의 score / confidence / adjusted 열도 함께 갱신
         
         Returns:
             (adjusted_segments, adjustment_logs)
@@ -76,116 +97,52 @@ class SegmentOverlapChecker:
         
         print("\n[Segment Overlap Checker] 시작")
         
-        # 1. Segment별 그룹핑
-        segment_groups = self._group_by_segment(segment_evaluations)
-        
-        print(f"  총 Segment 수: {len(segment_groups)}개")
-        print(f"  중복 평가된 Segment: {sum(1 for segs in segment_groups.values() if len(segs) > 1)}개")
+        # 1. Segment별 그룹핑 (열 배열)
+        if table is None:
+            table = SegmentTable(segment_evaluations)
+        segments = table.by_segment
         
+        print(f"  총 Segment 수: {segments.size}개")
+        print(f"  중복 평가된 Segment: {int(np.count_nonzero(segments.counts > 1))}개")
         
-        # 2. 조정이 필요한 Segment 탐지
-        segments_need_adjustment = []
         
-        for segment_id, evaluations in segment_groups.items():
-            if len(evaluations) < 2:
-                continue  # 중복 없음
-            
-            # 점수 격차 계산 (5점 척도로 정규화)
-            scores = [e["score"] for e in evaluations]
-            score_gap = max(scores) - min(scores)
-            
-            if score_gap > 30:  # 수정 (기존 1.5 → 30)
-                segments_need_adjustment.append({
-                    "segment_id": segment_id,
-                    "evaluations": evaluations,
-                    "score_gap": score_gap
-            })
+        # 2. 조정이 필요한 Segment 탐지 (점수 격차 > 30, 100점 척도)
+        score_gap = segments.gap(table.score)
+        confidence_gap = segments.gap(table.confidence)
+        need = np.flatnonzero((segments.counts > 1) & (score_gap > 30))
         
-        print(f"  조정 필요 Segment: {len(segments_need_adjustment)}개")
+        print(f"  조정 필요 Segment: {len(need)}개")
         
-        if not segments_need_adjustment:
+        if not len(need):
             print("   조정 불필요 - 모든 Segment 일관적")
             return segment_evaluations, []
         
         
-        # 3. Segment별 조정 수행
-        adjusted_segments = segment_evaluations.copy()
-        adjustment_logs = []
+        # 3. Confidence 차이가 크면 Rule-based, 작으면 AI 판단
+        ai_groups = need[confidence_gap[need] <= self.CONFIDENCE_GAP_THRESHOLD]
+        # Rule-based 결과는 AI 호출 실패 시 폴백으로도 사용
+        rule_results = self._adjust_by_rule(table, segment_evaluations, need, score_gap)
+        ai_results = await self._adjust_by_ai(table, segment_evaluations, ai_groups, score_gap) if len(ai_groups) else {}
         
-        for segment_info in segments_need_adjustment:
-            segment_id = segment_info["segment_id"]
-            evaluations = segment_info["evaluations"]
-            score_gap = segment_info["score_gap"]
-            
-            print(f"\n  [Segment {segment_id}] 조정 시작 (gap: {score_gap:.2f})")
-            
-            # Confidence 차이 체크
-            confidences = [e["confidence_v2"] for e in evaluations]
-            confidence_gap = max(confidences) - min(confidences)
-            
-            if confidence_gap > self.CONFIDENCE_GAP_THRESHOLD:
-                # Rule-based 조정
-                adjustment_result = self._adjust_by_rule(
-                    segment_id,
-                    evaluations,
-                    score_gap
-                )
-                print(f"    → Rule-based 조정 완료")
-            else:
-                # AI 호출
-                adjustment_result = await self._adjust_by_ai(
-                    segment_id,
-                    evaluations,
-                    score_gap
-                )
-                print(f"    → AI 판단 완료")
-            
-            # 조정 결과 반영
-            adjusted_segments = self._apply_adjustments(
-                adjusted_segments,
-                adjustment_result["adjustments"]
-            )
-            
-            adjustment_logs.append(adjustment_result)
+        adjustment_logs = [ai_results.get(group) or rule_results[group] for group in need.tolist()]
+        adjusted_segments = self._apply_adjustments(segment_evaluations, adjustment_logs, table)
         
+        print(
+            f"    → Rule-based {len(need) - len(ai_groups)}건, "
+            f"AI 판단 {len(ai_results)}건 (폴백 {len(ai_groups) - len(ai_results)}건)"
+        )
         print(f"\n[Segment Overlap Checker] 완료 - {len(adjustment_logs)}건 조정")
         
         return adjusted_segments, adjustment_logs
     
     
-    def _group_by_segment(
-        self,
-        segment_evaluations: List[Dict]
-    ) -> Dict[int, List[Dict]]:
-        """
-        Segment ID로 그룹핑
-        
-        Returns:
-            {
-                3: [
-                    {"competency": "achievement", "score": 85, ...},
-                    {"competency": "interpersonal", "score": 82, ...}
-                ],
-                7: [...],
-                ...
-            }
-        """
-        groups = defaultdict(list)
-        
-        for eval_item in segment_evaluations:
-            segment_id = eval_item.get("segment_id")
-            if segment_id is not None:
-                groups[segment_id].append(eval_item)
-        
-        return dict(groups)
-    
-    
     def _adjust_by_rule(
         self,
-        segment_id: int,
-        evaluations: List[Dict],
-        score_gap: float
-    ) -> Dict:
+        table: SegmentTable,
+        segment_evaluations: List[Dict],
+        groups: np.ndarray,
+        score_gap: np.ndarray
+    ) -> Dict[int, Dict]:
         """
         Rule-based 조정 (높은 Confidence 기준으로 조정)
         
@@ -194,8 +151,10 @@ class SegmentOverlapChecker:
             2. 낮은 Confidence 평가들을 Trust Agent 방향으로 조정 (30%)
             3. 조정된 평가의 Confidence도 페널티 (-5%)
         
+        점수/Confidence 계산은 전체 행에 대해 배열 연산으로 한 번에 수행합니다.
+        
         Returns:
-            {
+            {그룹 번호: {
                 "segment_id": 3,
                 "competencies": ["achievement_motivation", "interpersonal_skills"],
                 "score_gap": 2.5,
@@ -210,147 +169,202 @@ class SegmentOverlapChecker:
                         "reason": "Adjusted towards Trust Agent (interpersonal_skills, conf=0.85)"
                     }
                 ]
-            }
+            }}
         """
         
-        # Trust Agent 선정 (가장 높은 Confidence)
-        trust_agent = max(evaluations, key=lambda e: e["confidence_v2"])
-        trust_score_5scale = trust_agent["score"] / 20  # 100점 → 5점
-        
-        adjustments = []
-        competencies = []
-        
-        for eval_item in evaluations:
-            competencies.append(eval_item["competency"])
-            
-            if eval_item["competency"] == trust_agent["competency"]:
-                continue  # Trust Agent는 조정 안 함
-            
-            original_score_5scale = eval_item["score"] / 20
-            original_confidence = eval_item["confidence_v2"]
+        # Trust Agent 선정 (그룹별 가장 높은 Confidence, 동률이면 먼저 나온 평가)
+        segments = table.by_segment
+        trust = segments.first_argmax(table.confidence)
+        
+        # 100점 → 5점 척도로 30% 조정 후 다시 100점 환산, Confidence 페널티 -5%
+        original_5scale = table.score / 20
+        trust_5scale = segments.spread(table.score[trust]) / 20
+        adjusted_5scale = original_5scale + (trust_5scale - original_5scale) * 0.3
+        adjusted_confidence = np.maximum(0.3, table.confidence - 0.05)
+        
+        results = {}
+        for group in groups.tolist():
+            trust_agent = segment_evaluations[trust[group]]
+            reason = f"Adjusted towards Trust Agent ({trust_agent['competency']}, conf={trust_agent['confidence_v2']:.2f})"
+            adjustments = []
+            competencies = []
+            for row in segments.group_rows(group).tolist():
+                eval_item = segment_evaluations[row]
+                competencies.append(eval_item["competency"])
+                
+                if eval_item["competency"] == trust_agent["competency"]:
+                    continue  # Trust Agent는 조정 안 함
+                
+                adjustments.append({
+                    "competency": eval_item["competency"],
+                    "original_score": eval_item["score"],
+                    "adjusted_score": round(float(adjusted_5scale[row]) * 20, 1),
+                    "original_confidence": eval_item["confidence_v2"],
+                    "adjusted_confidence": round(float(adjusted_confidence[row]), 2),
+                    "reason": reason
+                })
             
-            # 30% 조정
-            adjusted_score_5scale = original_score_5scale + (trust_score_5scale - original_score_5scale) * 0.3
-            adjusted_score_100 = round(adjusted_score_5scale * 20, 1)  # 5점 → 100점
-            
-            # Confidence 페널티 -5%
-            adjusted_confidence = max(0.3, original_confidence - 0.05)
-            
-            adjustments.append({
-                "competency": eval_item["competency"],
-                "original_score": eval_item["score"],
-                "adjusted_score": adjusted_score_100,
-                "original_confidence": original_confidence,
-                "adjusted_confidence": round(adjusted_confidence, 2),
-                "reason": f"Adjusted towards Trust Agent ({trust_agent['competency']}, conf={trust_agent['confidence_v2']:.2f})"
-            })
+            results[group] = {
+                "segment_id": table.segment_ids[group],
+                "competencies": competencies,
+                "score_gap": round(float(score_gap[group]), 2),
+                "adjustment_type": "rule_based",
+                "adjustments": adjustments
+            }
         
-        return {
-            "segment_id": segment_id,
-            "competencies": competencies,
-            "score_gap": round(score_gap, 2),
-            "adjustment_type": "rule_based",
-            "adjustments": adjustments
-        }
+        return results
     
     
     async def _adjust_by_ai(
         self,
-        segment_id: int,
-        evaluations: List[Dict],
-        score_gap: float
-    ) -> Dict:
+        table: SegmentTable,
+        segment_evaluations: List[Dict],
+        groups: np.ndarray,
+        score_gap: np.ndarray
+    ) -> Dict[int, Dict]:
         """
         AI 기반 조정 (Confidence 차이가 작을 때)
         
         AI에게 질문:
             "둘 다 확신하는데 점수가 다름 - 어느 쪽이 맞나?"
         
+        Segment를 batch_size개씩 묶어 묶음당 1회 호출하고, 묶음들은 동시에 호출합니다
+        (모델별 공용 Limiter가 TPM/RPM 예산 안에서 순서를 정함).
+        
+        Returns:
+            {그룹 번호: 결과} (Rule-based와 동일한 구조, adjustment_type만 "ai_mediated").
+            호출이 실패했거나 응답에 빠진 Segment는 포함하지 않음 → Rule-based로 폴백
+        """
+        
+        segments = {
+            group: [segment_evaluations[row] for row in table.by_segment.group_rows(group).tolist()]
+            for group in groups.tolist()
+        }
+        batches = [list(segments)[i:i + self.batch_size] for i in range(0, len(segments), self.batch_size)]
+        print(f"  AI 판단 Segment {len(segments)}개 → 호출 {len(batches)}회 (동시)")
+        
+        mediations = await asyncio.gather(*(
+            self._mediate_batch(index, {table.segment_ids[group]: segments[group] for group in batch})
+            for index, batch in enumerate(batches)
+        ))
+        
+        results = {}
+        for batch, batch_mediations in zip(batches, mediations):
+            for group in batch:
+                segment_id = table.segment_ids[group]
+                ai_result = batch_mediations.get(str(segment_id))
+                if ai_result is None:
+                    continue
+                results[group] = self._parse_ai_mediation_result(
+                    segment_id,
+                    segments[group],
+                    float(score_gap[group]),
+                    ai_result
+                )
+        return results
+    
+    
+    async def _mediate_batch(self, index: int, segments: Dict[Any, List[Dict]]) -> Dict[str, Dict]:
+        """
+        Segment 묶음 1회 호출
+        
         Returns:
-            동일한 구조 (adjustment_type만 "ai_mediated")
+            {str(segment_id): {"trust_agent", "adjustments"}} (실패 시 빈 dict)
         """
         
-        # AI 프롬프트 생성
-        prompt = self._build_ai_mediation_prompt(segment_id, evaluations)
+        prompt = self._build_ai_mediation_prompt(segments)
+        messages = [
+            {
+                "role": "system",
+                "content": "You are an expert at mediating conflicting competency evaluations. When multiple agents evaluate the same segment with similar confidence but different scores, determine which evaluation is more accurate."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+        cache_key = build_cache_key(
+            "segment_overlap_mediation", self.router.route_key(self.TASK), self.temperature, messages,
+            prompt_version=self.PROMPT_VERSION
+        )
         
         try:
-            response = await self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert at mediating conflicting competency evaluations. When multiple agents evaluate the same segment with similar confidence but different scores, determine which evaluation is more accurate."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.3,
-                response_format={"type": "json_object"}
-            )
-            
-            result_text = response.choices[0].message.content
-            ai_result = json.loads(result_text)
-            
-            # AI 결과를 표준 형식으로 변환
-            return self._parse_ai_mediation_result(
-                segment_id,
-                evaluations,
-                score_gap,
-                ai_result
-            )
+            ai_result = await self.cache.aget(cache_key)
+            if ai_result is None:
+                ai_result, _ = await routed_chat_completion(
+                    self.client,
+                    self.TASK,
+                    messages,
+                    validate=_parse_mediations,
+                    span_label=f"segment_overlap:batch{index}",
+                    temperature=self.temperature,
+                    response_format={"type": "json_object"}
+                )
+                await self.cache.aset(cache_key, ai_result)
         
         except Exception as e:
-            print(f"      AI 호출 실패 - Rule-based로 폴백: {e}")
-            return self._adjust_by_rule(segment_id, evaluations, score_gap)
+            print(f"      AI 호출 실패 (Segment {list(segments)}) - Rule-based로 폴백: {e}")
+            return {}
+        
+        return {str(m.get("segment_id")): m for m in ai_result.get("mediations", []) if isinstance(m, dict)}
     
     
     def _build_ai_mediation_prompt(
         self,
-        segment_id: int,
-        evaluations: List[Dict]
+        segments: Dict[Any, List[Dict]]
     ) -> str:
         """
-        AI 조정 프롬프트 생성
+        AI 조정 프롬프트 생성 (Segment 여러 개를 한 번에)
         """
         
-        eval_summary = []
-        for e in evaluations:
-            eval_summary.append({
-                "competency": e["competency"],
-                "score": e["score"],
-                "confidence_v2": e["confidence_v2"],
-                "quotes": e.get("quotes", [])
+        segment_summary = []
+        for segment_id, evaluations in segments.items():
+            segment_summary.append({
+                "segment_id": segment_id,
+                "evaluations": [
+                    {
+                        "competency": e["competency"],
+                        "score": e["score"],
+                        "confidence_v2": e["confidence_v2"],
+                        "quotes": e.get("quotes", [])
+                    }
+                    for e in evaluations
+                ]
             })
         
         prompt = f"""# Task: Mediate Conflicting Evaluations
 
-Multiple competency agents evaluated the same segment ({segment_id}) with similar confidence but different scores.
+In each segment below, multiple competency agents evaluated the same segment with similar confidence but different scores.
+Mediate every segment independently.
 
-## Evaluations:
+## Segments:
 ```json
-{json.dumps(eval_summary, ensure_ascii=False, indent=2)}
+{json.dumps(segment_summary, ensure_ascii=False, indent=2)}
 ```
 
 ## Instructions:
-1. Analyze which evaluation is more accurate based on:
+1. For each segment, analyze which evaluation is more accurate based on:
    - Quality of quotes
    - Relevance to competency
    - Consistency with evidence
 
 2. Determine adjustments needed for lower-scored evaluations.
 
-3. Output JSON format:
+3. Output JSON format (exactly one entry per segment_id):
 {{
-  "trust_agent": "interpersonal_skills",  // Most accurate evaluation
-  "adjustments": [
+  "mediations": [
     {{
-      "competency": "achievement_motivation",
-      "adjustment_direction": "increase",  // "increase" or "decrease"
-      "adjustment_amount": 0.5,  // 5점 척도 기준
-      "confidence_penalty": 0.05,
-      "reason": "Evidence better supports interpersonal skills evaluation"
+      "segment_id": 3,
+      "trust_agent": "interpersonal_skills",  // Most accurate evaluation
+      "adjustments": [
+        {{
+          "competency": "achievement_motivation",
+          "adjustment_direction": "increase",  // "increase" or "decrease"
+          "adjustment_amount": 0.5,  // 5점 척도 기준
+          "confidence_penalty": 0.05,
+          "reason": "Evidence better supports interpersonal skills evaluation"
+        }}
+      ]
     }}
   ]
 }}
@@ -419,33 +433,56 @@ CRITICAL: Output ONLY valid JSON. NO markdown.
     def _apply_adjustments(
         self,
         segment_evaluations: List[Dict],
-        adjustments: List[Dict]
+        adjustment_logs: List[Dict],
+        table: Optional[SegmentTable] = None
     ) -> List[Dict]:
         """
-        조정 결과를 Segment 평가 목록에 반영
+        조정 결과를 Segment 평가 목록에 반영 (같은 Segment의 같은 역량 평가에만 적용)
+        
+        table의 조정된 행 열 값도 함께 갱신 (이후 역량별 집계가 같은 table을 사용)
         """
         
-        updated = []
+        if table is None:
+            table = SegmentTable(segment_evaluations)
+        
+        # (segment 그룹 번호, 역량 그룹 번호) → 행 키, 조정 대상 행만 골라 dict 갱신
+        segment_codes = {segment_id: code for code, segment_id in enumerate(table.segment_ids)}
+        competency_codes = {name: code for code, name in enumerate(table.competencies)}
+        width = max(1, len(competency_codes))
+        adjustments = {}
+        for log in adjustment_logs:
+            segment_code = segment_codes.get(log["segment_id"])
+            for adj in log["adjustments"]:
+                competency_code = competency_codes.get(adj["competency"])
+                if segment_code is not None and competency_code is not None:
+                    adjustments[segment_code * width + competency_code] = adj
+        
+        segment_rows = table.by_segment.codes
+        row_keys = np.where(segment_rows >= 0, segment_rows * width + table.by_competency.codes, -1)
+        rows = np.flatnonzero(np.isin(row_keys, np.fromiter(adjustments, dtype=np.int64, count=len(adjustments))))
+        
+        updated = list(segment_evaluations)
+        for row, key in zip(rows.tolist(), row_keys[rows].tolist()):
+            adjustment = adjustments[key]
+            updated[row] = {
+                **segment_evaluations[row],
+                "score": adjustment["adjusted_score"],
+                "confidence_v2": adjustment["adjusted_confidence"],
+                "adjusted": True,
+                "adjustment_reason": adjustment["reason"]
+            }
         
-        for seg_eval in segment_evaluations:
-            # 조정 대상인지 확인
-            adjustment = next(
-                (adj for adj in adjustments if adj["competency"] == seg_eval["competency"]),
-                None
-            )
-            
-            if adjustment:
-                # 조정 적용
-                updated_eval = {
-                    **seg_eval,
-                    "score": adjustment["adjusted_score"],
-                    "confidence_v2": adjustment["adjusted_confidence"],
-                    "adjusted": True,
-                    "adjustment_reason": adjustment["reason"]
-                }
-                updated.append(updated_eval)
-            else:
-                # 조정 없음
-                updated.append(seg_eval)
+        if len(rows):
+            table.score[rows] = [updated[row]["score"] for row in rows.tolist()]
+            table.confidence[rows] = [updated[row]["confidence_v2"] for row in rows.tolist()]
+            table.adjusted[rows] = True
         
-        return updated
\ No newline at end of file
+        return updated
+
+
+def _parse_mediations(content: str) -> Dict:
+    """묶음 조정 응답 검증 (mediations 목록 필수, 실패 시 라우터가 상위 모델로 승급)"""
+    result = parse_json_response(content)
+    if not isinstance(result, dict) or not isinstance(result.get("mediations"), list):
+        raise ValueError("mediations 목록 없음")
+    return result
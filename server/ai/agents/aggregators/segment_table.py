@@ -0,0 +1,200 @@
+"""
+Segment Table
+Segment 평가 목록(List[Dict])의 열 단위(NumPy) 표현
+
+Stage 2 rule-based 단계(Confidence V2, Segment Overlap, Cross-Competency / 역량별 집계)가
+Segment마다 dict를 순회하거나 역량마다 전체 목록을 다시 필터링하는 대신,
+열 배열과 그룹 단위 reduce(np.*.reduceat / np.bincount)로 한 번에 계산하도록 합니다.
+"""
+
+from typing import Dict, List
+
+import numpy as np
+
+
+# Resume 검증 강도 코드 (알 수 없는 값은 -1)
+STRENGTH_CODES = {"none": 0, "low": 1, "medium": 2, "high": 3}
+
+
+class Grouping:
+    """
+    행별 그룹 번호 열 → 그룹 단위 연산
+
+    Attributes:
+        codes: 행별 그룹 번호 (-1이면 그룹에서 제외된 행)
+        size: 그룹 수
+        order: 그룹 번호 기준 안정 정렬된 행 번호 (제외된 행 없음, 그룹 안에서는 원본 순서 유지)
+        starts / counts: order 기준 그룹별 시작 위치 / 행 수
+    """
+
+    __slots__ = ("codes", "size", "order", "starts", "counts")
+
+    def __init__(self, codes: np.ndarray, size: int):
+        self.codes = codes
+        self.size = size
+        included = np.flatnonzero(codes >= 0)
+        self.order = included[np.argsort(codes[included], kind="stable")]
+        self.counts = np.bincount(codes[included], minlength=size)
+        self.starts = np.concatenate(([0], np.cumsum(self.counts)[:-1])).astype(np.int64) if size else self.counts
+
+    def reduce(self, ufunc: np.ufunc, values: np.ndarray) -> np.ndarray:
+        """그룹별 reduce (예: np.maximum → 그룹별 최대값, 빈 그룹이 없어야 함)"""
+        if not self.size:
+            return values[:0]
+        return ufunc.reduceat(values[self.order], self.starts)
+
+    def sum(self, values: np.ndarray) -> np.ndarray:
+        """그룹별 합 (원본 순서로 누적 → sum(list)와 같은 값, 빈 그룹은 0)"""
+        included = self.codes >= 0
+        return np.bincount(self.codes[included], weights=values[included], minlength=self.size)
+
+    def mean(self, values: np.ndarray) -> np.ndarray:
+        """그룹별 평균 (빈 그룹은 nan)"""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.sum(values) / self.counts
+
+    def spread(self, per_group: np.ndarray) -> np.ndarray:
+        """그룹별 값 → 행별 값 (제외된 행의 값은 의미 없음)"""
+        return per_group[np.maximum(self.codes, 0)] if self.size else per_group[:0]
+
+    def first_argmax(self, values: np.ndarray) -> np.ndarray:
+        """그룹별 최대값을 가진 첫 행 (원본 순서 기준, max()와 동일한 선택)"""
+        if not self.size:
+            return self.order[:0]
+        is_max = values == self.spread(self.reduce(np.maximum, values))
+        # order 순서에서 그룹별 첫 최대값 위치
+        candidates = self.order[is_max[self.order]]
+        first = np.concatenate(([True], np.diff(self.codes[candidates]) != 0))
+        return candidates[first]
+
+    def group_rows(self, group: int) -> np.ndarray:
+        """그룹의 행 번호 (원본 순서)"""
+        start = self.starts[group]
+        return self.order[start:start + self.counts[group]]
+
+    def gap(self, values: np.ndarray) -> np.ndarray:
+        """그룹별 max - min"""
+        return self.reduce(np.maximum, values) - self.reduce(np.minimum, values)
+
+
+class SegmentTable:
+    """
+    Segment 평가 목록의 열 배열 (행 번호 = 원본 목록의 위치)
+
+    열은 처음 접근할 때 원본 dict 목록에서 한 번만 추출합니다
+    (dict 순회가 비용의 대부분이므로 단계마다 필요한 열만 추출하고, 같은 table을 공유하면 재사용).
+
+    Attributes:
+        score / confidence: 행별 점수 / confidence (confidence_key 필드)
+        interview_confidence: 행별 Agent 원본 confidence
+        strength: 행별 Resume 검증 강도 코드 (STRENGTH_CODES)
+        verified / adjusted: 행별 Resume 검증 여부 / Overlap 조정 여부
+        segment_ids / competencies: 그룹 번호 → segment_id / 역량 이름 (원본에서 처음 나온 순서)
+        by_segment: segment_id 그룹 (segment_id가 None인 행은 제외)
+        by_competency: 역량 그룹
+    """
+
+    __slots__ = ("evaluations", "confidence_key", "_columns", "_verifications", "_segment_ids", "_competencies",
+                 "_by_segment", "_by_competency")
+
+    def __init__(self, evaluations: List[Dict], confidence_key: str = "confidence_v2"):
+        self.evaluations = evaluations
+        self.confidence_key = confidence_key
+        self._columns: Dict[str, np.ndarray] = {}
+        self._verifications = None
+        self._segment_ids: List = []
+        self._competencies: List = []
+        self._by_segment = None
+        self._by_competency = None
+
+    def __len__(self) -> int:
+        return len(self.evaluations)
+
+    def _column(self, name: str, values, dtype) -> np.ndarray:
+        column = self._columns.get(name)
+        if column is None:
+            column = self._columns[name] = np.fromiter(values(), dtype=dtype, count=len(self.evaluations))
+        return column
+
+    def _verification_list(self) -> List[Dict]:
+        if self._verifications is None:
+            empty: Dict = {}
+            self._verifications = [item.get("resume_verification", empty) for item in self.evaluations]
+        return self._verifications
+
+    @property
+    def score(self) -> np.ndarray:
+        return self._column("score", lambda: (item.get("score", 0) for item in self.evaluations), np.float64)
+
+    @property
+    def confidence(self) -> np.ndarray:
+        key = self.confidence_key
+        return self._column("confidence", lambda: (item.get(key, 0.0) for item in self.evaluations), np.float64)
+
+    @property
+    def interview_confidence(self) -> np.ndarray:
+        return self._column(
+            "interview_confidence",
+            lambda: (item.get("interview_confidence", 0.5) for item in self.evaluations),
+            np.float64
+        )
+
+    @property
+    def strength(self) -> np.ndarray:
+        return self._column(
+            "strength",
+            lambda: (STRENGTH_CODES.get(v.get("strength", "none"), -1) for v in self._verification_list()),
+            np.int64
+        )
+
+    @property
+    def verified(self) -> np.ndarray:
+        return self._column(
+            "verified", lambda: (bool(v.get("verified", False)) for v in self._verification_list()), bool
+        )
+
+    @property
+    def adjusted(self) -> np.ndarray:
+        return self._column("adjusted", lambda: (bool(item.get("adjusted")) for item in self.evaluations), bool)
+
+    @property
+    def by_segment(self) -> Grouping:
+        if self._by_segment is None:
+            codes: Dict = {}
+            segment = np.fromiter(
+                (
+                    -1 if (segment_id := item.get("segment_id")) is None else codes.setdefault(segment_id, len(codes))
+                    for item in self.evaluations
+                ),
+                dtype=np.int64, count=len(self.evaluations)
+            )
+            self._segment_ids = list(codes)
+            self._by_segment = Grouping(segment, len(codes))
+        return self._by_segment
+
+    @property
+    def by_competency(self) -> Grouping:
+        if self._by_competency is None:
+            codes: Dict = {}
+            competency = np.fromiter(
+                (codes.setdefault(item.get("competency"), len(codes)) for item in self.evaluations),
+                dtype=np.int64, count=len(self.evaluations)
+            )
+            self._competencies = list(codes)
+            self._by_competency = Grouping(competency, len(codes))
+        return self._by_competency
+
+    @property
+    def segment_ids(self) -> List:
+        self.by_segment
+        return self._segment_ids
+
+    @property
+    def competencies(self) -> List:
+        self.by_competency
+        return self._competencies
+
+    def competency_rows(self) -> Dict[str, np.ndarray]:
+        """역량 이름 → 행 번호 (원본 순서)"""
+        groups = self.by_competency
+        return {name: groups.group_rows(code) for code, name in enumerate(self.competencies)}
@@ -8,17 +8,39 @@ Competency Agent (수정 버전)
 """
 
 import asyncio
-from asyncio import Semaphore
 import json
-import hashlib
-from typing import Dict
+from typing import Callable, Dict, List, Optional, Tuple
 from datetime import datetime
 from openai import AsyncOpenAI, RateLimitError, APIStatusError
 
+from ai.utils.llm_cache import build_cache_key, hash_payload, get_llm_cache
+from ai.utils.hedging import get_hedge_budget, hedged_call
+from ai.utils.model_router import get_model_router
+from ai.utils.rate_limiter import (
+    get_rate_limiter,
+    limited_chat_completion,
+    retry_after_seconds,
+)
+from ai.utils.streaming_json import StreamingJSONFieldExtractor
+from ai.utils.tracing import span
+from ai.utils.transcript_renderer import split_transcript_block
+
 
 class CompetencyAgent:
     """역량 평가 Agent"""
     
+    # 프롬프트/응답 형식이 바뀌면 올려서 기존 캐시 무효화
+    PROMPT_VERSION = "v1"
+    SYSTEM_PROMPT = "You are an expert HR evaluator. Respond with ONLY valid JSON."
+    
+    # grouped 모드: 1회 호출 응답 토큰 상한 (gpt-4o 최대 출력 16K)
+    GROUP_MAX_TOKENS = 16000
+    GROUP_SECTION_RULE = "═" * 39
+    
+    # 스트리밍 모드에서 완성 즉시 진행 채널로 발행할 필드
+    STREAM_SCALAR_FIELDS = ("overall_score",)
+    STREAM_CONTAINER_FIELDS = ("evidence_details",)
+    
     # 필수 필드 정의
     REQUIRED_FIELDS = {
         "competency_name": str,
@@ -33,20 +55,55 @@ class CompetencyAgent:
     def __init__(
         self,
         openai_client: AsyncOpenAI,
-        max_concurrent: int = 5,
         max_retries: int = 5,
+        cache=None,
+        progress=None,
+        streaming: Optional[bool] = None,
+        hedging: Optional[bool] = None,
     ):
         self.client = openai_client
-        self.model = "gpt-4o"
-        self.semaphore = Semaphore(max_concurrent)
-        self.cache = {}
+        # 역량 평가(rubric_scoring) 모델은 라우팅 테이블에서 선택 (검증/재시도는 _complete_json에서 처리)
+        self.model = get_model_router().select("rubric_scoring")
+        self.temperature = 0.0
+        # 동시 호출 제한은 에이전트별 Semaphore가 아닌 프로세스 공용 Limiter (동시 호출 상한 + TPM/RPM 예산)
+        self.rate_limiter = get_rate_limiter(self.model)
+        # 인스턴스가 매 평가마다 새로 생성되므로 프로세스 공용(디스크) 캐시 사용
+        self.cache = cache if cache is not None else get_llm_cache()
         self.max_retries = max_retries
+        # 역량별 토큰 사용량 (prompt prefix 캐시 적중 확인용)
+        self.usage_log: Dict[str, Dict] = {}
+        # 진행 이벤트 채널 (ProgressChannel, 없으면 발행 안 함)
+        self.progress = progress
+        # 완료된 역량 수 (진행 이벤트의 index / progress 계산용, 재사용 역량 포함)
+        self.completed_count = 0
+        # 스트리밍은 진행 채널이 있을 때만 의미가 있음 (부분 결과를 받을 곳이 필요)
+        if streaming is None:
+            from core.config import STAGE1_STREAMING
+            streaming = STAGE1_STREAMING
+        self.streaming = streaming and progress is not None
+        # 지연 호출 hedge (opt-in, ai/utils/hedging.py)
+        if hedging is None:
+            from core.config import STAGE1_HEDGING
+            hedging = STAGE1_HEDGING
+        self.hedging = hedging
     
-    def _get_cache_key(self, competency_name: str, transcript: Dict) -> str:
-        """캐시 키 생성"""
-        transcript_str = json.dumps(transcript, sort_keys=True, ensure_ascii=False)
-        transcript_hash = hashlib.md5(transcript_str.encode()).hexdigest()
-        return f"{competency_name}:{transcript_hash}"
+    def _build_messages(self, prompt: str) -> List[Dict[str, str]]:
+        return [
+            {"role": "system", "content": self.SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ]
+    
+    def _get_cache_key(self, competency_name: str, transcript: Dict, prompt: str) -> str:
+        """캐시 키 생성 (model + prompt version + temperature + transcript hash)"""
+        return build_cache_key(
+            "competency_agent",
+            self.model,
+            self.temperature,
+            self._build_messages(prompt),
+            prompt_version=self.PROMPT_VERSION,
+            competency_name=competency_name,
+            transcript_hash=hash_payload(transcript),
+        )
     
     
     def _validate_and_fix_response(
@@ -181,147 +238,538 @@ class CompetencyAgent:
         """역량 평가 실행"""
         
         # 캐시 확인
-        cache_key = self._get_cache_key(competency_name, transcript)
-        if cache_key in self.cache:
+        cache_key = self._get_cache_key(competency_name, transcript, prompt)
+        cached = await self.cache.aget(cache_key)
+        if cached is not None:
             print(f"[캐시 히트] {competency_name}")
-            return self.cache[cache_key]
+            self._publish_complete(cached)
+            return cached
         
-        # Rate Limiting
-        async with self.semaphore:
-            print(f"[평가 시작] {competency_name}")
-            
+        # Rate Limiting은 limited_chat_completion에서 프로세스 공용 TPM/RPM 예산 기준으로 수행
+        print(f"[평가 시작] {competency_name}")
+        self._publish("competency_start", {
+            "competency": competency_name,
+            "message": f"[평가 시작] {competency_name}",
+            "progress": self._stage_progress(),
+        })
+        
+        # 스트리밍 중 완성된 필드를 즉시 진행 채널로 발행
+        def on_field(field: str, value) -> None:
+            self._publish("competency_partial", {
+                "competency": competency_name,
+                "field": field,
+                "value": value,
+            })
+        
+        try:
+            result = await self._complete_json(
+                self._build_messages(prompt), competency_name, max_tokens=4000, on_field=on_field
+            )
+        except Exception as e:
+            self._publish("competency_error", {
+                "competency": competency_name,
+                "error": str(e),
+                "progress": self._stage_progress(),
+            })
+            raise RuntimeError(f"[{competency_name}] 평가 실패: {e}")
+        
+        result = self._finalize_result(result, competency_name, competency_display_name, competency_category)
+        
+        # 캐싱
+        await self.cache.aset(cache_key, result)
+        
+        print(f"[평가 완료] {competency_name}: {result.get('overall_score', 0)}점")
+        self._publish_complete(result)
+        
+        return result
+    
+    
+    def _publish(self, event: str, data: Dict) -> None:
+        if self.progress is not None:
+            self.progress.publish(event, {"stage": 1, **data})
+    
+    def _stage_progress(self) -> int:
+        """Stage 1 진행률 (10% → 40%, graph/progress.py의 batch_evaluation 구간)"""
+        return 10 + int(30 * self.completed_count / len(COMPETENCY_CONFIGS))
+    
+    def _publish_complete(self, result: Dict) -> None:
+        self.completed_count += 1
+        name = result.get("competency_name")
+        score = result.get("overall_score", 0)
+        self._publish("competency_complete", {
+            "competency": name,
+            "competency_display_name": result.get("competency_display_name"),
+            "score": score,
+            "confidence": result.get("confidence", {}).get("overall_confidence"),
+            "index": self.completed_count,
+            "total": len(COMPETENCY_CONFIGS),
+            "message": f"[평가 완료] {name}: {score}점",
+            "progress": self._stage_progress(),
+        })
+    
+    
+    async def evaluate_group(
+        self,
+        configs: List[Tuple[str, str, str]],
+        prompts: Dict[str, str],
+        transcript: Dict
+    ) -> Dict[str, Dict]:
+        """
+        여러 역량을 1회 호출로 평가 (grouped 모드)
+        
+        transcript 블록은 한 번만 보내고 역량별 rubric을 이어 붙인 뒤
+        {"results": {competency_name: {...}}} 형태로 역량별 JSON을 받습니다.
+        응답에서 빠진 역량은 개별 호출로 다시 평가합니다.
+        
+        Args:
+            configs: [(competency_name, display_name, category), ...]
+            prompts: 역량별 프롬프트
+            transcript: 면접 Transcript JSON
+        
+        Returns:
+            {competency_name: 평가 결과}
+        """
+        names = [name for name, _, _ in configs]
+        group_label = "+".join(names)
+        messages = self._build_messages(self._build_group_prompt(configs, prompts))
+        cache_key = build_cache_key(
+            "competency_agent_group",
+            self.model,
+            self.temperature,
+            messages,
+            prompt_version=self.PROMPT_VERSION,
+            transcript_hash=hash_payload(transcript),
+        )
+        
+        grouped = await self.cache.aget(cache_key)
+        if grouped is not None:
+            print(f"[캐시 히트] {group_label}")
+            for result in grouped.values():
+                self._publish_complete(result)
+            return grouped
+        
+        print(f"[그룹 평가 시작] {group_label}")
+        try:
+            response = await self._complete_json(
+                messages,
+                group_label,
+                max_tokens=min(self.GROUP_MAX_TOKENS, 4000 * len(configs))
+            )
+            raw_results = response.get("results", response)
+        except Exception as e:
+            print(f"[그룹 평가 실패] {group_label}: {e} → 개별 평가로 전환")
+            raw_results = {}
+        
+        grouped = {}
+        missing = []
+        for name, display, category in configs:
+            result = raw_results.get(name) if isinstance(raw_results, dict) else None
+            if not isinstance(result, dict):
+                missing.append((name, display, category))
+                continue
+            grouped[name] = self._finalize_result(result, name, display, category)
+            print(f"[평가 완료] {name}: {grouped[name].get('overall_score', 0)}점 (group)")
+            self._publish_complete(grouped[name])
+        
+        if missing:
+            print(f"[그룹 평가] 응답 누락 {len(missing)}개 → 개별 평가: {[m[0] for m in missing]}")
+            fallback = await asyncio.gather(
+                *(self.evaluate(name, display, category, prompts[name], transcript)
+                  for name, display, category in missing),
+                return_exceptions=True
+            )
+            failed = False
+            for (name, _, _), result in zip(missing, fallback):
+                if isinstance(result, Exception):
+                    # on_result(파이프라인 Resume 검증)와 이후 단계는 dict 결과만 다룸
+                    print(f"[오류] {name}: {result}")
+                    result = _failed_result(name, result)
+                    failed = True
+                grouped[name] = result
+            # 개별 평가 실패가 섞인 경우 그룹 결과는 캐시하지 않음
+            if failed:
+                return grouped
+        
+        await self.cache.aset(cache_key, grouped)
+        return grouped
+    
+    
+    def _build_group_prompt(
+        self,
+        configs: List[Tuple[str, str, str]],
+        prompts: Dict[str, str]
+    ) -> str:
+        """transcript 블록 1회 + 역량별 rubric + 묶음 출력 형식"""
+        transcript_block = None
+        sections = []
+        for index, (name, display, _) in enumerate(configs, start=1):
+            block, rubric = split_transcript_block(prompts[name])
+            if block is not None:
+                transcript_block = transcript_block or block
+            sections.append(
+                f"{self.GROUP_SECTION_RULE}\n"
+                f"[역량 {index}/{len(configs)}] competency_name: {name} ({display})\n"
+                f"{self.GROUP_SECTION_RULE}\n\n{rubric}"
+            )
+        
+        names = ", ".join(f'"{name}"' for name, _, _ in configs)
+        output_format = (
+            f"{self.GROUP_SECTION_RULE}\n"
+            "[묶음 출력 형식]\n"
+            f"{self.GROUP_SECTION_RULE}\n\n"
+            f"위 {len(configs)}개 역량을 각각 독립적으로 평가하고, 아래 형식의 JSON 하나만 출력하세요.\n"
+            '{"results": {"<competency_name>": <해당 역량 출력 형식의 JSON>, ...}}\n'
+            f"results에는 {names} 키가 모두 있어야 합니다."
+        )
+        
+        parts = ([transcript_block] if transcript_block else []) + sections + [output_format]
+        return "\n\n".join(parts)
+    
+    
+    def _finalize_result(
+        self,
+        result: Dict,
+        competency_name: str,
+        competency_display_name: str,
+        competency_category: str
+    ) -> Dict:
+        """필수 필드 검증/보강 + 메타 정보 추가"""
+        
+        # 🆕 필수 필드 검증 및 보강
+        result = self._validate_and_fix_response(result, competency_name)
+        
+        # 메타 정보 추가
+        result["competency_name"] = competency_name
+        result["competency_display_name"] = competency_display_name
+        result["competency_category"] = competency_category
+        result["evaluated_at"] = datetime.now().isoformat()
+        
+        return result
+    
+    
+    async def _complete_json(
+        self,
+        messages: List[Dict[str, str]],
+        label: str,
+        max_tokens: int,
+        on_field: Optional[Callable[[str, object], None]] = None
+    ) -> Dict:
+        """
+        OpenAI 호출 후 JSON 파싱 (429/파싱 오류 재시도 포함)
+        
+        streaming 모드에서 on_field가 주어지면 응답을 스트림으로 받으며
+        STREAM_FIELDS가 완성되는 즉시 on_field(field, value)를 호출합니다.
+        """
+        
+        for attempt in range(self.max_retries):
             try:
-                # OpenAI 호출 (재시도 포함)
-                for attempt in range(self.max_retries):
-                    try:
-                        response = await self.client.chat.completions.create(
-                            model=self.model,
-                            messages=[
-                                {
-                                    "role": "system",
-                                    "content": "You are an expert HR evaluator. Respond with ONLY valid JSON."
-                                },
-                                {
-                                    "role": "user",
-                                    "content": prompt
-                                }
-                            ],
-                            temperature=0.0,
-                            max_tokens=4000,
-                            response_format={"type": "json_object"}
-                        )
-                        
-                        content = response.choices[0].message.content.strip()
-                        
-                        # 마크다운 제거
-                        if content.startswith("```"):
-                            content = content.split("```")[1]
-                            if content.startswith("json"):
-                                content = content[4:]
-                        content = content.strip()
-                        
-                        # JSON 파싱
-                        result = json.loads(content)
-                        
-                        # 🆕 필수 필드 검증 및 보강
-                        result = self._validate_and_fix_response(result, competency_name)
-                        
-                        # 메타 정보 추가
-                        result["competency_name"] = competency_name
-                        result["competency_display_name"] = competency_display_name
-                        result["competency_category"] = competency_category
-                        result["evaluated_at"] = datetime.now().isoformat()
-                        
-                        # 캐싱
-                        self.cache[cache_key] = result
-                        
-                        print(f"[평가 완료] {competency_name}: {result.get('overall_score', 0)}점")
-                        
-                        return result
-                        
-                    except RateLimitError as e:
-                        await self._handle_rate_limit(e, attempt, competency_name)
-                        continue
-                    except APIStatusError as e:
-                        if e.status_code == 429:
-                            await self._handle_rate_limit(e, attempt, competency_name)
-                            continue
-                        raise
-                    except json.JSONDecodeError as e:
-                        if attempt < self.max_retries - 1:
-                            print(f"[재시도 {attempt+1}/{self.max_retries}] {competency_name}: JSON 파싱 오류 → 백오프 후 재시도")
-                            await asyncio.sleep(1 + attempt)
-                        else:
-                            raise
-                    except Exception as e:
-                        if attempt < self.max_retries - 1:
-                            print(f"[재시도 {attempt+1}/{self.max_retries}] {competency_name}: {e}")
-                            await asyncio.sleep(1 + attempt)
-                        else:
-                            raise
-                            
+                if self.hedging:
+                    content = await self._hedged_request(messages, label, max_tokens, on_field)
+                else:
+                    content = await self._request_content(messages, label, max_tokens, on_field)
+                content = content.strip()
+                
+                # 마크다운 제거
+                if content.startswith("```"):
+                    content = content.split("```")[1]
+                    if content.startswith("json"):
+                        content = content[4:]
+                content = content.strip()
+                
+                # JSON 파싱
+                return json.loads(content)
+                
+            except RateLimitError as e:
+                await self._handle_rate_limit(e, attempt, label)
+                continue
+            except APIStatusError as e:
+                if e.status_code == 429:
+                    await self._handle_rate_limit(e, attempt, label)
+                    continue
+                raise
+            except json.JSONDecodeError as e:
+                if attempt < self.max_retries - 1:
+                    print(f"[재시도 {attempt+1}/{self.max_retries}] {label}: JSON 파싱 오류 → 백오프 후 재시도")
+                    await asyncio.sleep(1 + attempt)
+                else:
+                    raise
             except Exception as e:
-                raise RuntimeError(f"[{competency_name}] 평가 실패: {e}")
+                if attempt < self.max_retries - 1:
+                    print(f"[재시도 {attempt+1}/{self.max_retries}] {label}: {e}")
+                    await asyncio.sleep(1 + attempt)
+                else:
+                    raise
+        
+        raise RuntimeError(f"[{label}] 재시도 {self.max_retries}회 초과")
+
+    async def _request_content(
+        self,
+        messages: List[Dict[str, str]],
+        label: str,
+        max_tokens: int,
+        on_field: Optional[Callable[[str, object], None]] = None
+    ) -> str:
+        """OpenAI 1회 호출 후 응답 텍스트 반환 (streaming 모드면 스트림 소비)"""
+        if self.streaming and on_field is not None:
+            return await self._stream_completion(messages, label, max_tokens, on_field)
+        
+        response = await limited_chat_completion(
+            self.client,
+            span_label=label,
+            model=self.model,
+            messages=messages,
+            temperature=self.temperature,
+            max_tokens=max_tokens,
+            response_format={"type": "json_object"}
+        )
+        
+        self._record_usage(label, response)
+        return response.choices[0].message.content
+    
+    async def _hedged_request(
+        self,
+        messages: List[Dict[str, str]],
+        label: str,
+        max_tokens: int,
+        on_field: Optional[Callable[[str, object], None]] = None
+    ) -> str:
+        """
+        최근 지연 분포의 백분위를 넘기면 중복 요청을 보내 먼저 끝난 응답 사용
+        
+        hedge 요청은 Rate Limiter에 즉시 쓸 수 있는 예산이 있을 때만 발송되므로
+        다른 호출을 대기열에서 밀어내지 않습니다.
+        """
+        from core.config import STAGE1_HEDGE_PERCENTILE, STAGE1_HEDGE_MAX_RATIO, STAGE1_HEDGE_MIN_SAMPLES
+        
+        # 두 요청이 같은 필드를 중복 발행하지 않도록 먼저 도착한 값만 전달
+        published = set()
+        
+        def on_field_once(field: str, value) -> None:
+            if field not in published:
+                published.add(field)
+                on_field(field, value)
+        
+        estimated = self.rate_limiter.reservation_tokens(messages, max_tokens)
+        return await hedged_call(
+            label,
+            lambda: self._request_content(
+                messages, label, max_tokens, on_field_once if on_field is not None else None
+            ),
+            percentile=STAGE1_HEDGE_PERCENTILE,
+            min_samples=STAGE1_HEDGE_MIN_SAMPLES,
+            budget=get_hedge_budget(self.model, STAGE1_HEDGE_MAX_RATIO),
+            can_hedge=lambda: self.rate_limiter.has_capacity(estimated),
+        )
+    
+    async def _stream_completion(
+        self,
+        messages: List[Dict[str, str]],
+        label: str,
+        max_tokens: int,
+        on_field: Callable[[str, object], None]
+    ) -> str:
+        """스트림으로 응답을 받으며 완성된 필드를 on_field로 전달, 전체 텍스트 반환"""
+        stream = await limited_chat_completion(
+            self.client,
+            span_label=label,
+            model=self.model,
+            messages=messages,
+            temperature=self.temperature,
+            max_tokens=max_tokens,
+            response_format={"type": "json_object"},
+            stream=True,
+            stream_options={"include_usage": True}
+        )
+        
+        extractor = StreamingJSONFieldExtractor(
+            scalar_fields=self.STREAM_SCALAR_FIELDS,
+            container_fields=self.STREAM_CONTAINER_FIELDS
+        )
+        try:
+            async for chunk in stream:
+                # include_usage: 마지막 청크는 choices 없이 usage만 포함
+                if getattr(chunk, "usage", None) is not None:
+                    self._record_usage(label, chunk)
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    for field, value in extractor.feed(delta):
+                        on_field(field, value)
+        finally:
+            # hedge 패배로 취소된 경우에도 커넥션 반환
+            close = getattr(stream, "close", None)
+            if close is not None:
+                await close()
+        
+        return extractor.buffer
+    
+    def _record_usage(self, competency_name: str, response) -> None:
+        """응답 usage에서 prompt/cached/completion 토큰 기록"""
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+        details = getattr(usage, "prompt_tokens_details", None)
+        self.usage_log[competency_name] = {
+            "prompt_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+            "cached_tokens": getattr(details, "cached_tokens", 0) or 0,
+            "completion_tokens": getattr(usage, "completion_tokens", 0) or 0,
+        }
+
+    def prompt_cache_summary(self) -> Dict:
+        """Stage 1 provider prompt 캐시 적중 요약 (execution_logs 기록용)"""
+        prompt_tokens = sum(u["prompt_tokens"] for u in self.usage_log.values())
+        cached_tokens = sum(u["cached_tokens"] for u in self.usage_log.values())
+        return {
+            "calls": len(self.usage_log),
+            "prompt_tokens": prompt_tokens,
+            "cached_tokens": cached_tokens,
+            "cache_hit_ratio": round(cached_tokens / prompt_tokens, 3) if prompt_tokens else 0.0,
+            "by_competency": self.usage_log,
+        }
 
     async def _handle_rate_limit(self, error: Exception, attempt: int, competency_name: str):
-        """429 오류 대응: retry-after 또는 지수 백오프 기반 대기"""
-        retry_after = None
-        response = getattr(error, "response", None)
-        if response:
-            retry_after = response.headers.get("retry-after") or response.headers.get("Retry-After")
-        if retry_after:
-            try:
-                wait_seconds = float(retry_after)
-            except ValueError:
-                wait_seconds = None
-        else:
-            wait_seconds = None
-        if wait_seconds is None:
-            import re
-            match = re.search(r"try again in ([0-9.]+)s", str(error))
-            if match:
-                wait_seconds = float(match.group(1))
+        """429 오류 대응: retry-after 또는 지수 백오프 동안 이 모델의 모든 호출을 보류"""
+        wait_seconds = retry_after_seconds(error)
         if wait_seconds is None:
             wait_seconds = min(30, 2 ** attempt * 2)
         print(f"[대기] {competency_name} rate limit 감지 → {wait_seconds:.1f}s 후 재시도 ({attempt+1}/{self.max_retries})")
-        await asyncio.sleep(wait_seconds)
+        # 개별 sleep 대신 공용 Limiter를 멈춰 다른 호출도 함께 대기 (재시도 폭주 방지)
+        self.rate_limiter.penalize(wait_seconds)
+
+
+# 10개 역량 설정 (name, display_name, category)
+COMPETENCY_CONFIGS = [
+    # Common Competencies (5개)
+    ("achievement_motivation", "성취/동기 역량", "common"),
+    ("growth_potential", "성장 잠재력", "common"),
+    ("interpersonal_skill", "대인관계 역량", "common"), 
+    ("organizational_fit", "조직 적합성", "common"),
+    ("problem_solving", "문제해결력", "common"),
+    
+    # Job Competencies (5개)
+    ("customer_journey_marketing", "고객 여정 설계 및 VMD·마케팅 통합 전략", "job"),
+    ("md_data_analysis", "매출·트렌드 데이터 분석 및 상품 기획", "job"),
+    ("seasonal_strategy_kpi", "시즌 전략 수립 및 비즈니스 문제해결", "job"),
+    ("stakeholder_collaboration", "유관부서 협업 및 이해관계자 협상", "job"),
+    ("value_chain_optimization", "소싱·생산·유통 밸류체인 최적화", "job"),
+]
+
+
+def resolve_competency_groups(
+    grouping: str,
+    configs: List[Tuple[str, str, str]] = COMPETENCY_CONFIGS
+) -> List[List[Tuple[str, str, str]]]:
+    """
+    Stage 1 호출 묶음 정책 해석
+    
+    Args:
+        grouping:
+            - "none": 역량당 1회 호출 (기본)
+            - "category": common 5개 / job 5개를 각각 1회 호출
+            - "a+b;c+d": 명시한 역량끼리 묶음 (나머지는 개별 호출)
+    
+    Returns:
+        호출 단위 리스트 (각 원소는 configs의 부분 리스트)
+    """
+    grouping = (grouping or "none").strip()
+    if grouping == "none":
+        return [[config] for config in configs]
+    
+    if grouping == "category":
+        by_category: Dict[str, List[Tuple[str, str, str]]] = {}
+        for config in configs:
+            by_category.setdefault(config[2], []).append(config)
+        return list(by_category.values())
+    
+    by_name = {config[0]: config for config in configs}
+    known = set(by_name) | {config[0] for config in COMPETENCY_CONFIGS}
+    groups = []
+    assigned = set()
+    for spec in grouping.split(";"):
+        names = [name.strip() for name in spec.split("+") if name.strip()]
+        unknown = [name for name in names if name not in known]
+        if unknown:
+            raise ValueError(f"알 수 없는 역량 이름: {unknown}")
+        # configs에서 빠진 역량(재사용 등)은 묶음에서 제외
+        names = [name for name in names if name in by_name and name not in assigned]
+        if names:
+            groups.append([by_name[name] for name in names])
+            assigned.update(names)
+    groups.extend([config] for config in configs if config[0] not in assigned)
+    return groups
+
+
+def _failed_result(name: str, error) -> Dict:
+    """평가 실패 역량의 기본 결과"""
+    return {
+        "error": str(error),
+        "overall_score": 0,
+        "confidence": {
+            "overall_confidence": 0.3
+        },
+        "key_observations": [f"{name} 평가 실패"]  # 🆕 에러 시에도 필드 보장
+    }
 
 
 async def evaluate_all_competencies(
     agent: CompetencyAgent,
     transcript: Dict,
-    prompts: Dict[str, str]
+    prompts: Dict[str, str],
+    grouping: Optional[str] = None,
+    on_result: Optional[Callable[[str, Dict], None]] = None,
+    reuse: Optional[Dict[str, Dict]] = None
 ) -> Dict[str, Dict]:
-    """10개 역량 배치 평가"""
+    """
+    10개 역량 배치 평가
+    
+    Args:
+        grouping: 호출 묶음 정책 (None이면 core.config.STAGE1_GROUPING, resolve_competency_groups 참고)
+        on_result: 역량 결과가 나올 때마다 호출 (name, result) - Stage 2 파이프라이닝용
+        reuse: 다시 평가하지 않고 그대로 쓸 역량 결과 (선택적 재평가, graph/reevaluation.py)
+    """
+    from core.config import STAGE1_GROUPING
+    
+    reuse = reuse or {}
+    configs = [config for config in COMPETENCY_CONFIGS if config[0] not in reuse]
+    groups = resolve_competency_groups(grouping or STAGE1_GROUPING, configs) if configs else []
     
     print("=" * 60)
-    print("10개 역량 배치 평가 시작")
+    print(f"10개 역량 배치 평가 시작 (호출 {len(groups)}회, 재사용 {len(reuse)}개)")
     print("=" * 60)
     
-    # 10개 역량 설정
-    competency_configs = [
-        # Common Competencies (5개)
-        ("achievement_motivation", "성취/동기 역량", "common"),
-        ("growth_potential", "성장 잠재력", "common"),
-        ("interpersonal_skill", "대인관계 역량", "common"), 
-        ("organizational_fit", "조직 적합성", "common"),
-        ("problem_solving", "문제해결력", "common"),
-        
-        # Job Competencies (5개)
-        ("customer_journey_marketing", "고객 여정 설계 및 VMD·마케팅 통합 전략", "job"),
-        ("md_data_analysis", "매출·트렌드 데이터 분석 및 상품 기획", "job"),
-        ("seasonal_strategy_kpi", "시즌 전략 수립 및 비즈니스 문제해결", "job"),
-        ("stakeholder_collaboration", "유관부서 협업 및 이해관계자 협상", "job"),
-        ("value_chain_optimization", "소싱·생산·유통 밸류체인 최적화", "job"),
-    ]
-    
-    # 병렬 평가 실행
-    tasks = [
-        agent.evaluate(name, display, category, prompts[name], transcript)
-        for name, display, category in competency_configs
-    ]
-    
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    agent.completed_count = len(reuse)
+    if on_result is not None:
+        for name, result in reuse.items():
+            on_result(name, result)
+    
+    # 병렬 평가 실행 (단일 역량은 evaluate, 묶음은 evaluate_group)
+    async def run(group):
+        names = [name for name, _, _ in group]
+        try:
+            with span(f"stage1:{'+'.join(names)}", "agent", competencies=names):
+                if len(group) == 1:
+                    name, display, category = group[0]
+                    group_result = {name: await agent.evaluate(name, display, category, prompts[name], transcript)}
+                else:
+                    group_result = await agent.evaluate_group(group, prompts, transcript)
+        except Exception as e:
+            if on_result is not None:
+                for name, _, _ in group:
+                    on_result(name, _failed_result(name, e))
+            raise
+        if on_result is not None:
+            for name, _, _ in group:
+                result = group_result.get(name)
+                on_result(name, result if result is not None else _failed_result(name, None))
+        return group_result
+    
+    group_results = await asyncio.gather(*(run(group) for group in groups), return_exceptions=True)
+    
+    results = dict(reuse)
+    for group, group_result in zip(groups, group_results):
+        for name, _, _ in group:
+            results[name] = group_result if isinstance(group_result, Exception) else group_result.get(name)
     
     print("=" * 60)
     print("배치 평가 완료")
@@ -329,17 +777,11 @@ async def evaluate_all_competencies(
     
     # 결과 매핑
     result_dict = {}
-    for (name, _, _), result in zip(competency_configs, results):
-        if isinstance(result, Exception):
+    for name, _, _ in COMPETENCY_CONFIGS:
+        result = results.get(name)
+        if isinstance(result, Exception) or result is None:
             print(f"[오류] {name}: {str(result)}")
-            result_dict[name] = {
-                "error": str(result),
-                "overall_score": 0,
-                "confidence": {
-                    "overall_confidence": 0.3
-                },
-                "key_observations": [f"{name} 평가 실패"]  # 🆕 에러 시에도 필드 보장
-            }
+            result_dict[name] = _failed_result(name, result)
         else:
             result_dict[name] = result
     
@@ -7,22 +7,39 @@ Sub-steps:
     2.2. Confidence V2 계산 (Rule-based)
     2.3. Segment Overlap Check (조건부, Rule + AI)
     2.4. Cross-Competency Validation (Rule-based)
+
+2.3 이후의 rule-based 계산(역량별 평균 / 검증 수 / Low Confidence 탐지)은 하나의 SegmentTable을
+공유해 역량 그룹 단위로 한 번에 계산합니다 (역량마다 전체 Segment 목록을 다시 필터링하지 않음).
 """
 
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
+
+import numpy as np
+
 from .state import EvaluationState
+from .context import context_value
+from .progress import publish_substep
 from ..aggregators.resume_verifier import ResumeVerifier
 from ..aggregators.confidence_calculator import ConfidenceCalculator
 from ..aggregators.segment_overlap_checker import SegmentOverlapChecker
+from ..aggregators.segment_table import STRENGTH_CODES, SegmentTable
+from ai.utils.llm_usage import LLMUsageRecorder, llm_usage_scope
+from ai.utils.tracing import span
 
 
-def _extract_resume_verification_summary(comp_segments: List[Dict]) -> Dict:
+def _extract_resume_verification_summary(
+    segments: List[Dict],
+    table: SegmentTable,
+    rows: np.ndarray
+) -> Dict:
     """
     역량별 Resume 검증 근거 추출 (상위 3개만)
     
     Args:
-        comp_segments: 특정 역량의 Segment 평가 목록
+        segments: 전체 Segment 평가 목록
+        table: segments의 SegmentTable
+        rows: 특정 역량의 Segment 평가 행 번호 (원본 순서)
     
     Returns:
         {
@@ -41,27 +58,15 @@ def _extract_resume_verification_summary(comp_segments: List[Dict]) -> Dict:
             ]
         }
     """
-    verified_segments = [
-        s for s in comp_segments 
-        if s.get("resume_verification", {}).get("verified", False)
-    ]
+    verified_rows = rows[table.verified[rows]]
+    strength = table.strength[verified_rows]
     
-    high_strength_segments = [
-        s for s in verified_segments
-        if s.get("resume_verification", {}).get("strength") == "high"
-    ]
-    
-    # 검증 강도 순으로 정렬 (high > medium > low)
-    strength_order = {"high": 3, "medium": 2, "low": 1, "none": 0}
-    verified_segments_sorted = sorted(
-        verified_segments,
-        key=lambda s: strength_order.get(s.get("resume_verification", {}).get("strength", "none"), 0),
-        reverse=True
-    )
+    # 검증 강도 순으로 정렬 (high > medium > low, 같은 강도는 원본 순서, 알 수 없는 강도는 none과 동일)
+    order = np.argsort(-np.maximum(strength, 0), kind="stable")
     
     # 상위 3개만 추출
     key_evidence = []
-    for seg in verified_segments_sorted[:3]:
+    for seg in (segments[row] for row in verified_rows[order[:3]].tolist()):
         resume_verification = seg.get("resume_verification", {})
         resume_matches = resume_verification.get("resume_matches", [])
         
@@ -81,69 +86,25 @@ def _extract_resume_verification_summary(comp_segments: List[Dict]) -> Dict:
         })
     
     return {
-        "verified_count": len(verified_segments),
-        "high_strength_count": len(high_strength_segments),
+        "verified_count": len(verified_rows),
+        "high_strength_count": int(np.count_nonzero(strength == STRENGTH_CODES["high"])),
         "key_evidence": key_evidence
     }
 
 
-async def aggregator_node(state: EvaluationState) -> Dict:
+async def _verify_and_score(
+    all_competency_results: Dict[str, Dict],
+    resume_data: Optional[Dict],
+    openai_client,
+    llm_usage: LLMUsageRecorder
+) -> Tuple[List[Dict], List[Dict]]:
     """
-    Stage 2: Aggregator Node
-    
-    처리 내용:
-        1. Resume Verification (AI 1회, Batch)
-        2. Confidence V2 계산 (Rule-based)
-        3. Segment Overlap Check (조건부, Rule + AI)
-        4. Cross-Competency Validation (Rule-based)
+    Sub-step 2.1 + 2.2 (파이프라이닝을 끈 경우, STAGE2_PIPELINE_BATCH_SIZE=0)
     
     Returns:
-        업데이트할 State 필드:
-            - segment_evaluations_with_resume
-            - confidence_v2_calculated
-            - segment_overlap_adjustments (내부 로직용)
-            - cross_competency_flags (내부 로직용)
-            - aggregated_competencies (Resume 검증 근거 포함)
-            - low_confidence_list
-            - requires_collaboration
+        (Resume 검증 결과가 추가된 Segment 평가 목록, confidence_v2까지 추가된 목록)
     """
     
-    start_time = datetime.now()
-    
-    print("\n" + "="*60)
-    print("[Stage 2] Aggregator 시작")
-    print("="*60)
-    
-
-    # 입력 데이터 준비
-
-    
-    # 10개 역량 결과 수집
-    all_competency_results = {
-        # Common Competencies (5개)
-        "achievement_motivation": state.get("achievement_motivation_result"),
-        "growth_potential": state.get("growth_potential_result"),
-        "interpersonal_skill": state.get("interpersonal_skill_result"),
-        "organizational_fit": state.get("organizational_fit_result"),
-        "problem_solving": state.get("problem_solving_result"),
-        
-        # Job Competencies (5개)
-        "customer_journey_marketing": state.get("customer_journey_marketing_result"),
-        "md_data_analysis": state.get("md_data_analysis_result"),
-        "seasonal_strategy_kpi": state.get("seasonal_strategy_kpi_result"),
-        "stakeholder_collaboration": state.get("stakeholder_collaboration_result"),
-        "value_chain_optimization": state.get("value_chain_optimization_result"),
-    }
-    
-    # None 제거
-    all_competency_results = {k: v for k, v in all_competency_results.items() if v is not None}
-    
-    print(f"\n✓ 평가 완료된 역량: {len(all_competency_results)}개")
-    
-    resume_data = state.get("resume_data")
-    openai_client = state.get("openai_client")
-    
-
     # Sub-step 2.1: Resume Verification
 
     
@@ -152,10 +113,11 @@ async def aggregator_node(state: EvaluationState) -> Dict:
     
     verifier = ResumeVerifier(openai_client)
     
-    segment_evaluations_with_resume = await verifier.verify_batch(
-        all_competency_results,
-        resume_data
-    )
+    with llm_usage_scope("aggregator", llm_usage), span("resume_verification", "substep"):
+        segment_evaluations_with_resume = await verifier.verify_batch(
+            all_competency_results,
+            resume_data
+        )
     
     # 통계 출력
     verified_count = sum(
@@ -187,9 +149,10 @@ async def aggregator_node(state: EvaluationState) -> Dict:
     print("\n[Sub-step 2.2] Confidence V2 재계산 (Rule-based)")
     print("-" * 60)
     
-    segment_evaluations_with_conf_v2 = ConfidenceCalculator.calculate_for_segments(
-        segment_evaluations_with_resume
-    )
+    with span("confidence_v2", "substep", segments=len(segment_evaluations_with_resume)):
+        segment_evaluations_with_conf_v2 = ConfidenceCalculator.calculate_for_segments(
+            segment_evaluations_with_resume
+        )
     
     # 통계 출력
     avg_conf_v2 = sum(s["confidence_v2"] for s in segment_evaluations_with_conf_v2) / len(segment_evaluations_with_conf_v2)
@@ -207,6 +170,91 @@ async def aggregator_node(state: EvaluationState) -> Dict:
         worst = sorted_by_conf[-1]
         print(f"    - 최고/최저: seg#{best.get('segment_id')}={best['confidence_v2']:.2f} / seg#{worst.get('segment_id')}={worst['confidence_v2']:.2f}")
     
+    return segment_evaluations_with_resume, segment_evaluations_with_conf_v2
+
+
+async def aggregator_node(state: EvaluationState) -> Dict:
+    """
+    Stage 2: Aggregator Node
+    
+    처리 내용:
+        1. Resume Verification (AI 1회, Batch)
+        2. Confidence V2 계산 (Rule-based)
+           → 1, 2는 기본적으로 batch_evaluation에서 Stage 1과 겹쳐 micro-batch로 실행되며
+             (incremental_verifier.py), 여기서는 그 결과를 합치기만 함
+        3. Segment Overlap Check (조건부, Rule + AI)
+        4. Cross-Competency Validation (Rule-based)
+    
+    Returns:
+        업데이트할 State 필드:
+            - segment_evaluations_with_resume
+            - confidence_v2_calculated
+            - segment_overlap_adjustments (내부 로직용)
+            - cross_competency_flags (내부 로직용)
+            - aggregated_competencies (Resume 검증 근거 포함)
+            - low_confidence_list
+            - requires_collaboration
+    """
+    
+    start_time = datetime.now()
+    
+    print("\n" + "="*60)
+    print("[Stage 2] Aggregator 시작")
+    print("="*60)
+    
+
+    # 입력 데이터 준비
+
+    
+    # 10개 역량 결과 수집
+    all_competency_results = {
+        # Common Competencies (5개)
+        "achievement_motivation": state.get("achievement_motivation_result"),
+        "growth_potential": state.get("growth_potential_result"),
+        "interpersonal_skill": state.get("interpersonal_skill_result"),
+        "organizational_fit": state.get("organizational_fit_result"),
+        "problem_solving": state.get("problem_solving_result"),
+        
+        # Job Competencies (5개)
+        "customer_journey_marketing": state.get("customer_journey_marketing_result"),
+        "md_data_analysis": state.get("md_data_analysis_result"),
+        "seasonal_strategy_kpi": state.get("seasonal_strategy_kpi_result"),
+        "stakeholder_collaboration": state.get("stakeholder_collaboration_result"),
+        "value_chain_optimization": state.get("value_chain_optimization_result"),
+    }
+    
+    # None 제거
+    all_competency_results = {k: v for k, v in all_competency_results.items() if v is not None}
+    
+    print(f"\n✓ 평가 완료된 역량: {len(all_competency_results)}개")
+    
+    resume_data = context_value(state, "resume_data")
+    openai_client = context_value(state, "openai_client")
+    
+
+    # Sub-step 2.1 + 2.2: batch_evaluation에서 파이프라인으로 이미 계산했으면 합치기만 수행
+
+    llm_usage = LLMUsageRecorder("aggregator")
+    
+    if state.get("confidence_v2_calculated"):
+        segment_evaluations_with_conf_v2 = state.get("segment_evaluations_with_resume", [])
+        segment_evaluations_with_resume = segment_evaluations_with_conf_v2
+        print("\n[Sub-step 2.1 + 2.2] Stage 1과 파이프라인으로 완료됨 - 결과 합치기")
+        print(f"    - Segment 평가: {len(segment_evaluations_with_conf_v2)}개")
+    else:
+        segment_evaluations_with_resume, segment_evaluations_with_conf_v2 = await _verify_and_score(
+            all_competency_results, resume_data, openai_client, llm_usage
+        )
+    
+    # Segment 평가 열 배열 (Overlap 조정이 score / confidence / adjusted 열을 갱신)
+    table = SegmentTable(segment_evaluations_with_conf_v2)
+    verified_count = int(np.count_nonzero(table.verified))
+    publish_substep(state, "resume_verification", f"Resume 검증 완료: {verified_count}개 검증됨", 55)
+    publish_substep(
+        state, "confidence_v2",
+        f"Confidence V2 계산 완료: Segment {len(segment_evaluations_with_conf_v2)}개", 58
+    )
+    
 
     # Sub-step 2.3: Segment Overlap Check (내부 로직용)
 
@@ -216,9 +264,12 @@ async def aggregator_node(state: EvaluationState) -> Dict:
     
     overlap_checker = SegmentOverlapChecker(openai_client)
     
-    adjusted_segments, segment_overlap_adjustments = await overlap_checker.check_and_adjust(
-        segment_evaluations_with_conf_v2
-    )
+    with llm_usage_scope("aggregator", llm_usage), \
+            span("segment_overlap", "substep", segments=len(segment_evaluations_with_conf_v2)):
+        adjusted_segments, segment_overlap_adjustments = await overlap_checker.check_and_adjust(
+            segment_evaluations_with_conf_v2,
+            table
+        )
     
     print(f"\n  Segment Overlap 체크 완료:")
     print(f"    - 조정된 Segment: {len(segment_overlap_adjustments)}개")
@@ -233,6 +284,9 @@ async def aggregator_node(state: EvaluationState) -> Dict:
             if len(adj.get("adjustments", [])) > 2:
                 print("         · ...")
     print("      이 정보는 내부 로직용이며 프론트엔드에 노출하지 않습니다.")
+    publish_substep(
+        state, "segment_overlap", f"Segment Overlap 체크 완료: {len(segment_overlap_adjustments)}개 조정", 63
+    )
     
 
     # Sub-step 2.4: Cross-Competency Validation (내부 로직용)
@@ -241,20 +295,21 @@ async def aggregator_node(state: EvaluationState) -> Dict:
     print("\n[Sub-step 2.4] Cross-Competency Validation (Rule-based)")
     print("-" * 60)
     
-    # 역량별 평균 Confidence V2 계산
+    # 역량별 평균 Confidence V2 / Segment 수 / Resume 검증 수 / Overlap 조정 여부 (역량 그룹 단위 1회)
+    by_competency = table.by_competency
+    comp_codes = {name: code for code, name in enumerate(table.competencies)}
+    comp_rows = table.competency_rows()
+    comp_avg_conf = by_competency.mean(table.confidence).tolist()
+    comp_verified = by_competency.sum(table.verified).astype(int).tolist()
+    comp_adjusted = (by_competency.sum(table.adjusted) > 0).tolist()
+    
     competency_confidences = {}
     
     for comp_name in all_competency_results.keys():
-        # 해당 역량의 Segment 평가들만 필터링
-        comp_segments = [
-            s for s in adjusted_segments 
-            if s["competency"] == comp_name
-        ]
-        
-        if comp_segments:
+        code = comp_codes.get(comp_name)
+        if code is not None:
             # 평균 Confidence V2
-            avg_conf = sum(s["confidence_v2"] for s in comp_segments) / len(comp_segments)
-            competency_confidences[comp_name] = round(avg_conf, 2)
+            competency_confidences[comp_name] = round(comp_avg_conf[code], 2)
         else:
             # Segment가 없으면 원본 Confidence 사용
             original_conf = all_competency_results[comp_name].get("confidence", {}).get("overall_confidence", 0.5)
@@ -287,6 +342,9 @@ async def aggregator_node(state: EvaluationState) -> Dict:
     
     print(f"\n  Cross-Competency 검증 완료:")
     print(f"    - Low Confidence 역량: {len(low_confidence_list)}개")
+    publish_substep(
+        state, "cross_competency", f"Cross-Competency 검증 완료: Low Confidence {len(low_confidence_list)}개", 67
+    )
     if low_confidence_list:
         for item in low_confidence_list:
             print(f"      * {item['competency']}: Conf={item['confidence_v2']:.2f}")
@@ -300,8 +358,9 @@ async def aggregator_node(state: EvaluationState) -> Dict:
     aggregated_competencies = {}
     
     for comp_name, comp_result in all_competency_results.items():
-        # 해당 역량의 Segment 평가들
-        comp_segments = [s for s in adjusted_segments if s["competency"] == comp_name]
+        # 해당 역량의 Segment 평가 행 번호
+        code = comp_codes.get(comp_name)
+        rows = comp_rows[comp_name] if code is not None else np.empty(0, dtype=np.int64)
         
         # 평균 Confidence V2
         avg_conf_v2 = competency_confidences.get(comp_name, 0.5)
@@ -310,7 +369,7 @@ async def aggregator_node(state: EvaluationState) -> Dict:
         original_score = comp_result.get("overall_score", 0)
         
         #  Resume 검증 근거 추출 (상위 3개만)
-        resume_verification_summary = _extract_resume_verification_summary(comp_segments)
+        resume_verification_summary = _extract_resume_verification_summary(adjusted_segments, table, rows)
         
         perspectives = comp_result.get("perspectives", {})
         evidence_details = perspectives.get("evidence_details", [])
@@ -324,12 +383,9 @@ async def aggregator_node(state: EvaluationState) -> Dict:
             "overall_score": original_score,  # Agent 점수 유지
             "interview_confidence": comp_result.get("confidence", {}).get("overall_confidence", 0.5),
             "confidence_v2": avg_conf_v2,  # Resume 검증 반영
-            "segment_count": len(comp_segments),
-            "resume_verified_count": sum(
-                1 for s in comp_segments 
-                if s.get("resume_verification", {}).get("verified", False)
-            ),
-            "adjusted_by_overlap": any(s.get("adjusted") for s in comp_segments),
+            "segment_count": len(rows),
+            "resume_verified_count": comp_verified[code] if code is not None else 0,
+            "adjusted_by_overlap": comp_adjusted[code] if code is not None else False,
             "perspectives": {
                 **perspectives,
                 "evidence_details": evidence_details  
@@ -376,6 +432,7 @@ async def aggregator_node(state: EvaluationState) -> Dict:
         "resume_verified_count": verified_count,
         "overlap_adjustments": len(segment_overlap_adjustments),
         "low_confidence_count": len(low_confidence_list),
+        "llm_usage": llm_usage.summary(),
         "timestamp": datetime.now().isoformat()
     }
     
@@ -399,5 +456,6 @@ async def aggregator_node(state: EvaluationState) -> Dict:
         "requires_collaboration": requires_collaboration,
         
         # 로그
-        "execution_logs": state.get("execution_logs", []) + [execution_log]
+        "execution_logs": state.get("execution_logs", []) + [execution_log],
+        "llm_spans": llm_usage.spans
     }
@@ -0,0 +1,272 @@
+"""
+평가 그래프 노드 단위 체크포인트
+
+graph.ainvoke()가 final_integration / presentation_formatter에서 실패하면 결과 전체가 사라지고,
+재시도하면 Stage 1 호출 10회를 다시 지불했습니다.
+각 노드가 끝날 때마다 EvaluationState(노드 update 반영 후)를 저장해 두고,
+EvaluationService.evaluate_interview(resume_from=...)가 첫 미완료 노드부터 다시 시작합니다.
+체크포인트는 실행 단위(checkpoint_run_key: interview + run)로 저장되므로, 재개는 같은 run으로 호출해야 합니다.
+
+저장 대상:
+    - 큰 입력(transcript, prompts, resume_data 등)은 State가 아닌 컨텍스트 저장소에 있으므로(context.py)
+      체크포인트에는 노드 결과만 저장됨
+    - TRANSIENT_STATE_KEYS(context_key, openai_client, progress_channel)는 직렬화하지 않고
+      재개 시 다시 주입 (context_key는 재개하는 실행이 새로 등록한 컨텍스트)
+    - datetime 필드(started_at, completed_at)는 ISO 문자열로 저장 후 복원
+
+백엔드 (EVALUATION_CHECKPOINT_BACKEND):
+    - "sqlite" (기본): EVALUATION_CHECKPOINT_PATH 로컬 파일
+    - "postgres": EVALUATION_CHECKPOINT_DATABASE_URL (미설정 시 DATABASE_URL)
+    - "none": 저장하지 않음
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import typing
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional
+
+from core.config import (
+    EVALUATION_CHECKPOINT_BACKEND,
+    EVALUATION_CHECKPOINT_DATABASE_URL,
+    EVALUATION_CHECKPOINT_PATH,
+    EVALUATION_CHECKPOINT_TTL_SECONDS,
+)
+from .state import EvaluationState
+from ai.utils.tracing import span
+
+
+TRANSIENT_STATE_KEYS = ("context_key", "openai_client", "progress_channel")
+DATETIME_STATE_KEYS = ("started_at", "completed_at")
+
+
+def _reducer_keys() -> List[str]:
+    """operator.add로 누적되는 State 필드 (execution_logs, errors, llm_spans)"""
+    hints = typing.get_type_hints(EvaluationState, include_extras=True)
+    return [
+        key for key, hint in hints.items()
+        if typing.get_origin(hint) is typing.Annotated and any(callable(m) for m in hint.__metadata__)
+    ]
+
+
+REDUCER_KEYS = _reducer_keys()
+
+
+def checkpoint_run_key(interview_id: int, run: Optional[str] = None) -> str:
+    """
+    체크포인트 run key
+
+    같은 interview를 동시에 실행해도(큐 재시도와 직접 호출, 재평가와 배치 등) 서로의 노드 State를
+    덮어쓰거나 재개하지 않도록 실행 구분 키(큐 작업 run / batch_id / SQS messageId)를 포함합니다.
+    run이 None이면 interview 단위 키 (run 없이 직접 호출하는 단일 실행용)
+    """
+    if run is None:
+        return f"interview:{interview_id}"
+    return f"interview:{interview_id}:run:{run}"
+
+
+def apply_node_update(state: Dict, update: Dict) -> Dict:
+    """LangGraph와 같은 규칙으로 노드 update를 State에 반영 (누적 필드는 이어붙임)"""
+    merged = dict(state)
+    for key, value in (update or {}).items():
+        if key in REDUCER_KEYS:
+            merged[key] = list(state.get(key) or []) + list(value or [])
+        else:
+            merged[key] = value
+    return merged
+
+
+def serialize_state(state: Dict) -> str:
+    payload = {key: value for key, value in state.items() if key not in TRANSIENT_STATE_KEYS}
+    for key in DATETIME_STATE_KEYS:
+        if isinstance(payload.get(key), datetime):
+            payload[key] = payload[key].isoformat()
+    return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+def deserialize_state(serialized: str, **transient: Any) -> Dict:
+    """저장된 State 복원 + 직렬화하지 않은 멤버(context_key 등) 재주입"""
+    state = json.loads(serialized)
+    for key in DATETIME_STATE_KEYS:
+        if isinstance(state.get(key), str):
+            state[key] = datetime.fromisoformat(state[key])
+    for key in TRANSIENT_STATE_KEYS:
+        state[key] = transient.get(key)
+    return state
+
+
+class SQLiteCheckpointStore:
+    """SQLite 기반 체크포인트 저장소 (run_key + node 당 최신 1건)"""
+
+    def __init__(self, path: str, ttl_seconds: int = 7 * 24 * 3600):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS evaluation_checkpoints (
+                    run_key TEXT NOT NULL,
+                    node TEXT NOT NULL,
+                    state TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (run_key, node)
+                )
+                """
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:  # commit / rollback
+                yield conn
+        finally:
+            conn.close()
+
+    def save(self, run_key: str, node: str, serialized_state: str) -> None:
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO evaluation_checkpoints (run_key, node, state, created_at) VALUES (?, ?, ?, ?)",
+                (run_key, node, serialized_state, now),
+            )
+            conn.execute("DELETE FROM evaluation_checkpoints WHERE created_at < ?", (now - self.ttl_seconds,))
+
+    def list(self, run_key: str) -> List[Dict[str, Any]]:
+        """완료 순서대로 [{node, state, created_at}]"""
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                "SELECT node, state, created_at FROM evaluation_checkpoints WHERE run_key = ? "
+                "ORDER BY created_at, rowid",
+                (run_key,),
+            ).fetchall()
+        return [{"node": node, "state": state, "created_at": created_at} for node, state, created_at in rows]
+
+    def clear(self, run_key: str) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM evaluation_checkpoints WHERE run_key = ?", (run_key,))
+
+    # 이벤트 루프를 막지 않도록 스레드에서 실행
+    async def asave(self, run_key: str, node: str, serialized_state: str) -> None:
+        await asyncio.to_thread(self.save, run_key, node, serialized_state)
+
+    async def alist(self, run_key: str) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self.list, run_key)
+
+    async def aclear(self, run_key: str) -> None:
+        await asyncio.to_thread(self.clear, run_key)
+
+
+class PostgresCheckpointStore(SQLiteCheckpointStore):
+    """Postgres 기반 체크포인트 저장소 (여러 워커/Lambda 간 공유)"""
+
+    def __init__(self, database_url: str, ttl_seconds: int = 7 * 24 * 3600):
+        from sqlalchemy import create_engine, text
+
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._text = text
+        self._engine = create_engine(database_url, pool_size=2, max_overflow=2, pool_pre_ping=True)
+        with self._engine.begin() as conn:
+            conn.execute(text(
+                """
+                CREATE TABLE IF NOT EXISTS evaluation_checkpoints (
+                    run_key TEXT NOT NULL,
+                    node TEXT NOT NULL,
+                    state TEXT NOT NULL,
+                    created_at DOUBLE PRECISION NOT NULL,
+                    PRIMARY KEY (run_key, node)
+                )
+                """
+            ))
+
+    def save(self, run_key: str, node: str, serialized_state: str) -> None:
+        now = time.time()
+        with self._engine.begin() as conn:
+            conn.execute(
+                self._text(
+                    "INSERT INTO evaluation_checkpoints (run_key, node, state, created_at) "
+                    "VALUES (:run_key, :node, :state, :now) "
+                    "ON CONFLICT (run_key, node) DO UPDATE SET state = EXCLUDED.state, created_at = EXCLUDED.created_at"
+                ),
+                {"run_key": run_key, "node": node, "state": serialized_state, "now": now},
+            )
+            conn.execute(
+                self._text("DELETE FROM evaluation_checkpoints WHERE created_at < :cutoff"),
+                {"cutoff": now - self.ttl_seconds},
+            )
+
+    def list(self, run_key: str) -> List[Dict[str, Any]]:
+        with self._engine.connect() as conn:
+            rows = conn.execute(
+                self._text(
+                    "SELECT node, state, created_at FROM evaluation_checkpoints "
+                    "WHERE run_key = :run_key ORDER BY created_at"
+                ),
+                {"run_key": run_key},
+            ).fetchall()
+        return [{"node": node, "state": state, "created_at": created_at} for node, state, created_at in rows]
+
+    def clear(self, run_key: str) -> None:
+        with self._engine.begin() as conn:
+            conn.execute(
+                self._text("DELETE FROM evaluation_checkpoints WHERE run_key = :run_key"),
+                {"run_key": run_key},
+            )
+
+
+_default_store = None
+_default_store_loaded = False
+
+
+def get_checkpoint_store():
+    """프로세스 공용 저장소 (EVALUATION_CHECKPOINT_BACKEND 설정 사용, "none"이면 None)"""
+    global _default_store, _default_store_loaded
+    if not _default_store_loaded:
+        backend = EVALUATION_CHECKPOINT_BACKEND
+        if backend == "sqlite":
+            _default_store = SQLiteCheckpointStore(EVALUATION_CHECKPOINT_PATH, EVALUATION_CHECKPOINT_TTL_SECONDS)
+        elif backend == "postgres":
+            _default_store = PostgresCheckpointStore(
+                EVALUATION_CHECKPOINT_DATABASE_URL, EVALUATION_CHECKPOINT_TTL_SECONDS
+            )
+        elif backend != "none":
+            raise ValueError(f"알 수 없는 EVALUATION_CHECKPOINT_BACKEND: {backend}")
+        _default_store_loaded = True
+    return _default_store
+
+
+def set_checkpoint_store(store) -> None:
+    """저장소 교체 (테스트/다른 백엔드 주입용, None이면 비활성화)"""
+    global _default_store, _default_store_loaded
+    _default_store = store
+    _default_store_loaded = True
+
+
+def checkpointed(node_name: str, node_fn: Callable[[Dict], Awaitable[Dict]], store) -> Callable[[Dict], Awaitable[Dict]]:
+    """노드 실행 후 update가 반영된 State를 저장하는 래퍼 (State에 checkpoint_key가 있을 때만)"""
+
+    async def run(state: Dict) -> Dict:
+        update = await node_fn(state)
+        run_key = state.get("checkpoint_key")
+        if run_key:
+            try:
+                with span("checkpoint_save", "io", node=node_name):
+                    await store.asave(run_key, node_name, serialize_state(apply_node_update(state, update)))
+            except Exception as e:
+                # 체크포인트 저장 실패가 평가 자체를 실패시키지 않도록 함
+                print(f"[Checkpoint] {node_name} 저장 실패: {e}")
+        return update
+
+    run.__name__ = node_fn.__name__
+    return run
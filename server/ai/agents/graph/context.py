@@ -0,0 +1,111 @@
+"""
+평가 컨텍스트 저장소 (큰 불변 입력은 State 밖에 1번만 보관)
+
+EvaluationState가 transcript(transcript / transcript_content로 2번), 역량별 프롬프트 10개
+(각각 transcript 전체 포함), resume_data, openai_client를 직접 들고 다녀서
+노드 체크포인트마다 수백 KB를 직렬화하고, 재평가 해시도 노드마다 프롬프트 전체를 다시 해싱했습니다.
+
+여기서는 실행 중 바뀌지 않는 입력을 프로세스 메모리의 컨텍스트에 1번만 등록하고,
+State에는 context_key만 남깁니다. 노드는 context_value(state, 이름)로 읽습니다.
+
+    - CONTEXT_KEYS: transcript, prompts, resume_data, previous_run, openai_client, progress_channel
+    - State에 같은 이름의 값이 있으면 그 값을 우선 사용 (노드 단위 테스트 / 스크립트 호환)
+    - context_hash(): 값별 hash_payload를 컨텍스트에 캐시 (재평가 노드 입력 해시용)
+    - 체크포인트에는 context_key를 저장하지 않고, 재개 시 새로 등록한 컨텍스트 키를 주입
+
+EvaluationService.build_initial_state()가 등록하고 evaluate_interview()가 끝날 때 해제합니다.
+"""
+
+import threading
+import uuid
+from typing import Any, Dict, Optional
+
+from ai.utils.llm_cache import hash_payload
+
+
+CONTEXT_KEYS = ("transcript", "prompts", "resume_data", "previous_run", "openai_client", "progress_channel")
+
+
+class EvaluationContextStore:
+    """context_key → {이름: 값} (프로세스 내 공유, 평가 종료 시 release)"""
+
+    def __init__(self):
+        self._contexts: Dict[str, Dict[str, Any]] = {}
+        self._hashes: Dict[str, Dict[str, str]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, **values: Any) -> str:
+        unknown = sorted(set(values) - set(CONTEXT_KEYS))
+        if unknown:
+            raise ValueError(f"알 수 없는 컨텍스트 항목: {', '.join(unknown)}")
+        key = uuid.uuid4().hex
+        with self._lock:
+            self._contexts[key] = dict(values)
+            self._hashes[key] = {}
+        return key
+
+    def update(self, key: str, **values: Any) -> None:
+        """평가 시작 전 입력 추가 (예: 재평가 모드의 previous_run)"""
+        with self._lock:
+            self._contexts[key].update(values)
+            for name in values:
+                self._hashes[key].pop(name, None)
+
+    def get(self, key: str, name: str, default: Any = None) -> Any:
+        context = self._contexts.get(key)
+        if context is None:
+            raise KeyError(f"해제되었거나 등록되지 않은 컨텍스트: {key}")
+        value = context.get(name)
+        return default if value is None else value
+
+    def value_hash(self, key: str, name: str) -> str:
+        hashes = self._hashes.get(key)
+        if hashes is None:
+            raise KeyError(f"해제되었거나 등록되지 않은 컨텍스트: {key}")
+        if name not in hashes:
+            hashes[name] = hash_payload(self._contexts[key].get(name))
+        return hashes[name]
+
+    def release(self, key: str) -> None:
+        with self._lock:
+            self._contexts.pop(key, None)
+            self._hashes.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._contexts)
+
+
+_default_store = EvaluationContextStore()
+
+
+def get_context_store() -> EvaluationContextStore:
+    return _default_store
+
+
+def register_context(**values: Any) -> str:
+    return _default_store.register(**values)
+
+
+def context_value(state: Dict, name: str, default: Any = None) -> Any:
+    """State에 직접 들어 있으면 그 값, 아니면 state["context_key"] 컨텍스트의 값"""
+    value = state.get(name)
+    if value is not None:
+        return value
+    key = state.get("context_key")
+    if key is None:
+        return default
+    return _default_store.get(key, name, default)
+
+
+def context_hash(state: Dict, name: str) -> str:
+    """context_value의 hash_payload (컨텍스트 값은 1번만 해싱)"""
+    key = state.get("context_key")
+    if state.get(name) is not None or key is None:
+        return hash_payload(state.get(name))
+    return _default_store.value_hash(key, name)
+
+
+def release_context(state: Optional[Dict]) -> None:
+    key = (state or {}).get("context_key")
+    if key:
+        _default_store.release(key)
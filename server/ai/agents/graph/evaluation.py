@@ -3,16 +3,22 @@ LangGraph Evaluation Graph
 Stage 1 → Stage 2 → Stage 3 (조건부 Collaboration)
 
 플로우:
-START → Stage 1 (10개 Agent 병렬) 
-      → Stage 2 (Aggregator: Resume + Confidence V2 + Segment Overlap + Cross-Competency)
+START → Stage 1 (10개 Agent 병렬, 결과가 도착하는 대로 Resume 검증 + Confidence V2 micro-batch 실행)
+      → Stage 2 (Aggregator: 부분 결과 합치기 + Segment Overlap + Cross-Competency)
       → [조건부 분기]
           ├─ Low Confidence 있음 → Collaboration (선택적) → Final Integration
           └─ 문제 없음 → Final Integration
       → END
 """
 
+from typing import Dict, List, Optional
+
 from langgraph.graph import StateGraph, END
+from ai.utils.tracing import traced
 from .state import EvaluationState
+from .checkpoint import checkpointed
+from .progress import reported
+from .reevaluation import tracked
 from .nodes import batch_evaluation_node
 from .aggregator_node import aggregator_node
 from .collaboration_node import collaboration_node
@@ -40,7 +46,40 @@ def should_collaborate(state: EvaluationState) -> str:
     return "final_integration"  # 현재는 항상 직행
 
 
-def create_evaluation_graph():
+def next_node(completed_node: str, state: Dict) -> Optional[str]:
+    """완료된 노드 다음에 실행될 노드 (그래프 Edge와 동일, 마지막이면 None)"""
+    if completed_node == "batch_evaluation":
+        return "aggregator"
+    if completed_node == "aggregator":
+        return should_collaborate(state)
+    if completed_node == "collaboration":
+        return "final_integration"
+    if completed_node == "final_integration":
+        return "presentation_formatter"
+    return None
+
+
+def plan_resume(checkpoints: List[Dict], resume_from: str) -> Optional[Dict]:
+    """
+    체크포인트 목록에서 재개 지점 선택
+    
+    Args:
+        checkpoints: [{"node": 완료된 노드, "state": 그 시점 State}] (완료 순서)
+        resume_from: "latest" (첫 미완료 노드) 또는 다시 시작할 노드 이름
+    
+    Returns:
+        {"entry_node": 시작 노드 (None이면 이미 완료), "state": 재개 State}
+        재개할 체크포인트가 없으면 None (처음부터 실행)
+    """
+    candidates = list(reversed(checkpoints))
+    for checkpoint in candidates:
+        entry = next_node(checkpoint["node"], checkpoint["state"])
+        if resume_from == "latest" or entry == resume_from:
+            return {"entry_node": entry, "state": checkpoint["state"]}
+    return None
+
+
+def create_evaluation_graph(entry_node: str = "batch_evaluation", checkpoint_store=None):
     """
     평가 그래프 생성
     
@@ -48,30 +87,39 @@ def create_evaluation_graph():
     Stage 1: 10개 Agent 병렬 평가
     Stage 2: Aggregator (Resume + Confidence V2 + Segment Overlap + Cross-Competency)
     Stage 3: Final Integration (+ 선택적 Collaboration)
+    
+    Args:
+        entry_node: 시작 노드 (체크포인트에서 재개할 때 첫 미완료 노드)
+        checkpoint_store: 지정 시 각 노드 완료 후 State 저장 (checkpoint.py)
+    
+    모든 노드는 입력 해시를 기록하고, 재평가 시 입력이 같으면 이전 출력을 재사용합니다 (reevaluation.py).
+    노드 시작/완료는 컨텍스트의 progress_channel로 발행됩니다 (progress.py).
     """
     
     graph = StateGraph(EvaluationState)
     
-    
+    def add_node(name, fn):
+        fn = traced(name, reported(name, tracked(name, fn)))
+        graph.add_node(name, checkpointed(name, fn, checkpoint_store) if checkpoint_store is not None else fn)
 
     # 1. Node 등록   
     # Stage 1: 10개 Agent 병렬 평가
-    graph.add_node("batch_evaluation", batch_evaluation_node)
+    add_node("batch_evaluation", batch_evaluation_node)
     
     # Stage 2: Aggregator
-    graph.add_node("aggregator", aggregator_node)
+    add_node("aggregator", aggregator_node)
     
     # Stage 3: Collaboration (선택적)
-    graph.add_node("collaboration", collaboration_node)
+    add_node("collaboration", collaboration_node)
     
     # Stage 3: Final Integration
-    graph.add_node("final_integration", final_integration_node)
+    add_node("final_integration", final_integration_node)
     
-    graph.add_node("presentation_formatter", presentation_formatter_node)
+    add_node("presentation_formatter", presentation_formatter_node)
 
     # 2. Edge 정의   
     # Entry Point
-    graph.set_entry_point("batch_evaluation")
+    graph.set_entry_point(entry_node)
     
     # Stage 1 → Stage 2
     graph.add_edge("batch_evaluation", "aggregator")
@@ -16,7 +16,11 @@ from datetime import datetime
 from openai import AsyncOpenAI
 
 from .state import EvaluationState
+from .context import context_value
 from services.evaluation.post_processing_service import PostProcessingService
+from ai.utils.llm_cache import build_cache_key, get_llm_cache
+from ai.utils.model_router import get_model_router, parse_json_response, routed_chat_completion
+from ai.utils.llm_usage import llm_usage_scope
 
 
 class FinalIntegrator:
@@ -30,6 +34,9 @@ class FinalIntegrator:
         - 종합 심사평 생성 (AI)
     """
     
+    # 종합 심사평 프롬프트 버전 (문구를 바꾸면 올려서 캐시 무효화)
+    PROMPT_VERSION = "v1"
+    
     # 신뢰도 레벨 Threshold
     RELIABILITY_THRESHOLDS = {
         "very_high": 0.85,  # 매우 높음
@@ -91,23 +98,22 @@ class FinalIntegrator:
         print("\n[Final Integrator] 최종 통합 시작")
         
     
-        # 1. Collaboration 결과 반영       
+        # 1~4. Collaboration 반영 + 최종 점수 + 평균 Confidence V2 + 신뢰도 (LLM 없음)
         if collaboration_results:
             print(f"  Collaboration 결과 반영: {len(collaboration_results)}건")
-            aggregated_competencies = FinalIntegrator._apply_collaboration_results(
-                aggregated_competencies,
-                collaboration_results
-            )
         else:
             print("  Collaboration 결과 없음 (스킵)")
-        
-        
-    
-        # 2. 최종 점수 계산 (가중 평균) 
-        final_score, competency_scores = FinalIntegrator._calculate_final_score(
+        scores = FinalIntegrator.compute_scores(
             aggregated_competencies,
-            competency_weights
+            competency_weights,
+            collaboration_results,
+            low_confidence_list
         )
+        aggregated_competencies = scores["aggregated_competencies"]
+        final_score = scores["final_score"]
+        competency_scores = scores["competency_scores"]
+        avg_confidence = scores["avg_confidence"]
+        reliability = scores["reliability"]
         
         print(f"\n  최종 점수: {final_score:.1f}점")
         if competency_scores:
@@ -122,12 +128,6 @@ class FinalIntegrator:
         
 
     
-        # 3. 평균 Confidence V2 계산
-        avg_confidence = FinalIntegrator._calculate_avg_confidence(
-            aggregated_competencies,
-            competency_weights
-        )
-        
         print(f"  평균 Confidence V2: {avg_confidence:.2f}")
         if competency_scores:
             best_conf = max(competency_scores, key=lambda c: c["confidence_v2"])
@@ -139,12 +139,6 @@ class FinalIntegrator:
         
 
     
-        # 4. 신뢰도 레벨 판단
-        reliability = FinalIntegrator._determine_reliability(
-            avg_confidence,
-            low_confidence_list or []
-        )
-        
         print(f"  신뢰도 레벨: {reliability['level']}")
         print(f"  신뢰도 근거: {reliability['note']}")
         if low_confidence_list:
@@ -204,8 +198,7 @@ class FinalIntegrator:
                 comp_name: {
                     "overall_score": comp_data["overall_score"],
                     "confidence_v2": comp_data["confidence_v2"],
-                    "weight": competency_weights.get(comp_name, 0.0),
-                    "weighted_contribution": comp_data["overall_score"] * competency_weights.get(comp_name, 0.0),
+                    **FinalIntegrator.weight_fields(comp_data, competency_weights.get(comp_name, 0.0)),
                     "resume_verified_count": comp_data.get("resume_verified_count", 0),
                     "segment_count": comp_data.get("segment_count", 0),
                     "perspectives": comp_data.get("perspectives", {}),
@@ -223,6 +216,62 @@ class FinalIntegrator:
         return final_result
     
     
+    @staticmethod
+    def compute_scores(
+        aggregated_competencies: Dict[str, Dict],
+        competency_weights: Dict[str, float],
+        collaboration_results: Optional[List[Dict]] = None,
+        low_confidence_list: Optional[List[Dict]] = None
+    ) -> Dict:
+        """
+        가중치에만 의존하는 점수 부분 (LLM 호출 없음, 가중치 재계산 rescoring_service.py에서도 사용)
+        
+        Returns:
+            {
+                "aggregated_competencies": Collaboration 반영된 역량,
+                "final_score": 82.5,
+                "competency_scores": [...],
+                "avg_confidence": 0.78,
+                "reliability": {...}
+            }
+        """
+        if collaboration_results:
+            aggregated_competencies = FinalIntegrator._apply_collaboration_results(
+                aggregated_competencies,
+                collaboration_results
+            )
+        
+        final_score, competency_scores = FinalIntegrator._calculate_final_score(
+            aggregated_competencies,
+            competency_weights
+        )
+        avg_confidence = FinalIntegrator._calculate_avg_confidence(
+            aggregated_competencies,
+            competency_weights
+        )
+        reliability = FinalIntegrator._determine_reliability(
+            avg_confidence,
+            low_confidence_list or []
+        )
+        
+        return {
+            "aggregated_competencies": aggregated_competencies,
+            "final_score": final_score,
+            "competency_scores": competency_scores,
+            "avg_confidence": avg_confidence,
+            "reliability": reliability
+        }
+    
+    
+    @staticmethod
+    def weight_fields(comp_data: Dict, weight: float) -> Dict:
+        """competency_details의 가중치 관련 필드"""
+        return {
+            "weight": weight,
+            "weighted_contribution": comp_data["overall_score"] * weight
+        }
+    
+    
     @staticmethod
     async def _generate_overall_evaluation_summary(
         openai_client: AsyncOpenAI,
@@ -315,35 +364,40 @@ class FinalIntegrator:
 - overall_evaluation_summary는 한 문단으로 작성 (줄바꿈 없음).
 """
         
+        messages = [
+            {
+                "role": "system",
+                "content": "You are an expert HR evaluator specializing in fashion MD hiring. Create comprehensive, insightful evaluation summaries."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+        cache = get_llm_cache()
+        cache_key = build_cache_key(
+            "final_integration_summary", get_model_router().route_key("final_summary"), 0.3, messages,
+            prompt_version=FinalIntegrator.PROMPT_VERSION
+        )
+        
         try:
-            response = await openai_client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert HR evaluator specializing in fashion MD hiring. Create comprehensive, insightful evaluation summaries."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
+            cached = await cache.aget(cache_key)
+            if cached is not None:
+                print("    [캐시 히트] 종합 심사평 재사용")
+                return cached
+            
+            summary, _ = await routed_chat_completion(
+                openai_client,
+                "final_summary",
+                messages,
+                validate=FinalIntegrator._parse_summary_response,
+                span_label="final_integration_summary",
                 temperature=0.3,
                 max_tokens=1000,
                 response_format={"type": "json_object"}
             )
-            
-            result_text = response.choices[0].message.content.strip()
-            
-            # 마크다운 제거
-            if result_text.startswith("```"):
-                result_text = result_text.split("```")[1]
-                if result_text.startswith("json"):
-                    result_text = result_text[4:]
-            result_text = result_text.strip()
-            
-            result = json.loads(result_text)
-            return result.get("overall_evaluation_summary", "")
+            await cache.aset(cache_key, summary)
+            return summary
         
         except Exception as e:
             print(f"    ⚠️  종합 심사평 생성 실패: {e}")
@@ -352,6 +406,15 @@ class FinalIntegrator:
             return f"지원자는 패션 MD 직무에 필요한 역량을 전반적으로 갖추고 있습니다 (종합 점수: {final_score:.1f}점). 신입 기준으로 적합하며, 입사 후 성장이 기대됩니다."
     
     
+    @staticmethod
+    def _parse_summary_response(content: str) -> str:
+        """종합 심사평 응답 검증 (JSON + 비어 있지 않은 overall_evaluation_summary)"""
+        summary = parse_json_response(content).get("overall_evaluation_summary", "")
+        if not summary:
+            raise ValueError("overall_evaluation_summary 없음")
+        return summary
+    
+    
     @staticmethod
     def _apply_collaboration_results(
         aggregated_competencies: Dict[str, Dict],
@@ -606,16 +669,17 @@ async def final_integration_node(state: EvaluationState) -> Dict:
     competency_weights = state.get("competency_weights", {})
     collaboration_results = state.get("collaboration_results", [])
     low_confidence_list = state.get("low_confidence_list", [])
-    openai_client = state.get("openai_client")
+    openai_client = context_value(state, "openai_client")
     post_processing_service = PostProcessingService()
 
-    final_result = await FinalIntegrator.integrate(
-        openai_client=openai_client,
-        aggregated_competencies=aggregated_competencies,
-        competency_weights=competency_weights,
-        collaboration_results=collaboration_results,
-        low_confidence_list=low_confidence_list
-    )
+    with llm_usage_scope("final_integration") as llm_usage:
+        final_result = await FinalIntegrator.integrate(
+            openai_client=openai_client,
+            aggregated_competencies=aggregated_competencies,
+            competency_weights=competency_weights,
+            collaboration_results=collaboration_results,
+            low_confidence_list=low_confidence_list
+        )
 
     # 후처리: 긍/부 키워드, 추천질문, 전체 요약 생성 (규칙 기반)
     analysis_summary = post_processing_service.build_analysis_summary(
@@ -637,6 +701,7 @@ async def final_integration_node(state: EvaluationState) -> Dict:
     execution_log = {
         "node": "final_integration",
         "duration_seconds": round(duration, 2),
+        "llm_usage": llm_usage.summary(),
         "timestamp": datetime.now().isoformat(),
         "status": "success"
     }
@@ -653,5 +718,6 @@ async def final_integration_node(state: EvaluationState) -> Dict:
             "source": "rules_over_llm_fallback",
             "llm_used": False
         },
-        "execution_logs": state.get("execution_logs", []) + [execution_log]
+        "execution_logs": state.get("execution_logs", []) + [execution_log],
+        "llm_spans": llm_usage.spans
     }
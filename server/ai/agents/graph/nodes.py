@@ -6,7 +6,15 @@ Stage 1: 10개 Agent 병렬 평가
 from typing import Dict
 from datetime import datetime
 from .state import EvaluationState
-from ..competency_agent import CompetencyAgent, evaluate_all_competencies
+from .context import context_value
+from ..competency_agent import COMPETENCY_CONFIGS, CompetencyAgent, evaluate_all_competencies
+from ..aggregators.incremental_verifier import IncrementalResumeVerifier, build_micro_batches
+from .reevaluation import reusable_stage1
+from ai.utils.hedging import hedge_stats, latency_summary
+from ai.utils.llm_gateway import gateway_metrics
+from ai.utils.llm_usage import llm_usage_scope
+from ai.utils.rate_limiter import rate_limiter_metrics
+from ai.utils.tracing import span
 
 
 async def batch_evaluation_node(state: EvaluationState) -> Dict:
@@ -17,6 +25,9 @@ async def batch_evaluation_node(state: EvaluationState) -> Dict:
         - 10개 Agent를 asyncio.gather로 병렬 실행
         - 각 Agent는 독립적으로 평가 수행
         - Interview Confidence 계산 (Resume 검증 전)
+        - (STAGE2_PIPELINE_BATCH_SIZE > 0) 역량 결과가 도착하는 대로 micro-batch로
+          Resume 검증 + Confidence V2 실행 (Stage 2.1/2.2를 Stage 1과 겹침)
+        - (재평가 모드) 프롬프트 입력이 같은 역량은 이전 결과와 Resume 검증 segment 재사용
     
     Returns:
         업데이트할 State 필드:
@@ -30,6 +41,7 @@ async def batch_evaluation_node(state: EvaluationState) -> Dict:
             - seasonal_strategy_kpi_result
             - stakeholder_collaboration_result
             - value_chain_optimization_result
+            - segment_evaluations_with_resume / confidence_v2_calculated (파이프라이닝 시)
             - execution_logs
     """
     
@@ -41,18 +53,44 @@ async def batch_evaluation_node(state: EvaluationState) -> Dict:
 
 
     # Agent 생성
+    # 동시 호출은 프로세스 공용 TPM/RPM Limiter가 예산 기준으로 제어 (ai/utils/rate_limiter.py)
     agent = CompetencyAgent(
-        state["openai_client"],
-        max_concurrent=4  # 동시 실행 최대 4개 (TPM 초과 방지)
+        context_value(state, "openai_client"),
+        progress=context_value(state, "progress_channel")
     )
 
 
+    # 재평가 모드: 입력이 바뀌지 않은 역량은 이전 결과 재사용 (reevaluation.py)
+    reused_results, reused_segments = reusable_stage1(state)
+    if reused_results:
+        print(f"[Re-evaluation] Stage 1 재사용 {len(reused_results)}개, 재실행 {len(COMPETENCY_CONFIGS) - len(reused_results)}개")
+    # Resume 검증 segment까지 재사용할 수 있는 역량은 검증 대상에서 제외
+    verify_names = [
+        name for name, _, _ in COMPETENCY_CONFIGS
+        if reused_segments is None or name not in reused_results
+    ]
+
+
+    # Stage 2 파이프라이닝: 결과가 도착하는 대로 Resume 검증 시작
+    from core.config import STAGE2_PIPELINE_BATCH_SIZE
+    incremental = None
+    if STAGE2_PIPELINE_BATCH_SIZE > 0:
+        incremental = IncrementalResumeVerifier(
+            context_value(state, "openai_client"),
+            context_value(state, "resume_data"),
+            build_micro_batches(verify_names, STAGE2_PIPELINE_BATCH_SIZE)
+        )
+
+
     # 10개 역량 배치 평가
-    all_results = await evaluate_all_competencies(
-        agent,
-        state["transcript_content"],
-        state["prompts"]
-    )
+    with llm_usage_scope("batch_evaluation") as llm_usage:
+        all_results = await evaluate_all_competencies(
+            agent,
+            context_value(state, "transcript"),
+            context_value(state, "prompts"),
+            on_result=incremental.add if incremental is not None else None,
+            reuse=reused_results
+        )
 
 
     # 결과 검증
@@ -79,6 +117,9 @@ async def batch_evaluation_node(state: EvaluationState) -> Dict:
     print(f"  - 성공: {success_count}개")
     print(f"  - 실패: {error_count}개")
     print(f"  - 점수 요약: avg={avg_score:.1f}, max={max_score:.1f}, min={min_score:.1f}")
+    prompt_cache = agent.prompt_cache_summary()
+    if prompt_cache["prompt_tokens"]:
+        print(f"  - Prompt 캐시: {prompt_cache['cached_tokens']}/{prompt_cache['prompt_tokens']} 토큰 ({prompt_cache['cache_hit_ratio']:.0%})")
     
     if error_count > 0:
         print(f"\n    실패한 역량:")
@@ -92,6 +133,27 @@ async def batch_evaluation_node(state: EvaluationState) -> Dict:
     print(f"\n[Stage 1] 배치 평가 완료 ({execution_time:.2f}초)")
     print("="*60)
 
+    # 남은 micro-batch 검증 대기 (aggregator는 결과 합치기만 수행)
+    pipeline_update = {}
+    pipeline_log = None
+    if incremental is not None:
+        with span("stage2_pipeline_tail", "substep"):
+            segments = await incremental.finish({name: all_results[name] for name in verify_names})
+        if reused_segments:
+            by_competency = {}
+            for seg in reused_segments + segments:
+                by_competency.setdefault(seg["competency"], []).append(seg)
+            segments = [seg for name in all_results for seg in by_competency.get(name, [])]
+        pipeline_log = incremental.summary()
+        print(
+            f"[Stage 2 파이프라인] Resume 검증 + Confidence V2 완료: {len(segments)}개 segment, "
+            f"Stage 1 종료 후 대기 {pipeline_log['tail_wait_seconds']:.2f}초"
+        )
+        pipeline_update = {
+            "segment_evaluations_with_resume": segments,
+            "confidence_v2_calculated": True,
+        }
+
     execution_log = {
         "stage": "stage_1",
         "node": "batch_evaluation",
@@ -99,6 +161,13 @@ async def batch_evaluation_node(state: EvaluationState) -> Dict:
         "competencies_evaluated": len(all_results),
         "success_count": success_count,
         "error_count": error_count,
+        "rate_limiter": rate_limiter_metrics(),
+        "prompt_cache": prompt_cache,
+        "hedging": {**hedge_stats, "latency": latency_summary()} if agent.hedging else None,
+        "llm_usage": llm_usage.summary(),
+        "llm_gateway": gateway_metrics(),
+        "stage2_pipeline": pipeline_log,
+        "stage1_reused": list(reused_results),
         "timestamp": datetime.now().isoformat(),
         "status": "success" if error_count == 0 else "partial_success"
     }
@@ -120,6 +189,10 @@ async def batch_evaluation_node(state: EvaluationState) -> Dict:
         "stakeholder_collaboration_result": all_results.get("stakeholder_collaboration"),
         "value_chain_optimization_result": all_results.get("value_chain_optimization"),
         
+        # Stage 2.1/2.2 (파이프라이닝 시)
+        **pipeline_update,
+        
         # Execution Logs
-        "execution_logs": [execution_log]  # 첫 번째 로그
+        "execution_logs": [execution_log],  # 첫 번째 로그
+        "llm_spans": llm_usage.spans + (incremental.llm_usage.spans if incremental is not None else [])
     }
@@ -3,13 +3,18 @@ Presentation Formatter Node
 프론트엔드용 데이터 재구성 + LLM 배치 근거 재생성
 """
 
+import asyncio
 import json
-import os
-from typing import Dict, List
+import time
+from typing import Dict, List, Optional
 from datetime import datetime
 from openai import AsyncOpenAI
-from pathlib import Path
-from dotenv import load_dotenv
+
+from ai.utils.llm_cache import build_cache_key, get_llm_cache
+from ai.utils.model_router import get_model_router, parse_json_response, routed_chat_completion
+from ai.utils.llm_usage import llm_usage_scope
+from .context import context_value
+from .reevaluation import reusable_presentation_details
 
 
 class PresentationFormatter:
@@ -57,15 +62,17 @@ class PresentationFormatter:
     ]
     
     
-    def __init__(self, openai_client: AsyncOpenAI):
+    PROMPT_VERSION = "v1"
+    
+    def __init__(self, openai_client: AsyncOpenAI, cache=None):
         self.client = openai_client
+        self.cache = cache if cache is not None else get_llm_cache()
         
-        env_path = Path(__file__).resolve().parents[3] / ".env"
-        load_dotenv(env_path, override=False)
-        # 기본값은 gpt-4o, 필요 시 .env에서 OPENAI_MODEL로 오버라이드
-        self.model = os.getenv("OPENAI_MODEL", "gpt-4o")
-        self.summary_model = os.getenv("OPENAI_SUMMARY_MODEL", self.model)
+        # 모델은 작업 유형별 라우팅 테이블에서 선택 (ai/utils/model_router.py, MODEL_ROUTES_JSON)
+        self.router = get_model_router()
         self._transcript_data = None
+        # 단계별 소요 시간 (execution_logs 기록용)
+        self.timings: Dict[str, float] = {}
     
     
     async def format(
@@ -73,11 +80,15 @@ class PresentationFormatter:
         final_result: Dict,
         aggregated_competencies: Dict,
         competency_weights: Dict[str, float],
-        transcript: Dict 
+        transcript: Dict,
+        reuse_details: Optional[Dict[str, Dict]] = None
     ) -> Dict:
         """
         프론트엔드용 응답 생성
         
+        Args:
+            reuse_details: 다시 생성하지 않을 역량의 이전 competency_details (선택적 재평가)
+        
         Returns:
             {
                 "overall_summary": {...},
@@ -107,17 +118,29 @@ class PresentationFormatter:
         #    - Strengths (평서형)
         #    - Weaknesses (평서형)
         #    - Key_observations (평서형)
-        print(f"  10개 역량의 근거/강점/약점/관찰을 1번의 LLM 호출로 배치 생성 중...")
+        reuse_details = reuse_details or {}
+        regenerate = {
+            comp_name: comp_data
+            for comp_name, comp_data in aggregated_competencies.items()
+            if comp_name not in reuse_details
+        }
+        if reuse_details:
+            print(f"  이전 결과 재사용 {len(reuse_details)}개 역량, 재생성 {len(regenerate)}개")
         
-        batch_result = await self._regenerate_all_batch(
-            aggregated_competencies,
-            transcript
-        )
+        batch_result = {}
+        if regenerate:
+            print(f"  {len(regenerate)}개 역량의 근거/강점/약점/관찰을 1번의 LLM 호출로 배치 생성 중...")
+            started = time.perf_counter()
+            batch_result = await self._regenerate_all_batch(
+                regenerate,
+                transcript
+            )
+            self.timings["batch_regeneration_seconds"] = round(time.perf_counter() - started, 2)
         
         # 5. 역량별 상세 구성
         competency_details = {}
         
-        for comp_name, comp_data in aggregated_competencies.items():
+        for comp_name, comp_data in regenerate.items():
             comp_batch = batch_result.get(comp_name, {})
             
             competency_details[comp_name] = {
@@ -148,6 +171,11 @@ class PresentationFormatter:
         # Connected Summary 추가
         print(f"  Connected Summary 생성 중...")
         competency_details = await self._add_connected_summaries(competency_details)
+        competency_details = {
+            comp_name: reuse_details.get(comp_name) or competency_details[comp_name]
+            for comp_name in aggregated_competencies
+            if comp_name in reuse_details or comp_name in competency_details
+        }
         
         total_evidences = sum(
             len(cd.get('evidences', [])) 
@@ -175,21 +203,22 @@ class PresentationFormatter:
         }
     
     
+    @classmethod
     def _calculate_score_breakdown(
-        self,
+        cls,
         aggregated_competencies: Dict,
         competency_weights: Dict[str, float],
         final_result: Dict
     ) -> Dict:
         """
-        점수 분해 계산 (전체/직무/공통)
+        점수 분해 계산 (전체/직무/공통, LLM 없음 - 가중치 재계산에서도 사용)
         """
         
         # 직무 역량 점수
         job_total = 0.0
         job_weight_sum = 0.0
         
-        for comp_name in self.JOB_COMPETENCIES:
+        for comp_name in cls.JOB_COMPETENCIES:
             if comp_name in aggregated_competencies:
                 score = aggregated_competencies[comp_name].get("overall_score", 0)
                 weight = competency_weights.get(comp_name, 0)
@@ -202,7 +231,7 @@ class PresentationFormatter:
         common_total = 0.0
         common_weight_sum = 0.0
         
-        for comp_name in self.COMMON_COMPETENCIES:
+        for comp_name in cls.COMMON_COMPETENCIES:
             if comp_name in aggregated_competencies:
                 score = aggregated_competencies[comp_name].get("overall_score", 0)
                 weight = competency_weights.get(comp_name, 0)
@@ -215,8 +244,8 @@ class PresentationFormatter:
             "final_score": final_result.get("final_score"),
             "job_score": job_score,
             "common_score": common_score,
-            "job_competencies": self.JOB_COMPETENCIES,
-            "common_competencies": self.COMMON_COMPETENCIES
+            "job_competencies": cls.JOB_COMPETENCIES,
+            "common_competencies": cls.COMMON_COMPETENCIES
         }
     
     
@@ -303,27 +332,38 @@ class PresentationFormatter:
         # 2. 배치 프롬프트 생성
         prompt = self._build_comprehensive_batch_prompt(all_competencies_data)
         
+        messages = [
+            {
+                "role": "system",
+                "content": "You are an expert at synthesizing competency evaluation data into clear, professional summaries for HR reports."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+        cache_key = build_cache_key(
+            "presentation_batch", self.router.route_key("evidence_rewrite"), 0.3, messages,
+            prompt_version=self.PROMPT_VERSION
+        )
+        
         # 3. LLM 1회 호출
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert at synthesizing competency evaluation data into clear, professional summaries for HR reports."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.3,
-                max_tokens=12000,  # 근거+강점+약점+관찰 모두 포함이므로 토큰 더 많이 필요
-                response_format={"type": "json_object"}
-            )
-            
-            result_text = response.choices[0].message.content.strip()
-            result = json.loads(result_text)
+            result = await self.cache.aget(cache_key)
+            if result is None:
+                result, _ = await routed_chat_completion(
+                    self.client,
+                    "evidence_rewrite",
+                    messages,
+                    validate=parse_json_response,
+                    span_label="presentation_batch",
+                    temperature=0.3,
+                    max_tokens=12000,  # 근거+강점+약점+관찰 모두 포함이므로 토큰 더 많이 필요
+                    response_format={"type": "json_object"}
+                )
+                await self.cache.aset(cache_key, result)
+            else:
+                print("  [캐시 히트] 배치 재생성 결과 재사용")
             
             # 4. 역량별로 파싱
             batch_by_competency = {}
@@ -740,20 +780,33 @@ __COMPETENCY_DATA__
     ) -> Dict:
         """
         각 역량의 evidences.summary를 자연스럽게 연결한 문단 생성
+        
+        역량별 호출은 서로 독립이므로 동시에 실행합니다. 호출은 routed_chat_completion → 공용 Rate Limiter를
+        거치므로 실제 동시 발송 수는 모델별 동시 호출 상한(OPENAI_MAX_IN_FLIGHT, 기본 8)과 TPM/RPM 예산으로 제한됩니다.
         """
         
-        for comp_name, comp_data in competency_details.items():
-            evidences = comp_data.get("evidences", [])
-            if not evidences:
-                comp_data["connected_summary"] = ""
-                continue
-            
-            individual_summaries = [ev.get("summary", "") for ev in evidences]
-            connected = await self._connect_summaries_naturally(
+        async def connect(comp_name: str, comp_data: Dict) -> float:
+            started = time.perf_counter()
+            individual_summaries = [ev.get("summary", "") for ev in comp_data["evidences"]]
+            comp_data["connected_summary"] = await self._connect_summaries_naturally(
                 individual_summaries,
                 comp_data.get("competency_display_name", comp_name)
             )
-            comp_data["connected_summary"] = connected
+            return time.perf_counter() - started
+        
+        pending = []
+        for comp_name, comp_data in competency_details.items():
+            if not comp_data.get("evidences", []):
+                comp_data["connected_summary"] = ""
+                continue
+            pending.append(connect(comp_name, comp_data))
+        
+        started = time.perf_counter()
+        call_seconds = await asyncio.gather(*pending)
+        self.timings["connected_summaries_seconds"] = round(time.perf_counter() - started, 2)
+        # 순차 실행이었다면 걸렸을 시간 (호출별 소요 합)
+        self.timings["connected_summaries_sequential_seconds"] = round(sum(call_seconds), 2)
+        self.timings["connected_summary_calls"] = len(call_seconds)
         
         return competency_details
 
@@ -786,27 +839,50 @@ __COMPETENCY_DATA__
 
 연결된 문단:"""
 
+        messages = [
+            {
+                "role": "system",
+                "content": "You are an expert at writing natural, flowing Korean prose."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+        cache_key = build_cache_key(
+            "presentation_connected_summary", self.router.route_key("summarization"), 0.3, messages,
+            prompt_version=self.PROMPT_VERSION
+        )
+
         try:
-            response = await self.client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert at writing natural, flowing Korean prose."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                model=self.summary_model,
+            cached = await self.cache.aget(cache_key)
+            if cached is not None:
+                return cached
+            connected, _ = await routed_chat_completion(
+                self.client,
+                "summarization",
+                messages,
+                validate=self._validate_connected_summary,
+                span_label=f"connected_summary:{competency_name}",
                 temperature=0.3,
                 max_tokens=500
             )
-            return response.choices[0].message.content.strip()
+            await self.cache.aset(cache_key, connected)
+            return connected
         except Exception as e:
             print(f"        Summary 연결 실패: {e}")
             return " ".join(summaries)
 
+    @staticmethod
+    def _validate_connected_summary(content: str) -> str:
+        """연결 문단 검증 (프롬프트 머리말 제거, 빈 응답이면 상위 모델로 승급)"""
+        connected = content.strip()
+        if connected.startswith("연결된 문단:"):
+            connected = connected[len("연결된 문단:"):].strip()
+        if not connected:
+            raise ValueError("빈 문단")
+        return connected
+
     def _fallback_all_batch(
         self,
         aggregated_competencies: Dict
@@ -895,19 +971,23 @@ async def presentation_formatter_node(state) -> Dict:
     print("[Presentation Formatter] 프론트용 데이터 변환 시작")
     print("="*60)
     
-    openai_client = state.get("openai_client")
+    openai_client = context_value(state, "openai_client")
     final_result = state.get("final_result", {})
     aggregated_competencies = state.get("aggregated_competencies", {})
     competency_weights = state.get("competency_weights", {})
-    transcript = state.get("transcript")
+    transcript = context_value(state, "transcript")
     formatter = PresentationFormatter(openai_client)
+    # 재평가 모드: aggregated 결과가 이전과 같은 역량은 근거/요약 재생성 생략
+    reuse_details = reusable_presentation_details(state)
     
-    presentation_result = await formatter.format(
-        final_result,
-        aggregated_competencies,
-        competency_weights,
-        transcript
-    )
+    with llm_usage_scope("presentation_formatter") as llm_usage:
+        presentation_result = await formatter.format(
+            final_result,
+            aggregated_competencies,
+            competency_weights,
+            transcript,
+            reuse_details=reuse_details
+        )
     
     duration = (datetime.now() - start_time).total_seconds()
     
@@ -922,6 +1002,25 @@ async def presentation_formatter_node(state) -> Dict:
     print(f"  처리 시간: {duration:.2f}초")
     print(f"  배치 효율: 10개 역량 → 1회 LLM 호출")
     
+    # Connected Summary 동시 실행 전/후 Stage 4 시간 (순차 실행 시간은 호출별 소요 합으로 추정)
+    timings = formatter.timings
+    stage4_timing = {
+        **timings,
+        "wall_seconds": round(duration, 2),
+        "sequential_wall_seconds": round(
+            duration
+            - timings.get("connected_summaries_seconds", 0.0)
+            + timings.get("connected_summaries_sequential_seconds", 0.0),
+            2
+        ),
+    }
+    print(
+        f"  Connected Summary {timings.get('connected_summary_calls', 0)}건 동시 실행: "
+        f"{timings.get('connected_summaries_seconds', 0.0):.2f}초 "
+        f"(순차 {timings.get('connected_summaries_sequential_seconds', 0.0):.2f}초), "
+        f"Stage 4 {stage4_timing['sequential_wall_seconds']:.2f}초 → {stage4_timing['wall_seconds']:.2f}초"
+    )
+    
     print("\n" + "="*60)
     print("[Presentation Formatter] 완료")
     print("="*60)
@@ -932,8 +1031,12 @@ async def presentation_formatter_node(state) -> Dict:
             "node": "presentation_formatter",
             "duration_seconds": round(duration, 2),
             "total_evidences_generated": total_evidences,
-            "batch_llm_calls": 1,
+            "batch_llm_calls": 1 if len(reuse_details) < len(aggregated_competencies) else 0,
+            "details_reused": list(reuse_details),
+            "stage4_timing": stage4_timing,
+            "llm_usage": llm_usage.summary(),
             "components_regenerated": ["evidences", "strengths", "weaknesses", "key_observations"],
             "timestamp": datetime.now().isoformat()
-        }]
+        }],
+        "llm_spans": llm_usage.spans
     }
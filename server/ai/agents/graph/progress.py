@@ -0,0 +1,70 @@
+"""
+그래프 진행 이벤트 (노드 시작/완료, aggregator Sub-step)
+
+컨텍스트의 progress_channel(services/evaluation/progress_channel.py)로 발행하며, 채널이 없으면 아무것도 하지 않습니다.
+SSE 엔드포인트는 이 이벤트를 가공하지 않고 그대로 전달하므로, 프론트엔드가 쓰는
+stage / stage_name / status / message / progress 필드를 여기서 채웁니다.
+"""
+
+import time
+from typing import Any, Awaitable, Callable, Dict
+
+from .context import context_value
+
+
+# 노드별 단계 정보와 진행률(시작 → 완료, %)
+NODE_PROGRESS = {
+    "batch_evaluation": {"stage": 1, "stage_name": "Stage 1: 역량별 평가", "start": 10, "end": 40},
+    "aggregator": {"stage": 2, "stage_name": "Stage 2: 통합 분석", "start": 50, "end": 70},
+    "collaboration": {"stage": 2, "stage_name": "Stage 2: 협업 검증", "start": 72, "end": 75},
+    "final_integration": {"stage": 3, "stage_name": "Stage 3: 최종 통합", "start": 80, "end": 90},
+    "presentation_formatter": {"stage": 4, "stage_name": "Stage 4: 결과 포맷팅", "start": 95, "end": 100},
+}
+
+
+def publish_progress(state: Dict, event: str, data: Dict[str, Any]) -> None:
+    channel = context_value(state, "progress_channel")
+    if channel is not None:
+        channel.publish(event, data)
+
+
+def publish_substep(state: Dict, substep: str, message: str, progress: int) -> None:
+    """aggregator Sub-step 완료 이벤트 (Resume 검증, Confidence V2, Segment Overlap, Cross-Competency)"""
+    publish_progress(state, "substep", {
+        "stage": 2,
+        "substep": substep,
+        "status": "in_progress",
+        "message": message,
+        "progress": progress,
+    })
+
+
+def reported(node_name: str, node_fn: Callable[[Dict], Awaitable[Dict]]) -> Callable[[Dict], Awaitable[Dict]]:
+    """노드 시작/완료 이벤트 발행 래퍼 (재평가로 재사용된 노드도 reused=True로 발행)"""
+    info = NODE_PROGRESS[node_name]
+
+    async def run(state: Dict) -> Dict:
+        base = {"stage": info["stage"], "stage_name": info["stage_name"], "node": node_name}
+        publish_progress(state, "node_start", {
+            **base,
+            "status": "in_progress",
+            "message": f"{info['stage_name']} 시작",
+            "progress": info["start"],
+        })
+        start = time.perf_counter()
+        update = await node_fn(state)
+        reused = any(
+            log.get("reused") for log in update.get("execution_logs") or [] if log.get("node") == node_name
+        )
+        publish_progress(state, "node_complete", {
+            **base,
+            "status": "completed",
+            "message": f"{info['stage_name']} 완료" + (" (이전 결과 재사용)" if reused else ""),
+            "progress": info["end"],
+            "duration_seconds": round(time.perf_counter() - start, 2),
+            "reused": reused,
+        })
+        return update
+
+    run.__name__ = node_fn.__name__
+    return run
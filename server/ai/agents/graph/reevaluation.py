@@ -0,0 +1,219 @@
+"""
+선택적 재평가 (프롬프트가 바뀐 역량만 다시 실행)
+
+rubric 하나(예: seasonal_strategy_kpi_prompt.py)를 고치면 지금까지는 10개 Agent + Stage 2~4를
+지원자마다 전부 다시 돌려야 했습니다. 여기서는 노드마다 입력 해시를 기록해 두고,
+재평가 시 입력이 바뀐 부분만 다시 계산합니다.
+
+해시 단위:
+    - 프롬프트 모듈: PROMPT_VERSION + rubric 본문(transcript 자리 표시자로 렌더링) → prompt_hashes
+      (문구는 같지만 의미를 바꿨다면 모듈의 PROMPT_VERSION을 올림)
+    - Stage 1 역량: 프롬프트 해시 + 실제 프롬프트 → 같으면 이전 결과 재사용,
+      Resume도 같으면 해당 역량의 Resume 검증 segment도 재사용
+    - 노드: NODE_INPUTS에 나열한 State 필드 → 같으면 노드 전체를 건너뛰고 이전 출력 재사용
+    - Presentation 역량: aggregated_competencies[역량] → 같으면 이전 competency_details 재사용
+
+transcript / prompts / resume_data / previous_run은 컨텍스트 저장소에서 읽고(context.py),
+노드 입력 해시에는 컨텍스트에 캐시된 값별 해시를 사용하므로 노드마다 프롬프트 전체를 다시 해싱하지 않습니다.
+
+이전 실행의 노드 출력은 노드가 끝난 직후 복사해 두므로(node_outputs), 이후 노드가
+dict를 in-place로 수정해도 해시 비교가 어긋나지 않습니다.
+EvaluationService가 이를 reevaluation_snapshot.json으로 S3에 저장하고,
+evaluate_interview(reevaluate=True)가 다시 읽어 컨텍스트의 previous_run으로 넘깁니다.
+"""
+
+import json
+import sys
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from ai.utils.llm_cache import hash_payload
+from ai.utils.transcript_renderer import TRANSCRIPT_REFERENCE
+from ..competency_agent import COMPETENCY_CONFIGS, CompetencyAgent
+from .context import CONTEXT_KEYS, context_hash, context_value
+
+
+STAGE1_RESULT_KEYS = {name: f"{name}_result" for name, _, _ in COMPETENCY_CONFIGS}
+
+# 노드별 입력 필드 (해시가 같으면 이전 출력 재사용)
+NODE_INPUTS = {
+    "batch_evaluation": ["prompts", "prompt_hashes", "resume_data"],
+    "aggregator": [*STAGE1_RESULT_KEYS.values(), "segment_evaluations_with_resume", "confidence_v2_calculated", "resume_data"],
+    "collaboration": ["aggregated_competencies", "low_confidence_list"],
+    "final_integration": ["aggregated_competencies", "competency_weights", "collaboration_results", "low_confidence_list"],
+    "presentation_formatter": ["final_result", "aggregated_competencies", "competency_weights", "transcript"],
+}
+
+# 노드별 출력 필드 (재사용 시 그대로 반환)
+NODE_OUTPUTS = {
+    "batch_evaluation": [*STAGE1_RESULT_KEYS.values(), "segment_evaluations_with_resume", "confidence_v2_calculated"],
+    "aggregator": [
+        "segment_evaluations_with_resume", "confidence_v2_calculated", "segment_overlap_adjustments",
+        "cross_competency_flags", "aggregated_competencies", "low_confidence_list", "requires_collaboration",
+    ],
+    "collaboration": ["collaboration_results", "collaboration_count"],
+    "final_integration": ["final_score", "avg_confidence", "final_reliability", "reliability_note", "final_result"],
+    "presentation_formatter": ["presentation_result"],
+}
+
+
+def _copy(value: Any) -> Any:
+    """JSON 왕복 복사 (이후 in-place 수정과 분리)"""
+    return json.loads(json.dumps(value, ensure_ascii=False, default=str))
+
+
+def compute_prompt_hashes(generators: Dict[str, Callable[[str], str]]) -> Dict[str, str]:
+    """
+    역량별 프롬프트 모듈 해시
+
+    Args:
+        generators: {역량: create_*_evaluation_prompt} (EvaluationService.PROMPT_GENERATORS)
+    """
+    hashes = {}
+    for name, generator in generators.items():
+        module = sys.modules.get(generator.__module__)
+        hashes[name] = hash_payload({
+            "module_version": getattr(module, "PROMPT_VERSION", None),
+            "agent_version": CompetencyAgent.PROMPT_VERSION,
+            "system_prompt": CompetencyAgent.SYSTEM_PROMPT,
+            "rubric": generator(TRANSCRIPT_REFERENCE),
+        })[:16]
+    return hashes
+
+
+def changed_prompts(previous_hashes: Optional[Dict[str, str]], current_hashes: Dict[str, str]) -> List[str]:
+    """프롬프트 해시가 바뀐 역량 (이전 해시가 없으면 전부)"""
+    previous_hashes = previous_hashes or {}
+    return [name for name, value in current_hashes.items() if previous_hashes.get(name) != value]
+
+
+def competency_input_hashes(state: Dict) -> Dict[str, str]:
+    """Stage 1 역량별 입력 해시 (프롬프트 모듈 해시 + 실제 프롬프트)"""
+    prompt_hashes = state.get("prompt_hashes") or {}
+    prompts = context_value(state, "prompts", {})
+    return {
+        name: hash_payload({"prompt_hash": prompt_hashes.get(name), "prompt": prompts.get(name)})
+        for name in STAGE1_RESULT_KEYS
+    }
+
+
+def node_input_hash(node_name: str, state: Dict) -> str:
+    return hash_payload({
+        key: context_hash(state, key) if key in CONTEXT_KEYS else state.get(key)
+        for key in NODE_INPUTS[node_name]
+    })
+
+
+def reusable_stage1(state: Dict) -> Tuple[Dict[str, Dict], Optional[List[Dict]]]:
+    """
+    이전 실행에서 재사용할 Stage 1 결과
+
+    Returns:
+        (results, segments)
+            results: {역량: 이전 결과} (입력 해시가 같고 실패하지 않은 역량만)
+            segments: 재사용 역량의 Resume 검증 + Confidence V2 segment
+                      (Resume가 바뀌었거나 이전 실행이 파이프라인을 쓰지 않았으면 None → 다시 검증)
+    """
+    previous_run = context_value(state, "previous_run", {})
+    previous_outputs = (previous_run.get("node_outputs") or {}).get("batch_evaluation") or {}
+    previous_hashes = previous_run.get("competency_input_hashes") or {}
+
+    results = {}
+    for name, value in competency_input_hashes(state).items():
+        result = previous_outputs.get(STAGE1_RESULT_KEYS[name])
+        if previous_hashes.get(name) == value and isinstance(result, dict) and "error" not in result:
+            results[name] = _copy(result)
+
+    segments = None
+    if (
+        previous_outputs.get("confidence_v2_calculated")
+        and previous_run.get("resume_hash") == context_hash(state, "resume_data")
+    ):
+        segments = [
+            _copy(seg) for seg in previous_outputs.get("segment_evaluations_with_resume") or []
+            if seg.get("competency") in results
+        ]
+    return results, segments
+
+
+def reusable_presentation_details(state: Dict) -> Dict[str, Dict]:
+    """aggregated_competencies[역량]이 이전 실행과 같은 역량의 이전 competency_details"""
+    previous_outputs = context_value(state, "previous_run", {}).get("node_outputs") or {}
+    previous_aggregated = (previous_outputs.get("aggregator") or {}).get("aggregated_competencies") or {}
+    previous_details = (
+        ((previous_outputs.get("presentation_formatter") or {}).get("presentation_result") or {})
+        .get("competency_details") or {}
+    )
+    current = state.get("aggregated_competencies") or {}
+    return {
+        name: _copy(previous_details[name])
+        for name, comp_data in current.items()
+        if name in previous_details
+        and name in previous_aggregated
+        and hash_payload(previous_aggregated[name]) == hash_payload(comp_data)
+    }
+
+
+def tracked(node_name: str, node_fn: Callable[[Dict], Awaitable[Dict]]) -> Callable[[Dict], Awaitable[Dict]]:
+    """
+    노드 입력 해시 기록 + 출력 스냅샷 래퍼
+
+    previous_run에 같은 입력 해시가 있으면 노드를 실행하지 않고 이전 출력을 반환합니다.
+    """
+
+    async def run(state: Dict) -> Dict:
+        fingerprint = node_input_hash(node_name, state)
+        previous_run = context_value(state, "previous_run", {})
+        previous_output = (previous_run.get("node_outputs") or {}).get(node_name)
+
+        if previous_output is not None and (previous_run.get("node_input_hashes") or {}).get(node_name) == fingerprint:
+            print(f"[Re-evaluation] {node_name}: 입력 변경 없음 → 이전 결과 재사용")
+            update = {
+                **_copy(previous_output),
+                "execution_logs": [{
+                    "node": node_name,
+                    "reused": True,
+                    "duration_seconds": 0.0,
+                    "timestamp": datetime.now().isoformat(),
+                }],
+            }
+        else:
+            update = await node_fn(state)
+
+        snapshot = _copy({key: update[key] for key in NODE_OUTPUTS[node_name] if key in update})
+        return {
+            **update,
+            "node_input_hashes": {**(state.get("node_input_hashes") or {}), node_name: fingerprint},
+            "node_outputs": {**(state.get("node_outputs") or {}), node_name: snapshot},
+        }
+
+    run.__name__ = node_fn.__name__
+    return run
+
+
+def build_reevaluation_snapshot(state: Dict) -> Dict:
+    """다음 재평가에 필요한 해시와 노드 출력 (reevaluation_snapshot.json)"""
+    return {
+        "prompt_hashes": state.get("prompt_hashes") or {},
+        "competency_input_hashes": competency_input_hashes(state),
+        "resume_hash": context_hash(state, "resume_data"),
+        "node_input_hashes": state.get("node_input_hashes") or {},
+        "node_outputs": state.get("node_outputs") or {},
+    }
+
+
+def reevaluation_summary(state: Dict) -> Dict:
+    """이번 실행에서 재사용/재계산된 노드와 역량 (execution_logs 기준)"""
+    logs = state.get("execution_logs") or []
+    reused_nodes = [log["node"] for log in logs if log.get("reused")]
+    if "batch_evaluation" in reused_nodes:
+        stage1_reused = list(STAGE1_RESULT_KEYS)
+    else:
+        stage1_reused = next(
+            (log.get("stage1_reused", []) for log in logs if log.get("node") == "batch_evaluation"), []
+        )
+    return {
+        "reused_nodes": reused_nodes,
+        "stage1_reused": stage1_reused,
+        "stage1_rerun": [name for name in STAGE1_RESULT_KEYS if name not in stage1_reused],
+    }
@@ -16,11 +16,15 @@ class EvaluationState(TypedDict):
     applicant_id: int
     job_id: int
     transcript_s3_url: str
-    transcript: Dict 
-    transcript_content: Dict
-    resume_data: Optional[Dict] 
-    openai_client: Any
-    prompts: Dict[str, str]
+    # transcript / prompts / resume_data / openai_client / progress_channel / previous_run은
+    # 컨텍스트 저장소에 1번만 보관하고 키만 전달 (context.py, 노드에서는 context_value로 조회)
+    context_key: Optional[str]
+    checkpoint_key: Optional[str]  # 노드별 체크포인트 저장 키 (checkpoint.py, 없으면 저장 안 함)
+    
+    # 선택적 재평가 (reevaluation.py)
+    prompt_hashes: Dict[str, str]  # 역량별 프롬프트 모듈 해시
+    node_input_hashes: Dict[str, str]  # 노드별 입력 해시
+    node_outputs: Dict[str, Dict]  # 노드 완료 직후 출력 복사본
     
     # 가중치 (10개 역량)
     competency_weights: Dict[str, float]
@@ -88,4 +92,6 @@ class EvaluationState(TypedDict):
     started_at: datetime
     completed_at: Optional[datetime]
     errors: Annotated[List[str], operator.add] 
-    execution_logs: Annotated[List[Dict[str, Any]], operator.add]  
\ No newline at end of file
+    execution_logs: Annotated[List[Dict[str, Any]], operator.add]
+    # LLM 호출 span (노드는 자신의 span만 반환, ai/utils/llm_usage.py)
+    llm_spans: Annotated[List[Dict[str, Any]], operator.add]  
\ No newline at end of file
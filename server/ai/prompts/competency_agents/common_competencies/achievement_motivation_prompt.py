@@ -12,6 +12,8 @@ Achievement Motivation Agent - 성취/동기 역량 평가
 - 업무 몰입: 집중력, 몰입 상태
 """
 
+PROMPT_VERSION = "v1"
+
 ACHIEVEMENT_MOTIVATION_PROMPT = """당신은 "성취/동기 역량(Achievement Motivation)" 평가 전문가입니다.
 
 ═══════════════════════════════════════
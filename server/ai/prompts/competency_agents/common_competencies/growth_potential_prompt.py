@@ -12,6 +12,8 @@ Growth Potential Agent - 성장 잠재력 평가
 - 성장 마인드: "노력하면 개선된다" 믿음
 """
 
+PROMPT_VERSION = "v1"
+
 GROWTH_POTENTIAL_PROMPT = """당신은 "성장 잠재력(Growth Potential)" 평가 전문가입니다.
 
 ═══════════════════════════════════════
@@ -16,6 +16,8 @@ Interpersonal Skill Agent - 대인관계 역량 평가
 - Stakeholder: 상위자 **수직 관계** (교수님, 팀장, 경영진)
 """
 
+PROMPT_VERSION = "v1"
+
 INTERPERSONAL_SKILL_PROMPT = """당신은 "대인관계 역량(Interpersonal Skill)" 평가 전문가입니다.
 
 ═══════════════════════════════════════
@@ -12,6 +12,8 @@ Organizational Fit Agent - 조직 적합성 평가
 - 마감 압박 수용: 시즌 런칭 및 프로모션 마감 대응
 """
 
+PROMPT_VERSION = "v1"
+
 ORGANIZATIONAL_FIT_PROMPT = """당신은 "조직 적합성(Organizational Fit)" 평가 전문가입니다.
 
 ═══════════════════════════════════════
@@ -12,6 +12,8 @@ Problem Solving Agent - 문제해결력 평가
 - 실행력: 해결책을 실제로 적용
 """
 
+PROMPT_VERSION = "v1"
+
 PROBLEM_SOLVING_PROMPT = """당신은 "문제해결력(Problem Solving)" 평가 전문가입니다.
 
 ═══════════════════════════════════════
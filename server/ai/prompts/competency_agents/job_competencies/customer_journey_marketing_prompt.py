@@ -13,6 +13,8 @@ Customer Journey & Marketing Integration Agent - 고객 여정 설계 및 VMD·
 - 프로모션 기획 (타이밍, 채널, 메시지)
 """
 
+PROMPT_VERSION = "v1"
+
 CUSTOMER_JOURNEY_MARKETING_PROMPT = """당신은 "고객 여정 설계 및 VMD·마케팅 통합 전략(Customer Journey & Marketing Integration)" 평가 전문가입니다.
 
 ═══════════════════════════════════════
@@ -12,6 +12,8 @@ MD Data Analysis Agent - 매출·트렌드 데이터 분석 및 상품 기획
 - 시즌 MD 계획 수립 (수량, 가격대, 스타일 믹스)
 """
 
+PROMPT_VERSION = "v1"
+
 MD_DATA_ANALYSIS_PROMPT = """당신은 "매출·트렌드 데이터 분석 및 상품 기획(MD Data Analysis & Product Planning)" 평가 전문가입니다.
 
 ═══════════════════════════════════════
@@ -12,6 +12,8 @@ KPI 모니터링을 통해 비즈니스 문제를 선제적으로 발견하여 
 - 전략 수정 및 최적화 (Plan B, 재고 처리 전략)
 """
 
+PROMPT_VERSION = "v1"
+
 SEASONAL_STRATEGY_KPI_PROMPT = """당신은 "시즌 전략 수립 및 비즈니스 문제해결(Seasonal Strategy & KPI Management)" 평가 전문가입니다.
 
 ═══════════════════════════════════════
@@ -13,6 +13,8 @@ Stakeholder Management & Collaboration Agent - 유관부서 협업 및 이해관
 - 데이터 기반 설득 (감정 아닌 논리와 수치)
 """
 
+PROMPT_VERSION = "v1"
+
 STAKEHOLDER_COLLABORATION_PROMPT = """당신은 "유관부서 협업 및 이해관계자 협상(Stakeholder Management & Collaboration)" 평가 전문가입니다.
 
 ═══════════════════════════════════════
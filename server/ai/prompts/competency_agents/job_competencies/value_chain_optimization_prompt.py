@@ -13,6 +13,8 @@ Value Chain Optimization Agent - 소싱·생산·유통 밸류체인 최적화
 - 마진 관리 (원가율, 판매가 설정, 할인 정책)
 """
 
+PROMPT_VERSION = "v1"
+
 VALUE_CHAIN_OPTIMIZATION_PROMPT = """당신은 "소싱·생산·유통 밸류체인 최적화(Value Chain Optimization)" 평가 전문가입니다.
 
 ═══════════════════════════════════════
@@ -0,0 +1,52 @@
+"""
+완성된 응답을 스트림 인터페이스로 노출
+
+stream=True로 요청했지만 응답을 한 번에 받는 백엔드(replay fixture, Bedrock failover)가
+CompetencyAgent의 스트림 소비 코드(async for + close())를 그대로 쓸 수 있도록
+ChatCompletion을 ChatCompletionChunk 시퀀스로 나눠 전달합니다.
+마지막 청크는 include_usage와 같이 choices 없이 usage만 담습니다.
+"""
+
+import asyncio
+
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
+
+
+class CompletionChunkStream:
+    """완성된 ChatCompletion을 ChatCompletionChunk 스트림으로 재생 (delay초에 걸쳐 나눠 전달)"""
+
+    def __init__(self, completion: ChatCompletion, chunk_size: int = 64, delay: float = 0.0):
+        self.completion = completion
+        self.chunk_size = chunk_size
+        self.delay = delay
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        content = self.completion.choices[0].message.content or ""
+        pieces = [content[i:i + self.chunk_size] for i in range(0, len(content), self.chunk_size)] or [""]
+        per_chunk = self.delay / len(pieces)
+        base = {
+            "id": self.completion.id,
+            "object": "chat.completion.chunk",
+            "created": self.completion.created,
+            "model": self.completion.model,
+        }
+        for index, piece in enumerate(pieces):
+            await asyncio.sleep(per_chunk)
+            yield ChatCompletionChunk.model_validate({
+                **base,
+                "choices": [{
+                    "index": 0,
+                    "delta": {"content": piece},
+                    "finish_reason": "stop" if index == len(pieces) - 1 else None,
+                }],
+            })
+        if self.completion.usage is not None:
+            yield ChatCompletionChunk.model_validate({
+                **base, "choices": [], "usage": self.completion.usage.model_dump()
+            })
+
+    async def close(self):
+        return None
@@ -0,0 +1,150 @@
+"""
+Hedged Request (꼬리 지연 제어)
+
+Stage 1은 10개 호출 중 가장 느린 호출이 끝나야 완료되므로, 간헐적인 지연 호출 하나가
+batch_evaluation 전체 시간을 두 배로 늘립니다.
+
+hedged_call()은 호출이 최근 지연 분포의 p-백분위 시간 안에 끝나지 않으면
+같은 요청을 한 번 더 보내고, 먼저 끝난 결과를 사용한 뒤 나머지를 취소합니다.
+    - 지연 분포: 키(역량)별 최근 N개 지연을 프로세스 메모리에 보관 (LatencyHistogram)
+    - 예산: 최근 요청 대비 hedge 비율 상한 + Rate Limiter에 즉시 쓸 수 있는 여유가 있을 때만 발송
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+
+class LatencyHistogram:
+    """최근 지연 시간 표본 (rolling window)"""
+
+    def __init__(self, window: int = 100):
+        self.samples: Deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, max(0, int(round(p * (len(ordered) - 1)))))
+        return ordered[index]
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": len(self.samples),
+            "p50": self.percentile(0.5),
+            "p90": self.percentile(0.9),
+            "p99": self.percentile(0.99),
+        }
+
+
+class HedgeBudget:
+    """최근 window개 이벤트 중 hedge 수를 요청 수 × max_ratio 이하로 제한"""
+
+    def __init__(self, max_ratio: float = 0.1, window: int = 100):
+        self.max_ratio = max_ratio
+        # False: 요청, True: hedge
+        self._recent: Deque[bool] = deque(maxlen=window)
+
+    def record_request(self) -> None:
+        self._recent.append(False)
+
+    def try_acquire(self) -> bool:
+        hedges = sum(self._recent)
+        requests = len(self._recent) - hedges
+        # 표본이 적을 때도 최소 1회는 허용하되, 비율 상한을 넘지 않도록
+        if hedges + 1 > max(1.0, self.max_ratio * requests):
+            return False
+        self._recent.append(True)
+        return True
+
+
+_histograms: Dict[str, LatencyHistogram] = {}
+_budgets: Dict[str, HedgeBudget] = {}
+hedge_stats = {"requests": 0, "hedged": 0, "hedge_wins": 0}
+
+
+def get_latency_histogram(key: str) -> LatencyHistogram:
+    histogram = _histograms.get(key)
+    if histogram is None:
+        histogram = _histograms[key] = LatencyHistogram()
+    return histogram
+
+
+def get_hedge_budget(key: str, max_ratio: float) -> HedgeBudget:
+    budget = _budgets.get(key)
+    if budget is None:
+        budget = _budgets[key] = HedgeBudget(max_ratio)
+    return budget
+
+
+def latency_summary() -> Dict[str, Dict[str, Any]]:
+    """키별 지연 분포 요약 (execution_logs 기록용)"""
+    return {key: histogram.summary() for key, histogram in _histograms.items()}
+
+
+async def hedged_call(
+    key: str,
+    call: Callable[[], Awaitable[Any]],
+    percentile: float = 0.9,
+    min_samples: int = 10,
+    budget: Optional[HedgeBudget] = None,
+    can_hedge: Optional[Callable[[], bool]] = None,
+) -> Any:
+    """
+    call()을 실행하되, p-백분위 지연을 넘기면 같은 호출을 한 번 더 보내 먼저 끝난 결과 사용
+
+    Args:
+        key: 지연 분포를 구분하는 키 (예: 역량 이름)
+        call: 매번 새 코루틴을 만드는 호출 함수
+        percentile: hedge 발송 기준 백분위
+        min_samples: 이 개수 이상 표본이 쌓이기 전에는 hedge하지 않음
+        budget: hedge 비율 상한
+        can_hedge: 추가 조건 (예: Rate Limiter 여유 확인)
+    """
+    histogram = get_latency_histogram(key)
+    hedge_stats["requests"] += 1
+    if budget is not None:
+        budget.record_request()
+
+    threshold = histogram.percentile(percentile) if len(histogram.samples) >= min_samples else None
+    started = time.monotonic()
+    primary = asyncio.ensure_future(call())
+
+    if threshold is None:
+        result = await primary
+        histogram.record(time.monotonic() - started)
+        return result
+
+    done, _ = await asyncio.wait({primary}, timeout=threshold)
+    if done or (can_hedge is not None and not can_hedge()) or (budget is not None and not budget.try_acquire()):
+        result = await primary
+        histogram.record(time.monotonic() - started)
+        return result
+
+    print(f"[Hedge] {key}: {threshold:.1f}s 초과 → 중복 요청 발송")
+    hedge_stats["hedged"] += 1
+    hedge_started = time.monotonic()
+    secondary = asyncio.ensure_future(call())
+    pending = {primary, secondary}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is not None:
+                    # 한쪽이 실패하면 나머지 결과를 기다림 (둘 다 실패하면 마지막 예외 전파)
+                    if not pending:
+                        raise task.exception()
+                    continue
+                if task is secondary:
+                    hedge_stats["hedge_wins"] += 1
+                    histogram.record(time.monotonic() - hedge_started)
+                else:
+                    histogram.record(time.monotonic() - started)
+                return task.result()
+    finally:
+        for task in pending:
+            task.cancel()
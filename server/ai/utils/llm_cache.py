@@ -0,0 +1,221 @@
+"""
+LLM 응답 캐시 (SQLite, content-addressed)
+
+평가 그래프는 노드마다 Agent/Verifier 인스턴스를 새로 만들기 때문에
+인스턴스 dict 캐시는 재실행·재시도·Lambda 재호출 사이에 적중하지 않습니다.
+이 모듈은 프로세스 밖(디스크)에 응답을 저장해 같은 입력이면 토큰 비용 없이
+이전 응답을 재사용합니다.
+
+키 구성: namespace + model + prompt_version + temperature + 입력 해시
+    - 입력(messages)에 transcript가 포함되므로 transcript가 바뀌면 키도 바뀜
+    - 프롬프트 템플릿을 수정하면 prompt_version(또는 본문 해시)이 바뀌어 자동 무효화
+
+만료/축출:
+    - TTL 초과 항목은 조회 시 무시되고, 저장 시 일괄 삭제
+    - 전체 크기가 max_bytes를 넘으면 마지막 접근이 오래된 순(LRU)으로 삭제
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from core.config import (
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_PATH,
+    LLM_CACHE_TTL_SECONDS,
+    LLM_CACHE_MAX_BYTES,
+)
+
+
+def hash_payload(payload: Any) -> str:
+    """JSON 직렬화 가능한 입력의 안정적인 SHA-256 해시"""
+    canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def build_cache_key(
+    namespace: str,
+    model: str,
+    temperature: float,
+    messages: List[Dict[str, str]],
+    prompt_version: str = "v1",
+    **extra: Any
+) -> str:
+    """
+    LLM 호출 캐시 키 생성
+
+    Args:
+        namespace: 호출 지점 (예: "competency_agent", "resume_verifier")
+        model: 모델명
+        temperature: 샘플링 온도
+        messages: chat.completions 요청 메시지 (프롬프트 + transcript 포함)
+        prompt_version: 프롬프트 템플릿 버전
+        extra: 추가 식별자 (예: transcript_hash, competency_name)
+    """
+    return hash_payload({
+        "namespace": namespace,
+        "model": model,
+        "prompt_version": prompt_version,
+        "temperature": temperature,
+        "input_hash": hash_payload(messages),
+        **extra,
+    })
+
+
+class LLMResponseCache:
+    """SQLite 기반 LLM 응답 캐시 (TTL + 크기 기반 LRU 축출)"""
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: int = 7 * 24 * 3600,
+        max_bytes: int = 256 * 1024 * 1024,
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_cache_accessed ON llm_cache (accessed_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_cache_created ON llm_cache (created_at)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:  # commit / rollback
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] + self.ttl_seconds < now:
+                self.misses += 1
+                return None
+            conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+        self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        now = time.time()
+        serialized = json.dumps(value, ensure_ascii=False, default=str)
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, serialized, len(serialized.encode("utf-8")), now, now),
+            )
+            # 만료 항목 정리
+            conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+            # 크기 초과분은 최근 접근 순 누적 크기 기준으로 오래된 항목부터 삭제
+            conn.execute(
+                """
+                DELETE FROM llm_cache WHERE key IN (
+                    SELECT key FROM (
+                        SELECT key, SUM(size) OVER (ORDER BY accessed_at DESC, rowid DESC) AS running
+                        FROM llm_cache
+                    ) WHERE running > ?
+                )
+                """,
+                (self.max_bytes,),
+            )
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM llm_cache")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock, self._connect() as conn:
+            count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache").fetchone()
+        return {"entries": count, "bytes": total, "hits": self.hits, "misses": self.misses}
+
+    # 이벤트 루프를 막지 않도록 스레드에서 실행
+    async def aget(self, key: str) -> Optional[Any]:
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, value: Any) -> None:
+        await asyncio.to_thread(self.set, key, value)
+
+
+class NullLLMCache:
+    """캐시 비활성화 시 사용하는 No-op 구현"""
+
+    hits = 0
+    misses = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        return None
+
+    def set(self, key: str, value: Any) -> None:
+        return None
+
+    def delete(self, key: str) -> None:
+        return None
+
+    def clear(self) -> None:
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        return {"entries": 0, "bytes": 0, "hits": 0, "misses": 0}
+
+    async def aget(self, key: str) -> Optional[Any]:
+        return None
+
+    async def aset(self, key: str, value: Any) -> None:
+        return None
+
+
+_default_cache = None
+
+
+def get_llm_cache():
+    """프로세스 공용 캐시 (core.config의 LLM_CACHE_* 설정 사용)"""
+    global _default_cache
+    if _default_cache is None:
+        if LLM_CACHE_ENABLED:
+            _default_cache = LLMResponseCache(
+                path=LLM_CACHE_PATH,
+                ttl_seconds=LLM_CACHE_TTL_SECONDS,
+                max_bytes=LLM_CACHE_MAX_BYTES,
+            )
+        else:
+            _default_cache = NullLLMCache()
+    return _default_cache
+
+
+def set_llm_cache(cache) -> None:
+    """캐시 구현 교체 (테스트/다른 백엔드 주입용)"""
+    global _default_cache
+    _default_cache = cache
@@ -1,46 +1,161 @@
 import asyncio
+from typing import Dict, Optional
+from urllib.parse import quote
+
 import boto3
-import json
-from botocore.config import Config
-from core.config import AWS_REGION # Import AWS_REGION from core.config
+import httpx
+from botocore.auth import SigV4Auth
+from botocore.awsrequest import AWSRequest
+from core.config import (  # Import AWS_REGION from core.config
+    AWS_REGION,
+    BEDROCK_MODEL_ID,
+    BEDROCK_ENDPOINT_URL,
+    BEDROCK_MAX_CONNECTIONS,
+    LLM_FAILOVER_ENABLED,
+    OPENAI_API_KEY,
+)
+from ai.utils.llm_gateway import BedrockChatProvider, LLMGateway, OpenAIChatProvider
+
+
+class AsyncBedrockTransport:
+    """
+    Non-blocking transport for Bedrock `InvokeModel`.
+
+    boto3 is synchronous, so calling `invoke_model` from a coroutine freezes the
+    event loop for the whole round trip. This transport signs requests with
+    botocore's SigV4 signer and sends them over a pooled `httpx.AsyncClient`,
+    so concurrent calls overlap instead of serializing the worker.
+    """
+
+    RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+    def __init__(
+        self,
+        region_name: str = AWS_REGION,
+        endpoint_url: Optional[str] = None,
+        max_connections: int = BEDROCK_MAX_CONNECTIONS,
+        read_timeout: float = 60,
+        connect_timeout: float = 10,
+        max_attempts: int = 3,
+    ):
+        self.region_name = region_name
+        self.endpoint_url = (
+            endpoint_url or f"https://bedrock-runtime.{region_name}.amazonaws.com"
+        ).rstrip("/")
+        self.max_connections = max_connections
+        self.max_attempts = max_attempts
+        self._timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self._credentials = boto3.Session().get_credentials()
+        # SSL 컨텍스트 생성 비용이 이벤트 루프에 걸리지 않도록 생성 시점에 풀 준비
+        self._client: Optional[httpx.AsyncClient] = self._create_client()
+
+    @property
+    def has_credentials(self) -> bool:
+        return self._credentials is not None
+
+    def _create_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            timeout=self._timeout,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+            ),
+        )
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = self._create_client()
+        return self._client
+
+    def _signed_headers(self, url: str, body: str) -> Dict[str, str]:
+        if self._credentials is None:
+            raise RuntimeError("AWS credentials not found for Bedrock invocation")
+        request = AWSRequest(
+            method="POST",
+            url=url,
+            data=body.encode("utf-8"),
+            headers={"Content-Type": "application/json", "Accept": "application/json"},
+        )
+        SigV4Auth(
+            self._credentials.get_frozen_credentials(), "bedrock", self.region_name
+        ).add_auth(request)
+        return dict(request.headers.items())
+
+    async def invoke_model(self, model_id: str, body: str) -> Dict:
+        """InvokeModel 호출 후 응답 body(JSON)를 반환"""
+        url = f"{self.endpoint_url}/model/{quote(model_id, safe='')}/invoke"
+        client = self._get_client()
+
+        for attempt in range(self.max_attempts):
+            # 재시도마다 서명 타임스탬프를 갱신해야 하므로 매번 다시 서명
+            headers = self._signed_headers(url, body)
+            try:
+                response = await client.post(url, content=body.encode("utf-8"), headers=headers)
+            except httpx.TransportError:
+                if attempt < self.max_attempts - 1:
+                    await asyncio.sleep(min(8, 2 ** attempt))
+                    continue
+                raise
+
+            if response.status_code in self.RETRYABLE_STATUS and attempt < self.max_attempts - 1:
+                await asyncio.sleep(min(8, 2 ** attempt))
+                continue
+
+            response.raise_for_status()
+            return response.json()
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
 
 class LLMClient:
     """
     This is a placeholder for the actual LLMClient that interacts with AWS Bedrock.
     It allows the server to start and provides a basic Bedrock invocation structure.
+
+    Bedrock calls go through `AsyncBedrockTransport`, so `generate`,
+    `chat_completion` and `ainvoke` never block the event loop. Requests are
+    routed via `LLMGateway`, which fails over to OpenAI (when an API key is
+    configured) while the Bedrock circuit breaker is open.
     """
-    def __init__(self):
-        # Configure with timeout settings
-        config = Config(
-            read_timeout=60,
-            connect_timeout=10,
-            retries={'max_attempts': 3, 'mode': 'adaptive'}
+    def __init__(
+        self,
+        transport: Optional[AsyncBedrockTransport] = None,
+        model_id: str = BEDROCK_MODEL_ID,
+    ):
+        self.model_id = model_id
+        self.transport = transport or AsyncBedrockTransport(
+            region_name=AWS_REGION,
+            endpoint_url=BEDROCK_ENDPOINT_URL,
+        )
+        fallback = None
+        if LLM_FAILOVER_ENABLED and OPENAI_API_KEY:
+            from openai import AsyncOpenAI
+            fallback = OpenAIChatProvider(AsyncOpenAI(api_key=OPENAI_API_KEY))
+        self.gateway = LLMGateway(BedrockChatProvider(self.transport, model_id), fallback)
+
+    async def _invoke(self, prompt: str, temperature: float, max_tokens: int) -> Optional[str]:
+        """Bedrock Claude 호출(장애 시 OpenAI failover) 후 텍스트 응답 반환 (텍스트가 없으면 None)"""
+        response = await self.gateway.chat.completions.create(
+            model=self.model_id,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=temperature,
+            max_tokens=max_tokens,
         )
-        self.bedrock_runtime = boto3.client('bedrock-runtime', region_name=AWS_REGION, config=config)
+        text = response.choices[0].message.content
+        return text.strip() if text else None
 
     async def generate(self, prompt: str, response_format: dict = None, temperature: float = 0.3, max_tokens: int = 2000) -> dict:
         print(f"[LLMClient] Generating with max_tokens={max_tokens}, temperature={temperature}")
-        model_id = "anthropic.claude-3-sonnet-20240229-v1:0" # Example model ID, can be configured
-
-        body = json.dumps({
-            "anthropic_version": "bedrock-2023-05-31",
-            "max_tokens": max_tokens,  # Use parameter instead of hardcoded value
-            "messages": [{"role": "user", "content": prompt}],
-            "temperature": temperature
-        })
 
         try:
             print("[LLMClient] Invoking Bedrock API...")
-            response = self.bedrock_runtime.invoke_model(
-                modelId=model_id, body=body, contentType="application/json", accept="application/json"
-            )
-            response_body = json.loads(response['body'].read().decode('utf-8'))
+            llm_response_text = await self._invoke(prompt, temperature, max_tokens)
             print("[LLMClient] ✓ Bedrock API response received")
 
-            # Extract text content from the response
-            if 'content' in response_body and len(response_body['content']) > 0 and 'text' in response_body['content'][0]:
-                llm_response_text = response_body['content'][0]['text'].strip()
-            else:
+            if llm_response_text is None:
                 llm_response_text = "Placeholder: No text content found in LLM response."
 
             # If a JSON schema is expected, try to return a dummy JSON
@@ -56,7 +171,7 @@ class LLMClient:
                     "strengths": ["Placeholder strength from Bedrock"],
                     "weaknesses": ["Placeholder weakness from Bedrock"]
                 }
-            
+
             return {"text": llm_response_text}
 
         except Exception as e:
@@ -100,31 +215,11 @@ class LLMClient:
 
             prompt += "Assistant:"
 
-            model_id = "anthropic.claude-3-sonnet-20240229-v1:0"
-
-            body = json.dumps({
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": max_tokens,
-                "messages": [{"role": "user", "content": prompt}],
-                "temperature": temperature
-            })
-
             print("[LLMClient] Invoking Bedrock API (chat_completion)...")
-            response = self.bedrock_runtime.invoke_model(
-                modelId=model_id,
-                body=body,
-                contentType="application/json",
-                accept="application/json"
-            )
-
-            response_body = json.loads(response['body'].read().decode('utf-8'))
+            text = await self._invoke(prompt, temperature, max_tokens)
             print("[LLMClient] ✓ Chat completion response received")
 
-            # Extract text content from the response
-            if 'content' in response_body and len(response_body['content']) > 0 and 'text' in response_body['content'][0]:
-                return response_body['content'][0]['text'].strip()
-            else:
-                return "No response generated"
+            return text if text is not None else "No response generated"
 
         except Exception as e:
             print(f"✗ ERROR in chat_completion Bedrock call: {e}")
@@ -145,33 +240,17 @@ class LLMClient:
         """
         print(f"[LLMClient] ainvoke with max_tokens={max_tokens}")
         try:
-            model_id = "anthropic.claude-3-sonnet-20240229-v1:0"
-
-            body = json.dumps({
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": max_tokens,
-                "messages": [{"role": "user", "content": prompt}],
-                "temperature": temperature
-            })
-
             print("[LLMClient] Invoking Bedrock API (ainvoke)...")
-            response = self.bedrock_runtime.invoke_model(
-                modelId=model_id,
-                body=body,
-                contentType="application/json",
-                accept="application/json"
-            )
-
-            response_body = json.loads(response['body'].read().decode('utf-8'))
+            text = await self._invoke(prompt, temperature, max_tokens)
             print("[LLMClient] ✓ ainvoke response received")
 
-            # Extract text content from the response
-            if 'content' in response_body and len(response_body['content']) > 0 and 'text' in response_body['content'][0]:
-                return response_body['content'][0]['text'].strip()
-            else:
-                return "No response generated"
+            return text if text is not None else "No response generated"
 
         except Exception as e:
             print(f"✗ ERROR in ainvoke Bedrock call: {e}")
             print(f"   Error type: {type(e).__name__}")
             raise
+
+    async def aclose(self):
+        """전송 계층 커넥션 풀 정리"""
+        await self.transport.aclose()
@@ -0,0 +1,362 @@
+"""
+LLM Gateway: OpenAI ↔ Bedrock failover + provider별 circuit breaker
+
+평가 그래프는 OpenAI만, LLMClient는 Bedrock만 사용하기 때문에 한쪽이 느려지거나 오류를 내면
+모든 요청이 재시도를 소진할 때까지 대기했습니다.
+
+LLMGateway는 chat.completions.create(...) 표면(OpenAI 형식)을 그대로 제공하면서
+    - primary provider 호출이 실패(연결 오류/타임아웃/5xx)하면 fallback provider로 재호출
+      (429는 넘기지 않고 그대로 올려 공용 Rate Limiter가 retry-after 동안 보류하게 함)
+    - provider별 CircuitBreaker가 최근 호출의 오류율 또는 p95 지연이 임계값을 넘으면 open되어
+      cooldown 동안 해당 provider를 건너뜀 (이후 half-open에서 1건으로 회복 확인)
+    - Bedrock으로 넘어간 JSON 요청(response_format=json_object)은 JSON 전용 지시 + "{" prefill로
+      응답이 JSON 객체 하나가 되도록 강제하고, 파싱되지 않으면 provider 실패로 처리
+      (CompetencyAgent 등이 기대하는 JSON-only 계약 유지)
+
+breaker 상태와 failover 횟수는 gateway_metrics()로 노출합니다 (/health, execution_logs).
+"""
+
+import asyncio
+import json
+import time
+from collections import deque
+from types import SimpleNamespace
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import httpx
+from openai import APIConnectionError, APIStatusError
+from openai.types.chat import ChatCompletion
+
+from core.config import (
+    BEDROCK_MODEL_ID,
+    LLM_BREAKER_COOLDOWN_SECONDS,
+    LLM_BREAKER_ERROR_RATE,
+    LLM_BREAKER_MIN_SAMPLES,
+    LLM_BREAKER_P95_SECONDS,
+    LLM_FAILOVER_OPENAI_MODEL,
+    LLM_PROVIDER_TIMEOUT_SECONDS,
+)
+from ai.utils.completion_stream import CompletionChunkStream
+
+
+JSON_ONLY_INSTRUCTION = (
+    "Respond with exactly one valid JSON object and nothing else. "
+    "Do not use markdown code fences or add any explanation."
+)
+
+
+class ProviderResponseError(RuntimeError):
+    """provider 응답이 계약(텍스트 존재, JSON-only)을 만족하지 않음"""
+
+
+class CircuitOpenError(RuntimeError):
+    """모든 provider의 breaker가 열려 있어 호출하지 않음"""
+
+
+class CircuitBreaker:
+    """최근 호출 결과 기반 circuit breaker (closed → open → half_open → closed)"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        error_rate_threshold: float = LLM_BREAKER_ERROR_RATE,
+        p95_latency_seconds: float = LLM_BREAKER_P95_SECONDS,
+        min_samples: int = LLM_BREAKER_MIN_SAMPLES,
+        cooldown_seconds: float = LLM_BREAKER_COOLDOWN_SECONDS,
+        window: int = 50,
+    ):
+        self.name = name
+        self.error_rate_threshold = error_rate_threshold
+        self.p95_latency_seconds = p95_latency_seconds
+        self.min_samples = min_samples
+        self.cooldown_seconds = cooldown_seconds
+        # (latency_seconds, ok)
+        self._recent: Deque[Tuple[float, bool]] = deque(maxlen=window)
+        self.state = self.CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.opened_count = 0
+        self.last_open_reason: Optional[str] = None
+
+    def allow(self) -> bool:
+        """이번 호출을 보내도 되는지 (half_open에서는 probe 1건만 허용)"""
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN:
+            if time.monotonic() - self._opened_at < self.cooldown_seconds:
+                return False
+            self.state = self.HALF_OPEN
+        if self._probe_in_flight:
+            return False
+        self._probe_in_flight = True
+        return True
+
+    def record(self, latency_seconds: float, ok: bool) -> None:
+        self._recent.append((latency_seconds, ok))
+        if self.state == self.HALF_OPEN:
+            self._probe_in_flight = False
+            if ok and latency_seconds <= self.p95_latency_seconds:
+                self.state = self.CLOSED
+                self._recent.clear()
+            else:
+                self._open("half-open probe 실패")
+            return
+        if self.state == self.CLOSED and len(self._recent) >= self.min_samples:
+            if self.error_rate() > self.error_rate_threshold:
+                self._open(f"error_rate {self.error_rate():.0%}")
+            elif self.p95_latency() > self.p95_latency_seconds:
+                self._open(f"p95 {self.p95_latency():.1f}s")
+
+    def release_probe(self) -> None:
+        """결과 없이 끝난 호출 (취소 등)"""
+        self._probe_in_flight = False
+
+    def _open(self, reason: str) -> None:
+        self.state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._probe_in_flight = False
+        self.opened_count += 1
+        self.last_open_reason = reason
+        print(f"[LLM Gateway] {self.name} circuit open ({reason}) → {self.cooldown_seconds:.0f}s 동안 우회")
+
+    def error_rate(self) -> float:
+        if not self._recent:
+            return 0.0
+        return sum(1 for _, ok in self._recent if not ok) / len(self._recent)
+
+    def p95_latency(self) -> float:
+        if not self._recent:
+            return 0.0
+        ordered = sorted(latency for latency, _ in self._recent)
+        return ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+
+    def health_score(self) -> float:
+        """0~1 (성공률 × 지연 여유), open이면 0"""
+        if self.state == self.OPEN:
+            return 0.0
+        p95 = self.p95_latency()
+        latency_factor = 1.0 if p95 <= self.p95_latency_seconds else self.p95_latency_seconds / p95
+        return round((1 - self.error_rate()) * latency_factor, 3)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "health_score": self.health_score(),
+            "samples": len(self._recent),
+            "error_rate": round(self.error_rate(), 3),
+            "p95_latency_seconds": round(self.p95_latency(), 3),
+            "opened_count": self.opened_count,
+            "last_open_reason": self.last_open_reason,
+        }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+gateway_stats: Dict[str, Any] = {"calls": 0, "failovers": 0, "short_circuited": 0, "by_route": {}}
+
+
+def get_circuit_breaker(provider: str) -> CircuitBreaker:
+    """provider별 프로세스 공용 breaker"""
+    breaker = _breakers.get(provider)
+    if breaker is None:
+        breaker = _breakers[provider] = CircuitBreaker(provider)
+    return breaker
+
+
+def set_circuit_breaker(provider: str, breaker: CircuitBreaker) -> None:
+    """breaker 교체 (테스트/임계값 조정용)"""
+    _breakers[provider] = breaker
+
+
+def gateway_metrics() -> Dict[str, Any]:
+    """provider별 breaker 상태 + failover 횟수 (모니터링용)"""
+    return {
+        "breakers": {name: breaker.snapshot() for name, breaker in _breakers.items()},
+        "calls": gateway_stats["calls"],
+        "failovers": gateway_stats["failovers"],
+        "short_circuited": gateway_stats["short_circuited"],
+        "by_route": dict(gateway_stats["by_route"]),
+    }
+
+
+def is_provider_failure(error: BaseException) -> bool:
+    """다른 provider로 넘길 오류인지 (요청 자체 문제인 400/404/422 등과 429 예산 초과는 제외)"""
+    if isinstance(error, (asyncio.TimeoutError, ProviderResponseError, APIConnectionError, httpx.TransportError)):
+        return True
+    status = getattr(error, "status_code", None)
+    if status is None and isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+    if status is None:
+        return False
+    return status in (401, 403, 408, 409) or status >= 500
+
+
+class OpenAIChatProvider:
+    """AsyncOpenAI (또는 같은 표면의 클라이언트) 래퍼"""
+
+    name = "openai"
+
+    def __init__(self, client, failover_model: str = LLM_FAILOVER_OPENAI_MODEL):
+        self.client = client
+        self.failover_model = failover_model
+
+    async def create(self, model: str, **kwargs):
+        return await self.client.chat.completions.create(model=model, **kwargs)
+
+
+class BedrockChatProvider:
+    """OpenAI chat 요청을 Bedrock Claude InvokeModel로 변환"""
+
+    name = "bedrock"
+    ANTHROPIC_VERSION = "bedrock-2023-05-31"
+    DEFAULT_MAX_TOKENS = 4096
+
+    def __init__(self, transport=None, model_id: str = BEDROCK_MODEL_ID):
+        if transport is None:
+            from ai.utils.llm_client import AsyncBedrockTransport
+            transport = AsyncBedrockTransport()
+        self.transport = transport
+        self.failover_model = model_id
+
+    def build_body(self, messages: List[Dict[str, Any]], temperature: float, max_tokens: int, json_mode: bool) -> Dict:
+        system_parts = [m["content"] for m in messages if m["role"] == "system"]
+        turns: List[Dict[str, str]] = []
+        for message in messages:
+            if message["role"] == "system":
+                continue
+            # Claude는 user/assistant가 번갈아 와야 하므로 연속된 같은 role은 합침
+            if turns and turns[-1]["role"] == message["role"]:
+                turns[-1]["content"] += "\n\n" + message["content"]
+            else:
+                turns.append({"role": message["role"], "content": message["content"]})
+        if json_mode:
+            system_parts.append(JSON_ONLY_INSTRUCTION)
+            turns.append({"role": "assistant", "content": "{"})
+
+        body = {
+            "anthropic_version": self.ANTHROPIC_VERSION,
+            "max_tokens": max_tokens,
+            "messages": turns,
+            "temperature": temperature,
+        }
+        if system_parts:
+            body["system"] = "\n\n".join(system_parts)
+        return body
+
+    @staticmethod
+    def extract_json_object(text: str) -> str:
+        """prefill("{") 뒤 응답에서 JSON 객체 하나만 잘라 검증"""
+        end = text.rfind("}")
+        candidate = text[:end + 1] if end != -1 else text
+        try:
+            json.loads(candidate)
+        except json.JSONDecodeError as e:
+            raise ProviderResponseError(f"Bedrock 응답이 JSON 객체가 아님: {e}") from e
+        return candidate
+
+    async def create(
+        self,
+        model: str,
+        messages: List[Dict[str, Any]],
+        temperature: float = 0.3,
+        max_tokens: Optional[int] = None,
+        response_format: Optional[Dict[str, Any]] = None,
+        stream: bool = False,
+        **_ignored
+    ):
+        json_mode = bool(response_format) and response_format.get("type") in ("json_object", "json_schema")
+        body = self.build_body(messages, temperature, max_tokens or self.DEFAULT_MAX_TOKENS, json_mode)
+        response = await self.transport.invoke_model(model, json.dumps(body))
+
+        blocks = response.get("content") or []
+        text = "".join(block.get("text", "") for block in blocks if isinstance(block, dict))
+        content = self.extract_json_object("{" + text) if json_mode else text
+
+        usage = response.get("usage") or {}
+        completion = ChatCompletion.model_validate({
+            "id": response.get("id", "bedrock"),
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": content},
+            }],
+            "usage": {
+                "prompt_tokens": usage.get("input_tokens", 0),
+                "completion_tokens": usage.get("output_tokens", 0),
+                "total_tokens": usage.get("input_tokens", 0) + usage.get("output_tokens", 0),
+            },
+        })
+        return CompletionChunkStream(completion) if stream else completion
+
+
+def bedrock_failover_provider() -> Optional[BedrockChatProvider]:
+    """OpenAI 호출의 Bedrock failover provider (AWS 자격 증명이 없으면 None)"""
+    from ai.utils.llm_client import AsyncBedrockTransport
+    transport = AsyncBedrockTransport()
+    if not transport.has_credentials:
+        print("[LLM Gateway] AWS 자격 증명 없음 → Bedrock failover 비활성화")
+        return None
+    return BedrockChatProvider(transport)
+
+
+class LLMGateway:
+    """chat.completions.create 표면을 가진 failover 클라이언트"""
+
+    def __init__(self, primary, fallback=None, timeout_seconds: float = LLM_PROVIDER_TIMEOUT_SECONDS):
+        self.primary = primary
+        self.fallback = fallback
+        self.timeout_seconds = timeout_seconds
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _providers(self) -> List[Any]:
+        providers = [self.primary]
+        if self.fallback is not None:
+            providers.append(self.fallback)
+        return providers
+
+    async def _create(self, **kwargs):
+        model = kwargs.pop("model")
+        gateway_stats["calls"] += 1
+        last_error: Optional[BaseException] = None
+
+        for provider in self._providers():
+            breaker = get_circuit_breaker(provider.name)
+            if not breaker.allow():
+                gateway_stats["short_circuited"] += 1
+                continue
+
+            provider_model = model if provider is self.primary else provider.failover_model
+            started = time.monotonic()
+            try:
+                result = await asyncio.wait_for(
+                    provider.create(provider_model, **kwargs), timeout=self.timeout_seconds
+                )
+            except asyncio.CancelledError:
+                breaker.release_probe()
+                raise
+            except Exception as e:
+                if not is_provider_failure(e):
+                    # 요청 자체의 문제는 provider 건강도와 무관
+                    breaker.release_probe()
+                    raise
+                breaker.record(time.monotonic() - started, ok=False)
+                last_error = e
+                print(f"[LLM Gateway] {provider.name} 호출 실패 ({type(e).__name__}) → 다음 provider 시도")
+                continue
+
+            breaker.record(time.monotonic() - started, ok=True)
+            if provider is not self.primary:
+                route = f"{self.primary.name}->{provider.name}"
+                gateway_stats["failovers"] += 1
+                gateway_stats["by_route"][route] = gateway_stats["by_route"].get(route, 0) + 1
+            return result
+
+        if last_error is not None:
+            raise last_error
+        raise CircuitOpenError(f"모든 provider circuit open: {[p.name for p in self._providers()]}")
@@ -0,0 +1,289 @@
+"""
+LLM 호출 span 기록 및 비용/지연 집계
+
+limited_chat_completion()을 거치는 모든 호출을 1건의 span으로 기록합니다.
+    - model, label(호출 구분), status(ok / rate_limited / error / cancelled)
+    - prompt / cached / completion 토큰과 추정 비용(USD)
+    - queue_wait_seconds: Rate Limiter 대기 시간 (그중 429 보류로 인한 대기는 rate_limit_wait_seconds)
+    - latency_seconds: 발송부터 응답 완료까지 (스트림은 마지막 청크까지)
+
+노드는 llm_usage_scope("노드명")으로 감싸 자신의 span을 모으고,
+State의 llm_spans(operator.add)로 넘깁니다. 평가 단위 요약은 summarize_llm_usage(),
+여러 평가(예: 같은 job) 합산은 merge_llm_usage()를 사용합니다.
+
+재시도 수는 같은 (node, label) 호출의 두 번째 이후 시도 수로 계산합니다 (취소된 hedge 호출 제외).
+"""
+
+import contextvars
+import json
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from core.config import LLM_PRICING_JSON
+
+
+# 모델별 단가 (USD / 1M tokens), LLM_PRICING_JSON으로 덮어쓰기 가능
+DEFAULT_PRICING = {
+    "gpt-4o-mini": {"input": 0.15, "cached_input": 0.075, "output": 0.60},
+    "gpt-4o": {"input": 2.50, "cached_input": 1.25, "output": 10.00},
+}
+PRICING = {**DEFAULT_PRICING, **(json.loads(LLM_PRICING_JSON) if LLM_PRICING_JSON else {})}
+
+
+def estimate_cost_usd(model: str, prompt_tokens: int, cached_tokens: int, completion_tokens: int) -> float:
+    """모델 단가 기준 추정 비용 (날짜 접미사가 붙은 모델명은 가장 긴 접두어로 매칭, 모르는 모델은 0)"""
+    matches = [name for name in PRICING if model == name or model.startswith(name + "-")]
+    if not matches:
+        return 0.0
+    price = PRICING[max(matches, key=len)]
+    return (
+        (prompt_tokens - cached_tokens) * price["input"]
+        + cached_tokens * price.get("cached_input", price["input"])
+        + completion_tokens * price["output"]
+    ) / 1_000_000
+
+
+class LLMUsageRecorder:
+    """노드 1회 실행 동안의 span 목록"""
+
+    def __init__(self, node: str):
+        self.node = node
+        self.spans: List[Dict[str, Any]] = []
+
+    def summary(self) -> Dict[str, Any]:
+        return summarize_llm_usage(self.spans)["total"]
+
+
+_current_recorder: "contextvars.ContextVar[Optional[LLMUsageRecorder]]" = contextvars.ContextVar(
+    "llm_usage_recorder", default=None
+)
+
+
+@contextmanager
+def llm_usage_scope(node: str, recorder: Optional[LLMUsageRecorder] = None):
+    """
+    이 블록(및 여기서 생성된 task)의 LLM 호출 span을 recorder에 모음
+
+    recorder를 넘기면 기존 recorder에 이어서 기록 (한 노드 안의 여러 구간을 합칠 때)
+    """
+    recorder = recorder or LLMUsageRecorder(node)
+    token = _current_recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _current_recorder.reset(token)
+
+
+class LLMSpan:
+    """진행 중인 호출 1건 (finish() 시 현재 recorder에 기록)"""
+
+    def __init__(
+        self,
+        recorder: LLMUsageRecorder,
+        label: Optional[str],
+        model: str,
+        stream: bool,
+        queue_wait_seconds: float,
+        rate_limit_wait_seconds: float,
+    ):
+        self.recorder = recorder
+        self.finished = False
+        self._started = time.monotonic()
+        self.data: Dict[str, Any] = {
+            "node": recorder.node,
+            "label": label,
+            "model": model,
+            "stream": stream,
+            "queue_wait_seconds": round(queue_wait_seconds, 3),
+            "rate_limit_wait_seconds": round(rate_limit_wait_seconds, 3),
+            "started_at": datetime.now().isoformat(),
+        }
+
+    def finish(self, status: str, usage=None) -> None:
+        if self.finished:
+            return
+        self.finished = True
+        details = getattr(usage, "prompt_tokens_details", None)
+        prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+        cached_tokens = getattr(details, "cached_tokens", 0) or 0
+        completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+        self.data.update({
+            "status": status,
+            "latency_seconds": round(time.monotonic() - self._started, 3),
+            "prompt_tokens": prompt_tokens,
+            "cached_tokens": cached_tokens,
+            "completion_tokens": completion_tokens,
+            "cost_usd": round(
+                estimate_cost_usd(self.data["model"], prompt_tokens, cached_tokens, completion_tokens), 6
+            ),
+        })
+        self.recorder.spans.append(self.data)
+
+
+def begin_llm_span(
+    label: Optional[str],
+    model: str,
+    stream: bool = False,
+    queue_wait_seconds: float = 0.0,
+    rate_limit_wait_seconds: float = 0.0,
+) -> Optional[LLMSpan]:
+    """현재 scope가 없으면 None (기록하지 않음)"""
+    recorder = _current_recorder.get()
+    if recorder is None:
+        return None
+    return LLMSpan(recorder, label, model, stream, queue_wait_seconds, rate_limit_wait_seconds)
+
+
+class MeteredStream:
+    """
+    스트림 응답을 감싸 마지막 usage 청크 또는 close() 시점에 on_finish(status, usage) 호출
+
+    on_finish는 한 번만 호출됩니다 (끝까지 소비한 뒤 close()해도 다시 호출하지 않음).
+    """
+
+    def __init__(self, stream, on_finish: Callable[[str, Any], None]):
+        self._stream = stream
+        self._on_finish = on_finish
+        self._usage = None
+        self._finished = False
+
+    def _finish(self, status: str) -> None:
+        if not self._finished:
+            self._finished = True
+            self._on_finish(status, self._usage)
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        status = "cancelled"
+        try:
+            async for chunk in self._stream:
+                if getattr(chunk, "usage", None) is not None:
+                    self._usage = chunk.usage
+                yield chunk
+            status = "ok"
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            self._finish(status)
+
+    async def close(self):
+        # 끝까지 소비하지 않고 닫힌 스트림 (hedge 패배 등)
+        self._finish("cancelled")
+        close = getattr(self._stream, "close", None)
+        if close is not None:
+            await close()
+
+
+def _empty_bucket() -> Dict[str, Any]:
+    return {
+        "calls": 0,
+        "retries": 0,
+        "rate_limited": 0,
+        "errors": 0,
+        "cancelled": 0,
+        "prompt_tokens": 0,
+        "cached_tokens": 0,
+        "completion_tokens": 0,
+        "cost_usd": 0.0,
+        "latency_seconds": 0.0,
+        "max_latency_seconds": 0.0,
+        "queue_wait_seconds": 0.0,
+        "rate_limit_wait_seconds": 0.0,
+    }
+
+
+def _merge_bucket(target: Dict[str, Any], source: Dict[str, Any]) -> None:
+    for field, value in source.items():
+        if field == "max_latency_seconds":
+            target[field] = max(target.get(field, 0.0), value)
+        else:
+            target[field] = target.get(field, 0) + value
+
+
+def _round_bucket(bucket: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        field: round(value, 6 if field == "cost_usd" else 3) if isinstance(value, float) else value
+        for field, value in bucket.items()
+    }
+
+
+def summarize_llm_usage(spans: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    span 목록 → 전체 / 노드별 / 모델별 집계
+
+    Returns:
+        {"total": {...}, "by_node": {node: {...}}, "by_model": {model: {...}}}
+    """
+    total = _empty_bucket()
+    by_node: Dict[str, Dict[str, Any]] = {}
+    by_model: Dict[str, Dict[str, Any]] = {}
+    seen = set()
+
+    for span in spans:
+        bucket = _empty_bucket()
+        status = span.get("status")
+        bucket["calls"] = 1
+        bucket["rate_limited"] = int(status == "rate_limited")
+        bucket["errors"] = int(status == "error")
+        bucket["cancelled"] = int(status == "cancelled")
+        if status != "cancelled" and span.get("label") is not None:
+            key = (span.get("node"), span["label"])
+            bucket["retries"] = int(key in seen)
+            seen.add(key)
+        for field in ("prompt_tokens", "cached_tokens", "completion_tokens",
+                      "cost_usd", "queue_wait_seconds", "rate_limit_wait_seconds"):
+            bucket[field] = span.get(field, 0) or 0
+        bucket["latency_seconds"] = bucket["max_latency_seconds"] = span.get("latency_seconds", 0.0) or 0.0
+
+        _merge_bucket(total, bucket)
+        _merge_bucket(by_node.setdefault(span.get("node") or "unknown", _empty_bucket()), bucket)
+        _merge_bucket(by_model.setdefault(span.get("model") or "unknown", _empty_bucket()), bucket)
+
+    return {
+        "total": _round_bucket(total),
+        "by_node": {node: _round_bucket(b) for node, b in by_node.items()},
+        "by_model": {model: _round_bucket(b) for model, b in by_model.items()},
+    }
+
+
+def merge_llm_usage(summaries: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """summarize_llm_usage() 결과 여러 개 합산 (job 단위 집계용)"""
+    total = _empty_bucket()
+    by_node: Dict[str, Dict[str, Any]] = {}
+    by_model: Dict[str, Dict[str, Any]] = {}
+    evaluations = 0
+
+    for summary in summaries:
+        if not summary:
+            continue
+        evaluations += 1
+        _merge_bucket(total, summary.get("total", {}))
+        for node, bucket in summary.get("by_node", {}).items():
+            _merge_bucket(by_node.setdefault(node, _empty_bucket()), bucket)
+        for model, bucket in summary.get("by_model", {}).items():
+            _merge_bucket(by_model.setdefault(model, _empty_bucket()), bucket)
+
+    return {
+        "evaluations": evaluations,
+        "total": _round_bucket(total),
+        "by_node": {node: _round_bucket(b) for node, b in by_node.items()},
+        "by_model": {model: _round_bucket(b) for model, b in by_model.items()},
+    }
+
+
+def format_llm_usage(summary: Dict[str, Any]) -> str:
+    """콘솔 출력용 노드별 한 줄 요약"""
+    lines = []
+    for node, bucket in summary.get("by_node", {}).items():
+        lines.append(
+            f"  {node:<24} calls={bucket['calls']:<3} retries={bucket['retries']:<2} "
+            f"tokens={bucket['prompt_tokens']}+{bucket['completion_tokens']} "
+            f"(cached {bucket['cached_tokens']}) ${bucket['cost_usd']:.4f} "
+            f"queue={bucket['queue_wait_seconds']:.1f}s"
+        )
+    return "\n".join(lines)
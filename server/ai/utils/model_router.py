@@ -0,0 +1,205 @@
+"""
+작업 유형별 모델 라우팅 (Model Tiering)
+
+호출부는 모델 이름 대신 작업 유형(task)을 선언하고, 라우터가 모델을 고릅니다.
+    - 각 작업은 싼 모델 → 큰 모델 순서의 사다리(models)를 가짐
+    - 최근 지연 p90이 latency_target_seconds를 넘거나 검증 실패율이 max_failure_rate를 넘는
+      모델은 건너뛰고 다음 모델부터 시작 (표본 min_samples개 이상일 때, 마지막 모델은 항상 후보)
+    - routed_chat_completion()은 응답 검증(validate)이 실패하면 다음 모델로 올려 재호출
+
+라우팅 테이블은 MODEL_ROUTES_JSON(JSON 문자열 또는 파일 경로)으로 코드 수정 없이 조정합니다.
+
+작업 유형:
+    rubric_scoring         Stage 1 역량 평가 (CompetencyAgent)
+    evidence_rewrite       Presentation 근거/강점/약점 배치 재작성
+    verification           Resume 검증 (ResumeVerifier)
+    mediation              Segment 중복 평가 조정 (SegmentOverlapChecker)
+    final_summary          종합 심사평 (FinalIntegrator)
+    summarization          근거 문장 연결 (PresentationFormatter._connect_summaries_naturally)
+    binary_classification  답변 WEAK/STRONG 판정 (InterviewServiceV4._evaluate_answer_quality)
+"""
+
+import json
+import os
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from core.config import MODEL_ROUTES_JSON, OPENAI_MODEL, OPENAI_SUMMARY_MODEL
+from ai.utils.hedging import LatencyHistogram
+from ai.utils.rate_limiter import limited_chat_completion
+
+
+ROUTE_DEFAULTS = {
+    "latency_target_seconds": None,
+    "max_failure_rate": 0.3,
+    "min_samples": 10,
+}
+
+DEFAULT_MODEL_ROUTES: Dict[str, Dict[str, Any]] = {
+    "rubric_scoring": {"models": ["gpt-4o"]},
+    "evidence_rewrite": {"models": [OPENAI_MODEL]},
+    "verification": {"models": ["gpt-4o-mini", "gpt-4o"]},
+    "mediation": {"models": ["gpt-4o-mini", "gpt-4o"]},
+    "final_summary": {"models": ["gpt-4o-mini", "gpt-4o"]},
+    "summarization": {"models": [OPENAI_SUMMARY_MODEL] if OPENAI_SUMMARY_MODEL else ["gpt-4o-mini", "gpt-4o"]},
+    "binary_classification": {"models": ["gpt-4o-mini", "gpt-4o"]},
+}
+
+
+class RoutingValidationError(ValueError):
+    """모든 후보 모델의 응답이 검증에 실패"""
+
+
+def load_model_routes(override: str = MODEL_ROUTES_JSON) -> Dict[str, Dict[str, Any]]:
+    """기본 라우팅 테이블 + MODEL_ROUTES_JSON 오버라이드 (작업 단위로 필드 병합)"""
+    routes = {task: {**ROUTE_DEFAULTS, **route} for task, route in DEFAULT_MODEL_ROUTES.items()}
+    if not override:
+        return routes
+    if os.path.isfile(override):
+        with open(override, encoding="utf-8") as f:
+            custom = json.load(f)
+    else:
+        custom = json.loads(override)
+    for task, route in custom.items():
+        routes[task] = {**routes.get(task, ROUTE_DEFAULTS), **route}
+    return routes
+
+
+class ModelRouter:
+    """작업별 모델 사다리 + (작업, 모델)별 지연/검증 결과 통계"""
+
+    def __init__(self, routes: Optional[Dict[str, Dict[str, Any]]] = None, window: int = 50):
+        self.routes = routes if routes is not None else load_model_routes()
+        self._window = window
+        self._latency: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._outcomes: Dict[Tuple[str, str], Deque[bool]] = {}
+        self.escalations = 0
+
+    def route(self, task: str) -> Dict[str, Any]:
+        route = self.routes.get(task)
+        if route is None or not route.get("models"):
+            raise ValueError(f"라우팅 테이블에 없는 작업 유형: {task}")
+        return route
+
+    def _meets_target(self, task: str, model: str, route: Dict[str, Any]) -> bool:
+        key = (task, model)
+        min_samples = route.get("min_samples", ROUTE_DEFAULTS["min_samples"])
+        target = route.get("latency_target_seconds")
+        histogram = self._latency.get(key)
+        if target is not None and histogram is not None and len(histogram.samples) >= min_samples:
+            if histogram.percentile(0.9) > target:
+                return False
+        outcomes = self._outcomes.get(key)
+        if outcomes is not None and len(outcomes) >= min_samples:
+            failure_rate = outcomes.count(False) / len(outcomes)
+            if failure_rate > route.get("max_failure_rate", ROUTE_DEFAULTS["max_failure_rate"]):
+                return False
+        return True
+
+    def candidates(self, task: str) -> List[str]:
+        """이번 호출에서 시도할 모델 순서 (목표를 만족하는 가장 싼 모델부터)"""
+        route = self.route(task)
+        models = route["models"]
+        for index, model in enumerate(models[:-1]):
+            if self._meets_target(task, model, route):
+                return models[index:]
+        return models[-1:]
+
+    def select(self, task: str) -> str:
+        """검증/승급 없이 모델 하나만 필요한 호출부용"""
+        return self.candidates(task)[0]
+
+    def route_key(self, task: str) -> str:
+        """LLM 캐시 키용 (라우팅 테이블이 바뀌면 캐시도 분리)"""
+        return f"{task}:" + "+".join(self.route(task)["models"])
+
+    def record(self, task: str, model: str, latency_seconds: float, valid: bool) -> None:
+        key = (task, model)
+        histogram = self._latency.get(key)
+        if histogram is None:
+            histogram = self._latency[key] = LatencyHistogram(self._window)
+        histogram.record(latency_seconds)
+        self._outcomes.setdefault(key, deque(maxlen=self._window)).append(valid)
+
+    def stats(self) -> Dict[str, Any]:
+        """(작업, 모델)별 호출 수/검증 실패율/p90 지연 (execution_logs 기록용)"""
+        by_route = {}
+        for (task, model), outcomes in self._outcomes.items():
+            by_route[f"{task}/{model}"] = {
+                "calls": len(outcomes),
+                "failure_rate": round(outcomes.count(False) / len(outcomes), 3),
+                "p90_latency_seconds": self._latency[(task, model)].percentile(0.9),
+            }
+        return {"escalations": self.escalations, "routes": by_route}
+
+
+_router: Optional[ModelRouter] = None
+
+
+def get_model_router() -> ModelRouter:
+    """프로세스 공용 라우터"""
+    global _router
+    if _router is None:
+        _router = ModelRouter()
+    return _router
+
+
+def set_model_router(router: ModelRouter) -> None:
+    """라우터 교체 (테스트/라우팅 테이블 재로딩용)"""
+    global _router
+    _router = router
+
+
+async def routed_chat_completion(
+    client,
+    task: str,
+    messages: List[Dict[str, Any]],
+    validate: Optional[Callable[[str], Any]] = None,
+    span_label: Optional[str] = None,
+    **kwargs
+) -> Tuple[Any, str]:
+    """
+    작업 유형에 맞는 모델로 호출하고, 검증 실패 시 다음 모델로 승급
+
+    Args:
+        task: 작업 유형 (DEFAULT_MODEL_ROUTES 키)
+        validate: 응답 텍스트 → 결과 값 (실패 시 ValueError, 미지정 시 텍스트 그대로)
+        kwargs: model/messages를 제외한 chat.completions.create 인자
+
+    Returns:
+        (검증된 결과 값, 응답한 모델)
+    """
+    router = get_model_router()
+    models = router.candidates(task)
+    last_error: Optional[Exception] = None
+
+    for index, model in enumerate(models):
+        started = time.monotonic()
+        response = await limited_chat_completion(
+            client, span_label=span_label or task, model=model, messages=messages, **kwargs
+        )
+        content = response.choices[0].message.content or ""
+        try:
+            value = validate(content) if validate is not None else content
+        except ValueError as e:
+            router.record(task, model, time.monotonic() - started, valid=False)
+            last_error = e
+            if index < len(models) - 1:
+                router.escalations += 1
+                print(f"[Router] {task}: {model} 응답 검증 실패 ({e}) → {models[index + 1]}로 승급")
+            continue
+        router.record(task, model, time.monotonic() - started, valid=True)
+        return value, model
+
+    raise RoutingValidationError(f"[{task}] 모든 후보 모델 응답 검증 실패: {models}") from last_error
+
+
+def parse_json_response(content: str) -> Any:
+    """JSON 응답 검증기 (마크다운 코드 블록 허용)"""
+    text = content.strip()
+    if text.startswith("```"):
+        text = text.split("```")[1]
+        if text.startswith("json"):
+            text = text[4:]
+    return json.loads(text.strip())
@@ -0,0 +1,335 @@
+"""
+OpenAI TPM/RPM 토큰 버킷 Rate Limiter (프로세스 공용)
+
+기존에는 CompetencyAgent마다 Semaphore(4)를 만들어 호출 "개수"만 제한했기 때문에
+평가가 2건 동시에 돌면 8개가 동시에 나가고, Stage 3/4 호출은 아예 제한이 없어
+429 → 재시도 → 다시 429를 반복했습니다.
+
+이 모듈은 모델별로 분당 토큰(TPM)/요청(RPM) 예산을 토큰 버킷으로 관리합니다.
+    - 호출 전 프롬프트 토큰 + 예상 응답 토큰을 예약해 예산이 있을 때만 발송 (FIFO)
+      예상 응답 토큰은 이 모델의 최근 completion_tokens 평균 (max_tokens를 넘지 않음)
+    - 응답의 usage로 실제 사용량을 정산해 남은 예약분을 반환하거나 초과분을 차감
+      (스트림은 마지막 usage 청크까지 소비하거나 닫을 때)
+    - 동시에 응답을 기다리는 호출 수 상한 (max_in_flight)
+    - 429 발생 시 해당 모델의 모든 대기 호출을 retry-after 동안 함께 멈춤
+    - metrics()로 대기열 길이/대기 시간 노출
+
+TPM/RPM 예산은 0이면 꺼집니다 (기본값). 예산이 꺼져 있어도 동시 호출 상한, 429 보류(penalize), 메트릭은 동작합니다.
+"""
+
+import asyncio
+import re
+import time
+import weakref
+from typing import Any, Dict, List, Optional
+
+from openai import APIStatusError, RateLimitError
+
+from core.config import OPENAI_MAX_IN_FLIGHT, OPENAI_RPM_LIMIT, OPENAI_TPM_LIMIT
+from ai.utils.llm_usage import MeteredStream, begin_llm_span
+from ai.utils.tracing import start_span
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None  # 미설치 시 문자 수 기반 추정
+
+
+# 응답 토큰 관측값이 없을 때의 예상치 (max_tokens 미지정 호출 포함)
+DEFAULT_COMPLETION_TOKENS = 1000
+# 예상 응답 토큰 이동 평균의 최근값 가중치
+COMPLETION_EWMA_ALPHA = 0.2
+# chat 메시지당 role/구분자 오버헤드
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """텍스트 토큰 수 추정 (tiktoken 없으면 ASCII 4자당 1토큰, 한글 등은 1자당 1토큰)"""
+    if not text:
+        return 0
+    if tiktoken is not None:
+        return len(tiktoken.get_encoding("o200k_base").encode(text))
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return ascii_chars // 4 + (len(text) - ascii_chars) + 1
+
+
+def estimate_chat_tokens(messages: List[Dict[str, Any]]) -> int:
+    """chat.completions 요청 프롬프트 토큰 추정"""
+    return sum(
+        estimate_tokens(str(message.get("content") or "")) + MESSAGE_OVERHEAD_TOKENS
+        for message in messages
+    )
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """429 응답의 retry-after 헤더 또는 오류 메시지("try again in Xs")에서 대기 시간 추출"""
+    response = getattr(error, "response", None)
+    if response is not None:
+        retry_after = response.headers.get("retry-after") or response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+    match = re.search(r"try again in ([0-9.]+)s", str(error))
+    if match:
+        return float(match.group(1))
+    return None
+
+
+class TokenBucketRateLimiter:
+    """분당 토큰/요청 예산 + 동시 호출 수 기반 비동기 Rate Limiter (0 이하면 해당 제한 없음)"""
+
+    def __init__(self, tokens_per_minute: int, requests_per_minute: int, max_in_flight: int = 0):
+        self.tokens_per_minute = tokens_per_minute
+        self.requests_per_minute = requests_per_minute
+        self.max_in_flight = max_in_flight
+        self._tokens = float(tokens_per_minute)
+        self._requests = float(requests_per_minute)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._expected_completion = float(DEFAULT_COMPLETION_TOKENS)
+        # asyncio.Lock/Event는 이벤트 루프에 묶이므로 루프별로 생성 (Lambda는 호출마다 새 루프)
+        self._locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
+        self._slot_events: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Event]" = weakref.WeakKeyDictionary()
+
+        # 메트릭
+        self.waiting = 0
+        self.in_flight = 0
+        self.admitted = 0
+        self.rate_limited = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def _lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        lock = self._locks.get(loop)
+        if lock is None:
+            lock = self._locks[loop] = asyncio.Lock()
+        return lock
+
+    def _slot_event(self) -> asyncio.Event:
+        loop = asyncio.get_running_loop()
+        event = self._slot_events.get(loop)
+        if event is None:
+            event = self._slot_events[loop] = asyncio.Event()
+        return event
+
+    def _at_in_flight_cap(self) -> bool:
+        return self.max_in_flight > 0 and self.in_flight >= self.max_in_flight
+
+    def reservation_tokens(self, messages: List[Dict[str, Any]], max_tokens: Optional[int] = None) -> int:
+        """호출 1건의 예약 토큰 (프롬프트 추정 + 예상 응답 토큰, 응답은 max_tokens를 넘지 않음)"""
+        expected = int(self._expected_completion)
+        if max_tokens is not None:
+            expected = min(expected, max_tokens)
+        return estimate_chat_tokens(messages) + expected
+
+    def observe_completion(self, completion_tokens: Optional[int]) -> None:
+        """응답 usage의 completion_tokens로 예상 응답 토큰 갱신"""
+        if completion_tokens:
+            self._expected_completion += COMPLETION_EWMA_ALPHA * (completion_tokens - self._expected_completion)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        if self.tokens_per_minute > 0:
+            self._tokens = min(self.tokens_per_minute, self._tokens + elapsed * self.tokens_per_minute / 60)
+        if self.requests_per_minute > 0:
+            self._requests = min(self.requests_per_minute, self._requests + elapsed * self.requests_per_minute / 60)
+
+    def _seconds_until_available(self, tokens: float) -> float:
+        waits = [max(0.0, self._blocked_until - time.monotonic())]
+        if self.tokens_per_minute > 0 and self._tokens < tokens:
+            waits.append((tokens - self._tokens) * 60 / self.tokens_per_minute)
+        if self.requests_per_minute > 0 and self._requests < 1:
+            waits.append((1 - self._requests) * 60 / self.requests_per_minute)
+        return max(waits)
+
+    async def acquire(self, tokens: int, timings: Optional[Dict[str, float]] = None) -> int:
+        """
+        예산이 확보될 때까지 대기 후 예약
+
+        Args:
+            tokens: 예약할 토큰 수 (reservation_tokens(): 프롬프트 추정 + 예상 응답 토큰)
+            timings: 주어지면 queue_wait_seconds / rate_limit_wait_seconds(429 보류 대기)를 기록
+
+        Returns:
+            실제 예약된 토큰 수 (버킷 용량을 넘으면 용량으로 제한, TPM 제한이 없으면 0)
+        """
+        reserved = min(tokens, self.tokens_per_minute) if self.tokens_per_minute > 0 else 0
+        start = time.monotonic()
+        blocked_wait = 0.0
+        self.waiting += 1
+        try:
+            # 선두 호출만 버킷을 기다리고 나머지는 락 대기열에서 순서대로 대기 (FIFO)
+            async with self._lock():
+                while True:
+                    if self._at_in_flight_cap():
+                        # 진행 중인 호출이 끝나(release) 자리가 날 때까지 대기
+                        event = self._slot_event()
+                        event.clear()
+                        await event.wait()
+                        continue
+                    self._refill()
+                    wait = self._seconds_until_available(reserved)
+                    if wait <= 0:
+                        break
+                    blocked_wait += min(wait, max(0.0, self._blocked_until - time.monotonic()))
+                    await asyncio.sleep(wait)
+                self._tokens -= reserved
+                if self.requests_per_minute > 0:
+                    self._requests -= 1
+                self.in_flight += 1
+        finally:
+            self.waiting -= 1
+
+        waited = time.monotonic() - start
+        self.admitted += 1
+        self.total_wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        if timings is not None:
+            timings["queue_wait_seconds"] = waited
+            timings["rate_limit_wait_seconds"] = blocked_wait
+        return reserved
+
+    def has_capacity(self, tokens: int) -> bool:
+        """대기 없이 즉시 발송 가능한지 (대기열이 비어 있고 동시 호출 자리와 예산이 남아 있는지)"""
+        self._refill()
+        return self.waiting == 0 and not self._at_in_flight_cap() and self._seconds_until_available(
+            min(tokens, self.tokens_per_minute) if self.tokens_per_minute > 0 else 0
+        ) <= 0
+
+    def release(self, reserved: int, used: Optional[int] = None) -> None:
+        """
+        호출 완료 후 정산
+
+        Args:
+            reserved: acquire()가 반환한 예약 토큰
+            used: 응답 usage.total_tokens (None이면 예약분을 모두 사용한 것으로 간주)
+        """
+        self.in_flight = max(0, self.in_flight - 1)
+        for event in list(self._slot_events.values()):
+            event.set()
+        if used is None or self.tokens_per_minute <= 0:
+            return
+        self._refill()
+        # 덜 쓴 만큼 반환, 초과 사용분은 차감 (버킷이 음수가 되면 다음 호출이 그만큼 더 대기)
+        self._tokens = min(self.tokens_per_minute, self._tokens + reserved - used)
+
+    def penalize(self, seconds: float) -> None:
+        """429 수신 시 이 모델의 모든 호출을 seconds 동안 보류"""
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    def metrics(self) -> Dict[str, Any]:
+        self._refill()
+        return {
+            "tokens_per_minute": self.tokens_per_minute,
+            "requests_per_minute": self.requests_per_minute,
+            "max_in_flight": self.max_in_flight,
+            "expected_completion_tokens": int(self._expected_completion),
+            "available_tokens": int(self._tokens),
+            "available_requests": int(self._requests),
+            "queue_depth": self.waiting,
+            "in_flight": self.in_flight,
+            "admitted": self.admitted,
+            "rate_limited": self.rate_limited,
+            "avg_wait_seconds": round(self.total_wait_seconds / self.admitted, 3) if self.admitted else 0.0,
+            "max_wait_seconds": round(self.max_wait_seconds, 3),
+        }
+
+
+_limiters: Dict[str, TokenBucketRateLimiter] = {}
+
+
+def get_rate_limiter(model: str) -> TokenBucketRateLimiter:
+    """모델별 공용 Limiter (OpenAI TPM/RPM은 모델 단위로 부과됨)"""
+    limiter = _limiters.get(model)
+    if limiter is None:
+        limiter = _limiters[model] = TokenBucketRateLimiter(OPENAI_TPM_LIMIT, OPENAI_RPM_LIMIT, OPENAI_MAX_IN_FLIGHT)
+    return limiter
+
+
+def set_rate_limiter(model: str, limiter: TokenBucketRateLimiter) -> None:
+    """Limiter 교체 (테스트/모델별 예산 조정용)"""
+    _limiters[model] = limiter
+
+
+def rate_limiter_metrics() -> Dict[str, Dict[str, Any]]:
+    """모델별 Limiter 메트릭"""
+    return {model: limiter.metrics() for model, limiter in _limiters.items()}
+
+
+async def limited_chat_completion(client, span_label: Optional[str] = None, **kwargs):
+    """
+    Rate Limiter를 거쳐 chat.completions.create 호출
+
+    kwargs는 chat.completions.create 인자 그대로 (model, messages, max_tokens ...)
+    span_label: 호출 구분 이름 (llm_usage_scope 안에서 호출되면 span으로 기록, 재시도 집계 기준)
+    """
+    limiter = get_rate_limiter(kwargs["model"])
+    estimated = limiter.reservation_tokens(kwargs["messages"], kwargs.get("max_tokens"))
+    # 구간 trace는 Rate Limiter 대기부터 응답 완료(스트림은 마지막 청크)까지
+    trace = start_span(span_label or "chat_completion", "llm", model=kwargs["model"], stream=bool(kwargs.get("stream")))
+    timings: Dict[str, float] = {}
+    try:
+        reserved = await limiter.acquire(estimated, timings)
+    except BaseException:
+        if trace is not None:
+            trace.end(status="cancelled")
+        raise
+    span = begin_llm_span(
+        span_label,
+        kwargs["model"],
+        stream=bool(kwargs.get("stream")),
+        queue_wait_seconds=timings["queue_wait_seconds"],
+        rate_limit_wait_seconds=timings["rate_limit_wait_seconds"],
+    )
+
+    def finish(status: str, usage=None) -> None:
+        if span is not None:
+            span.finish(status, usage)
+        if trace is not None:
+            trace.end(
+                status=status,
+                queue_wait_seconds=round(timings["queue_wait_seconds"], 3),
+                prompt_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+                completion_tokens=getattr(usage, "completion_tokens", 0) or 0,
+            )
+
+    try:
+        response = await client.chat.completions.create(**kwargs)
+    except (RateLimitError, APIStatusError) as e:
+        if isinstance(e, RateLimitError) or e.status_code == 429:
+            limiter.rate_limited += 1
+            limiter.penalize(retry_after_seconds(e) or 1.0)
+            limiter.release(reserved, used=0)
+            finish("rate_limited")
+        else:
+            limiter.release(reserved)
+            finish("error")
+        raise
+    except asyncio.CancelledError:
+        # hedge 패배 등으로 취소된 호출도 in-flight에서 제외
+        limiter.release(reserved)
+        finish("cancelled")
+        raise
+    except Exception:
+        limiter.release(reserved)
+        finish("error")
+        raise
+
+    if kwargs.get("stream"):
+        # 스트림은 usage가 마지막 청크에 오므로 소비가 끝나거나 닫힐 때 정산 (그때까지 in-flight)
+        def settle(status: str, usage=None) -> None:
+            limiter.observe_completion(getattr(usage, "completion_tokens", None))
+            limiter.release(reserved, getattr(usage, "total_tokens", None))
+            finish(status, usage)
+
+        return MeteredStream(response, settle)
+    usage = getattr(response, "usage", None)
+    limiter.observe_completion(getattr(usage, "completion_tokens", None))
+    limiter.release(reserved, getattr(usage, "total_tokens", None))
+    finish("ok", usage)
+    return response
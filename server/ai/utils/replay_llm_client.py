@@ -0,0 +1,161 @@
+"""
+Record / Replay OpenAI 클라이언트 (오프라인 벤치마크용)
+
+그래프 노드가 사용하는 `client.chat.completions.create(...)` 표면만 구현한 대체 클라이언트입니다.
+    - record: 실제 AsyncOpenAI로 호출하고 요청 해시별 응답을 fixture(JSON)로 저장
+    - replay: 저장된 fixture를 반환 (네트워크/비용 없음)
+              지연 시간(기록값 배율 또는 고정값)과 429 주입 확률을 설정 가능
+
+요청 키는 model, messages, temperature, max_tokens, response_format의 해시이며
+stream 여부는 키에 포함하지 않습니다 (stream=True 요청은 저장된 응답을 청크로 나눠 재생).
+
+Usage:
+    client = RecordReplayOpenAI("replay", "benchmarks/fixtures/jiwon")
+    service = EvaluationService(openai_client=client)
+"""
+
+import asyncio
+import json
+import os
+import random
+import time
+from typing import Any, Dict, Optional, Union
+
+import httpx
+from openai import AsyncOpenAI, RateLimitError
+from openai.types.chat import ChatCompletion
+
+from ai.utils.completion_stream import CompletionChunkStream
+from ai.utils.llm_cache import hash_payload
+
+
+# 요청 키에 포함하는 인자 (결과에 영향을 주는 것만)
+KEY_FIELDS = ("model", "messages", "temperature", "max_tokens", "response_format")
+
+
+def request_key(kwargs: Dict[str, Any]) -> str:
+    return hash_payload({field: kwargs.get(field) for field in KEY_FIELDS})
+
+
+class _Completions:
+    def __init__(self, owner: "RecordReplayOpenAI"):
+        self._owner = owner
+
+    async def create(self, **kwargs):
+        return await self._owner._create(**kwargs)
+
+
+class _Chat:
+    def __init__(self, owner: "RecordReplayOpenAI"):
+        self.completions = _Completions(owner)
+
+
+class RecordReplayOpenAI:
+    """AsyncOpenAI 대체 클라이언트 (chat.completions.create만 지원)"""
+
+    def __init__(
+        self,
+        mode: str,
+        fixtures_dir: str,
+        real_client: Optional[AsyncOpenAI] = None,
+        latency: Union[str, float] = "recorded",
+        latency_scale: float = 1.0,
+        rate_limit_probability: float = 0.0,
+        retry_after_seconds: float = 1.0,
+        stream_chunk_size: int = 64,
+        seed: Optional[int] = None,
+    ):
+        """
+        Args:
+            mode: "record" 또는 "replay"
+            fixtures_dir: fixture 저장 디렉토리
+            real_client: record 모드에서 사용할 실제 클라이언트 (없으면 환경변수 키로 생성)
+            latency: "recorded"(기록된 지연 × latency_scale) 또는 고정 지연(초)
+            rate_limit_probability: replay 시 429를 반환할 확률
+            retry_after_seconds: 주입한 429의 retry-after 헤더 값
+            seed: 429 주입 난수 시드 (재현용)
+        """
+        if mode not in ("record", "replay"):
+            raise ValueError(f"mode must be 'record' or 'replay': {mode}")
+        self.mode = mode
+        self.fixtures_dir = fixtures_dir
+        self.latency = latency
+        self.latency_scale = latency_scale
+        self.rate_limit_probability = rate_limit_probability
+        self.retry_after_seconds = retry_after_seconds
+        self.stream_chunk_size = stream_chunk_size
+        self._random = random.Random(seed)
+        self._real_client = real_client
+        if mode == "record" and real_client is None:
+            self._real_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        os.makedirs(fixtures_dir, exist_ok=True)
+
+        self.chat = _Chat(self)
+        self.stats = {"calls": 0, "recorded": 0, "replayed": 0, "injected_429": 0}
+
+    def _fixture_path(self, key: str) -> str:
+        return os.path.join(self.fixtures_dir, f"{key}.json")
+
+    async def _create(self, **kwargs):
+        self.stats["calls"] += 1
+        key = request_key(kwargs)
+        stream = kwargs.pop("stream", False)
+        kwargs.pop("stream_options", None)
+
+        if self.mode == "record":
+            completion = await self._record(key, kwargs)
+            return CompletionChunkStream(completion, self.stream_chunk_size, 0.0) if stream else completion
+
+        fixture = self._load(key, kwargs)
+        if self._random.random() < self.rate_limit_probability:
+            self.stats["injected_429"] += 1
+            await asyncio.sleep(0.01)
+            raise self._rate_limit_error()
+
+        delay = self._delay(fixture)
+        completion = ChatCompletion.model_validate(fixture["response"])
+        self.stats["replayed"] += 1
+        if stream:
+            return CompletionChunkStream(completion, self.stream_chunk_size, delay)
+        await asyncio.sleep(delay)
+        return completion
+
+    async def _record(self, key: str, kwargs: Dict[str, Any]) -> ChatCompletion:
+        started = time.perf_counter()
+        completion = await self._real_client.chat.completions.create(**kwargs)
+        elapsed = time.perf_counter() - started
+
+        fixture = {
+            "key": key,
+            "model": kwargs.get("model"),
+            "latency_seconds": round(elapsed, 3),
+            "request": {field: kwargs.get(field) for field in KEY_FIELDS},
+            "response": completion.model_dump(mode="json"),
+        }
+        with open(self._fixture_path(key), "w", encoding="utf-8") as f:
+            json.dump(fixture, f, ensure_ascii=False, indent=2)
+        self.stats["recorded"] += 1
+        return completion
+
+    def _load(self, key: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        path = self._fixture_path(key)
+        if not os.path.exists(path):
+            raise FileNotFoundError(
+                f"Replay fixture 없음 (model={kwargs.get('model')}, key={key[:12]}). "
+                f"같은 입력으로 record 모드를 먼저 실행하세요: {path}"
+            )
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _delay(self, fixture: Dict[str, Any]) -> float:
+        if self.latency == "recorded":
+            return fixture.get("latency_seconds", 0.0) * self.latency_scale
+        return float(self.latency)
+
+    def _rate_limit_error(self) -> RateLimitError:
+        response = httpx.Response(
+            429,
+            headers={"retry-after": str(self.retry_after_seconds)},
+            request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions"),
+        )
+        return RateLimitError("Injected rate limit (replay)", response=response, body=None)
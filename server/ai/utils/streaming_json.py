@@ -0,0 +1,95 @@
+"""
+스트리밍 JSON 필드 추출기
+
+LLM이 JSON을 토큰 단위로 흘려보내는 동안, 전체 응답이 끝나기 전에
+관심 필드(예: overall_score, evidence_details)가 완성되는 즉시 값을 꺼냅니다.
+    - 숫자 필드: `"key": 86` 뒤에 구분자(, } 공백)가 오면 완성
+    - 배열/객체 필드: 여는 괄호부터 짝이 맞는 닫는 괄호까지 (문자열 내부 괄호 무시)
+
+각 필드는 처음 완성된 1회만 반환합니다.
+"""
+
+import json
+import re
+from typing import Any, Dict, Iterable, List, Tuple
+
+
+class StreamingJSONFieldExtractor:
+    """청크를 누적하며 완성된 필드를 (name, value)로 반환"""
+
+    def __init__(self, scalar_fields: Iterable[str] = (), container_fields: Iterable[str] = ()):
+        self.buffer = ""
+        self._scalar_patterns = {
+            name: re.compile(rf'"{re.escape(name)}"\s*:\s*(-?\d+(?:\.\d+)?)(?=[\s,}}\]])')
+            for name in scalar_fields
+        }
+        self._container_keys = {
+            name: re.compile(rf'"{re.escape(name)}"\s*:\s*([\[{{])')
+            for name in container_fields
+        }
+        # 배열/객체 필드 스캔 상태: start, pos, depth, in_string, escape
+        self._scans: Dict[str, Dict[str, Any]] = {}
+        self.completed: Dict[str, Any] = {}
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """청크 추가 후 이번에 새로 완성된 필드 목록 반환"""
+        self.buffer += chunk
+        found: List[Tuple[str, Any]] = []
+
+        for name, pattern in self._scalar_patterns.items():
+            if name in self.completed:
+                continue
+            match = pattern.search(self.buffer)
+            if match:
+                value = json.loads(match.group(1))
+                self.completed[name] = value
+                found.append((name, value))
+
+        for name, pattern in self._container_keys.items():
+            if name in self.completed:
+                continue
+            scan = self._scans.get(name)
+            if scan is None:
+                match = pattern.search(self.buffer)
+                if not match:
+                    continue
+                scan = self._scans[name] = {
+                    "start": match.start(1), "pos": match.start(1),
+                    "depth": 0, "in_string": False, "escape": False,
+                }
+            end = self._advance(scan)
+            if end is not None:
+                try:
+                    value = json.loads(self.buffer[scan["start"]:end])
+                except json.JSONDecodeError:
+                    continue
+                self.completed[name] = value
+                found.append((name, value))
+
+        return found
+
+    def _advance(self, scan: Dict[str, Any]):
+        """이전 위치부터 이어서 괄호 깊이 추적, 닫히면 끝 인덱스 반환"""
+        buffer = self.buffer
+        pos = scan["pos"]
+        while pos < len(buffer):
+            ch = buffer[pos]
+            pos += 1
+            if scan["in_string"]:
+                if scan["escape"]:
+                    scan["escape"] = False
+                elif ch == "\\":
+                    scan["escape"] = True
+                elif ch == '"':
+                    scan["in_string"] = False
+            elif ch == '"':
+                scan["in_string"] = True
+            elif ch in "[{":
+                scan["depth"] += 1
+            elif ch in "]}":
+                scan["depth"] -= 1
+                if scan["depth"] == 0:
+                    scan["pos"] = pos
+                    return pos
+        scan["pos"] = pos
+        return None
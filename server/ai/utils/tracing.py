@@ -0,0 +1,315 @@
+"""
+평가 파이프라인 구간(span) 추적 + Chrome trace / speedscope 내보내기
+
+노드마다 출력하는 datetime.now() 차이만으로는 지원자 1명당 60초+가 어디에 쓰이는지 알 수 없어,
+평가 1회 동안의 구간을 계층(span 안의 span)으로 기록합니다.
+    - 그래프 노드 (traced 래퍼, ai/agents/graph/evaluation.py)
+    - Sub-step (Stage 1 호출 묶음, Resume 색인 사전 판정 / 검증, Confidence V2, Segment Overlap)
+    - LLM 호출 (limited_chat_completion, Rate Limiter 대기 포함, 스트림은 마지막 청크까지)
+    - 체크포인트 / S3 업로드 / DB 저장
+
+현재 Tracer와 열린 span은 contextvars로 전달되므로 (llm_usage_scope와 같은 방식),
+trace_scope 안에서 생성된 asyncio task / asyncio.to_thread에도 그대로 이어집니다.
+scope 밖에서는 span()이 아무것도 기록하지 않습니다.
+
+Chrome trace의 tid는 asyncio task(또는 스레드)마다 하나씩 배정합니다.
+한 task 안의 span은 항상 중첩되므로 chrome://tracing / Perfetto / speedscope에서 그대로 계층으로 보입니다.
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+class Span:
+    """진행 중인 구간 1개 (end() 시 Tracer에 기록)"""
+
+    __slots__ = ("tracer", "id", "parent", "name", "category", "lane", "start_us", "args", "ended")
+
+    def __init__(self, tracer: "Tracer", span_id: int, parent: Optional[int], name: str,
+                 category: str, lane: int, args: Dict[str, Any]):
+        self.tracer = tracer
+        self.id = span_id
+        self.parent = parent
+        self.name = name
+        self.category = category
+        self.lane = lane
+        self.start_us = tracer.now_us()
+        self.args = args
+        self.ended = False
+
+    def set(self, **args) -> None:
+        self.args.update(args)
+
+    def end(self, **args) -> None:
+        if self.ended:
+            return
+        self.ended = True
+        self.args.update(args)
+        self.tracer._finish(self, self.tracer.now_us())
+
+
+class Tracer:
+    """
+    평가 1회 동안의 span 목록
+
+    Attributes:
+        name: trace 이름 (Chrome trace의 process 이름)
+        metadata: interview_id 등 내보내기에 함께 넣을 값
+        spans: 종료된 span (시작 시각 µs, 길이 µs, 부모 id, lane)
+    """
+
+    def __init__(self, name: str = "evaluation", metadata: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.metadata = dict(metadata or {})
+        self.started_at = datetime.now().isoformat()
+        self.spans: List[Dict[str, Any]] = []
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._open: Dict[int, Span] = {}
+        self._lanes: Dict[Any, int] = {}
+        self._lane_names: Dict[int, str] = {}
+
+    def now_us(self) -> float:
+        return (time.perf_counter() - self._origin) * 1_000_000
+
+    def _lane(self) -> int:
+        """현재 asyncio task (없으면 스레드) → lane 번호"""
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        if task is not None:
+            # 끝난 task의 id가 재사용되더라도 그 task의 span은 이미 모두 닫힌 상태
+            key, label = ("task", id(task)), task.get_name()
+        else:
+            thread = threading.current_thread()
+            key, label = ("thread", thread.ident), thread.name
+        lane = self._lanes.get(key)
+        if lane is None:
+            lane = self._lanes[key] = len(self._lanes) + 1
+            self._lane_names[lane] = label
+        return lane
+
+    def start(self, name: str, category: str, parent: Optional[int], args: Dict[str, Any]) -> Span:
+        with self._lock:
+            self._next_id += 1
+            span = Span(self, self._next_id, parent, name, category, self._lane(), args)
+            self._open[span.id] = span
+        return span
+
+    def _finish(self, span: Span, end_us: float) -> None:
+        with self._lock:
+            self._open.pop(span.id, None)
+            self.spans.append(self._record(span, end_us))
+
+    @staticmethod
+    def _record(span: Span, end_us: float, **extra) -> Dict[str, Any]:
+        return {
+            "id": span.id,
+            "parent": span.parent,
+            "name": span.name,
+            "category": span.category,
+            "lane": span.lane,
+            "start_us": round(span.start_us, 1),
+            "duration_us": round(end_us - span.start_us, 1),
+            "args": {**span.args, **extra},
+        }
+
+    def records(self) -> List[Dict[str, Any]]:
+        """종료된 span + 아직 열린 span (지금까지의 길이, unfinished=True), 시작 순"""
+        now = self.now_us()
+        with self._lock:
+            records = self.spans + [self._record(span, now, unfinished=True) for span in self._open.values()]
+        return sorted(records, key=lambda r: (r["start_us"], -r["duration_us"]))
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """
+        Chrome trace JSON (chrome://tracing, Perfetto, speedscope에서 열기)
+
+        span은 complete 이벤트(ph "X", ts / dur µs), lane은 tid로 내보냅니다.
+        """
+        events: List[Dict[str, Any]] = [
+            {"name": "process_name", "ph": "M", "pid": 1, "tid": 0, "args": {"name": self.name}},
+        ]
+        for lane, label in sorted(self._lane_names.items()):
+            events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": lane, "args": {"name": label}})
+            events.append({"name": "thread_sort_index", "ph": "M", "pid": 1, "tid": lane, "args": {"sort_index": lane}})
+        for record in self.records():
+            events.append({
+                "name": record["name"],
+                "cat": record["category"],
+                "ph": "X",
+                "ts": record["start_us"],
+                "dur": record["duration_us"],
+                "pid": 1,
+                "tid": record["lane"],
+                "args": {**record["args"], "span_id": record["id"], "parent_id": record["parent"]},
+            })
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {**self.metadata, "name": self.name, "started_at": self.started_at},
+        }
+
+    def to_speedscope(self) -> Dict[str, Any]:
+        return chrome_trace_to_speedscope(self.to_chrome_trace())
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """(category, name)별 호출 수 / 합계 / 최대 시간(초), 합계 시간 내림차순"""
+        buckets: Dict[str, Dict[str, Any]] = {}
+        for record in self.records():
+            key = f"{record['category']}:{record['name']}"
+            bucket = buckets.setdefault(key, {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+            seconds = record["duration_us"] / 1_000_000
+            bucket["count"] += 1
+            bucket["total_seconds"] += seconds
+            bucket["max_seconds"] = max(bucket["max_seconds"], seconds)
+        ordered = sorted(buckets.items(), key=lambda item: item[1]["total_seconds"], reverse=True)
+        return {
+            key: {**bucket, "total_seconds": round(bucket["total_seconds"], 3),
+                  "max_seconds": round(bucket["max_seconds"], 3)}
+            for key, bucket in ordered
+        }
+
+
+_current_tracer: "contextvars.ContextVar[Optional[Tracer]]" = contextvars.ContextVar("tracer", default=None)
+_current_span: "contextvars.ContextVar[Optional[int]]" = contextvars.ContextVar("trace_span", default=None)
+
+
+def current_tracer() -> Optional[Tracer]:
+    return _current_tracer.get()
+
+
+@contextmanager
+def trace_scope(tracer: Optional[Tracer]):
+    """이 블록(및 여기서 생성된 task)의 span을 tracer에 기록 (None이면 기록하지 않음)"""
+    token = _current_tracer.set(tracer)
+    span_token = _current_span.set(None)
+    try:
+        yield tracer
+    finally:
+        _current_span.reset(span_token)
+        _current_tracer.reset(token)
+
+
+def start_span(name: str, category: str = "function", **args) -> Optional[Span]:
+    """
+    직접 end()로 닫는 span (스트림처럼 블록 밖에서 끝나는 구간용, 현재 scope가 없으면 None)
+
+    span()과 달리 현재 span으로 설정하지 않으므로 자식 span의 부모가 되지 않습니다.
+    """
+    tracer = _current_tracer.get()
+    if tracer is None:
+        return None
+    return tracer.start(name, category, _current_span.get(), args)
+
+
+@contextmanager
+def span(name: str, category: str = "function", **args):
+    """
+    블록 구간 기록 (블록 안에서 시작한 span / task는 이 span의 자식)
+
+    예외로 끝나면 args에 error가 남습니다. 현재 scope가 없으면 None을 yield합니다.
+    """
+    current = start_span(name, category, **args)
+    if current is None:
+        yield None
+        return
+    token = _current_span.set(current.id)
+    try:
+        yield current
+    except BaseException as e:
+        current.set(error=type(e).__name__)
+        raise
+    finally:
+        _current_span.reset(token)
+        current.end()
+
+
+def traced(node_name: str, node_fn: Callable[[Dict], Awaitable[Dict]]) -> Callable[[Dict], Awaitable[Dict]]:
+    """그래프 노드 실행 전체를 span으로 감싸는 래퍼 (category "node")"""
+
+    async def run(state: Dict) -> Dict:
+        with span(node_name, "node"):
+            return await node_fn(state)
+
+    run.__name__ = node_fn.__name__
+    return run
+
+
+def chrome_trace_to_speedscope(trace: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Chrome trace JSON(to_chrome_trace 결과) → speedscope evented 프로필 (lane마다 프로필 1개)
+
+    저장된 trace(S3)를 그대로 변환할 수 있도록 Tracer가 아닌 이벤트 목록을 입력으로 받습니다.
+    """
+    frames: List[Dict[str, str]] = []
+    frame_index: Dict[str, int] = {}
+    lane_names: Dict[int, str] = {}
+    lanes: Dict[int, List[Dict[str, Any]]] = {}
+    for event in trace.get("traceEvents", []):
+        if event.get("ph") == "M" and event.get("name") == "thread_name":
+            lane_names[event["tid"]] = event["args"]["name"]
+        elif event.get("ph") == "X":
+            lanes.setdefault(event["tid"], []).append(event)
+
+    profiles = []
+    for lane in sorted(lanes):
+        events = sorted(lanes[lane], key=lambda e: (e["ts"], -e["dur"]))
+        opened: List[Any] = []
+        output: List[Dict[str, Any]] = []
+
+        def close_until(at: float) -> None:
+            while opened and opened[-1][1] <= at:
+                frame, end = opened.pop()
+                output.append({"type": "C", "frame": frame, "at": end / 1000})
+
+        for event in events:
+            close_until(event["ts"])
+            name = event["name"]
+            if name not in frame_index:
+                frame_index[name] = len(frames)
+                frames.append({"name": name})
+            end = event["ts"] + event["dur"]
+            if opened:
+                # 반올림으로 부모보다 늦게 끝나는 자식은 부모 종료 시각에 맞춤
+                end = min(end, opened[-1][1])
+            output.append({"type": "O", "frame": frame_index[name], "at": event["ts"] / 1000})
+            opened.append((frame_index[name], end))
+        close_until(float("inf"))
+
+        profiles.append({
+            "type": "evented",
+            "name": lane_names.get(lane, f"lane {lane}"),
+            "unit": "milliseconds",
+            "startValue": output[0]["at"],
+            "endValue": output[-1]["at"],
+            "events": output,
+        })
+
+    other = trace.get("otherData", {})
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "name": other.get("name", "evaluation"),
+        "exporter": "ai.utils.tracing",
+        "activeProfileIndex": 0,
+        "shared": {"frames": frames},
+        "profiles": profiles,
+    }
+
+
+def format_trace_summary(summary: Dict[str, Dict[str, Any]], limit: int = 15) -> str:
+    """콘솔 출력용 구간별 한 줄 요약 (합계 시간 상위 limit개)"""
+    lines = []
+    for key, bucket in list(summary.items())[:limit]:
+        lines.append(
+            f"  {key:<40} count={bucket['count']:<4} total={bucket['total_seconds']:.2f}s "
+            f"max={bucket['max_seconds']:.2f}s"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,117 @@
+"""
+Transcript → 프롬프트 렌더러
+
+기존에는 transcript 전체를 json.dumps(indent=2)로 10개 프롬프트에 그대로 넣어
+들여쓰기 공백, 반복되는 키 이름, Agent가 읽지 않는 필드(persona_meta, weights,
+timestamp, weak_flags 등)까지 매번 토큰으로 지불했습니다.
+
+이 모듈은 Agent가 실제로 쓰는 필드만 고정된 순서의 밀집 텍스트로 출력합니다.
+    [segment_id: 3 | main | char_index: 0-350]
+    question_text: ...
+    answer_text: ...
+
+segment_id와 char_index(답변 내 문자 위치)는 원본 값을 그대로 유지하므로
+aggregator_node / PresentationFormatter._get_transcript_text 계약이 바뀌지 않습니다.
+"""
+
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from ai.utils.rate_limiter import estimate_tokens
+
+
+# transcript_first 레이아웃: 모든 역량 프롬프트가 같은 transcript 블록으로 시작
+TRANSCRIPT_BLOCK_START = "[Interview Transcript]"
+TRANSCRIPT_BLOCK_END = "[/Interview Transcript]"
+# rubric 본문의 {transcript} 자리에 들어가는 안내 문구
+TRANSCRIPT_REFERENCE = "(프롬프트 맨 앞 [Interview Transcript] 블록 참고)"
+
+SEGMENT_HEADER = "[segment_id: {segment_id}{turn_type} | char_index: {start}-{end}]"
+FORMAT_GUIDE = "# 면접 Transcript ([segment_id | 질문 유형 | 답변 char_index 범위] → question_text / answer_text)"
+
+
+def _single_line(text: Any) -> str:
+    """줄바꿈/연속 공백을 하나의 공백으로 압축 (STT 텍스트에는 의미 있는 줄바꿈이 없음)"""
+    return " ".join(str(text or "").split())
+
+
+def _render_segment(segment: Dict[str, Any]) -> str:
+    answer = segment.get("answer_text") or ""
+    start = segment.get("char_index_start", 0)
+    end = segment.get("char_index_end", start + len(answer))
+    turn_type = segment.get("turn_type")
+
+    header = SEGMENT_HEADER.format(
+        segment_id=segment.get("segment_id"),
+        turn_type=f" | {turn_type}" if turn_type else "",
+        start=start,
+        end=end,
+    )
+    return "\n".join([
+        header,
+        f"question_text: {_single_line(segment.get('question_text'))}",
+        # answer_text는 char_index 기준 문자열이므로 원문 그대로 유지
+        f"answer_text: {answer}",
+    ])
+
+
+def render_transcript_for_prompt(transcript: Dict[str, Any]) -> str:
+    """
+    Agent 프롬프트용 compact transcript 문자열 생성
+
+    Args:
+        transcript: InterviewTranscript JSON (segments 리스트 포함)
+
+    Returns:
+        segment 단위 밀집 텍스트 (segments가 없으면 공백 없는 JSON)
+    """
+    segments: List[Dict[str, Any]] = transcript.get("segments") if isinstance(transcript, dict) else None
+    if not segments:
+        return json.dumps(transcript, ensure_ascii=False, separators=(",", ":"))
+
+    ordered = sorted(
+        segments,
+        key=lambda s: (s.get("segment_order", s.get("segment_id", 0)) or 0, s.get("segment_id", 0) or 0),
+    )
+    return "\n\n".join([FORMAT_GUIDE] + [_render_segment(segment) for segment in ordered])
+
+
+def transcript_token_report(transcript: Dict[str, Any], rendered: str = None) -> Dict[str, Any]:
+    """
+    기존 JSON(indent=2) 대비 compact 렌더링의 토큰 수 비교
+
+    Returns:
+        {"json_tokens", "compact_tokens", "saved_tokens", "reduction_ratio", "segment_count"}
+    """
+    if rendered is None:
+        rendered = render_transcript_for_prompt(transcript)
+    json_tokens = estimate_tokens(json.dumps(transcript, ensure_ascii=False, indent=2))
+    compact_tokens = estimate_tokens(rendered)
+    segments = transcript.get("segments") if isinstance(transcript, dict) else None
+    return {
+        "json_tokens": json_tokens,
+        "compact_tokens": compact_tokens,
+        "saved_tokens": json_tokens - compact_tokens,
+        "reduction_ratio": round(1 - compact_tokens / json_tokens, 3) if json_tokens else 0.0,
+        "segment_count": len(segments or []),
+    }
+
+
+def wrap_transcript_block(transcript_str: str) -> str:
+    """프롬프트 앞에 붙는 transcript 블록"""
+    return f"{TRANSCRIPT_BLOCK_START}\n{transcript_str}\n{TRANSCRIPT_BLOCK_END}"
+
+
+def split_transcript_block(prompt: str) -> Tuple[Optional[str], str]:
+    """
+    transcript_first 프롬프트를 (transcript 블록, 역량별 rubric)으로 분리
+
+    transcript 블록으로 시작하지 않는 프롬프트(inline 레이아웃)는 (None, prompt) 반환
+    """
+    if not prompt.startswith(TRANSCRIPT_BLOCK_START):
+        return None, prompt
+    end = prompt.find(TRANSCRIPT_BLOCK_END)
+    if end < 0:
+        return None, prompt
+    end += len(TRANSCRIPT_BLOCK_END)
+    return prompt[:end], prompt[end:].lstrip("\n")
@@ -13,6 +13,7 @@ from models.evaluation import Evaluation
 from models.interview import Applicant
 from services.storage.s3_service import S3Service
 from core.config import S3_BUCKET_NAME, AWS_REGION
+from ai.utils.tracing import chrome_trace_to_speedscope
 
 router = APIRouter(prefix="/agent-logs", tags=["Agent Logs"])
 
@@ -195,6 +196,41 @@ async def get_stage_logs(evaluation_id: int, stage_number: int):
         db.close()
 
 
+@router.get("/{evaluation_id}/trace", summary="평가 구간 trace 조회")
+async def get_evaluation_trace(evaluation_id: int, format: str = "chrome"):
+    """
+    평가 1회의 구간(span) trace를 조회합니다.
+
+    - format=chrome: Chrome trace JSON (chrome://tracing, ui.perfetto.dev)
+    - format=speedscope: speedscope JSON (www.speedscope.app)
+    """
+    if format not in ("chrome", "speedscope"):
+        raise HTTPException(status_code=400, detail="format must be chrome or speedscope")
+
+    db = SessionLocal()
+    try:
+        evaluation = db.query(Evaluation).filter(Evaluation.id == evaluation_id).first()
+        if not evaluation:
+            raise HTTPException(status_code=404, detail=f"Evaluation {evaluation_id} not found")
+
+        s3_url = (evaluation.evaluation_metadata or {}).get("s3_paths", {}).get("trace")
+        if not s3_url:
+            raise HTTPException(status_code=404, detail="Trace not found")
+
+        trace = s3_service.download_json(parse_s3_key(s3_url))
+        if not trace:
+            raise HTTPException(status_code=404, detail="Failed to download trace from S3")
+
+        return JSONResponse(content=chrome_trace_to_speedscope(trace) if format == "speedscope" else trace)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch trace: {str(e)}")
+    finally:
+        db.close()
+
+
 @router.get("/{evaluation_id}/competency/{competency_name}", summary="특정 역량 평가 상세 조회")
 async def get_competency_detail(evaluation_id: int, competency_name: str):
     """
@@ -11,9 +11,17 @@ from models.evaluation import Evaluation
 from models.interview import Applicant
 from models.job import Job
 from models.company import Company
+from ai.agents.graph.checkpoint import get_checkpoint_store
+from services.evaluation.evaluation_service import find_stale_evaluations
+from services.evaluation.job_batch import JobBatchProgress
+from services.evaluation.job_queue import get_evaluation_queue
+from services.evaluation.rescoring_service import RescoringService
+from services.storage.s3_service import S3Service
+from core.config import S3_BUCKET_NAME, AWS_REGION
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 import logging
+import uuid
 
 router = APIRouter(prefix="/evaluations")
 logger = logging.getLogger("uvicorn")
@@ -119,6 +127,20 @@ class AggregatedEvaluationPayload(BaseModel):
     post_processing: Optional[PostProcessingMeta] = Field(None, description="후처리 메타 정보")
 
 
+class RescoreRequest(BaseModel):
+    competency_weights: Optional[Dict[str, float]] = Field(None, description="새 역량 가중치 (미지정 시 Job에 저장된 가중치)")
+    applicant_ids: Optional[List[int]] = Field(None, description="재계산할 지원자 (미지정 시 job 전체)")
+    save_weights: bool = Field(False, description="Job.competency_weights도 갱신할지 여부")
+    update_presentation: bool = Field(False, description="S3 Stage 4 결과의 점수 부분도 갱신할지 여부")
+
+
+class JobBatchRequest(BaseModel):
+    interview_ids: List[int] = Field(..., description="평가할 면접 ID 목록")
+    max_parallel: Optional[int] = Field(None, ge=1, description="동시에 진행할 지원자 수 상한 (기본 EVALUATION_BATCH_MAX_PARALLEL)")
+    competency_weights: Optional[Dict[str, float]] = Field(None, description="역량 가중치 (미지정 시 Job에 저장된 가중치)")
+    batch_id: Optional[str] = Field(None, description="중단된 배치를 이어서 실행할 때 이전 batch_id")
+
+
 class ApplicantEvaluationDetail(BaseModel):
     evaluation_id: int
     job_id: Optional[int] = None
@@ -288,3 +310,86 @@ async def get_job_statistics(
         "min_score": round(min(scores), 1) if scores else 0,
         "max_score": round(max(scores), 1) if scores else 0
     }
+
+
+@router.post("/jobs/{job_id}/rescore")
+def rescore_job_evaluations(
+    job_id: int,
+    request: RescoreRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    가중치만 바꿔 최종 점수/신뢰도/score_breakdown 재계산 (LLM 재실행 없음)
+
+    레거시 평가의 S3 다운로드/프레젠테이션 업로드가 동기(boto3) 호출이므로 일반 def로 두어
+    FastAPI 스레드풀에서 실행 (SSE 스트림과 워커 풀이 도는 이벤트 루프를 막지 않음)
+    """
+    logger.info(f"Rescoring evaluations for job ID: {job_id}")
+
+    s3_service = S3Service(bucket_name=S3_BUCKET_NAME, region_name=AWS_REGION)
+    service = RescoringService(s3_service=s3_service)
+    try:
+        return service.rescore_job(
+            db,
+            job_id,
+            competency_weights=request.competency_weights,
+            applicant_ids=request.applicant_ids,
+            save_weights=request.save_weights,
+            update_presentation=request.update_presentation
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/jobs/{job_id}/stale")
+async def get_stale_evaluations(
+    job_id: int,
+    db: Session = Depends(get_db)
+):
+    """프롬프트 모듈 해시가 바뀐 역량이 있는 평가 목록 (선택적 재평가 대상)"""
+    logger.info(f"Getting stale evaluations for job ID: {job_id}")
+    return find_stale_evaluations(db, job_id)
+
+
+@router.post("/jobs/{job_id}/batch")
+async def start_job_batch_evaluation(job_id: int, request: JobBatchRequest):
+    """
+    job 지원자 배치 평가 등록 (작업 큐에 넣고 바로 반환, 워커가 evaluate_job_batch로 실행)
+
+    진행 상황은 GET /jobs/{job_id}/batch/{batch_id}, 큐 작업 상태는 GET /evaluations/stream/jobs/{queue_job_id}.
+    같은 batch_id로 다시 요청하면 기존 작업을 반환합니다 (실패로 끝난 작업은 완료된 지원자를 건너뛰고 다시 실행).
+    """
+    batch_id = request.batch_id or uuid.uuid4().hex
+    logger.info(f"Enqueueing batch evaluation for job ID: {job_id} ({len(request.interview_ids)} interviews, batch {batch_id})")
+
+    job, created = await get_evaluation_queue().aenqueue_job_batch(job_id, batch_id, {
+        "interview_ids": request.interview_ids,
+        "max_parallel": request.max_parallel,
+        "competency_weights": request.competency_weights,
+    })
+    return {
+        "job_id": job_id,
+        "batch_id": batch_id,
+        "queue_job_id": job["id"],
+        "status": job["status"],
+        "created": created,
+        "total": len(request.interview_ids),
+    }
+
+
+@router.get("/jobs/{job_id}/batch/{batch_id}")
+async def get_job_batch_progress(job_id: int, batch_id: str):
+    """배치 평가 진행 상황 (지원자별 started / completed / failed 기록)"""
+    records = await JobBatchProgress(get_checkpoint_store(), job_id, batch_id).load()
+    if not records:
+        raise HTTPException(status_code=404, detail=f"batch {batch_id}의 진행 기록이 없습니다")
+    applicants = list(records.values())
+    return {
+        "job_id": job_id,
+        "batch_id": batch_id,
+        "started": len(applicants),
+        "completed": sum(1 for r in applicants if r["status"] == "completed"),
+        "failed": sum(1 for r in applicants if r["status"] == "failed"),
+        "in_progress": sum(1 for r in applicants if r["status"] == "started"),
+        "applicants": applicants,
+    }
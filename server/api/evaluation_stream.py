@@ -1,24 +1,30 @@
 """
 실시간 평가 스트리밍 API (SSE)
 - 프론트엔드에서 평가 진행 상황을 실시간으로 표시
+- 평가는 요청 안에서 실행하지 않고 작업 큐(services/evaluation/job_queue.py)에 넣어 워커 풀이 실행
+- SSE는 워커가 발행한 그래프 진행 이벤트(노드 시작/완료, 역량별 완료, aggregator Sub-step)를 그대로 전달
+  (이벤트마다 id 포함 → 재연결 시 Last-Event-ID 이후부터 재전송)
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Dict, Optional, AsyncGenerator
 import asyncio
 import json
-from datetime import datetime
+import time
 
-from services.evaluation.evaluation_service import EvaluationService
-from services.storage.s3_service import S3Service
-from core.config import S3_BUCKET_NAME, AWS_REGION
+from services.evaluation.job_queue import TERMINAL_STATUSES, get_evaluation_queue
+from services.evaluation.progress_channel import HEARTBEAT, get_progress_channel
+from core.config import EVALUATION_STREAM_HEARTBEAT_SECONDS, EVALUATION_WORKER_POLL_INTERVAL
 
 router = APIRouter(prefix="/evaluations/stream")
 
-# 진행 상황 저장소
-progress_store: Dict[int, dict] = {}
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no"
+}
 
 
 class StreamEvaluationRequest(BaseModel):
@@ -27,257 +33,151 @@ class StreamEvaluationRequest(BaseModel):
     applicant_id: int
     job_id: int
     competency_weights: Optional[Dict[str, float]] = None
+    # 이전 실행의 체크포인트에서 재개 ("latest" 또는 노드 이름, EvaluationService.evaluate_interview 참고)
+    resume_from: Optional[str] = None
+    # 최근 평가와 비교해 프롬프트가 바뀐 역량/노드만 다시 실행 (EvaluationService.evaluate_interview 참고)
+    reevaluate: bool = False
+    # 같은 (interview_id, run)의 작업은 한 번만 등록
+    # (미지정 시 매번 새 평가, 같은 요청이 진행 중이거나 EVALUATION_QUEUE_DEDUP_SECONDS 안에 끝났으면 그 작업 반환)
+    run: Optional[str] = None
 
 
-def create_sse_message(event: str, data: dict) -> str:
+def create_sse_message(event: str, data: dict, event_id: Optional[int] = None) -> str:
     """SSE 메시지 포맷"""
-    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+    id_line = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{id_line}event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _job_response(job: Dict) -> Dict:
+    return {
+        "job_id": job["id"],
+        "interview_id": job["interview_id"],
+        "run": job["run"],
+        "status": job["status"],
+        "attempts": job["attempts"],
+        "max_attempts": job["max_attempts"],
+        "last_error": job["last_error"],
+        "progress": job["progress"],
+        "result": job["result"],
+        "stream_url": f"/api/v1/evaluations/stream/jobs/{job['id']}/events",
+    }
 
 
-async def stream_evaluation_progress(
-    interview_id: int,
-    applicant_id: int,
-    job_id: int,
-    competency_weights: Dict[str, float]
-) -> AsyncGenerator[str, None]:
-    """평가 진행 상황을 SSE로 스트리밍"""
+async def enqueue_evaluation(request: StreamEvaluationRequest, competency_weights: Optional[Dict[str, float]]):
+    payload = {
+        "applicant_id": request.applicant_id,
+        "job_id": request.job_id,
+        "competency_weights": competency_weights,
+        "resume_from": request.resume_from,
+        "reevaluate": request.reevaluate,
+    }
+    return await get_evaluation_queue().aenqueue(request.interview_id, payload, run=request.run)
 
-    evaluation_id = interview_id  # 간단히 interview_id를 사용
 
-    # 초기화
-    progress_store[evaluation_id] = {
-        "status": "initializing",
-        "current_stage": 0,
-        "stages": []
-    }
+async def stream_job_events(job_id: str, last_event_id: int = 0) -> AsyncGenerator[str, None]:
+    """
+    작업의 진행 이벤트를 SSE로 스트리밍 (작업이 succeeded / failed가 될 때까지, 재시도 사이에도 유지)
 
-    try:
-        # === Stage 0: 초기화 ===
-        yield create_sse_message("progress", {
-            "stage": 0,
-            "stage_name": "초기화",
-            "status": "in_progress",
-            "message": "평가 시스템 초기화 중...",
-            "progress": 0
-        })
-
-        # S3에서 데이터 로드
-        s3_service = S3Service(bucket_name=S3_BUCKET_NAME, region_name=AWS_REGION)
-
-        # transcript 로드
-        transcript_key = f"interviews/{interview_id}/transcript.json"
-        transcript = s3_service.download_json(transcript_key)
-
-        if not transcript:
-            yield create_sse_message("error", {
-                "message": f"Transcript를 찾을 수 없습니다: {transcript_key}"
-            })
+    같은 프로세스의 워커가 실행 중이면 작업별 채널의 이벤트를 전부 전달하고,
+    다른 프로세스에서 실행 중이면 큐에 기록된 마지막 진행 이벤트를 polling해 전달합니다.
+    """
+    queue = get_evaluation_queue()
+    cursor = last_event_id
+    last_sent = time.monotonic()
+
+    while True:
+        channel = get_progress_channel(job_id)
+        if channel is not None:
+            async for item in channel.events(cursor, heartbeat=EVALUATION_STREAM_HEARTBEAT_SECONDS):
+                if item is HEARTBEAT:
+                    yield ": heartbeat\n\n"
+                    continue
+                cursor = item.get("id", cursor)
+                yield create_sse_message(item["event"], item["data"], item.get("id"))
+            last_sent = time.monotonic()
+
+        job = await queue.aget(job_id)
+        if job is None:
+            return
+        progress = job["progress"] or {}
+        # 로컬 채널이 없거나 닫힌 상태에서 더 새 이벤트가 있으면 다른 프로세스의 워커가 기록한 것
+        if progress.get("id", 0) > cursor and (channel is None or channel.closed):
+            cursor = progress["id"]
+            yield create_sse_message(progress["event"], progress["data"], cursor)
+            last_sent = time.monotonic()
+        if job["status"] in TERMINAL_STATUSES:
+            if job["status"] == "failed" and progress.get("event") != "error":
+                # 평가 시작 전 실패 (입력 로드 오류 등)
+                yield create_sse_message("error", {
+                    "status": "failed",
+                    "message": f"평가 중 오류 발생: {job['last_error']}"
+                })
             return
 
-        # resume 로드
-        resume_key = f"applicants/{applicant_id}/resume.json"
-        resume_data = s3_service.download_json(resume_key)
-
-        yield create_sse_message("progress", {
-            "stage": 0,
-            "stage_name": "초기화",
-            "status": "completed",
-            "message": f"데이터 로드 완료 (Segments: {len(transcript.get('segments', []))}개)",
-            "progress": 5
-        })
-
-        await asyncio.sleep(0.3)
-
-        # === Stage 1: 10개 역량 평가 시작 ===
-        yield create_sse_message("progress", {
-            "stage": 1,
-            "stage_name": "Stage 1: 역량별 평가",
-            "status": "in_progress",
-            "message": "10개 역량 병렬 평가 시작...",
-            "progress": 10
-        })
-
-        competencies = [
-            "achievement_motivation", "growth_potential", "interpersonal_skill",
-            "organizational_fit", "problem_solving",
-            "customer_journey_marketing", "md_data_analysis", "seasonal_strategy_kpi",
-            "stakeholder_collaboration", "value_chain_optimization"
-        ]
-
-        # 역량별 평가 시뮬레이션 (실제로는 병렬 실행)
-        for i, comp in enumerate(competencies):
-            yield create_sse_message("competency_start", {
-                "stage": 1,
-                "competency": comp,
-                "index": i + 1,
-                "total": 10,
-                "message": f"[평가 시작] {comp}"
-            })
-
-            await asyncio.sleep(0.1)  # 실제 평가 시간 대신 짧은 딜레이
-
-        yield create_sse_message("progress", {
-            "stage": 1,
-            "stage_name": "Stage 1: 역량별 평가",
-            "status": "in_progress",
-            "message": "AI 평가 진행 중... (약 30초 소요)",
-            "progress": 20
-        })
-
-        # 실제 평가 실행
-        service = EvaluationService()
-
-        # 평가 시작 (내부에서 Stage 1-3 실행)
-        result = await service.evaluate_interview(
-            interview_id=interview_id,
-            applicant_id=applicant_id,
-            job_id=job_id,
-            transcript=transcript,
-            competency_weights=competency_weights,
-            resume_data=resume_data
-        )
-
-        # 역량별 결과 전송
-        aggregated = result.get("aggregated_competencies", {})
-        for i, comp in enumerate(competencies):
-            comp_data = aggregated.get(comp, {})
-            score = comp_data.get("overall_score", 0)
-
-            yield create_sse_message("competency_complete", {
-                "stage": 1,
-                "competency": comp,
-                "score": score,
-                "index": i + 1,
-                "total": 10,
-                "message": f"[평가 완료] {comp}: {score}점"
-            })
-
-        yield create_sse_message("progress", {
-            "stage": 1,
-            "stage_name": "Stage 1: 역량별 평가",
-            "status": "completed",
-            "message": "10개 역량 평가 완료",
-            "progress": 40
-        })
-
-        # === Stage 2: Aggregator ===
-        yield create_sse_message("progress", {
-            "stage": 2,
-            "stage_name": "Stage 2: 통합 분석",
-            "status": "in_progress",
-            "message": "Resume 검증 및 Confidence 계산 중...",
-            "progress": 50
-        })
-
-        await asyncio.sleep(0.3)
-
-        # Sub-steps
-        segment_evals = result.get("segment_evaluations_with_resume", [])
-        verified_count = sum(1 for s in segment_evals if s.get("resume_verified"))
-
-        yield create_sse_message("substep", {
-            "stage": 2,
-            "substep": "resume_verification",
-            "message": f"Resume 검증 완료: {verified_count}개 검증됨"
-        })
-
-        yield create_sse_message("substep", {
-            "stage": 2,
-            "substep": "confidence_v2",
-            "message": f"Confidence V2 계산 완료: 평균 {result.get('avg_confidence', 0):.2f}"
-        })
-
-        yield create_sse_message("progress", {
-            "stage": 2,
-            "stage_name": "Stage 2: 통합 분석",
-            "status": "completed",
-            "message": "통합 분석 완료",
-            "progress": 70
-        })
-
-        # === Stage 3: Final Integration ===
-        yield create_sse_message("progress", {
-            "stage": 3,
-            "stage_name": "Stage 3: 최종 통합",
-            "status": "in_progress",
-            "message": "최종 점수 계산 및 심사평 생성 중...",
-            "progress": 80
-        })
-
-        await asyncio.sleep(0.3)
-
-        yield create_sse_message("progress", {
-            "stage": 3,
-            "stage_name": "Stage 3: 최종 통합",
-            "status": "completed",
-            "message": "최종 통합 완료",
-            "progress": 90
-        })
-
-        # === Stage 4: Presentation ===
-        yield create_sse_message("progress", {
-            "stage": 4,
-            "stage_name": "Stage 4: 결과 포맷팅",
-            "status": "in_progress",
-            "message": "프론트엔드용 데이터 변환 중...",
-            "progress": 95
-        })
-
-        await asyncio.sleep(0.2)
-
-        yield create_sse_message("progress", {
-            "stage": 4,
-            "stage_name": "Stage 4: 결과 포맷팅",
-            "status": "completed",
-            "message": "포맷팅 완료",
-            "progress": 100
-        })
-
-        # === 최종 결과 ===
-        final_score = result.get("final_score", 0)
-        competency_details = result.get("competency_details", {})
-
-        # 역량별 점수 추출
-        competency_scores = {}
-        for comp in competencies:
-            data = competency_details.get(comp, aggregated.get(comp, {}))
-            competency_scores[comp] = {
-                "score": data.get("overall_score", 0),
-                "confidence": data.get("confidence_v2", data.get("interview_confidence", 0))
-            }
-
-        yield create_sse_message("complete", {
-            "status": "completed",
-            "final_score": final_score,
-            "avg_confidence": result.get("avg_confidence", 0),
-            "reliability_level": result.get("final_reliability", ""),
-            "competency_scores": competency_scores,
-            "s3_urls": {
-                "transcript": result.get("transcript_s3_url"),
-                "stage1": result.get("stage1_evidence_s3_url"),
-                "stage2": result.get("stage2_aggregator_s3_url"),
-                "stage3": result.get("stage3_final_integration_s3_url"),
-                "presentation": result.get("stage4_presentation_s3_url")
-            },
-            "message": f"평가 완료! 최종 점수: {final_score:.1f}점"
-        })
-
-    except Exception as e:
-        yield create_sse_message("error", {
-            "status": "failed",
-            "message": f"평가 중 오류 발생: {str(e)}"
-        })
-
-    finally:
-        # 정리
-        if evaluation_id in progress_store:
-            del progress_store[evaluation_id]
+        # 재시도 대기 중이거나 다른 프로세스에서 실행 중
+        if time.monotonic() - last_sent >= EVALUATION_STREAM_HEARTBEAT_SECONDS:
+            yield ": heartbeat\n\n"
+            last_sent = time.monotonic()
+        await asyncio.sleep(EVALUATION_WORKER_POLL_INTERVAL)
+
+
+@router.post("/jobs")
+async def enqueue_evaluation_job(request: StreamEvaluationRequest):
+    """
+    평가 작업 등록 (바로 반환)
+
+    competency_weights가 없으면 워커가 Job.competency_weights를 사용합니다.
+    같은 run으로 다시 요청하면 기존 작업을 반환합니다 (실패로 끝난 작업만 다시 실행).
+    run을 생략하면 매번 새로 평가하고, 같은 요청의 작업이 진행 중이거나
+    EVALUATION_QUEUE_DEDUP_SECONDS 안에 성공했을 때만 그 작업을 반환합니다.
+
+    Returns:
+        job_id, status, created(새로 등록 여부), stream_url
+    """
+    job, created = await enqueue_evaluation(request, request.competency_weights)
+    return {**_job_response(job), "created": created}
+
+
+@router.get("/jobs/{job_id}")
+async def get_evaluation_job(job_id: str):
+    """평가 작업 상태 / 마지막 진행 이벤트 / 결과"""
+    job = await get_evaluation_queue().aget(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"평가 작업을 찾을 수 없습니다: {job_id}")
+    return _job_response(job)
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_evaluation_job(
+    job_id: str,
+    last_event_id: Optional[int] = None,
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID")
+):
+    """
+    평가 작업 진행 이벤트 SSE
+
+    재연결 시 브라우저가 보내는 Last-Event-ID 헤더(또는 last_event_id 쿼리) 이후 이벤트부터 전송합니다.
+    """
+    if await get_evaluation_queue().aget(job_id) is None:
+        raise HTTPException(status_code=404, detail=f"평가 작업을 찾을 수 없습니다: {job_id}")
+    if last_event_id is None:
+        last_event_id = int(last_event_id_header) if (last_event_id_header or "").isdigit() else 0
+
+    return StreamingResponse(
+        stream_job_events(job_id, last_event_id),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
 
 
 @router.post("/start")
 async def start_streaming_evaluation(request: StreamEvaluationRequest):
     """
-    실시간 평가 스트리밍 시작
+    실시간 평가 스트리밍 시작 (작업 등록 + 해당 작업의 SSE)
+
+    연결이 끊겨도 평가는 워커에서 계속 진행되며, X-Evaluation-Job-Id의
+    /jobs/{job_id}/events로 다시 연결할 수 있습니다.
+    run 처리는 POST /jobs와 같습니다 (생략하면 같은 요청도 다시 평가).
 
     Returns:
         SSE 스트림으로 진행 상황 전송
@@ -297,17 +197,10 @@ async def start_streaming_evaluation(request: StreamEvaluationRequest):
         "value_chain_optimization": 0.10,  # 높임 (0.05 -> 0.10)
     }
 
+    job, _ = await enqueue_evaluation(request, weights)
+
     return StreamingResponse(
-        stream_evaluation_progress(
-            interview_id=request.interview_id,
-            applicant_id=request.applicant_id,
-            job_id=request.job_id,
-            competency_weights=weights
-        ),
+        stream_job_events(job["id"]),
         media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no"
-        }
+        headers={**SSE_HEADERS, "X-Evaluation-Job-Id": job["id"]}
     )
@@ -1,26 +1,78 @@
 """
 AWS Lambda entrypoint for running the evaluation pipeline.
 
-Expected event payload (SQS, EventBridge, or direct invoke):
+Expected event payload (EventBridge or direct invoke):
 {
-  "company_id": 1,
   "job_id": 1,
   "applicant_id": 1,
-  "interview_id": 123
+  "interview_id": 123,
+  "competency_weights": {...},   # optional, defaults to Job.competency_weights
+  "resume_from": "latest",       # optional, see EvaluationService.evaluate_interview
+  "reevaluate": false,           # optional
+  "run": "..."                   # optional, checkpoint run key (needed to resume a direct invoke)
 }
 
+SQS batch (event source mapping with ReportBatchItemFailures enabled):
+{"Records": [{"messageId": "...", "body": "<payload above as JSON>", "attributes": {...}}, ...]}
+Records are evaluated concurrently (up to EVALUATION_BATCH_MAX_PARALLEL) and failed
+records are returned in "batchItemFailures" so only they are redelivered. Redelivered
+records (ApproximateReceiveCount > 1) resume from the node checkpoints of the failed
+attempt (checkpoints are keyed by messageId, so concurrent evaluations of the same
+interview do not share them); set EVALUATION_CHECKPOINT_BACKEND=postgres so checkpoints outlive the container.
+
+Warm start:
+- EvaluationService (compiled LangGraph, AsyncOpenAI HTTP pool, boto3 S3 client) is built
+  once per container and reused across invocations. Inside the Lambda runtime it is built
+  during the init phase (module import).
+- A single event loop is kept per container so the AsyncOpenAI connection pool stays usable
+  (asyncio.run per invocation would bind the pool to a closed loop).
+- Competency prompt modules are imported on first use (PROMPT_GENERATORS).
+
 Environment:
 - USE_AWS_S3=true
 - S3_BUCKET_NAME, AWS_REGION set
 - AWS credentials via role
-
-This reuses the existing EvaluationPipelineService and S3 selector without
-modifying MAS logic or prompts.
 """
-from typing import Any, Dict
+import asyncio
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from core.config import EVALUATION_BATCH_MAX_PARALLEL
+from services.evaluation.evaluation_service import EvaluationService, build_completion_event
+
+
+REQUIRED_KEYS = ("job_id", "applicant_id", "interview_id")
+
+_service: Optional[EvaluationService] = None
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_invocations = 0
 
-from services.s3_service_factory import get_s3_service
-from services.evaluation_pipeline_service import EvaluationPipelineService
+
+def get_service() -> EvaluationService:
+    """컨테이너당 1회 생성 (그래프 컴파일 + OpenAI / S3 클라이언트)"""
+    global _service
+    if _service is None:
+        start = time.perf_counter()
+        _service = EvaluationService()
+        print(f"[Lambda] EvaluationService 초기화 {time.perf_counter() - start:.2f}s")
+    return _service
+
+
+def set_service(service: Optional[EvaluationService]) -> None:
+    """서비스 교체 (테스트/벤치마크용 stub 주입, None이면 다음 호출에서 다시 생성)"""
+    global _service
+    _service = service
+
+
+def _run(coro):
+    """컨테이너 공용 이벤트 루프에서 실행"""
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+    return _loop.run_until_complete(coro)
 
 
 def _extract(key: str, event: Dict[str, Any]) -> Any:
@@ -33,27 +85,80 @@ def _extract(key: str, event: Dict[str, Any]) -> Any:
     return detail.get(key)
 
 
-def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
-    company_id = _extract("company_id", event)
-    job_id = _extract("job_id", event)
-    applicant_id = _extract("applicant_id", event)
-    interview_id = _extract("interview_id", event)
-
-    if None in (company_id, job_id, applicant_id, interview_id):
-        return {
-            "statusCode": 400,
-            "body": {
-                "message": "Missing required ids (company_id, job_id, applicant_id, interview_id)"
-            }
-        }
-
-    s3 = get_s3_service()
-    pipeline = EvaluationPipelineService(s3_service=s3)
-    result = pipeline.run_pipeline(
-        company_id=int(company_id),
-        job_id=int(job_id),
-        applicant_id=int(applicant_id),
-        interview_id=int(interview_id),
+def _payload(event: Dict[str, Any]) -> Dict[str, Any]:
+    payload = {key: _extract(key, event) for key in REQUIRED_KEYS + ("competency_weights", "resume_from", "reevaluate", "run")}
+    missing = [key for key in REQUIRED_KEYS if payload[key] is None]
+    if missing:
+        raise ValueError(f"Missing required ids ({', '.join(missing)})")
+    for key in REQUIRED_KEYS:
+        payload[key] = int(payload[key])
+    return payload
+
+
+async def evaluate_payload(
+    payload: Dict[str, Any], resume_from: Optional[str] = None, run: Optional[str] = None
+) -> Dict[str, Any]:
+    service = get_service()
+    weights = payload.get("competency_weights")
+    if not weights:
+        weights = await asyncio.to_thread(service._load_job_weights, payload["job_id"])
+    inputs = await asyncio.to_thread(service.load_interview_input, payload["interview_id"], payload["applicant_id"])
+    result = await service.evaluate_interview(
+        interview_id=payload["interview_id"],
+        applicant_id=payload["applicant_id"],
+        job_id=payload["job_id"],
+        transcript=inputs["transcript"],
+        competency_weights=weights,
+        resume_data=inputs["resume_data"],
+        resume_from=resume_from or payload.get("resume_from"),
+        reevaluate=bool(payload.get("reevaluate")),
+        run=run or payload.get("run"),
     )
+    return build_completion_event(result)
+
+
+async def process_sqs_records(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """SQS 배치 → 실패한 메시지만 batchItemFailures로 보고"""
+    semaphore = asyncio.Semaphore(EVALUATION_BATCH_MAX_PARALLEL)
+
+    async def process(record: Dict[str, Any]) -> Optional[str]:
+        message_id = record.get("messageId")
+        async with semaphore:
+            try:
+                payload = _payload(json.loads(record.get("body") or "{}"))
+                receive_count = int((record.get("attributes") or {}).get("ApproximateReceiveCount", 1))
+                # 재전달된 메시지는 이전 시도의 노드 체크포인트에서 재개
+                completion = await evaluate_payload(payload, "latest" if receive_count > 1 else None, run=message_id)
+                print(f"[Lambda] {message_id}: interview {payload['interview_id']} 완료 ({completion['final_score']}점)")
+                return None
+            except Exception as e:
+                print(f"[Lambda] {message_id}: 평가 실패: {e}")
+                return message_id
+
+    failed = await asyncio.gather(*(process(record) for record in records))
+    return {"batchItemFailures": [{"itemIdentifier": message_id} for message_id in failed if message_id]}
+
+
+def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    global _invocations
+    _invocations += 1
+    print(f"[Lambda] 호출 {_invocations}회째 ({'cold' if _invocations == 1 else 'warm'})")
+
+    if isinstance(event, dict) and event.get("Records"):
+        return _run(process_sqs_records(event["Records"]))
+
+    try:
+        payload = _payload(event)
+    except (TypeError, ValueError) as e:
+        return {"statusCode": 400, "body": {"message": str(e)}}
+
+    try:
+        return {"statusCode": 200, "body": _run(evaluate_payload(payload))}
+    except ValueError as e:
+        # 입력 오류 (transcript / 가중치 없음)
+        return {"statusCode": 404, "body": {"message": str(e)}}
+
 
-    return {"statusCode": 200, "body": result}
+# Lambda 런타임에서는 init 단계(모듈 import)에 미리 생성 → 첫 호출 지연에서 제외
+if os.getenv("AWS_LAMBDA_FUNCTION_NAME"):
+    get_service()
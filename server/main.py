@@ -13,6 +13,8 @@ from pathlib import Path
 from typing import Dict, Any, Optional
 import time
 from fastapi import Request
+from core.config import EVALUATION_WORKERS_ENABLED
+from services.evaluation.worker_pool import get_worker_pool
 
 # 로거 설정
 logger = logging.getLogger("uvicorn") # Re-insert logger definition
@@ -88,6 +90,17 @@ async def startup_event():
     else:
         logger.info("✅ 모든 초기화 완료. 서버 준비 완료!")
 
+    # 평가 작업 큐 워커 (api/evaluation_stream.py가 등록한 작업 실행)
+    if EVALUATION_WORKERS_ENABLED:
+        get_worker_pool().start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """서버 종료 시 평가 워커 정리 (실행 중이던 작업은 visibility timeout 후 다시 실행됨)"""
+    if EVALUATION_WORKERS_ENABLED:
+        await get_worker_pool().stop()
+
 # CORS 설정 - 프론트엔드와 통신 허용
 app.add_middleware(
     CORSMiddleware,
@@ -133,4 +146,5 @@ async def health_check():
     """
     헬스 체크 엔드포인트
     """
-    return {"status": "healthy", "service": "AWS_FLEX"}
\ No newline at end of file
+    from ai.utils.llm_gateway import gateway_metrics
+    return {"status": "healthy", "service": "AWS_FLEX", "llm_gateway": gateway_metrics()}
\ No newline at end of file
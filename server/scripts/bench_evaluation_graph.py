@@ -0,0 +1,125 @@
+"""
+평가 그래프 end-to-end 벤치마크 (record / replay)
+
+create_evaluation_graph() 전체(Stage 1 → 2 → 3 → 4)를 실행하고 단계별 시간을 측정합니다.
+S3 업로드와 DB 저장은 건너뛰고 graph.ainvoke만 실행합니다.
+
+    - record: 실제 OpenAI API를 호출하고 응답을 fixture로 저장 (OPENAI_API_KEY 필요)
+    - replay: 저장된 fixture로 실행 (네트워크 없음, 노트북에서 반복 실행 가능)
+              --latency로 지연 시간, --rate-limit-prob로 429 주입 확률 설정
+
+LLM 응답 캐시는 끄고(NullLLMCache) 실행하므로 매 run마다 모든 호출이 클라이언트를 거칩니다.
+
+Usage:
+    python server/scripts/bench_evaluation_graph.py --mode record \
+        [--transcript test_data/transcript_박서진_102.json] [--fixtures benchmarks/fixtures/박서진_102]
+    python server/scripts/bench_evaluation_graph.py --mode replay \
+        [--latency recorded|0.5] [--latency-scale 1.0] [--rate-limit-prob 0.05] [--runs 3]
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from ai.agents.competency_agent import COMPETENCY_CONFIGS
+from ai.agents.graph.context import release_context
+from ai.utils.llm_cache import NullLLMCache, set_llm_cache
+from ai.utils.llm_usage import format_llm_usage, summarize_llm_usage
+from ai.utils.replay_llm_client import RecordReplayOpenAI
+from services.evaluation.evaluation_service import EvaluationService
+
+
+def stage_durations(execution_logs: list) -> dict:
+    """execution_logs의 노드별 duration_seconds (중복 로그는 노드당 1회만)"""
+    durations = {}
+    for log in execution_logs:
+        node = log.get("node")
+        if node and node not in durations and log.get("duration_seconds") is not None:
+            durations[node] = log["duration_seconds"]
+    return durations
+
+
+async def run_once(service: EvaluationService, transcript: dict, weights: dict) -> dict:
+    state = service.build_initial_state(
+        interview_id=0,
+        applicant_id=0,
+        job_id=0,
+        transcript=transcript,
+        competency_weights=weights,
+    )
+    start = time.perf_counter()
+    try:
+        result = await service.graph.ainvoke(state)
+    finally:
+        release_context(state)
+    wall = time.perf_counter() - start
+
+    return {
+        "wall_seconds": round(wall, 2),
+        "stages": stage_durations(result.get("execution_logs", [])),
+        "errors": len(result.get("errors", [])),
+        "final_score": (result.get("final_result") or {}).get("final_score"),
+        "llm_usage": summarize_llm_usage(result.get("llm_spans", [])),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mode", choices=["record", "replay"], default="replay")
+    parser.add_argument("--transcript", default="test_data/transcript_박서진_102.json")
+    parser.add_argument("--fixtures", default=None, help="fixture 디렉토리 (기본: benchmarks/fixtures/<transcript 이름>)")
+    parser.add_argument("--latency", default="recorded", help="'recorded' 또는 고정 지연(초)")
+    parser.add_argument("--latency-scale", type=float, default=1.0)
+    parser.add_argument("--rate-limit-prob", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--runs", type=int, default=1)
+    args = parser.parse_args()
+
+    with open(args.transcript, encoding="utf-8") as f:
+        transcript = json.load(f)
+
+    fixtures = args.fixtures or os.path.join(
+        "benchmarks", "fixtures", os.path.splitext(os.path.basename(args.transcript))[0]
+    )
+    latency = args.latency if args.latency == "recorded" else float(args.latency)
+    client = RecordReplayOpenAI(
+        args.mode,
+        fixtures,
+        latency=latency,
+        latency_scale=args.latency_scale,
+        rate_limit_probability=args.rate_limit_prob if args.mode == "replay" else 0.0,
+        seed=args.seed,
+    )
+
+    set_llm_cache(NullLLMCache())
+    service = EvaluationService(openai_client=client)
+    weights = {name: round(1 / len(COMPETENCY_CONFIGS), 4) for name, _, _ in COMPETENCY_CONFIGS}
+
+    runs = args.runs if args.mode == "replay" else 1
+    results = []
+    for run in range(runs):
+        print(f"\n>>> run {run + 1}/{runs} mode={args.mode} fixtures={fixtures}")
+        results.append(await run_once(service, transcript, weights))
+
+    print(f"\n{'run':<5}{'wall(s)':>9}{'errors':>8}{'score':>8}")
+    for index, r in enumerate(results):
+        print(f"{index + 1:<5}{r['wall_seconds']:>9}{r['errors']:>8}{str(r['final_score']):>8}")
+
+    print("\n단계별 시간 (중앙값, 초)")
+    for node in results[0]["stages"]:
+        values = [r["stages"][node] for r in results if node in r["stages"]]
+        print(f"  {node:<28}{statistics.median(values):>8.2f}")
+
+    print("\nLLM 사용량 (마지막 run, 노드별)")
+    print(format_llm_usage(results[-1]["llm_usage"]))
+
+    print(f"\n클라이언트 통계: {client.stats}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
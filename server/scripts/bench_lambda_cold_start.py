@@ -0,0 +1,138 @@
+"""
+Lambda 콜드 스타트 / warm 호출 벤치마크
+
+새 Python 프로세스(= 새 Lambda 컨테이너)마다 측정합니다.
+    - import: lambda_evaluation_handler import 시간 (LangGraph / openai / boto3 / SQLAlchemy 등)
+    - init: EvaluationService 생성 (그래프 컴파일 + AsyncOpenAI / boto3 클라이언트)
+    - 호출 1~N: lambda_handler 전체 시간 (Stage 1~4 그래프 + S3 업로드 + DB 저장)
+
+비교 모드:
+    - legacy: 호출마다 EvaluationService 생성 + asyncio.run (기존 핸들러 방식)
+    - warm: 컨테이너당 1회 생성한 서비스 / 이벤트 루프 재사용 (lambda_evaluation_handler)
+
+LLM은 stub 응답(지연 10ms), S3는 메모리 stub, DB 저장은 건너뜁니다 (네트워크 없음).
+클라이언트 생성 비용은 포함되도록 실제 AsyncOpenAI / boto3 클라이언트를 만든 뒤 호출만 stub으로 바꿉니다.
+
+Usage:
+    python server/scripts/bench_lambda_cold_start.py [--transcript test_data/transcript_jiwon_101.json] \
+        [--containers 3] [--invocations 3]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+import tempfile
+
+SERVER_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, SERVER_DIR)
+
+
+def run_container(mode: str, transcript_path: str, invocations: int) -> dict:
+    """(자식 프로세스) 컨테이너 1개 수명 동안의 init / 호출 시간"""
+    import asyncio
+    from types import SimpleNamespace
+
+    start = time.perf_counter()
+    import lambda_evaluation_handler as handler
+    import_seconds = time.perf_counter() - start
+
+    from ai.agents.competency_agent import COMPETENCY_CONFIGS
+    from ai.utils.llm_cache import NullLLMCache, set_llm_cache
+    from ai.utils.rate_limiter import TokenBucketRateLimiter, set_rate_limiter
+    from services.evaluation.evaluation_service import EvaluationService
+    from scripts.bench_state_memory import StubCompletions
+
+    with open(transcript_path, encoding="utf-8") as f:
+        transcript = json.load(f)
+
+    set_llm_cache(NullLLMCache())
+    for model in ("gpt-4o", "gpt-4o-mini"):
+        set_rate_limiter(model, TokenBucketRateLimiter(10**9, 10**6))
+
+    class StubS3:
+        bucket_name = "bench"
+
+        def download_json(self, key):
+            return transcript if key.endswith("transcript.json") else None
+
+        def upload_json(self, key, data):
+            json.dumps(data, ensure_ascii=False, default=str)
+            return f"s3://bench/{key}"
+
+    def build_service() -> EvaluationService:
+        service = EvaluationService(api_key="bench")
+        service.openai_client = SimpleNamespace(chat=SimpleNamespace(completions=StubCompletions()))
+        service.s3_service = StubS3()
+        return service
+
+    EvaluationService._save_evaluation_to_db = lambda self, db, *args: SimpleNamespace(id=1)
+    event = {
+        "job_id": 1,
+        "applicant_id": 1,
+        "interview_id": 1,
+        "competency_weights": {name: round(1 / len(COMPETENCY_CONFIGS), 4) for name, _, _ in COMPETENCY_CONFIGS},
+    }
+
+    init_seconds = 0.0
+    if mode == "warm":
+        start = time.perf_counter()
+        handler.set_service(build_service())
+        init_seconds = time.perf_counter() - start
+
+    calls = []
+    for _ in range(invocations):
+        start = time.perf_counter()
+        if mode == "warm":
+            response = handler.lambda_handler(event, None)
+        else:
+            payload = handler._payload(event)
+            handler.set_service(build_service())
+            response = {"statusCode": 200, "body": asyncio.run(handler.evaluate_payload(payload))}
+        calls.append(time.perf_counter() - start)
+        assert response["statusCode"] == 200, response
+
+    return {"import": import_seconds, "init": init_seconds, "calls": calls}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--transcript", default="test_data/transcript_jiwon_101.json")
+    parser.add_argument("--containers", type=int, default=3)
+    parser.add_argument("--invocations", type=int, default=3)
+    parser.add_argument("--child", choices=["legacy", "warm"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        # 자식 프로세스 출력 중 마지막 줄만 결과 JSON
+        print(json.dumps(run_container(args.child, args.transcript, args.invocations)))
+        return
+
+    transcript = os.path.abspath(args.transcript)
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(os.environ, EVALUATION_CHECKPOINT_PATH=os.path.join(directory, "checkpoints.sqlite3"))
+        for mode in ("legacy", "warm"):
+            runs = []
+            for _ in range(args.containers):
+                output = subprocess.run(
+                    [sys.executable, os.path.abspath(__file__), "--child", mode, "--transcript", transcript,
+                     "--invocations", str(args.invocations)],
+                    cwd=SERVER_DIR, env=env, capture_output=True, text=True, check=True,
+                ).stdout
+                runs.append(json.loads(output.strip().splitlines()[-1]))
+
+            first = [r["import"] + r["init"] + r["calls"][0] for r in runs]
+            later = [c for r in runs for c in r["calls"][1:]]
+            print(f"[{mode}] 컨테이너 {len(runs)}개 x 호출 {args.invocations}회")
+            print(f"  import: {statistics.median(r['import'] for r in runs):.2f}s")
+            print(f"  init (그래프 컴파일 + 클라이언트): {statistics.median(r['init'] for r in runs):.3f}s")
+            print(f"  첫 호출: {statistics.median(r['calls'][0] for r in runs):.3f}s "
+                  f"(import + init 포함 {statistics.median(first):.2f}s)")
+            if later:
+                print(f"  이후 호출: {statistics.median(later):.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+LLMClient 이벤트 루프 지연(lag) 벤치마크
+
+로컬 Fake Bedrock 엔드포인트를 띄운 뒤 20개 동시 호출 중 이벤트 루프가
+얼마나 멈추는지 측정합니다.
+    - blocking: 기존 방식 (코루틴 안에서 boto3 invoke_model 직접 호출)
+    - async:    AsyncBedrockTransport (httpx 커넥션 풀)
+
+Usage:
+    python server/scripts/bench_llm_client_event_loop.py [--concurrency 20] [--delay 0.5]
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Fake 엔드포인트 서명용 더미 자격 증명
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "bench")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "bench")
+
+import boto3
+from botocore.config import Config
+
+from ai.utils.llm_client import LLMClient, AsyncBedrockTransport
+
+
+def start_fake_bedrock(delay: float) -> ThreadingHTTPServer:
+    """InvokeModel 응답을 delay초 후 돌려주는 로컬 HTTP 서버"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            self.rfile.read(length)
+            time.sleep(delay)
+            payload = json.dumps({"content": [{"type": "text", "text": "ok"}]}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        daemon_threads = True
+        request_queue_size = 128  # 동시 연결이 backlog에 막혀 재전송 대기하지 않도록
+
+    server = Server(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def monitor_lag(stop: asyncio.Event, samples: list, interval: float = 0.005):
+    """interval마다 깨어나 예정 시각 대비 지연을 기록"""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, loop.time() - expected))
+
+
+async def run_blocking(client, concurrency: int):
+    body = json.dumps({"anthropic_version": "bedrock-2023-05-31", "max_tokens": 10,
+                       "messages": [{"role": "user", "content": "ping"}]})
+
+    async def call():
+        response = client.invoke_model(
+            modelId="anthropic.claude-3-sonnet-20240229-v1:0", body=body,
+            contentType="application/json", accept="application/json"
+        )
+        return json.loads(response["body"].read())
+
+    await asyncio.gather(*(call() for _ in range(concurrency)))
+
+
+async def run_async(client: LLMClient, concurrency: int):
+    try:
+        await asyncio.gather(*(client.ainvoke("ping", max_tokens=10) for _ in range(concurrency)))
+    finally:
+        await client.aclose()
+
+
+async def measure(name: str, runner, client, concurrency: int) -> dict:
+    samples: list = []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(monitor_lag(stop, samples))
+    await asyncio.sleep(0.05)
+
+    start = time.perf_counter()
+    await runner(client, concurrency)
+    wall = time.perf_counter() - start
+
+    stop.set()
+    await monitor
+
+    ordered = sorted(samples) or [0.0]
+    return {
+        "mode": name,
+        "wall_seconds": round(wall, 3),
+        "max_lag_ms": round(ordered[-1] * 1000, 1),
+        "p95_lag_ms": round(ordered[int(len(ordered) * 0.95) - 1 if len(ordered) > 1 else 0] * 1000, 1),
+        "ticks": len(samples),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--delay", type=float, default=0.5, help="Fake Bedrock 응답 지연(초)")
+    args = parser.parse_args()
+
+    server = start_fake_bedrock(args.delay)
+    endpoint = f"http://127.0.0.1:{server.server_address[1]}"
+    print(f"Fake Bedrock: {endpoint} (delay={args.delay}s, concurrency={args.concurrency})")
+
+    # 클라이언트 생성 비용은 측정에서 제외 (서버에서는 서비스 초기화 시 1회)
+    boto3_client = boto3.client(
+        "bedrock-runtime",
+        region_name="us-east-1",
+        endpoint_url=endpoint,
+        config=Config(retries={"max_attempts": 1}),
+    )
+    llm_client = LLMClient(
+        transport=AsyncBedrockTransport(
+            region_name="us-east-1", endpoint_url=endpoint, max_connections=args.concurrency
+        )
+    )
+
+    try:
+        results = [
+            await measure("blocking (boto3)", run_blocking, boto3_client, args.concurrency),
+            await measure("async (httpx pool)", run_async, llm_client, args.concurrency),
+        ]
+    finally:
+        server.shutdown()
+
+    print(f"\n{'mode':<22}{'wall(s)':>10}{'max lag(ms)':>14}{'p95 lag(ms)':>14}{'ticks':>8}")
+    for r in results:
+        print(f"{r['mode']:<22}{r['wall_seconds']:>10}{r['max_lag_ms']:>14}{r['p95_lag_ms']:>14}{r['ticks']:>8}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
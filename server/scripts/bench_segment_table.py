@@ -0,0 +1,180 @@
+"""
+Stage 2 rule-based 단계 벤치마크 (SegmentTable 열 배열 vs dict 목록 순회)
+
+대량 재집계(bulk re-aggregation) 규모의 Segment 평가 목록(기본 1만 / 5만 건)을 만들어 측정합니다.
+    - Confidence V2: 행마다 calculate_confidence_v2 호출(legacy) vs calculate_for_segments (열 연산)
+    - 역량별 통계(평균 Confidence V2 / 검증 수 / Overlap 조정 여부 / Low Confidence):
+      역량마다 전체 목록 필터링(legacy) vs SegmentTable.by_competency 그룹 연산
+    - Segment Overlap (rule-based 경로만, AI 판단 비활성화)
+    - aggregator_node 전체 (Stage 1 파이프라인 결과가 있는 상태에서 2.3 이후)
+
+LLM / 네트워크 없음. 측정마다 gc.collect() 후 반복 측정의 중앙값을 출력합니다.
+
+Usage:
+    python server/scripts/bench_segment_table.py [--sizes 10000,50000] [--repeats 5] [--competencies 10]
+
+--competencies를 10보다 크게 주면 역량 이름을 복제해 늘립니다 (역량 수에 비례하는 legacy 필터링 비용 확인용,
+aggregator_node는 10개 역량 기준으로만 측정).
+"""
+import os
+import sys
+import gc
+import time
+import random
+import asyncio
+import argparse
+import statistics
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from ai.agents.aggregators.confidence_calculator import ConfidenceCalculator
+from ai.agents.aggregators.segment_overlap_checker import SegmentOverlapChecker
+from ai.agents.aggregators.segment_table import SegmentTable
+from ai.agents.competency_agent import COMPETENCY_CONFIGS
+from ai.agents.graph.aggregator_node import aggregator_node
+from ai.utils.llm_cache import NullLLMCache
+
+
+COMPETENCIES = [name for name, _, _ in COMPETENCY_CONFIGS]
+LOW_CONFIDENCE_THRESHOLD = 0.6
+
+
+def competency_names(count: int) -> list:
+    return [COMPETENCIES[i % len(COMPETENCIES)] + ("" if i < len(COMPETENCIES) else f"_{i}") for i in range(count)]
+
+
+def build_segments(size: int, competencies: list = COMPETENCIES, seed: int = 7) -> list:
+    """Segment 평가 목록 (Segment당 평균 3개 역량이 겹쳐 평가)"""
+    rnd = random.Random(seed)
+    segments = []
+    for i in range(size):
+        strength = rnd.choice(["high", "medium", "low", "none"])
+        segments.append({
+            "competency": rnd.choice(competencies),
+            "segment_id": rnd.randrange(max(1, size // 3)),
+            "quote_text": f"인용 {i}",
+            "score": rnd.choice([40, 55, 70, 85, 95]),
+            "interview_confidence": rnd.random(),
+            "resume_verification": {
+                "verified": strength != "none",
+                "strength": strength,
+                "resume_matches": [{"resume_section": "experience", "matched_content": "근거"}],
+            },
+        })
+    return segments
+
+
+def legacy_confidence(segments: list) -> list:
+    return [
+        {**seg, "confidence_v2": ConfidenceCalculator.calculate_confidence_v2(
+            seg.get("interview_confidence", 0.5),
+            seg.get("resume_verification", {}).get("strength", "none")
+        )}
+        for seg in segments
+    ]
+
+
+def legacy_competency_stats(segments: list, competencies: list = COMPETENCIES) -> dict:
+    stats = {}
+    for name in competencies:
+        comp_segments = [s for s in segments if s["competency"] == name]
+        if not comp_segments:
+            continue
+        avg = round(sum(s["confidence_v2"] for s in comp_segments) / len(comp_segments), 2)
+        stats[name] = {
+            "confidence_v2": avg,
+            "segment_count": len(comp_segments),
+            "resume_verified_count": sum(
+                1 for s in comp_segments if s.get("resume_verification", {}).get("verified", False)
+            ),
+            "adjusted_by_overlap": any(s.get("adjusted") for s in comp_segments),
+            "low_confidence": avg < LOW_CONFIDENCE_THRESHOLD,
+        }
+    return stats
+
+
+def table_competency_stats(segments: list) -> dict:
+    table = SegmentTable(segments)
+    groups = table.by_competency
+    avg = groups.mean(table.confidence).tolist()
+    verified = groups.sum(table.verified).astype(int).tolist()
+    adjusted = (groups.sum(table.adjusted) > 0).tolist()
+    counts = groups.counts.tolist()
+    stats = {}
+    for code, name in enumerate(table.competencies):
+        confidence_v2 = round(avg[code], 2)
+        stats[name] = {
+            "confidence_v2": confidence_v2,
+            "segment_count": counts[code],
+            "resume_verified_count": verified[code],
+            "adjusted_by_overlap": adjusted[code],
+            "low_confidence": confidence_v2 < LOW_CONFIDENCE_THRESHOLD,
+        }
+    return stats
+
+
+def measure(fn, repeats: int) -> float:
+    durations = []
+    for _ in range(repeats):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="10000,50000")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--competencies", type=int, default=len(COMPETENCIES))
+    args = parser.parse_args()
+
+    # rule-based 경로만 측정 (AI 판단 대상 없음)
+    SegmentOverlapChecker.CONFIDENCE_GAP_THRESHOLD = -1
+    checker = SegmentOverlapChecker(openai_client=None, cache=NullLLMCache())
+    devnull = open(os.devnull, "w")
+
+    names = competency_names(args.competencies)
+    for size in (int(s) for s in args.sizes.split(",")):
+        segments = build_segments(size, names)
+        with_confidence = ConfidenceCalculator.calculate_for_segments(segments)
+        assert with_confidence == legacy_confidence(segments)
+        assert table_competency_stats(with_confidence) == legacy_competency_stats(with_confidence, names)
+
+        state = {"segment_evaluations_with_resume": with_confidence, "confidence_v2_calculated": True}
+        for name in COMPETENCIES:
+            state[f"{name}_result"] = {"overall_score": 70, "confidence": {"overall_confidence": 0.5}}
+        state["openai_client"] = SimpleNamespace()
+
+        def run_overlap():
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                asyncio.run(checker.check_and_adjust(with_confidence))
+            finally:
+                sys.stdout = stdout
+
+        def run_aggregator():
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                asyncio.run(aggregator_node(dict(state)))
+            finally:
+                sys.stdout = stdout
+
+        print(f"[Segment 평가 {size:,}개, 역량 {len(names)}개]")
+        rows = [
+            ("Confidence V2", measure(lambda: legacy_confidence(segments), args.repeats),
+             measure(lambda: ConfidenceCalculator.calculate_for_segments(segments), args.repeats)),
+            ("역량별 통계", measure(lambda: legacy_competency_stats(with_confidence, names), args.repeats),
+             measure(lambda: table_competency_stats(with_confidence), args.repeats)),
+        ]
+        for label, legacy, table in rows:
+            print(f"  {label}: legacy {legacy * 1000:.1f}ms → table {table * 1000:.1f}ms ({legacy / table:.1f}x)")
+        print(f"  Segment Overlap (rule-based): {measure(run_overlap, args.repeats) * 1000:.1f}ms")
+        if names == COMPETENCIES:
+            print(f"  aggregator_node 전체: {measure(run_aggregator, args.repeats) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Stage 1 호출 묶음(grouping) 벤치마크
+
+같은 transcript로 Stage 1을 묶음 정책별로 실행해 비교합니다.
+    - wall time
+    - prompt / completion / cached 토큰과 추정 비용
+    - 역량 점수 drift (기준 모드 "none" 대비 절대 차이)
+
+LLM 응답 캐시는 끄고(NullLLMCache) 실제 OpenAI API를 호출하므로 OPENAI_API_KEY가 필요합니다.
+
+Usage:
+    python server/scripts/bench_stage1_grouping.py [--transcript test_data/transcript_박서진_102.json]
+        [--modes none,category] [--runs 1]
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from openai import AsyncOpenAI
+
+from ai.agents.competency_agent import CompetencyAgent, evaluate_all_competencies
+from ai.utils.llm_cache import NullLLMCache
+from services.evaluation.evaluation_service import EvaluationService
+
+# gpt-4o 단가 (USD / 1M tokens)
+PRICE_INPUT = 2.50
+PRICE_CACHED_INPUT = 1.25
+PRICE_OUTPUT = 10.00
+
+
+async def run_mode(client: AsyncOpenAI, transcript: dict, prompts: dict, grouping: str) -> dict:
+    agent = CompetencyAgent(client, cache=NullLLMCache())
+
+    start = time.perf_counter()
+    results = await evaluate_all_competencies(agent, transcript, prompts, grouping=grouping)
+    wall = time.perf_counter() - start
+
+    usage = agent.usage_log.values()
+    prompt_tokens = sum(u["prompt_tokens"] for u in usage)
+    cached_tokens = sum(u["cached_tokens"] for u in usage)
+    completion_tokens = sum(u["completion_tokens"] for u in usage)
+    cost = (
+        (prompt_tokens - cached_tokens) * PRICE_INPUT
+        + cached_tokens * PRICE_CACHED_INPUT
+        + completion_tokens * PRICE_OUTPUT
+    ) / 1_000_000
+
+    return {
+        "mode": grouping,
+        "wall_seconds": round(wall, 2),
+        "calls": len(agent.usage_log),
+        "prompt_tokens": prompt_tokens,
+        "cached_tokens": cached_tokens,
+        "completion_tokens": completion_tokens,
+        "cost_usd": round(cost, 4),
+        "errors": sum(1 for r in results.values() if "error" in r),
+        "scores": {name: r.get("overall_score", 0) for name, r in results.items()},
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--transcript", default="test_data/transcript_박서진_102.json")
+    parser.add_argument("--modes", default="none,category", help="쉼표 구분 grouping 정책 (첫 번째가 drift 기준)")
+    parser.add_argument("--runs", type=int, default=1)
+    args = parser.parse_args()
+
+    with open(args.transcript, encoding="utf-8") as f:
+        transcript = json.load(f)
+
+    # 서비스 초기화(S3/그래프) 없이 프롬프트 구성만 사용
+    prompts = object.__new__(EvaluationService)._load_prompts(transcript)
+    client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+
+    results = []
+    for run in range(args.runs):
+        for mode in modes:
+            print(f"\n>>> run {run + 1}/{args.runs} mode={mode}")
+            results.append(await run_mode(client, transcript, prompts, mode))
+
+    baseline = [r for r in results if r["mode"] == modes[0]]
+    print(f"\n{'mode':<12}{'wall(s)':>9}{'calls':>7}{'prompt':>9}{'cached':>9}{'compl':>8}{'cost($)':>9}{'err':>5}{'drift':>8}")
+    for r in results:
+        base = baseline[min(len(baseline) - 1, results.index(r) // len(modes))]["scores"]
+        drift = sum(abs(r["scores"][k] - base.get(k, 0)) for k in r["scores"]) / max(1, len(r["scores"]))
+        print(
+            f"{r['mode']:<12}{r['wall_seconds']:>9}{r['calls']:>7}{r['prompt_tokens']:>9}"
+            f"{r['cached_tokens']:>9}{r['completion_tokens']:>8}{r['cost_usd']:>9}{r['errors']:>5}{drift:>8.1f}"
+        )
+
+    print("\n역량별 점수")
+    for name in results[0]["scores"]:
+        print(f"  {name:<28}" + "".join(f"{r['mode']}={r['scores'][name]:<5}" for r in results))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,131 @@
+"""
+평가 State 메모리 / 체크포인트 크기 벤치마크
+
+동시 평가 N건을 stub LLM 클라이언트로 실행하면서 측정합니다 (네트워크/S3/DB 없음).
+    - tracemalloc peak / 평가 1건당 peak
+    - 노드별 체크포인트(직렬화된 State) 크기와 직렬화 시간
+
+Usage:
+    python server/scripts/bench_state_memory.py [--transcript test_data/transcript_jiwon_101.json] [--concurrency 8]
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+import tracemalloc
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from ai.agents.competency_agent import COMPETENCY_CONFIGS
+from ai.agents.graph.checkpoint import SQLiteCheckpointStore, set_checkpoint_store
+from ai.agents.graph.context import release_context
+from ai.utils.llm_cache import NullLLMCache, set_llm_cache
+from ai.utils.rate_limiter import TokenBucketRateLimiter, set_rate_limiter
+from services.evaluation.evaluation_service import EvaluationService
+
+
+STUB_RESPONSE = json.dumps({
+    "overall_score": 70,
+    "strengths": ["강점"],
+    "weaknesses": ["약점"],
+    "key_observations": ["관찰"],
+    "perspectives": {"evidence_details": [{"segment_id": 1, "char_index": 0, "text": "근거"}]},
+    "confidence": {"overall_confidence": 0.8},
+    "verifications": [],
+    "competencies": [],
+    "summary": "요약",
+    "overall_evaluation_summary": "심사평",
+}, ensure_ascii=False)
+
+
+class StubCompletions:
+    """모든 호출에 같은 JSON 응답 (지연 10ms)"""
+
+    async def create(self, **kwargs):
+        await asyncio.sleep(0.01)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=STUB_RESPONSE))],
+            usage=None,
+        )
+
+
+class MeasuringStore(SQLiteCheckpointStore):
+    """저장되는 체크포인트 크기 기록"""
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.sizes = []
+
+    def save(self, run_key: str, node: str, serialized_state: str) -> None:
+        self.sizes.append(len(serialized_state.encode("utf-8")))
+        super().save(run_key, node, serialized_state)
+
+
+async def run_concurrent(service: EvaluationService, transcript: dict, weights: dict, concurrency: int) -> list:
+    async def run_one(index: int) -> dict:
+        state = service.build_initial_state(
+            interview_id=index,
+            applicant_id=index,
+            job_id=0,
+            transcript=transcript,
+            competency_weights=weights,
+        )
+        state["checkpoint_key"] = f"bench:{index}"
+        try:
+            return await service.graph.ainvoke(state)
+        finally:
+            release_context(state)
+
+    return await asyncio.gather(*(run_one(index) for index in range(concurrency)))
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--transcript", default="test_data/transcript_jiwon_101.json")
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    with open(args.transcript, encoding="utf-8") as f:
+        transcript = json.load(f)
+
+    set_llm_cache(NullLLMCache())
+    for model in ("gpt-4o", "gpt-4o-mini"):
+        set_rate_limiter(model, TokenBucketRateLimiter(10**9, 10**6))
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = MeasuringStore(os.path.join(directory, "checkpoints.sqlite3"))
+        set_checkpoint_store(store)
+        service = EvaluationService(
+            openai_client=SimpleNamespace(chat=SimpleNamespace(completions=StubCompletions())),
+            s3_service=SimpleNamespace(bucket_name="bench"),
+        )
+        weights = {name: round(1 / len(COMPETENCY_CONFIGS), 4) for name, _, _ in COMPETENCY_CONFIGS}
+
+        # import / 그래프 컴파일 등 1회성 할당 제외
+        await run_concurrent(service, transcript, weights, 1)
+        store.sizes.clear()
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        results = await run_concurrent(service, transcript, weights, args.concurrency)
+        wall = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        final_states = [json.dumps({k: v for k, v in r.items() if k != "openai_client"}, default=str) for r in results]
+        print(f"동시 평가 {args.concurrency}건, wall {wall:.2f}s, errors {sum(len(r.get('errors', [])) for r in results)}")
+        print(f"tracemalloc peak: {peak / 1024 / 1024:.2f} MiB ({peak / args.concurrency / 1024:.1f} KiB / 평가)")
+        print(
+            f"체크포인트: {len(store.sizes)}건, 평균 {sum(store.sizes) / len(store.sizes) / 1024:.1f} KiB, "
+            f"평가당 {sum(store.sizes) / args.concurrency / 1024:.1f} KiB"
+        )
+        print(f"최종 State JSON: {len(final_states[0].encode('utf-8')) / 1024:.1f} KiB")
+        set_checkpoint_store(None)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -4,12 +4,35 @@
 
 import os
 import json
+import importlib
 from datetime import datetime
-from typing import Dict, Optional
+from collections.abc import Mapping
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional
 from pathlib import Path
 from dotenv import load_dotenv
 import asyncio
-from ai.agents.graph.evaluation import create_evaluation_graph
+import uuid
+from ai.agents.graph.evaluation import create_evaluation_graph, plan_resume
+from ai.agents.graph.checkpoint import checkpoint_run_key, deserialize_state, get_checkpoint_store
+from ai.agents.graph.context import context_value, get_context_store, register_context, release_context
+from ai.agents.graph.reevaluation import (
+    build_reevaluation_snapshot,
+    changed_prompts,
+    compute_prompt_hashes,
+    reevaluation_summary,
+)
+from ai.utils.transcript_renderer import (
+    TRANSCRIPT_REFERENCE,
+    render_transcript_for_prompt,
+    transcript_token_report,
+    wrap_transcript_block,
+)
+from ai.utils.llm_usage import format_llm_usage, merge_llm_usage, summarize_llm_usage
+from ai.utils.model_router import get_model_router
+from ai.utils.rate_limiter import estimate_tokens, get_rate_limiter
+from ai.utils.tracing import Tracer, current_tracer, format_trace_summary, span, trace_scope
+from services.evaluation.job_batch import JobBatchProgress, run_job_batch
+from services.evaluation.progress_channel import ProgressChannel
 from services.storage.s3_service import S3Service
 from sqlalchemy.orm import Session
 from db.database import SessionLocal
@@ -21,54 +44,234 @@ env_path = Path(__file__).parent.parent.parent / '.env'
 # Force override so .env values (e.g., OPENAI_API_KEY) are used even if the shell has others.
 load_dotenv(env_path, override=True)
 
-from ai.prompts.competency_agents.common_competencies.problem_solving_prompt import create_problem_solving_evaluation_prompt
-from ai.prompts.competency_agents.common_competencies.organizational_fit_prompt import create_organizational_fit_evaluation_prompt
-from ai.prompts.competency_agents.common_competencies.growth_potential_prompt import create_growth_potential_evaluation_prompt
-from ai.prompts.competency_agents.common_competencies.interpersonal_skill_prompt import create_interpersonal_skill_evaluation_prompt
-from ai.prompts.competency_agents.common_competencies.achievement_motivation_prompt import create_achievement_motivation_evaluation_prompt
+from openai import AsyncOpenAI
 
-from ai.prompts.competency_agents.job_competencies.customer_journey_marketing_prompt import create_customer_journey_marketing_evaluation_prompt
-from ai.prompts.competency_agents.job_competencies.data_analysis_prompt import create_md_data_analysis_evaluation_prompt
-from ai.prompts.competency_agents.job_competencies.seasonal_strategy_kpi_prompt import create_seasonal_strategy_kpi_evaluation_prompt
-from ai.prompts.competency_agents.job_competencies.stakeholder_collaboration_prompt import create_stakeholder_collaboration_evaluation_prompt
-from ai.prompts.competency_agents.job_competencies.value_chain_optimization_prompt import create_value_chain_optimization_evaluation_prompt
 
-from openai import AsyncOpenAI
+class LazyPromptGenerators(Mapping):
+    """
+    역량 → create_*_evaluation_prompt (프롬프트 모듈은 처음 사용할 때 import)
+
+    evaluation_service를 import하는 것만으로 10개 프롬프트 모듈을 읽지 않도록 함
+    (Lambda 콜드 스타트 / 큐 API 프로세스 등 프롬프트를 쓰지 않는 경로)
+    """
+
+    def __init__(self, paths: Dict[str, str]):
+        self._paths = paths
+        self._loaded: Dict[str, Callable[[str], str]] = {}
+
+    def __getitem__(self, name: str) -> Callable[[str], str]:
+        if name not in self._loaded:
+            module_name, function_name = self._paths[name].rsplit(":", 1)
+            self._loaded[name] = getattr(importlib.import_module(module_name), function_name)
+        return self._loaded[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._paths)
 
-PROMPT_GENERATORS = {
+    def __len__(self) -> int:
+        return len(self._paths)
+
+
+_COMMON_PROMPTS = "ai.prompts.competency_agents.common_competencies"
+_JOB_PROMPTS = "ai.prompts.competency_agents.job_competencies"
+
+PROMPT_GENERATORS = LazyPromptGenerators({
     # Common Competencies (5개)
-    "problem_solving": create_problem_solving_evaluation_prompt,
-    "organizational_fit": create_organizational_fit_evaluation_prompt,
-    "growth_potential": create_growth_potential_evaluation_prompt,
-    "interpersonal_skill": create_interpersonal_skill_evaluation_prompt, 
-    "achievement_motivation": create_achievement_motivation_evaluation_prompt,
+    "problem_solving": f"{_COMMON_PROMPTS}.problem_solving_prompt:create_problem_solving_evaluation_prompt",
+    "organizational_fit": f"{_COMMON_PROMPTS}.organizational_fit_prompt:create_organizational_fit_evaluation_prompt",
+    "growth_potential": f"{_COMMON_PROMPTS}.growth_potential_prompt:create_growth_potential_evaluation_prompt",
+    "interpersonal_skill": f"{_COMMON_PROMPTS}.interpersonal_skill_prompt:create_interpersonal_skill_evaluation_prompt",
+    "achievement_motivation": (
+        f"{_COMMON_PROMPTS}.achievement_motivation_prompt:create_achievement_motivation_evaluation_prompt"
+    ),
     
     # Job Competencies (5개)
-    "customer_journey_marketing": create_customer_journey_marketing_evaluation_prompt,
-    "md_data_analysis": create_md_data_analysis_evaluation_prompt,
-    "seasonal_strategy_kpi": create_seasonal_strategy_kpi_evaluation_prompt,
-    "stakeholder_collaboration": create_stakeholder_collaboration_evaluation_prompt,
-    "value_chain_optimization": create_value_chain_optimization_evaluation_prompt,
-}
+    "customer_journey_marketing": (
+        f"{_JOB_PROMPTS}.customer_journey_marketing_prompt:create_customer_journey_marketing_evaluation_prompt"
+    ),
+    "md_data_analysis": f"{_JOB_PROMPTS}.data_analysis_prompt:create_md_data_analysis_evaluation_prompt",
+    "seasonal_strategy_kpi": f"{_JOB_PROMPTS}.seasonal_strategy_kpi_prompt:create_seasonal_strategy_kpi_evaluation_prompt",
+    "stakeholder_collaboration": (
+        f"{_JOB_PROMPTS}.stakeholder_collaboration_prompt:create_stakeholder_collaboration_evaluation_prompt"
+    ),
+    "value_chain_optimization": (
+        f"{_JOB_PROMPTS}.value_chain_optimization_prompt:create_value_chain_optimization_evaluation_prompt"
+    ),
+})
+
+_prompt_hashes: Optional[Dict[str, str]] = None
+
+
+def current_prompt_hashes() -> Dict[str, str]:
+    """현재 배포된 프롬프트 모듈 해시 (프로세스당 1회 계산)"""
+    global _prompt_hashes
+    if _prompt_hashes is None:
+        _prompt_hashes = compute_prompt_hashes(PROMPT_GENERATORS)
+    return _prompt_hashes
+
+
+def find_stale_evaluations(db: Session, job_id: int) -> Dict:
+    """job의 평가 중 현재 프롬프트와 해시가 다른 역량이 있는 평가 (evaluate_interview(reevaluate=True) 대상)"""
+    current = current_prompt_hashes()
+    evaluations = db.query(Evaluation).filter(Evaluation.job_id == job_id).all()
+    stale = []
+    for evaluation in evaluations:
+        changed = changed_prompts((evaluation.evaluation_metadata or {}).get("prompt_hashes"), current)
+        if changed:
+            stale.append({
+                "evaluation_id": evaluation.id,
+                "interview_id": evaluation.interview_id,
+                "applicant_id": evaluation.applicant_id,
+                "changed_competencies": changed,
+            })
+    return {
+        "job_id": job_id,
+        "prompt_hashes": current,
+        "total_evaluations": len(evaluations),
+        "stale_evaluations": stale,
+    }
+
+
+def build_completion_event(result: Dict) -> Dict:
+    """평가 결과 → SSE "complete" 이벤트 데이터 (큐 작업 결과로도 저장)"""
+    final_score = result.get("final_score") or 0
+    aggregated = result.get("aggregated_competencies", {})
+    competency_details = result.get("competency_details", {})
+
+    competency_scores = {}
+    for comp in PROMPT_GENERATORS:
+        data = competency_details.get(comp, aggregated.get(comp, {}))
+        competency_scores[comp] = {
+            "score": data.get("overall_score", 0),
+            "confidence": data.get("confidence_v2", data.get("interview_confidence", 0))
+        }
+
+    return {
+        "status": "completed",
+        "evaluation_id": result.get("evaluation_id"),
+        "final_score": final_score,
+        "avg_confidence": result.get("avg_confidence", 0),
+        "reliability_level": result.get("final_reliability", ""),
+        "competency_scores": competency_scores,
+        "s3_urls": {
+            "transcript": result.get("transcript_s3_url"),
+            "stage1": result.get("stage1_evidence_s3_url"),
+            "stage2": result.get("stage2_aggregator_s3_url"),
+            "stage3": result.get("stage3_final_integration_s3_url"),
+            "presentation": result.get("stage4_presentation_s3_url")
+        },
+        "message": f"평가 완료! 최종 점수: {final_score:.1f}점"
+    }
 
 
 class EvaluationService:
     """평가 서비스"""
     
-    def __init__(self, api_key: str = None):
-        if api_key is None:
-            api_key = os.getenv("OPENAI_API_KEY")
-        
-        from core.config import S3_BUCKET_NAME, AWS_REGION
-        self.openai_client = AsyncOpenAI(api_key=api_key)
-        self.graph = create_evaluation_graph()
-        self.s3_service = S3Service(bucket_name=S3_BUCKET_NAME, region_name=AWS_REGION)
+    def __init__(self, api_key: str = None, openai_client=None, s3_service: Optional[S3Service] = None):
+        """
+        Args:
+            api_key: OpenAI API 키 (openai_client 미지정 시 사용)
+            openai_client: chat.completions.create를 제공하는 클라이언트 주입
+                           (예: 벤치마크용 RecordReplayOpenAI)
+            s3_service: S3 서비스 주입 (미지정 시 config 기준으로 생성)
+        """
+        if openai_client is None:
+            if api_key is None:
+                api_key = os.getenv("OPENAI_API_KEY")
+            openai_client = AsyncOpenAI(api_key=api_key)
+
+            # OpenAI 장애/지연 시 Bedrock으로 failover (opt-in, 주입된 클라이언트는 그대로 사용)
+            from core.config import LLM_FAILOVER_ENABLED
+            if LLM_FAILOVER_ENABLED:
+                from ai.utils.llm_gateway import LLMGateway, OpenAIChatProvider, bedrock_failover_provider
+                fallback = bedrock_failover_provider()
+                if fallback is not None:
+                    openai_client = LLMGateway(OpenAIChatProvider(openai_client), fallback)
+
+        if s3_service is None:
+            from core.config import S3_BUCKET_NAME, AWS_REGION
+            s3_service = S3Service(bucket_name=S3_BUCKET_NAME, region_name=AWS_REGION)
+
+        self.openai_client = openai_client
+        self.checkpoint_store = get_checkpoint_store()
+        self.graph = create_evaluation_graph(checkpoint_store=self.checkpoint_store)
+        self._resume_graphs = {"batch_evaluation": self.graph}
+        self.s3_service = s3_service
+    
+    def _graph_from(self, entry_node: str):
+        """entry_node부터 시작하는 그래프 (체크포인트 재개용, 시작 노드별로 재사용)"""
+        if entry_node not in self._resume_graphs:
+            self._resume_graphs[entry_node] = create_evaluation_graph(
+                entry_node=entry_node, checkpoint_store=self.checkpoint_store
+            )
+        return self._resume_graphs[entry_node]
+    
+    async def _load_resume_point(self, run_key: str, resume_from: str, context_key: str) -> Optional[Dict]:
+        """저장된 체크포인트에서 재개 지점 선택 (없으면 None, 입력은 이번 실행의 컨텍스트 사용)"""
+        if self.checkpoint_store is None:
+            return None
+        checkpoints = await self.checkpoint_store.alist(run_key)
+        restored = [
+            {
+                "node": checkpoint["node"],
+                "state": deserialize_state(
+                    checkpoint["state"],
+                    context_key=context_key,
+                ),
+            }
+            for checkpoint in checkpoints
+        ]
+        return plan_resume(restored, resume_from)
+    
+    def _find_reevaluation_snapshot_url(self, interview_id: int) -> Optional[str]:
+        db = SessionLocal()
+        try:
+            evaluation = (
+                db.query(Evaluation)
+                .filter(Evaluation.interview_id == interview_id)
+                .order_by(Evaluation.id.desc())
+                .first()
+            )
+        finally:
+            db.close()
+        if evaluation is None:
+            return None
+        return ((evaluation.evaluation_metadata or {}).get("s3_paths") or {}).get("reevaluation_snapshot")
+    
+    async def _load_previous_run(self, interview_id: int) -> Optional[Dict]:
+        """interview의 최근 평가 스냅샷 (선택적 재평가용, 없으면 None)"""
+        url = await asyncio.to_thread(self._find_reevaluation_snapshot_url, interview_id)
+        if not url:
+            return None
+        key = url.split(f"s3://{self.s3_service.bucket_name}/", 1)[-1]
+        return await asyncio.to_thread(self.s3_service.download_json, key)
+    
+    def _render_transcript(self, transcript: Dict) -> str:
+        """프롬프트용 transcript 문자열 (TRANSCRIPT_PROMPT_FORMAT에 따라 compact / json)"""
+        from core.config import TRANSCRIPT_PROMPT_FORMAT
+        if TRANSCRIPT_PROMPT_FORMAT == "json":
+            return json.dumps(transcript, ensure_ascii=False, indent=2)
+        return render_transcript_for_prompt(transcript)
     
     def _load_prompts(self, transcript: Dict) -> Dict[str, str]:
-        """프롬프트 로딩"""
-        transcript_str = json.dumps(transcript, ensure_ascii=False, indent=2)
+        """
+        프롬프트 로딩
+        
+        PROMPT_LAYOUT="transcript_first"(기본)이면 10개 요청이 [system + transcript]라는
+        동일한 prefix로 시작하고 역량별 rubric은 뒤에 붙습니다.
+        OpenAI prompt caching이 prefix 단위로 적중하므로 transcript 토큰을 10번 중 9번 재사용할 수 있습니다.
+        """
+        from core.config import PROMPT_LAYOUT
+        transcript_str = self._render_transcript(transcript)
+        if PROMPT_LAYOUT == "inline":
+            return {
+                name: generator(transcript_str)
+                for name, generator in PROMPT_GENERATORS.items()
+            }
+        
+        shared_prefix = wrap_transcript_block(transcript_str) + "\n\n"
         return {
-            name: generator(transcript_str)
+            name: shared_prefix + generator(TRANSCRIPT_REFERENCE)
             for name, generator in PROMPT_GENERATORS.items()
         }
     
@@ -239,33 +442,33 @@ class EvaluationService:
         
         return result
     
-    async def evaluate_interview(
+    def build_initial_state(
         self,
         interview_id: int,
         applicant_id: int,
         job_id: int,
         transcript: Dict,
-        competency_weights: Dict[str, float], 
-        resume_data: Optional[Dict] = None 
+        competency_weights: Dict[str, float],
+        resume_data: Optional[Dict] = None,
+        progress_channel=None,
+        prompts: Optional[Dict[str, str]] = None
     ) -> Dict:
         """
-        면접 평가 실행
-        
-        Args:
-            interview_id: 면접 ID
-            applicant_id: 지원자 ID
-            job_id: JD ID
-            transcript: 면접 Transcript JSON
-            competency_weights: 10개 역량 가중치
-            resume_data: 파싱된 Resume JSON (선택적)
-        
-        Returns:
-            평가 결과
+        그래프 입력 State 구성 (S3 업로드/DB 저장 없이 graph.ainvoke만 실행할 때도 사용)
+
+        transcript / prompts / resume_data / openai_client / progress_channel은 컨텍스트 저장소에
+        등록하고 State에는 context_key만 넣습니다 (ai/agents/graph/context.py).
+        실행이 끝나면 release_context(state)로 해제해야 합니다.
+        prompts를 넘기면 (배치 입력 로딩에서 이미 만든 경우) 다시 렌더링하지 않습니다.
         """
-        
-        transcript_content = transcript
         transcript_s3_url = f"s3://{self.s3_service.bucket_name}/transcripts/{interview_id}_mock.json"
-        prompts = self._load_prompts(transcript_content)
+        context_key = register_context(
+            transcript=transcript,
+            prompts=prompts if prompts is not None else self._load_prompts(transcript),
+            resume_data=resume_data,
+            openai_client=self.openai_client,
+            progress_channel=progress_channel,
+        )
 
         # Initial State 구성
         initial_state = {
@@ -274,11 +477,13 @@ class EvaluationService:
             "applicant_id": applicant_id,
             "job_id": job_id,
             "transcript_s3_url": transcript_s3_url,
-            "transcript_content": transcript_content,
-            "transcript": transcript_content,
-            "resume_data": resume_data, 
-            "openai_client": self.openai_client,
-            "prompts": prompts,
+            "context_key": context_key,
+            "checkpoint_key": None,
+            
+            # 선택적 재평가용 해시 (reevaluation.py)
+            "prompt_hashes": current_prompt_hashes(),
+            "node_input_hashes": {},
+            "node_outputs": {},
             
             # 가중치 
             "competency_weights": competency_weights,
@@ -322,15 +527,190 @@ class EvaluationService:
             "started_at": datetime.now(),
             "completed_at": None,
             "errors": [],
-            "execution_logs": []
+            "execution_logs": [],
+            "llm_spans": []
         }
+
+        return initial_state
+
+    async def evaluate_interview(
+        self,
+        interview_id: int,
+        applicant_id: int,
+        job_id: int,
+        transcript: Dict,
+        competency_weights: Dict[str, float], 
+        resume_data: Optional[Dict] = None,
+        progress_channel=None,
+        resume_from: Optional[str] = None,
+        reevaluate: bool = False,
+        prompts: Optional[Dict[str, str]] = None,
+        run: Optional[str] = None
+    ) -> Dict:
+        """
+        면접 평가 실행
         
-        # 그래프 실행
-        print("\n" + "="*80)
-        print(f"평가 시작: Interview ID {interview_id}")
-        print("="*80)
+        Args:
+            interview_id: 면접 ID
+            applicant_id: 지원자 ID
+            job_id: JD ID
+            transcript: 면접 Transcript JSON
+            competency_weights: 10개 역량 가중치
+            resume_data: 파싱된 Resume JSON (선택적)
+            progress_channel: 진행 이벤트 채널 (ProgressChannel, 선택적)
+            resume_from: 이전 실행의 체크포인트에서 재개
+                - "latest": 첫 미완료 노드부터 (예: final_integration 실패 시 Stage 1/2 재사용)
+                - 노드 이름: 해당 노드부터 다시 실행
+                - None: 처음부터 실행 (기존 체크포인트 삭제)
+            reevaluate: 같은 interview의 최근 평가 스냅샷과 비교해 입력(프롬프트 해시 등)이
+                바뀐 역량/노드만 다시 실행 (스냅샷이 없으면 전체 실행)
+            prompts: 이미 렌더링한 역량별 프롬프트 (None이면 transcript로 생성)
+            run: 체크포인트 실행 구분 키 (큐 작업 run / batch_id / SQS messageId).
+                같은 interview를 동시에 실행하는 경로는 반드시 지정하고, 재개할 때도 같은 run으로 호출
+                (None이면 interview 단위 키)
+        
+        Returns:
+            평가 결과 (trace_s3_url: 구간 trace, Chrome trace JSON)
+        """
+        from core.config import EVALUATION_TRACE_ENABLED
+
+        tracer = Tracer("evaluation", {
+            "interview_id": interview_id,
+            "applicant_id": applicant_id,
+            "job_id": job_id,
+        }) if EVALUATION_TRACE_ENABLED else None
+        with trace_scope(tracer):
+            with span("evaluate_interview", "evaluation", interview_id=interview_id, reevaluate=reevaluate):
+                result = await self._run_evaluation(
+                    interview_id, applicant_id, job_id, transcript, competency_weights,
+                    resume_data, progress_channel, resume_from, reevaluate, prompts, run
+                )
+
+        if tracer is not None:
+            print("\n[Trace] 구간별 소요 시간 (합계 상위)")
+            print(format_trace_summary(tracer.summary()))
+            try:
+                # 키는 _run_evaluation에서 DB에 기록한 trace_s3_url과 같음
+                await asyncio.to_thread(
+                    self.s3_service.upload_json,
+                    self._trace_s3_key(applicant_id, interview_id, result["evaluation_run_ts"]),
+                    tracer.to_chrome_trace()
+                )
+            except Exception as e:
+                # trace는 진단용이므로 업로드 실패가 평가 결과를 바꾸지 않음
+                print(f"[Trace] 업로드 실패: {e}")
+                result["trace_s3_url"] = None
+                try:
+                    # 없는 trace를 가리키지 않도록 DB의 s3_paths.trace도 비움
+                    await asyncio.to_thread(self._clear_trace_s3_url, result["evaluation_id"])
+                except Exception as e:
+                    print(f"[Trace] DB trace 경로 정리 실패: {e}")
+        return result
+
+    def _clear_trace_s3_url(self, evaluation_id: int) -> None:
+        """업로드에 실패한 trace 경로를 Evaluation.evaluation_metadata에서 제거"""
+        db = SessionLocal()
+        try:
+            evaluation = db.query(Evaluation).filter(Evaluation.id == evaluation_id).first()
+            if evaluation is None:
+                return
+            metadata = evaluation.evaluation_metadata or {}
+            # JSON 컬럼은 변경 추적이 안 되므로 새 dict로 교체
+            evaluation.evaluation_metadata = {
+                **metadata,
+                "s3_paths": {**metadata.get("s3_paths", {}), "trace": None},
+            }
+            db.commit()
+        finally:
+            db.close()
+
+    @staticmethod
+    def _trace_s3_key(applicant_id: int, interview_id: int, run_ts_str: str) -> str:
+        """구간 trace 키 (execution_logs 옆)"""
+        return f"logs/evaluations/{applicant_id}/{interview_id}/{run_ts_str}_trace.json"
+
+    def _upload_json(self, key: str, data) -> str:
+        """S3 JSON 업로드 (구간 trace에 s3_upload span으로 기록)"""
+        with span("s3_upload", "io", key=key):
+            return self.s3_service.upload_json(key, data)
+
+    async def _run_evaluation(
+        self,
+        interview_id: int,
+        applicant_id: int,
+        job_id: int,
+        transcript: Dict,
+        competency_weights: Dict[str, float],
+        resume_data: Optional[Dict],
+        progress_channel,
+        resume_from: Optional[str],
+        reevaluate: bool,
+        prompts: Optional[Dict[str, str]] = None,
+        run: Optional[str] = None
+    ) -> Dict:
+        """evaluate_interview 본문 (그래프 실행 → S3 업로드 → DB 저장)"""
+        
+        prompt_token_report = transcript_token_report(
+            transcript, self._render_transcript(transcript)
+        )
+        initial_state = self.build_initial_state(
+            interview_id=interview_id,
+            applicant_id=applicant_id,
+            job_id=job_id,
+            transcript=transcript,
+            competency_weights=competency_weights,
+            resume_data=resume_data,
+            progress_channel=progress_channel,
+            prompts=prompts,
+        )
+        context_key = initial_state["context_key"]
+        try:
+            run_key = checkpoint_run_key(interview_id, run)
+            entry_node = "batch_evaluation"
+            resume_point = None
+            if resume_from:
+                resume_point = await self._load_resume_point(run_key, resume_from, context_key)
+                if resume_point is None:
+                    print(f"[Checkpoint] {run_key}: 재개할 체크포인트 없음 → 처음부터 실행")
+                else:
+                    initial_state = resume_point["state"]
+                    entry_node = resume_point["entry_node"]
+                    print(f"[Checkpoint] {run_key}: {entry_node or '완료된 실행'}부터 재개")
+            if resume_point is None and self.checkpoint_store is not None:
+                initial_state["checkpoint_key"] = run_key
+                await self.checkpoint_store.aclear(run_key)
+            if reevaluate and resume_point is None:
+                previous_run = await self._load_previous_run(interview_id)
+                if previous_run is None:
+                    print(f"[Re-evaluation] interview {interview_id}: 이전 스냅샷 없음 → 전체 실행")
+                else:
+                    get_context_store().update(context_key, previous_run=previous_run)
+                    changed = changed_prompts(previous_run.get("prompt_hashes"), initial_state["prompt_hashes"])
+                    print(f"[Re-evaluation] interview {interview_id}: 프롬프트 변경 역량 {changed or '없음'}")
+            transcript_s3_url = initial_state["transcript_s3_url"]
+            print(
+                f"[Prompt] transcript 토큰: {prompt_token_report['json_tokens']} → "
+                f"{prompt_token_report['compact_tokens']} "
+                f"(-{prompt_token_report['reduction_ratio'] * 100:.0f}%, 프롬프트 {len(context_value(initial_state, 'prompts'))}개)"
+            )
         
-        result = await self.graph.ainvoke(initial_state)
+            # 그래프 실행
+            print("\n" + "="*80)
+            print(f"평가 시작: Interview ID {interview_id}")
+            print("="*80)
+        
+            if entry_node is None:
+                # 모든 노드가 이미 완료된 체크포인트 (후처리/저장 단계에서 실패한 경우)
+                result = initial_state
+            else:
+                result = await self._graph_from(entry_node).ainvoke(initial_state)
+
+            # 다음 선택적 재평가용 스냅샷 (노드 입력 해시 + 노드 완료 직후 출력, 컨텍스트 해제 전에 계산)
+            reevaluation_snapshot = build_reevaluation_snapshot(result)
+            reevaluated = context_value(result, "previous_run") is not None
+        finally:
+            # transcript / prompts / previous_run 등 컨텍스트 해제
+            release_context({"context_key": context_key})
         
         #  필수 필드 강제 보장
         result = self._ensure_required_fields(result)
@@ -345,7 +725,7 @@ class EvaluationService:
 
         # S3 업로드
         execution_logs_s3_key = f"logs/evaluations/{applicant_id}/{interview_id}/{run_ts_str}_execution_logs.json"
-        agent_logs_s3_url = self.s3_service.upload_json(
+        agent_logs_s3_url = self._upload_json(
             execution_logs_s3_key, result["execution_logs"]
         )
 
@@ -363,7 +743,7 @@ class EvaluationService:
             "value_chain_optimization": result.get("value_chain_optimization_result"),
         }
         stage1_key = f"{evaluation_base_prefix}/stage1_evidence.json"
-        stage1_evidence_url = self.s3_service.upload_json(stage1_key, stage1_payload)
+        stage1_evidence_url = self._upload_json(stage1_key, stage1_payload)
 
         stage2_payload = {
             "segment_evaluations_with_resume": result.get("segment_evaluations_with_resume", []),
@@ -376,7 +756,7 @@ class EvaluationService:
             "competency_weights": competency_weights,
         }
         stage2_key = f"{evaluation_base_prefix}/stage2_aggregator.json"
-        stage2_aggregator_url = self.s3_service.upload_json(stage2_key, stage2_payload)
+        stage2_aggregator_url = self._upload_json(stage2_key, stage2_payload)
 
         stage3_payload = {
             "final_score": result.get("final_score"),
@@ -390,30 +770,69 @@ class EvaluationService:
             "post_processing": result.get("post_processing"),
         }
         stage3_key = f"{evaluation_base_prefix}/stage3_final_integration.json"
-        stage3_final_url = self.s3_service.upload_json(stage3_key, stage3_payload)
+        stage3_final_url = self._upload_json(stage3_key, stage3_payload)
 
         #  Stage 4: Presentation 결과 S3 저장
         presentation_key = f"{evaluation_base_prefix}/stage4_presentation_frontend.json"
-        presentation_s3_url = self.s3_service.upload_json(
+        presentation_s3_url = self._upload_json(
             presentation_key,
             result.get("presentation_result", {})
         )
 
+        # 다음 선택적 재평가용 스냅샷
+        reevaluation_snapshot_url = self._upload_json(
+            f"{evaluation_base_prefix}/reevaluation_snapshot.json",
+            reevaluation_snapshot
+        )
+        reevaluation = reevaluation_summary(result)
+        if reevaluated:
+            print(
+                f"[Re-evaluation] 재사용 노드 {reevaluation['reused_nodes']}, "
+                f"Stage 1 재실행 {reevaluation['stage1_rerun']}"
+            )
+
+        # LLM 호출 span + 노드/모델별 비용·지연 요약
+        llm_usage = summarize_llm_usage(result.get("llm_spans", []))
+        result["llm_usage"] = llm_usage
+        print(f"\n[LLM 사용량] 호출 {llm_usage['total']['calls']}회, ${llm_usage['total']['cost_usd']:.4f}")
+        print(format_llm_usage(llm_usage))
+        llm_usage_key = f"{evaluation_base_prefix}/llm_usage.json"
+        llm_usage_s3_url = self._upload_json(
+            llm_usage_key,
+            {
+                "interview_id": interview_id,
+                "applicant_id": applicant_id,
+                "job_id": job_id,
+                "summary": llm_usage,
+                "spans": result.get("llm_spans", []),
+            }
+        )
+
+        # 구간 trace (DB 저장까지 포함해야 하므로 업로드는 evaluate_interview에서 마지막에 수행,
+        # 업로드 실패 시 evaluate_interview가 DB의 경로를 비움)
+        trace_s3_url = None
+        if current_tracer() is not None:
+            trace_s3_url = f"s3://{self.s3_service.bucket_name}/{self._trace_s3_key(applicant_id, interview_id, run_ts_str)}"
+
         # DB 저장
         db = SessionLocal()
         try:
-            evaluation_record = await asyncio.to_thread(
-                self._save_evaluation_to_db, 
-                db, 
-                result, 
-                transcript_s3_url, 
-                agent_logs_s3_url,
-                stage1_evidence_url,
-                stage2_aggregator_url,
-                stage3_final_url,
-                presentation_s3_url, 
-                run_ts_str
-            )
+            with span("db_save", "io"):
+                evaluation_record = await asyncio.to_thread(
+                    self._save_evaluation_to_db, 
+                    db, 
+                    result, 
+                    transcript_s3_url, 
+                    agent_logs_s3_url,
+                    stage1_evidence_url,
+                    stage2_aggregator_url,
+                    stage3_final_url,
+                    presentation_s3_url, 
+                    run_ts_str,
+                    llm_usage_s3_url,
+                    reevaluation_snapshot_url,
+                    trace_s3_url
+                )
             evaluation_id = evaluation_record.id
         finally:
             await asyncio.to_thread(db.close)
@@ -435,6 +854,11 @@ class EvaluationService:
             "stage3_final_integration_s3_url": stage3_final_url,
             "stage4_presentation_s3_url": presentation_s3_url, 
             "evaluation_run_ts": run_ts_str,
+            "prompt_token_report": prompt_token_report,
+            "llm_usage": llm_usage,
+            "llm_usage_s3_url": llm_usage_s3_url,
+            "trace_s3_url": trace_s3_url,
+            "reevaluation": reevaluation,
             
             "execution_logs": result.get("execution_logs", []),
             "segment_evaluations_with_resume": result.get("segment_evaluations_with_resume", []),
@@ -460,6 +884,165 @@ class EvaluationService:
             "completed_at": datetime.now().isoformat()
         }
 
+    def load_interview_input(self, interview_id: int, applicant_id: int) -> Dict:
+        """S3에서 평가 입력 로드 (transcript 필수, resume 선택)"""
+        transcript_key = f"interviews/{interview_id}/transcript.json"
+        transcript = self.s3_service.download_json(transcript_key)
+        if not transcript:
+            raise ValueError(f"Transcript를 찾을 수 없습니다: {transcript_key}")
+        return {
+            "transcript": transcript,
+            "resume_data": self.s3_service.download_json(f"applicants/{applicant_id}/resume.json"),
+        }
+
+    async def stream_evaluation(
+        self,
+        channel: Optional[ProgressChannel] = None,
+        error_status: str = "failed",
+        **kwargs
+    ) -> AsyncIterator[Dict]:
+        """
+        evaluate_interview를 실행하면서 그래프 진행 이벤트를 발생 순서대로 반환
+
+        노드 시작/완료(graph/progress.py), 역량별 시작/부분 결과/완료(CompetencyAgent),
+        aggregator Sub-step 이벤트가 실제 실행 시점에 나오고, 마지막에 "complete"
+        (build_completion_event) 또는 "error" 이벤트가 나옵니다. 평가 예외는 이벤트를 모두
+        반환한 뒤 다시 발생시킵니다.
+
+        Args:
+            channel: 이벤트를 받을 채널 (재연결용 재전송 버퍼, 없으면 새로 생성)
+            error_status: 실패 시 "error" 이벤트의 status (큐 재시도 예정이면 "retrying")
+            **kwargs: evaluate_interview 인자
+        """
+        channel = channel or ProgressChannel(kwargs.get("interview_id"))
+        # 재시도로 다시 연 채널이면 이번 실행에서 발행한 이벤트만 반환
+        first_event_id = channel.last_event_id
+
+        async def run():
+            try:
+                result = await self.evaluate_interview(progress_channel=channel, **kwargs)
+                channel.publish("complete", build_completion_event(result))
+                return result
+            except Exception as e:
+                channel.publish("error", {
+                    "status": error_status,
+                    "message": f"평가 중 오류 발생: {str(e)}"
+                })
+                raise
+            finally:
+                channel.close()
+
+        task = asyncio.create_task(run())
+        try:
+            async for item in channel.events(first_event_id):
+                yield item
+            await task
+        finally:
+            # 소비자가 중간에 멈춘 경우 평가도 취소
+            if not task.done():
+                task.cancel()
+
+    def _load_batch_input(self, interview_id: int) -> Dict:
+        """배치 평가 입력 (InterviewSession → applicant_id, S3 transcript / resume)"""
+        db = SessionLocal()
+        try:
+            interview = db.query(InterviewSession).filter(InterviewSession.id == interview_id).first()
+        finally:
+            db.close()
+        if interview is None:
+            raise ValueError(f"InterviewSession {interview_id}를 찾을 수 없습니다")
+
+        transcript_key = f"interviews/{interview_id}/transcript.json"
+        if interview.transcript_s3_url:
+            transcript_key = interview.transcript_s3_url.split(f"s3://{self.s3_service.bucket_name}/", 1)[-1]
+        transcript = self.s3_service.download_json(transcript_key)
+        if not transcript:
+            raise ValueError(f"Transcript를 찾을 수 없습니다: {transcript_key}")
+
+        # 한 번만 렌더링해 토큰 추정과 그래프 컨텍스트(evaluate_interview)에 함께 사용
+        prompts = self._load_prompts(transcript)
+        return {
+            "applicant_id": interview.applicant_id,
+            "transcript": transcript,
+            "resume_data": self.s3_service.download_json(f"applicants/{interview.applicant_id}/resume.json"),
+            "prompts": prompts,
+            # Stage 1 호출 1건의 최대 프롬프트 토큰 (Limiter 여유 판단용)
+            "call_tokens": max(estimate_tokens(prompt) for prompt in prompts.values()),
+        }
+
+    def _load_job_weights(self, job_id: int) -> Dict[str, float]:
+        db = SessionLocal()
+        try:
+            job = db.query(Job).filter(Job.id == job_id).first()
+        finally:
+            db.close()
+        if job is None or not job.competency_weights:
+            raise ValueError(f"job {job_id}에 저장된 competency_weights가 없습니다")
+        return job.competency_weights
+
+    async def evaluate_job_batch(
+        self,
+        job_id: int,
+        interview_ids: List[int],
+        max_parallel: Optional[int] = None,
+        competency_weights: Optional[Dict[str, float]] = None,
+        batch_id: Optional[str] = None
+    ) -> Dict:
+        """
+        job의 지원자 여러 명 배치 평가 (services/evaluation/job_batch.py)
+
+        이 서비스 인스턴스의 컴파일된 그래프 / OpenAI 클라이언트 / S3 클라이언트를 모든 지원자가 공유하고,
+        Stage 1 모델 Limiter에 여유가 있을 때 다음 지원자를 시작해 지원자 간 Stage 1 호출을 섞습니다.
+
+        Args:
+            interview_ids: 평가할 면접 ID (InterviewSession에는 job_id가 없으므로 명시)
+            max_parallel: 동시에 진행할 지원자 수 상한 (기본 EVALUATION_BATCH_MAX_PARALLEL)
+            competency_weights: 가중치 (None이면 Job.competency_weights)
+            batch_id: 진행 기록 키. 중단된 배치를 같은 batch_id로 다시 호출하면 완료된 지원자는 건너뛰고
+                      진행 중이던 지원자는 노드 체크포인트에서 재개 (None이면 새 배치)
+
+        Returns:
+            summarize_batch() 결과 (지원자별 / 전체 처리량 포함)
+        """
+        from core.config import EVALUATION_BATCH_ADMISSION_INTERVAL, EVALUATION_BATCH_MAX_PARALLEL
+
+        if competency_weights is None:
+            competency_weights = await asyncio.to_thread(self._load_job_weights, job_id)
+        # 같은 초에 시작한 배치끼리 진행 기록 키가 겹치지 않도록 uuid 사용
+        batch_id = batch_id or uuid.uuid4().hex
+        progress = JobBatchProgress(self.checkpoint_store, job_id, batch_id)
+        if self.checkpoint_store is None:
+            print(f"[Batch] 체크포인트 저장소가 없어 진행 기록은 메모리에만 남습니다 ({progress.run_key})")
+
+        async def load_input(interview_id: int) -> Dict:
+            return await asyncio.to_thread(self._load_batch_input, interview_id)
+
+        async def evaluate(interview_id: int, inputs: Dict, resume_from: Optional[str]) -> Dict:
+            return await self.evaluate_interview(
+                interview_id=interview_id,
+                applicant_id=inputs["applicant_id"],
+                job_id=job_id,
+                transcript=inputs["transcript"],
+                competency_weights=competency_weights,
+                resume_data=inputs.get("resume_data"),
+                resume_from=resume_from,
+                prompts=inputs.get("prompts"),
+                # 같은 interview가 다른 배치/큐 작업과 겹쳐도 체크포인트가 섞이지 않도록 배치별 키 사용
+                run=batch_id,
+            )
+
+        return await run_job_batch(
+            job_id,
+            batch_id,
+            list(interview_ids),
+            load_input,
+            evaluate,
+            progress,
+            limiter=get_rate_limiter(get_model_router().select("rubric_scoring")),
+            max_parallel=max_parallel or EVALUATION_BATCH_MAX_PARALLEL,
+            admission_interval=EVALUATION_BATCH_ADMISSION_INTERVAL,
+        )
+
     def _save_evaluation_to_db(
         self, 
         db: Session, 
@@ -470,7 +1053,10 @@ class EvaluationService:
         stage2_aggregator_s3_url: str,
         stage3_final_s3_url: str,
         presentation_s3_url: str, 
-        evaluation_run_ts: str
+        evaluation_run_ts: str,
+        llm_usage_s3_url: Optional[str] = None,
+        reevaluation_snapshot_s3_url: Optional[str] = None,
+        trace_s3_url: Optional[str] = None
     ):
         """평가 결과를 DB에 저장"""
         
@@ -537,7 +1123,14 @@ class EvaluationService:
                 "stage3_final_integration": stage3_final_s3_url,
                 "stage4_presentation_frontend": presentation_s3_url,  
                 "execution_logs": agent_logs_s3_url,
+                "llm_usage": llm_usage_s3_url,
+                "reevaluation_snapshot": reevaluation_snapshot_s3_url,
+                "trace": trace_s3_url,
             },
+            # 프롬프트 변경 후 재평가 대상 판단용 (get_stale_evaluations)
+            "prompt_hashes": state.get("prompt_hashes"),
+            # job 단위 비용 집계용 (get_job_llm_usage)
+            "llm_usage": state.get("llm_usage"),
             "evaluation_run_ts": evaluation_run_ts,
             "evaluation_prefix": f"evaluations/{state.get('interview_id')}/{evaluation_run_ts}"
         }
@@ -600,3 +1193,13 @@ class EvaluationService:
         db.commit()
         db.refresh(evaluation_record)
         return evaluation_record
+
+    def get_job_llm_usage(self, db: Session, job_id: int) -> Dict:
+        """job의 모든 평가 LLM 사용량 합산 (노드/모델별 토큰·비용·지연)"""
+        evaluations = db.query(Evaluation).filter(Evaluation.job_id == job_id).all()
+        summary = merge_llm_usage(
+            (evaluation.evaluation_metadata or {}).get("llm_usage")
+            for evaluation in evaluations
+        )
+        summary["job_id"] = job_id
+        return summary
@@ -0,0 +1,231 @@
+"""
+job 단위 배치 평가 (지원자 N명)
+
+지원자를 1명씩 evaluate_interview로 돌리면 Stage 1 호출 10개가 끝나고 Stage 2~4가 도는 동안
+TPM 예산이 놀고, 요청마다 EvaluationService(그래프 컴파일 + S3/OpenAI 클라이언트)를 새로 만들었습니다.
+
+여기서는 EvaluationService 1개(컴파일된 그래프, OpenAI 클라이언트 풀, S3 클라이언트 공유)로
+여러 지원자를 동시에 진행합니다.
+    - 스케줄링: 실행 중인 지원자가 max_parallel 미만이고 Stage 1 모델 Limiter가 대기 없이
+      호출 1건을 더 받을 수 있을 때만 다음 지원자를 시작 → 지원자들의 Stage 1 호출이 같은
+      Limiter 대기열에서 섞여 예산을 채움 (동시 호출 상한 OPENAI_MAX_IN_FLIGHT 또는 TPM/RPM 예산이 차면 시작을 미룸)
+      시작한 지원자의 호출이 Limiter에 도달하기 전에는 여유가 그대로 보이므로, 입력 로딩 중이거나
+      평가를 시작한 지 admission_interval이 지나지 않은 지원자가 있으면 다음 지원자를 시작하지 않음
+    - 진행 기록: 지원자마다 started / completed / failed를 체크포인트 저장소에 기록
+      (run_key = job_batch:{job_id}:{batch_id}). 같은 batch_id로 다시 실행하면 완료된 지원자는
+      건너뛰고, 시작했지만 끝나지 않은 지원자는 노드 체크포인트에서 재개(resume_from="latest")
+    - 처리량: 지원자별 wall time / LLM 호출 / 토큰, 배치 전체 지원자/분, 토큰/분, TPM 사용률
+"""
+
+import asyncio
+import json
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+def batch_run_key(job_id: int, batch_id: str) -> str:
+    return f"job_batch:{job_id}:{batch_id}"
+
+
+class JobBatchProgress:
+    """지원자별 진행 기록 (체크포인트 저장소의 node 자리에 interview:{id} 저장, store가 None이면 메모리만)"""
+
+    def __init__(self, store, job_id: int, batch_id: str):
+        self.store = store
+        self.run_key = batch_run_key(job_id, batch_id)
+        self.records: Dict[int, Dict[str, Any]] = {}
+
+    async def load(self) -> Dict[int, Dict[str, Any]]:
+        if self.store is not None:
+            for row in await self.store.alist(self.run_key):
+                record = json.loads(row["state"])
+                self.records[record["interview_id"]] = record
+        return self.records
+
+    async def record(self, record: Dict[str, Any]) -> None:
+        self.records[record["interview_id"]] = record
+        if self.store is None:
+            return
+        try:
+            await self.store.asave(
+                self.run_key, f"interview:{record['interview_id']}", json.dumps(record, ensure_ascii=False, default=str)
+            )
+        except Exception as e:
+            # 진행 기록 실패가 배치 자체를 멈추지 않도록 함
+            print(f"[Batch] {self.run_key} 진행 기록 실패: {e}")
+
+
+def _applicant_record(interview_id: int, applicant_id: Optional[int], started: float, result: Dict) -> Dict[str, Any]:
+    wall = time.perf_counter() - started
+    total = (result.get("llm_usage") or {}).get("total") or {}
+    tokens = (total.get("prompt_tokens") or 0) + (total.get("completion_tokens") or 0)
+    return {
+        "interview_id": interview_id,
+        "applicant_id": applicant_id,
+        "status": "completed",
+        "evaluation_id": result.get("evaluation_id"),
+        "final_score": result.get("final_score"),
+        "wall_seconds": round(wall, 2),
+        "llm_calls": total.get("calls", 0),
+        "prompt_tokens": total.get("prompt_tokens", 0),
+        "completion_tokens": total.get("completion_tokens", 0),
+        "tokens_per_second": round(tokens / wall, 1) if wall > 0 else 0.0,
+        "cost_usd": total.get("cost_usd", 0.0),
+        "completed_at": datetime.now().isoformat(),
+    }
+
+
+def summarize_batch(
+    job_id: int,
+    batch_id: str,
+    interview_ids: List[int],
+    records: Dict[int, Dict[str, Any]],
+    wall_seconds: float,
+    tokens_per_minute_budget: Optional[int] = None,
+    resumed: Optional[List[int]] = None,
+    peak_parallel: int = 0
+) -> Dict[str, Any]:
+    """지원자별 기록 → 배치 처리량 요약 (이번 실행에서 처리한 지원자 기준)"""
+    resumed = set(resumed or [])
+    applicants = [records[i] for i in interview_ids if i in records]
+    processed = [r for r in applicants if r["interview_id"] not in resumed]
+    completed = [r for r in processed if r["status"] == "completed"]
+    tokens = sum((r.get("prompt_tokens") or 0) + (r.get("completion_tokens") or 0) for r in completed)
+    minutes = wall_seconds / 60 if wall_seconds > 0 else 0
+
+    tokens_per_minute = round(tokens / minutes, 1) if minutes else 0.0
+    return {
+        "job_id": job_id,
+        "batch_id": batch_id,
+        "total": len(interview_ids),
+        "completed": sum(1 for r in applicants if r["status"] == "completed"),
+        "failed": sum(1 for r in applicants if r["status"] == "failed"),
+        "skipped_already_completed": len(resumed),
+        "processed_this_run": len(processed),
+        "peak_parallel": peak_parallel,
+        "wall_seconds": round(wall_seconds, 2),
+        "applicants_per_minute": round(len(completed) / minutes, 2) if minutes else 0.0,
+        "avg_applicant_seconds": (
+            round(sum(r["wall_seconds"] for r in completed) / len(completed), 2) if completed else 0.0
+        ),
+        "llm_calls": sum(r.get("llm_calls") or 0 for r in completed),
+        "tokens": tokens,
+        "tokens_per_minute": tokens_per_minute,
+        "tpm_budget": tokens_per_minute_budget,
+        "tpm_utilization": (
+            round(tokens_per_minute / tokens_per_minute_budget, 3) if tokens_per_minute_budget else None
+        ),
+        "cost_usd": round(sum(r.get("cost_usd") or 0 for r in completed), 6),
+        "applicants": applicants,
+    }
+
+
+async def run_job_batch(
+    job_id: int,
+    batch_id: str,
+    interview_ids: List[int],
+    load_input: Callable[[int], Awaitable[Dict[str, Any]]],
+    evaluate: Callable[[int, Dict[str, Any], Optional[str]], Awaitable[Dict]],
+    progress: JobBatchProgress,
+    limiter=None,
+    max_parallel: int = 4,
+    admission_interval: float = 0.5
+) -> Dict[str, Any]:
+    """
+    지원자 배치 스케줄러
+
+    Args:
+        load_input: interview_id → {"applicant_id", "transcript", "resume_data", "prompts", "call_tokens"}
+                    (call_tokens: Stage 1 호출 1건의 예상 토큰, Limiter 여유 판단용)
+        evaluate: (interview_id, load_input 결과, resume_from) → evaluate_interview 결과
+        limiter: Stage 1 모델의 TokenBucketRateLimiter (None이면 max_parallel만 적용,
+                 예산이 꺼져 있어도 동시 호출 상한으로 시작을 미룸)
+        max_parallel: 동시에 진행할 지원자 수 상한
+
+    Returns:
+        summarize_batch() 결과
+    """
+    records = await progress.load()
+    resumed = [i for i in interview_ids if (records.get(i) or {}).get("status") == "completed"]
+    queue = [i for i in interview_ids if i not in resumed]
+    if resumed:
+        print(f"[Batch] {progress.run_key}: 완료된 지원자 {len(resumed)}명 건너뜀, 남은 지원자 {len(queue)}명")
+
+    call_tokens = 1
+    peak_parallel = 0
+    # 시작했지만 아직 평가(Stage 1 호출)에 들어가지 않은 지원자 수 / 마지막 평가 시작 후 Limiter 판단을 미룰 시각
+    starting = 0
+    settle_until = 0.0
+
+    async def run_one(interview_id: int) -> None:
+        nonlocal call_tokens, starting, settle_until
+        previous = records.get(interview_id)
+        # 이전 배치에서 시작만 하고 끝나지 않은 지원자는 노드 체크포인트에서 재개
+        resume_from = "latest" if previous is not None else None
+        attempts = (previous or {}).get("attempts", 0) + 1
+        started = time.perf_counter()
+        applicant_id = None
+        loading = True
+        try:
+            inputs = await load_input(interview_id)
+            applicant_id = inputs.get("applicant_id")
+            call_tokens = max(call_tokens, inputs.get("call_tokens") or 1)
+            await progress.record({
+                "interview_id": interview_id,
+                "applicant_id": applicant_id,
+                "status": "started",
+                "attempts": attempts,
+                "started_at": datetime.now().isoformat(),
+            })
+            starting -= 1
+            loading = False
+            settle_until = time.monotonic() + admission_interval
+            result = await evaluate(interview_id, inputs, resume_from)
+            record = _applicant_record(interview_id, applicant_id, started, result)
+        except Exception as e:
+            if loading:
+                starting -= 1
+            print(f"[Batch] interview {interview_id} 평가 실패: {e}")
+            record = {
+                "interview_id": interview_id,
+                "applicant_id": applicant_id,
+                "status": "failed",
+                "error": str(e),
+                "wall_seconds": round(time.perf_counter() - started, 2),
+                "completed_at": datetime.now().isoformat(),
+            }
+        record["attempts"] = attempts
+        await progress.record(record)
+
+    start = time.perf_counter()
+    running = set()
+    while queue or running:
+        # 슬롯이 있고 Limiter가 대기 없이 호출을 더 받을 수 있을 때만 다음 지원자 시작
+        # (실행 중인 지원자가 없으면 예산과 무관하게 시작)
+        while queue and len(running) < max_parallel and (
+            not running or limiter is None or (
+                starting == 0 and time.monotonic() >= settle_until and limiter.has_capacity(call_tokens)
+            )
+        ):
+            starting += 1
+            running.add(asyncio.create_task(run_one(queue.pop(0))))
+            peak_parallel = max(peak_parallel, len(running))
+        _, running = await asyncio.wait(running, timeout=admission_interval, return_when=asyncio.FIRST_COMPLETED)
+
+    summary = summarize_batch(
+        job_id,
+        batch_id,
+        interview_ids,
+        records,
+        time.perf_counter() - start,
+        tokens_per_minute_budget=getattr(limiter, "tokens_per_minute", None),
+        resumed=resumed,
+        peak_parallel=peak_parallel,
+    )
+    print(
+        f"[Batch] {progress.run_key}: 완료 {summary['completed']}/{summary['total']}, 실패 {summary['failed']}, "
+        f"{summary['wall_seconds']}s, {summary['applicants_per_minute']}명/분, "
+        f"{summary['tokens_per_minute']} tok/분 (TPM 사용률 {summary['tpm_utilization']})"
+    )
+    return summary
@@ -0,0 +1,378 @@
+"""
+평가 작업 큐
+
+/evaluations/stream과 Lambda 핸들러가 수 분짜리 평가 그래프를 요청 안에서 직접 실행해서,
+연결이 끊기거나 워커가 재시작되면 진행 중인 평가가 사라졌습니다.
+API는 작업을 큐에 넣고 job id를 바로 반환하고, 워커 풀(worker_pool.py)이 작업을 가져가 실행합니다.
+
+    - 멱등성: (interview_id, run) 당 작업 1개 (idempotency_key = interview:{id}:run:{run}).
+      같은 키로 다시 넣으면 기존 작업을 그대로 반환하고, 실패로 끝난 작업만 다시 대기열에 올림
+      run을 생략하면 매번 새 작업 (요청 내용 해시 + 임의 suffix). 단, 같은 요청의 작업이 대기/실행 중이거나
+      EVALUATION_QUEUE_DEDUP_SECONDS 안에 성공했으면 그 작업을 반환 (클라이언트 재시도 중복 방지)
+    - visibility timeout: claim한 워커가 locked_until 전에 extend()하지 않으면 (프로세스 종료 등)
+      다른 워커가 다시 가져감 (attempts 증가, 노드 체크포인트에서 재개)
+    - 재시도: fail(retry_delay=...)이면 available_at 이후 다시 대기, attempts가 max_attempts에 도달하면 failed
+    - 진행 상황: 워커가 마지막 진행 이벤트를 progress 컬럼에 기록 → 다른 프로세스의 API도 조회 가능
+    - job 배치 (enqueue_job_batch): (job_id, batch_id) 당 작업 1개, 워커가 evaluate_job_batch로 실행
+      (interview_id는 0, 재시도 시 같은 batch_id의 진행 기록으로 완료된 지원자를 건너뜀)
+
+백엔드 (EVALUATION_QUEUE_BACKEND):
+    - "sqlite" (기본): EVALUATION_QUEUE_PATH 로컬 파일 (BEGIN IMMEDIATE로 claim 직렬화)
+    - "postgres": EVALUATION_QUEUE_DATABASE_URL (미설정 시 DATABASE_URL, FOR UPDATE SKIP LOCKED)
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from core.config import (
+    EVALUATION_QUEUE_BACKEND,
+    EVALUATION_QUEUE_DATABASE_URL,
+    EVALUATION_QUEUE_DEDUP_SECONDS,
+    EVALUATION_QUEUE_MAX_ATTEMPTS,
+    EVALUATION_QUEUE_PATH,
+)
+
+
+JOB_COLUMNS = (
+    "id", "idempotency_key", "interview_id", "run", "payload", "status", "attempts", "max_attempts",
+    "available_at", "locked_by", "locked_until", "last_error", "progress", "result", "created_at", "updated_at",
+)
+JSON_COLUMNS = ("payload", "progress", "result")
+TERMINAL_STATUSES = ("succeeded", "failed")
+
+_CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS evaluation_jobs (
+    id TEXT PRIMARY KEY,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    interview_id INTEGER NOT NULL,
+    run TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at {real} NOT NULL,
+    locked_by TEXT,
+    locked_until {real},
+    last_error TEXT,
+    progress TEXT,
+    result TEXT,
+    created_at {real} NOT NULL,
+    updated_at {real} NOT NULL
+)
+"""
+_CREATE_INDEX = "CREATE INDEX IF NOT EXISTS evaluation_jobs_available ON evaluation_jobs (status, available_at)"
+
+
+def idempotency_key(interview_id: int, run: str) -> str:
+    return f"interview:{interview_id}:run:{run}"
+
+
+def batch_idempotency_key(job_id: int, batch_id: str) -> str:
+    return f"job_batch:{job_id}:{batch_id}"
+
+
+def payload_run(payload: Dict[str, Any]) -> str:
+    """요청 내용 해시 (run 미지정 작업의 run prefix, 재시도 중복 판단용)"""
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:16]
+
+
+def _row_to_job(row) -> Optional[Dict[str, Any]]:
+    if row is None:
+        return None
+    job = dict(zip(JOB_COLUMNS, row))
+    for key in JSON_COLUMNS:
+        if job[key] is not None:
+            job[key] = json.loads(job[key])
+    return job
+
+
+def _dumps(value: Any) -> Optional[str]:
+    return None if value is None else json.dumps(value, ensure_ascii=False, default=str)
+
+
+class SQLiteJobQueue:
+    """SQLite 기반 평가 작업 큐 (한 호스트의 여러 프로세스가 공유)"""
+
+    # claim 후보 조회 시 행 잠금 (Postgres만 사용)
+    lock_clause = ""
+
+    def __init__(self, path: str, max_attempts: int = EVALUATION_QUEUE_MAX_ATTEMPTS):
+        self.path = path
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._transaction() as run:
+            run(_CREATE_TABLE.format(real="REAL"))
+            run(_CREATE_INDEX)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[Callable[..., Any]]:
+        """쓰기 잠금을 먼저 잡는 트랜잭션 (claim 중 다른 프로세스가 같은 작업을 가져가지 못하게 함)"""
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            with self._lock:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    yield lambda sql, params=None: conn.execute(sql, params or {})
+                    conn.execute("COMMIT")
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+        finally:
+            conn.close()
+
+    def _select(self, run, where: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        row = run(f"SELECT {', '.join(JOB_COLUMNS)} FROM evaluation_jobs WHERE {where}", params).fetchone()
+        return _row_to_job(row)
+
+    def enqueue(
+        self,
+        interview_id: int,
+        payload: Dict[str, Any],
+        run: Optional[str] = None,
+        max_attempts: Optional[int] = None
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        작업 등록
+
+        Args:
+            run: 재실행 구분 키. 같은 run으로 다시 넣으면 기존 작업 반환 (None이면 새 작업,
+                 같은 요청이 대기/실행 중이거나 EVALUATION_QUEUE_DEDUP_SECONDS 안에 성공했으면 그 작업 반환)
+
+        Returns:
+            (작업, 새로 등록/재등록 여부) - 같은 (interview_id, run) 작업이 대기/실행/성공 상태면 그대로 반환
+        """
+        now = time.time()
+        digest = None
+        run_id = run
+        if run_id is None:
+            digest = payload_run(payload)
+            run_id = f"{digest}:{uuid.uuid4().hex[:8]}"
+        key = idempotency_key(interview_id, run_id)
+        params = {
+            "id": uuid.uuid4().hex,
+            "key": key,
+            "interview_id": interview_id,
+            "run": run_id,
+            "payload": _dumps(payload),
+            "max_attempts": max_attempts or self.max_attempts,
+            "now": now,
+        }
+        with self._transaction() as execute:
+            if digest is not None:
+                recent = self._select(
+                    execute,
+                    "interview_id = :interview_id AND run LIKE :prefix AND (status IN ('queued', 'running') "
+                    "OR (status = 'succeeded' AND updated_at >= :since)) ORDER BY created_at DESC LIMIT 1",
+                    {"interview_id": interview_id, "prefix": f"{digest}:%", "since": now - EVALUATION_QUEUE_DEDUP_SECONDS},
+                )
+                if recent is not None:
+                    return recent, False
+            return self._insert_or_requeue(execute, params)
+
+    def enqueue_job_batch(
+        self,
+        job_id: int,
+        batch_id: str,
+        payload: Dict[str, Any],
+        max_attempts: Optional[int] = None
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        job 배치 작업 등록 (같은 (job_id, batch_id)는 작업 1개, 실패로 끝난 작업만 다시 대기열에 올림)
+
+        payload: {"interview_ids", "max_parallel", "competency_weights"} (kind / job_id는 여기서 채움)
+        """
+        now = time.time()
+        params = {
+            "id": uuid.uuid4().hex,
+            "key": batch_idempotency_key(job_id, batch_id),
+            "interview_id": 0,
+            "run": batch_id,
+            "payload": _dumps({**payload, "kind": "job_batch", "job_id": job_id}),
+            "max_attempts": max_attempts or self.max_attempts,
+            "now": now,
+        }
+        with self._transaction() as execute:
+            return self._insert_or_requeue(execute, params)
+
+    def _insert_or_requeue(self, execute, params: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+        inserted = execute(
+            "INSERT INTO evaluation_jobs (id, idempotency_key, interview_id, run, payload, status, attempts, "
+            "max_attempts, available_at, created_at, updated_at) "
+            "VALUES (:id, :key, :interview_id, :run, :payload, 'queued', 0, :max_attempts, :now, :now, :now) "
+            "ON CONFLICT (idempotency_key) DO NOTHING",
+            params,
+        ).rowcount == 1
+        # 최종 실패한 작업만 다시 대기열에 올림 (진행 중/성공 작업은 그대로 반환)
+        requeued = not inserted and execute(
+            "UPDATE evaluation_jobs SET status = 'queued', attempts = 0, max_attempts = :max_attempts, "
+            "payload = :payload, available_at = :now, locked_by = NULL, locked_until = NULL, "
+            "last_error = NULL, result = NULL, updated_at = :now "
+            "WHERE idempotency_key = :key AND status = 'failed'",
+            params,
+        ).rowcount == 1
+        job = self._select(execute, "idempotency_key = :key", params)
+        return job, inserted or requeued
+
+    def claim(self, worker_id: str, visibility_timeout: float) -> Optional[Dict[str, Any]]:
+        """
+        실행할 작업 1개 가져오기 (대기 시간이 지난 queued 작업 또는 잠금이 만료된 running 작업)
+
+        잠금이 만료됐는데 이미 max_attempts번 시도한 작업은 failed로 정리합니다.
+        """
+        now = time.time()
+        params = {"worker": worker_id, "now": now, "until": now + visibility_timeout}
+        with self._transaction() as execute:
+            execute(
+                "UPDATE evaluation_jobs SET status = 'failed', locked_by = NULL, locked_until = NULL, "
+                "last_error = COALESCE(last_error, 'visibility timeout'), updated_at = :now "
+                "WHERE status = 'running' AND locked_until < :now AND attempts >= max_attempts",
+                params,
+            )
+            row = execute(
+                "UPDATE evaluation_jobs SET status = 'running', attempts = attempts + 1, "
+                "locked_by = :worker, locked_until = :until, updated_at = :now "
+                "WHERE id = (SELECT id FROM evaluation_jobs "
+                "WHERE (status = 'queued' AND available_at <= :now) OR (status = 'running' AND locked_until < :now) "
+                f"ORDER BY available_at, created_at LIMIT 1 {self.lock_clause}) "
+                f"RETURNING {', '.join(JOB_COLUMNS)}",
+                params,
+            ).fetchone()
+        return _row_to_job(row)
+
+    def extend(self, job_id: str, worker_id: str, visibility_timeout: float) -> bool:
+        """잠금 연장 (False면 잠금을 잃음 → 다른 워커가 가져갔으므로 실행 중단)"""
+        now = time.time()
+        with self._transaction() as execute:
+            return execute(
+                "UPDATE evaluation_jobs SET locked_until = :until, updated_at = :now "
+                "WHERE id = :id AND locked_by = :worker AND status = 'running'",
+                {"id": job_id, "worker": worker_id, "until": now + visibility_timeout, "now": now},
+            ).rowcount == 1
+
+    def complete(self, job_id: str, worker_id: str, result: Dict[str, Any]) -> bool:
+        now = time.time()
+        with self._transaction() as execute:
+            return execute(
+                "UPDATE evaluation_jobs SET status = 'succeeded', result = :result, last_error = NULL, "
+                "locked_by = NULL, locked_until = NULL, updated_at = :now "
+                "WHERE id = :id AND locked_by = :worker AND status = 'running'",
+                {"id": job_id, "worker": worker_id, "result": _dumps(result), "now": now},
+            ).rowcount == 1
+
+    def fail(self, job_id: str, worker_id: str, error: str, retry_delay: Optional[float] = None) -> Optional[str]:
+        """
+        실패 기록
+
+        Args:
+            retry_delay: 재시도 대기(초). None이거나 max_attempts에 도달하면 failed로 종료
+
+        Returns:
+            변경된 상태 ("queued" / "failed"), 잠금을 잃었으면 None
+        """
+        now = time.time()
+        params = {"id": job_id, "worker": worker_id, "error": error[:2000], "now": now}
+        with self._transaction() as execute:
+            job = self._select(execute, "id = :id AND locked_by = :worker AND status = 'running'", params)
+            if job is None:
+                return None
+            status = "queued" if retry_delay is not None and job["attempts"] < job["max_attempts"] else "failed"
+            execute(
+                "UPDATE evaluation_jobs SET status = :status, last_error = :error, available_at = :available_at, "
+                "locked_by = NULL, locked_until = NULL, updated_at = :now WHERE id = :id",
+                {**params, "status": status, "available_at": now + (retry_delay or 0)},
+            )
+        return status
+
+    def update_progress(self, job_id: str, event: Dict[str, Any]) -> None:
+        with self._transaction() as execute:
+            execute(
+                "UPDATE evaluation_jobs SET progress = :progress, updated_at = :now WHERE id = :id",
+                {"id": job_id, "progress": _dumps(event), "now": time.time()},
+            )
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._transaction() as execute:
+            return self._select(execute, "id = :id", {"id": job_id})
+
+    # 이벤트 루프를 막지 않도록 스레드에서 실행
+    async def aenqueue(self, interview_id: int, payload: Dict[str, Any], run: Optional[str] = None,
+                       max_attempts: Optional[int] = None) -> Tuple[Dict[str, Any], bool]:
+        return await asyncio.to_thread(self.enqueue, interview_id, payload, run, max_attempts)
+
+    async def aenqueue_job_batch(self, job_id: int, batch_id: str, payload: Dict[str, Any],
+                                 max_attempts: Optional[int] = None) -> Tuple[Dict[str, Any], bool]:
+        return await asyncio.to_thread(self.enqueue_job_batch, job_id, batch_id, payload, max_attempts)
+
+    async def aclaim(self, worker_id: str, visibility_timeout: float) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self.claim, worker_id, visibility_timeout)
+
+    async def aextend(self, job_id: str, worker_id: str, visibility_timeout: float) -> bool:
+        return await asyncio.to_thread(self.extend, job_id, worker_id, visibility_timeout)
+
+    async def acomplete(self, job_id: str, worker_id: str, result: Dict[str, Any]) -> bool:
+        return await asyncio.to_thread(self.complete, job_id, worker_id, result)
+
+    async def afail(self, job_id: str, worker_id: str, error: str, retry_delay: Optional[float] = None) -> Optional[str]:
+        return await asyncio.to_thread(self.fail, job_id, worker_id, error, retry_delay)
+
+    async def aupdate_progress(self, job_id: str, event: Dict[str, Any]) -> None:
+        await asyncio.to_thread(self.update_progress, job_id, event)
+
+    async def aget(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self.get, job_id)
+
+
+class PostgresJobQueue(SQLiteJobQueue):
+    """Postgres 기반 평가 작업 큐 (여러 호스트/Lambda의 워커가 SKIP LOCKED로 작업을 나눠 가져감)"""
+
+    lock_clause = "FOR UPDATE SKIP LOCKED"
+
+    def __init__(self, database_url: str, max_attempts: int = EVALUATION_QUEUE_MAX_ATTEMPTS):
+        from sqlalchemy import create_engine, text
+
+        self.max_attempts = max_attempts
+        self._text = text
+        self._engine = create_engine(database_url, pool_size=2, max_overflow=2, pool_pre_ping=True)
+        with self._transaction() as run:
+            run(_CREATE_TABLE.format(real="DOUBLE PRECISION"))
+            run(_CREATE_INDEX)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[Callable[..., Any]]:
+        with self._engine.begin() as conn:
+            yield lambda sql, params=None: conn.execute(self._text(sql), params or {})
+
+
+_default_queue = None
+
+
+def get_evaluation_queue():
+    """프로세스 공용 큐 (EVALUATION_QUEUE_BACKEND 설정 사용)"""
+    global _default_queue
+    if _default_queue is None:
+        backend = EVALUATION_QUEUE_BACKEND
+        if backend == "sqlite":
+            _default_queue = SQLiteJobQueue(EVALUATION_QUEUE_PATH)
+        elif backend == "postgres":
+            _default_queue = PostgresJobQueue(EVALUATION_QUEUE_DATABASE_URL)
+        else:
+            raise ValueError(f"알 수 없는 EVALUATION_QUEUE_BACKEND: {backend}")
+    return _default_queue
+
+
+def set_evaluation_queue(queue) -> None:
+    """큐 교체 (테스트/다른 백엔드 주입용)"""
+    global _default_queue
+    _default_queue = queue
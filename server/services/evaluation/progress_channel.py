@@ -0,0 +1,118 @@
+"""
+평가 진행 이벤트 채널
+
+평가 그래프 내부(노드 시작/완료, CompetencyAgent 역량별 이벤트, aggregator Sub-step)에서 발생한
+진행 이벤트를 SSE 엔드포인트가 실시간으로 소비할 수 있도록 전달합니다.
+컨텍스트의 progress_channel로 노드에 전달되며(ai/agents/graph/context.py), 없으면 이벤트는 발행되지 않습니다.
+
+    - 이벤트마다 증가하는 id를 붙이고 최근 max_events개만 보관 (평가별 재전송 버퍼)
+    - 소비자 여러 개가 각자 위치(last_event_id)부터 읽음 → SSE 재연결(Last-Event-ID) 시 이어서 전송
+    - 평가별 채널은 open_progress_channel(key)로 등록하고, 종료된 채널은 최근
+      EVALUATION_PROGRESS_RETAINED_CHANNELS개만 남김 (기존 모듈 전역 progress_store 대체)
+"""
+
+import asyncio
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Optional
+
+from core.config import EVALUATION_PROGRESS_BUFFER_SIZE, EVALUATION_PROGRESS_RETAINED_CHANNELS
+
+
+# 대기 중 heartbeat 주기마다 events()가 내보내는 항목 (id 없음, SSE 주석으로 전송)
+HEARTBEAT = {"event": "heartbeat", "data": {}}
+
+
+class ProgressChannel:
+    """단일 평가의 진행 이벤트 (발행자 여러 개 → 소비자 여러 개, 최근 이벤트 재전송 버퍼)"""
+
+    def __init__(self, evaluation_id: Optional[Any] = None, max_events: int = EVALUATION_PROGRESS_BUFFER_SIZE):
+        self.evaluation_id = evaluation_id
+        self._events: "deque[Dict[str, Any]]" = deque(maxlen=max_events)
+        self._wake = asyncio.Event()
+        self.last_event_id = 0
+        self.closed = False
+
+    def _notify(self) -> None:
+        self._wake.set()
+        self._wake = asyncio.Event()
+
+    def publish(self, event: str, data: Dict[str, Any]) -> None:
+        """이벤트 발행 (대기 없음, 닫힌 채널이면 무시)"""
+        if self.closed:
+            return
+        self.last_event_id += 1
+        self._events.append({
+            "id": self.last_event_id,
+            "event": event,
+            "data": data,
+            "timestamp": datetime.now().isoformat(),
+        })
+        self._notify()
+
+    def close(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self._notify()
+
+    def reopen(self) -> None:
+        """같은 평가의 재시도 (id는 이어서 증가)"""
+        self.closed = False
+
+    async def events(
+        self,
+        last_event_id: int = 0,
+        heartbeat: Optional[float] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        last_event_id 이후 이벤트를 발행 순서대로 반환 (close()될 때까지)
+
+        Args:
+            last_event_id: 이미 받은 마지막 이벤트 id (재연결 시 Last-Event-ID)
+            heartbeat: 지정 시 이 시간(초) 동안 새 이벤트가 없으면 HEARTBEAT 반환
+        """
+        cursor = last_event_id
+        while True:
+            # yield 중에 발행된 이벤트를 놓치지 않도록 대기 대상 Event를 먼저 잡아 둠
+            wake = self._wake
+            pending = [item for item in self._events if item["id"] > cursor]
+            if pending and pending[0]["id"] > cursor + 1:
+                # 재전송 버퍼를 넘어 밀려난 이벤트가 있음
+                yield {
+                    "event": "replay_truncated",
+                    "data": {"last_event_id": cursor, "first_available_id": pending[0]["id"]},
+                }
+            for item in pending:
+                cursor = item["id"]
+                yield item
+            if self.closed and cursor >= self.last_event_id:
+                return
+            if pending:
+                continue
+            try:
+                await asyncio.wait_for(wake.wait(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield HEARTBEAT
+
+
+_channels: "OrderedDict[Any, ProgressChannel]" = OrderedDict()
+
+
+def open_progress_channel(key: Any) -> ProgressChannel:
+    """평가(작업)별 채널 등록 (이미 있으면 다시 열어 재사용)"""
+    channel = _channels.get(key)
+    if channel is None:
+        channel = _channels[key] = ProgressChannel(key)
+    else:
+        channel.reopen()
+        _channels.move_to_end(key)
+
+    # 종료된 채널부터 오래된 순으로 정리
+    closed = [k for k, c in _channels.items() if c.closed]
+    for k in closed[:max(0, len(_channels) - EVALUATION_PROGRESS_RETAINED_CHANNELS)]:
+        del _channels[k]
+    return channel
+
+
+def get_progress_channel(key: Any) -> Optional[ProgressChannel]:
+    return _channels.get(key)
@@ -0,0 +1,253 @@
+"""
+가중치 재계산 서비스 (LLM 재실행 없음)
+
+최종 점수 / 신뢰도 / Stage 4 score_breakdown은 저장된 Stage 2 결과(aggregated_competencies)와
+가중치만으로 결정되므로, 가중치가 바뀌어도 그래프를 다시 돌릴 필요가 없습니다.
+Evaluation.individual_evaluations(= Stage 2 aggregated_competencies)를 읽어 재계산하고
+(없으면 S3 stage2_aggregator.json), 점수 컬럼과 final_result를 갱신합니다.
+
+LLM이 만든 부분(overall_evaluation_summary, 역량별 강점/약점/근거)은 가중치와 무관하므로 그대로 둡니다.
+"""
+
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from ai.agents.competency_agent import COMPETENCY_CONFIGS
+from ai.agents.graph.final_integration_node import FinalIntegrator
+from ai.agents.graph.presentation_formatter_node import PresentationFormatter
+from models.evaluation import Evaluation
+from models.job import Job
+
+
+KNOWN_COMPETENCIES = [name for name, _, _ in COMPETENCY_CONFIGS]
+
+
+def validate_weights(competency_weights: Dict[str, float]) -> Dict[str, float]:
+    """알 수 없는 역량 / 음수 / 합 0 가중치 거부"""
+    if not competency_weights:
+        raise ValueError("competency_weights가 비어 있습니다")
+    unknown = sorted(set(competency_weights) - set(KNOWN_COMPETENCIES))
+    if unknown:
+        raise ValueError(f"알 수 없는 역량: {', '.join(unknown)}")
+    weights = {name: float(weight) for name, weight in competency_weights.items()}
+    negative = sorted(name for name, weight in weights.items() if weight < 0)
+    if negative:
+        raise ValueError(f"음수 가중치: {', '.join(negative)}")
+    if sum(weights.values()) <= 0:
+        raise ValueError("가중치 합이 0입니다")
+    return weights
+
+
+def rescore_aggregated(
+    aggregated_competencies: Dict[str, Dict],
+    competency_weights: Dict[str, float],
+    collaboration_results: Optional[List[Dict]] = None,
+    low_confidence_list: Optional[List[Dict]] = None,
+    final_result: Optional[Dict] = None
+) -> Dict:
+    """
+    Stage 2 결과 + 새 가중치 → final_integration / presentation_formatter와 같은 점수 계산
+
+    Returns:
+        {
+            "final_score": 82.5,
+            "avg_confidence": 0.78,
+            "reliability": {...},
+            "competency_scores": [...],
+            "score_breakdown": {...},
+            "final_result": 기존 final_result에 새 점수/가중치를 덮어쓴 사본
+        }
+    """
+    scores = FinalIntegrator.compute_scores(
+        aggregated_competencies,
+        competency_weights,
+        collaboration_results,
+        low_confidence_list
+    )
+    adjusted = scores["aggregated_competencies"]
+
+    updated_result = dict(final_result or {})
+    updated_result.update({
+        "final_score": scores["final_score"],
+        "avg_confidence": scores["avg_confidence"],
+        "reliability": scores["reliability"],
+        "competency_scores": scores["competency_scores"],
+    })
+    details = updated_result.get("competency_details")
+    if details:
+        updated_result["competency_details"] = {
+            comp_name: {
+                **detail,
+                **(
+                    FinalIntegrator.weight_fields(adjusted[comp_name], competency_weights.get(comp_name, 0.0))
+                    if comp_name in adjusted else {}
+                )
+            }
+            for comp_name, detail in details.items()
+        }
+
+    score_breakdown = PresentationFormatter._calculate_score_breakdown(
+        adjusted,
+        competency_weights,
+        updated_result
+    )
+
+    return {
+        "final_score": scores["final_score"],
+        "avg_confidence": scores["avg_confidence"],
+        "reliability": scores["reliability"],
+        "competency_scores": scores["competency_scores"],
+        "score_breakdown": score_breakdown,
+        "final_result": updated_result
+    }
+
+
+class RescoringService:
+    """
+    job 단위 가중치 재계산 (지원자 1명 또는 전체)
+    """
+
+    def __init__(self, s3_service=None):
+        # individual_evaluations가 비어 있는 (이전 버전) 평가만 S3 Stage 2 아티팩트에서 읽음
+        self.s3_service = s3_service
+
+    def rescore_job(
+        self,
+        db: Session,
+        job_id: int,
+        competency_weights: Optional[Dict[str, float]] = None,
+        applicant_ids: Optional[Iterable[int]] = None,
+        save_weights: bool = False,
+        update_presentation: bool = False
+    ) -> Dict:
+        """
+        Args:
+            competency_weights: 새 가중치 (None이면 Job.competency_weights 사용)
+            applicant_ids: 대상 지원자 (None이면 job의 전체 평가)
+            save_weights: True면 Job.competency_weights도 갱신
+            update_presentation: True면 S3 stage4_presentation_frontend.json의 점수 부분도 갱신
+
+        Returns:
+            {"job_id", "competency_weights", "rescored": [...], "skipped": [...], "duration_ms"}
+        """
+        started = datetime.now()
+
+        job = db.query(Job).filter(Job.id == job_id).first()
+        if competency_weights is None:
+            if job is None or not job.competency_weights:
+                raise ValueError(f"job {job_id}에 저장된 competency_weights가 없습니다")
+            competency_weights = job.competency_weights
+        weights = validate_weights(competency_weights)
+
+        query = db.query(Evaluation).filter(Evaluation.job_id == job_id)
+        if applicant_ids is not None:
+            query = query.filter(Evaluation.applicant_id.in_(list(applicant_ids)))
+        evaluations = query.all()
+
+        rescored = []
+        skipped = []
+        for evaluation in evaluations:
+            aggregated = self._load_aggregated(evaluation)
+            if not aggregated:
+                skipped.append({"evaluation_id": evaluation.id, "applicant_id": evaluation.applicant_id})
+                continue
+            previous_score = evaluation.match_score
+            result = self._apply(evaluation, aggregated, weights)
+            if update_presentation:
+                self._update_presentation(evaluation, result)
+            rescored.append({
+                "evaluation_id": evaluation.id,
+                "applicant_id": evaluation.applicant_id,
+                "previous_score": previous_score,
+                "final_score": result["final_score"],
+                "reliability": result["reliability"]["level"],
+            })
+
+        if save_weights and job is not None:
+            job.competency_weights = weights
+        db.commit()
+
+        duration_ms = (datetime.now() - started).total_seconds() * 1000
+        print(f"[Rescoring] job {job_id}: {len(rescored)}건 재계산, {len(skipped)}건 스킵 ({duration_ms:.1f}ms)")
+
+        return {
+            "job_id": job_id,
+            "competency_weights": weights,
+            "rescored": rescored,
+            "skipped": skipped,
+            "duration_ms": round(duration_ms, 2)
+        }
+
+    def _s3_key(self, evaluation: Evaluation, stage: str) -> Optional[str]:
+        url = ((evaluation.evaluation_metadata or {}).get("s3_paths") or {}).get(stage)
+        if not url or self.s3_service is None:
+            return None
+        return url.split(f"s3://{self.s3_service.bucket_name}/", 1)[-1]
+
+    def _load_aggregated(self, evaluation: Evaluation) -> Optional[Dict]:
+        if evaluation.individual_evaluations:
+            return evaluation.individual_evaluations
+        key = self._s3_key(evaluation, "stage2_aggregator")
+        if key is None:
+            return None
+        artifact = self.s3_service.download_json(key) or {}
+        return artifact.get("aggregated_competencies")
+
+    def _update_presentation(self, evaluation: Evaluation, result: Dict) -> None:
+        """Stage 4 결과에서 가중치에 의존하는 부분만 교체 (근거/강점/약점은 유지)"""
+        key = self._s3_key(evaluation, "stage4_presentation_frontend")
+        if key is None:
+            return
+        presentation = self.s3_service.download_json(key)
+        if not presentation:
+            return
+        presentation["score_breakdown"] = result["score_breakdown"]
+        presentation["competency_scores"] = result["competency_scores"]
+        presentation["overall_summary"] = {
+            **(presentation.get("overall_summary") or {}),
+            "final_score": result["final_score"],
+            "avg_confidence": result["avg_confidence"],
+            "reliability": result["reliability"],
+        }
+        self.s3_service.upload_json(key, presentation)
+
+    def _apply(self, evaluation: Evaluation, aggregated: Dict, weights: Dict[str, float]) -> Dict:
+        aggregated_evaluation = evaluation.aggregated_evaluation or {}
+        final_result = aggregated_evaluation.get("final_result") or {}
+        collaboration_results = (final_result.get("collaboration_summary") or {}).get("adjustments")
+        low_confidence_list = (evaluation.validation_result or {}).get("low_confidence_list")
+
+        result = rescore_aggregated(
+            aggregated,
+            weights,
+            collaboration_results=collaboration_results,
+            low_confidence_list=low_confidence_list,
+            final_result=final_result
+        )
+        updated_final_result = {**result["final_result"], "score_breakdown": result["score_breakdown"]}
+        previous_score = evaluation.match_score
+
+        # JSON 컬럼은 변경 추적이 안 되므로 새 dict로 교체
+        evaluation.match_score = result["final_score"]
+        evaluation.normalized_score = result["final_score"]
+        evaluation.weighted_score = result["final_score"]
+        evaluation.confidence_score = result["avg_confidence"]
+        evaluation.match_result = {
+            **(evaluation.match_result or {}),
+            "final_score": result["final_score"],
+            "reliability": result["reliability"]["level"],
+            "reliability_note": result["reliability"]["note"],
+        }
+        evaluation.aggregated_evaluation = {**aggregated_evaluation, "final_result": updated_final_result}
+        evaluation.evaluation_metadata = {
+            **(evaluation.evaluation_metadata or {}),
+            "rescoring": {
+                "competency_weights": weights,
+                "previous_score": previous_score,
+                "rescored_at": datetime.now().isoformat(),
+            }
+        }
+        evaluation.updated_at = datetime.now()
+        return result
@@ -0,0 +1,203 @@
+"""
+평가 워커 풀
+
+평가 작업 큐(job_queue.py)에서 작업을 가져와 EvaluationService.stream_evaluation으로 실행합니다.
+    - 동시 작업 수: concurrency (EVALUATION_WORKER_CONCURRENCY)
+    - 실행 중에는 visibility_timeout / 3마다 잠금을 연장하고, 잠금을 잃으면(다른 워커가 가져감) 실행을 취소
+    - 진행 이벤트는 작업별 ProgressChannel(open_progress_channel(job_id))로 발행 → 같은 프로세스의 SSE가
+      그대로 전달하고, 마지막 이벤트는 큐의 progress 컬럼에도 기록 (다른 프로세스의 SSE / 상태 조회용)
+    - 실패 시 base * 2^(시도-1)초 뒤 재시도 (최대 EVALUATION_QUEUE_RETRY_MAX_SECONDS),
+      두 번째 시도부터는 같은 run의 노드 체크포인트에서 재개(resume_from="latest")
+    - 입력 오류(ValueError: transcript 없음 등)는 재시도하지 않음
+    - job 배치 작업(payload kind="job_batch")은 EvaluationService.evaluate_job_batch로 실행
+      (재시도하면 같은 batch_id의 진행 기록에서 이어서 실행)
+"""
+
+import asyncio
+import os
+import socket
+import uuid
+from typing import Any, Dict, List, Optional
+
+from core.config import (
+    EVALUATION_QUEUE_RETRY_BASE_SECONDS,
+    EVALUATION_QUEUE_RETRY_MAX_SECONDS,
+    EVALUATION_QUEUE_VISIBILITY_TIMEOUT,
+    EVALUATION_WORKER_CONCURRENCY,
+    EVALUATION_WORKER_POLL_INTERVAL,
+)
+from services.evaluation.progress_channel import open_progress_channel
+
+
+def retry_delay(attempts: int) -> float:
+    return min(EVALUATION_QUEUE_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0), EVALUATION_QUEUE_RETRY_MAX_SECONDS)
+
+
+class EvaluationWorkerPool:
+    """큐 작업을 동시에 concurrency개까지 실행하는 async 워커 묶음"""
+
+    def __init__(
+        self,
+        queue,
+        service=None,
+        concurrency: int = EVALUATION_WORKER_CONCURRENCY,
+        visibility_timeout: float = EVALUATION_QUEUE_VISIBILITY_TIMEOUT,
+        poll_interval: float = EVALUATION_WORKER_POLL_INTERVAL
+    ):
+        """
+        Args:
+            queue: SQLiteJobQueue / PostgresJobQueue
+            service: EvaluationService (None이면 첫 작업에서 생성, 모든 작업이 공유)
+        """
+        self.queue = queue
+        self._service = service
+        self.concurrency = concurrency
+        self.visibility_timeout = visibility_timeout
+        self.poll_interval = poll_interval
+        self.worker_prefix = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def service(self):
+        if self._service is None:
+            from services.evaluation.evaluation_service import EvaluationService
+            self._service = EvaluationService()
+        return self._service
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._worker(f"{self.worker_prefix}:{i}")) for i in range(self.concurrency)
+        ]
+        print(f"[Queue] 평가 워커 {self.concurrency}개 시작 ({self.worker_prefix})")
+
+    async def stop(self) -> None:
+        """워커 종료 (실행 중이던 작업은 visibility timeout 후 다른 워커가 다시 가져감)"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _worker(self, worker_id: str) -> None:
+        while True:
+            try:
+                processed = await self.process_next(worker_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # 큐 DB 장애 등으로 워커가 죽지 않도록 함
+                print(f"[Queue] {worker_id} 작업 처리 오류: {e}")
+                processed = False
+            if not processed:
+                await asyncio.sleep(self.poll_interval)
+
+    async def drain(self, max_jobs: Optional[int] = None) -> int:
+        """대기 중인 작업을 바로 실행할 수 있는 것이 없을 때까지 처리 (Lambda / 스크립트용)"""
+        processed = 0
+
+        async def run(worker_id: str) -> None:
+            nonlocal processed
+            while max_jobs is None or processed < max_jobs:
+                if not await self.process_next(worker_id):
+                    return
+                processed += 1
+
+        await asyncio.gather(*(run(f"{self.worker_prefix}:{i}") for i in range(self.concurrency)))
+        return processed
+
+    async def process_next(self, worker_id: str) -> bool:
+        """작업 1개 실행 (가져올 작업이 없으면 False)"""
+        job = await self.queue.aclaim(worker_id, self.visibility_timeout)
+        if job is None:
+            return False
+        await self._run_job(job, worker_id)
+        return True
+
+    async def _run_job(self, job: Dict[str, Any], worker_id: str) -> None:
+        job_id = job["id"]
+        final_attempt = job["attempts"] >= job["max_attempts"]
+        channel = open_progress_channel(job_id)
+        # 다른 프로세스에서 이전 시도가 실행된 경우에도 이벤트 id가 이어지도록 함 (SSE Last-Event-ID)
+        channel.last_event_id = max(channel.last_event_id, (job.get("progress") or {}).get("id") or 0)
+        print(f"[Queue] {worker_id}: 작업 {job_id} 시작 (interview {job['interview_id']}, 시도 {job['attempts']})")
+
+        run_task = asyncio.create_task(self._evaluate(job, channel, final_attempt))
+        heartbeat = asyncio.create_task(self._keep_lock(job_id, worker_id, run_task))
+        try:
+            result = await run_task
+        except asyncio.CancelledError:
+            if heartbeat.done() and heartbeat.result() is False:
+                print(f"[Queue] 작업 {job_id} 잠금 만료 → 실행 중단")
+                return
+            raise
+        except Exception as e:
+            delay = None if isinstance(e, ValueError) else retry_delay(job["attempts"])
+            status = await self.queue.afail(job_id, worker_id, str(e), delay)
+            print(f"[Queue] 작업 {job_id} 실패 ({status}): {e}")
+            return
+        finally:
+            heartbeat.cancel()
+            channel.close()
+
+        await self.queue.acomplete(job_id, worker_id, result)
+        print(f"[Queue] 작업 {job_id} 완료 (최종 점수 {result.get('final_score')})")
+
+    async def _evaluate(self, job: Dict[str, Any], channel, final_attempt: bool) -> Dict[str, Any]:
+        payload = job["payload"]
+        service = self.service
+        if payload.get("kind") == "job_batch":
+            return await service.evaluate_job_batch(
+                payload["job_id"],
+                payload["interview_ids"],
+                max_parallel=payload.get("max_parallel"),
+                competency_weights=payload.get("competency_weights"),
+                batch_id=job["run"],
+            )
+        weights = payload.get("competency_weights")
+        if not weights:
+            weights = await asyncio.to_thread(service._load_job_weights, payload["job_id"])
+        inputs = await asyncio.to_thread(service.load_interview_input, job["interview_id"], payload["applicant_id"])
+
+        completion = None
+        async for item in service.stream_evaluation(
+            channel=channel,
+            error_status="failed" if final_attempt else "retrying",
+            interview_id=job["interview_id"],
+            applicant_id=payload["applicant_id"],
+            job_id=payload["job_id"],
+            transcript=inputs["transcript"],
+            competency_weights=weights,
+            resume_data=inputs["resume_data"],
+            # 이전 시도가 남긴 노드 체크포인트에서 재개
+            resume_from="latest" if job["attempts"] > 1 else payload.get("resume_from"),
+            reevaluate=payload.get("reevaluate", False),
+            # 체크포인트는 작업(run)별로 저장 → 같은 interview의 다른 작업과 섞이지 않음
+            run=job["run"],
+        ):
+            if item["event"] == "competency_partial":
+                continue
+            if item["event"] == "complete":
+                completion = item["data"]
+            await self.queue.aupdate_progress(job["id"], item)
+        return completion
+
+    async def _keep_lock(self, job_id: str, worker_id: str, run_task: asyncio.Task) -> bool:
+        """잠금 연장 (잠금을 잃으면 평가 취소 후 False)"""
+        while True:
+            await asyncio.sleep(self.visibility_timeout / 3)
+            if not await self.queue.aextend(job_id, worker_id, self.visibility_timeout):
+                run_task.cancel()
+                return False
+
+
+_default_pool: Optional[EvaluationWorkerPool] = None
+
+
+def get_worker_pool() -> EvaluationWorkerPool:
+    """프로세스 공용 워커 풀 (공용 큐 사용)"""
+    global _default_pool
+    if _default_pool is None:
+        from services.evaluation.job_queue import get_evaluation_queue
+        _default_pool = EvaluationWorkerPool(get_evaluation_queue())
+    return _default_pool
@@ -9,8 +9,9 @@ import os
 import uuid
 import wave
 from pathlib import Path
-from openai import OpenAI
+from openai import AsyncOpenAI
 from utils.s3_uploader import upload_file_and_get_url
+from ai.utils.model_router import routed_chat_completion
 from utils.stt_tts_translator import stt_tts_translator
 from db.database import SessionLocal
 from models.interview import InterviewSession
@@ -19,7 +20,7 @@ class InterviewServiceV4:
     def __init__(self):
         self.example_question_list = ["첫번째 질문입니다", "두번째 질문입니다", "세번째 질문입니다"]
         self.interview_results = []
-        self.openai_client = OpenAI()  # OPENAI_API_KEY 환경변수 사용
+        self.openai_client = AsyncOpenAI()  # OPENAI_API_KEY 환경변수 사용
 
     async def _evaluate_answer_quality(self, question: str, answer: str, intent: str = None) -> bool:
         """
@@ -63,15 +64,17 @@ class InterviewServiceV4:
 위 기준 중 3개 이상 충족하지 못하면 "WEAK", 충족하면 "STRONG"으로만 답변하세요.
 애매하면 "WEAK"로 판단하세요."""
 
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt}],
+            # 라우터가 가장 싼 모델부터 호출, WEAK/STRONG 외 응답이면 상위 모델로 승급
+            result, _ = await routed_chat_completion(
+                self.openai_client,
+                "binary_classification",
+                [{"role": "user", "content": prompt}],
+                validate=self._parse_quality_label,
+                span_label="answer_quality",
                 max_tokens=10,
                 temperature=0
             )
-
-            result = response.choices[0].message.content.strip().upper()
-            is_weak = "WEAK" in result
+            is_weak = result == "WEAK"
             print(f"답변 품질 판단: {result} → 꼬리질문 {'필요' if is_weak else '불필요'}")
             return is_weak
 
@@ -79,6 +82,16 @@ class InterviewServiceV4:
             print(f"답변 품질 판단 실패: {e}")
             return True  # 에러 시에도 꼬리질문 실행 (더 안전)
 
+    @staticmethod
+    def _parse_quality_label(content: str) -> str:
+        """답변 품질 판정 응답 검증 (WEAK / STRONG 중 하나)"""
+        label = content.strip().upper()
+        if "WEAK" in label:
+            return "WEAK"
+        if "STRONG" in label:
+            return "STRONG"
+        raise ValueError(f"WEAK/STRONG 아님: {content!r}")
+
     def _load_persona_data(self):
         """
         3개 면접관이 정의된 persona_samsung_fashion.json 불러오기
@@ -4,11 +4,13 @@ CompanyProfile을 기반으로 면접관 페르소나를 생성합니다.
 """
 
 import json
+import time
 import boto3
 from typing import List
 from models.company_profile import CompanyProfile
 from models.persona import Persona, ArchetypeEnum
 from core.config import AWS_REGION, BEDROCK_MODEL_ID
+from ai.utils.llm_gateway import get_circuit_breaker
 
 
 class PersonaGenerator:
@@ -83,6 +85,13 @@ class PersonaGenerator:
 시스템 프롬프트만 작성하고, 다른 설명은 붙이지 마세요.
 """
 
+        # Bedrock circuit이 열려 있으면 호출하지 않고 바로 기본 프롬프트 사용
+        breaker = get_circuit_breaker("bedrock")
+        if not breaker.allow():
+            print("System Prompt 생성: Bedrock circuit open → 기본 프롬프트 사용")
+            return f"{base_prompt}\n\n당신은 {company_profile.company_name}의 면접관입니다. {', '.join(company_profile.key_skills)} 역량을 중심으로 질문하세요."
+
+        started = time.monotonic()
         try:
             body = json.dumps({
                 "anthropic_version": "bedrock-2023-05-31",
@@ -100,10 +109,12 @@ class PersonaGenerator:
 
             response_body = json.loads(response['body'].read().decode('utf-8'))
             system_prompt = response_body['content'][0]['text'].strip()
+            breaker.record(time.monotonic() - started, ok=True)
 
             return system_prompt
 
         except Exception as e:
+            breaker.record(time.monotonic() - started, ok=False)
             print(f"System Prompt 생성 에러: {e}")
             # 기본 프롬프트 반환
             return f"{base_prompt}\n\n당신은 {company_profile.company_name}의 면접관입니다. {', '.join(company_profile.key_skills)} 역량을 중심으로 질문하세요."
@@ -0,0 +1,130 @@
+import sys
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Ensure server package importable when running pytest from repo root
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from ai.agents.aggregators.incremental_verifier import IncrementalResumeVerifier, build_micro_batches
+from ai.agents.competency_agent import (
+    COMPETENCY_CONFIGS,
+    CompetencyAgent,
+    evaluate_all_competencies,
+    resolve_competency_groups,
+)
+from ai.utils.llm_cache import NullLLMCache
+from ai.utils.rate_limiter import TokenBucketRateLimiter, set_rate_limiter
+from ai.utils.transcript_renderer import wrap_transcript_block
+
+
+@pytest.fixture(autouse=True)
+def unlimited_rate_limiter():
+    # 환경변수로 설정된 공용 Limiter 예산에 막히지 않도록 테스트 전용 Limiter 사용
+    set_rate_limiter("gpt-4o", TokenBucketRateLimiter(10 ** 9, 10 ** 6))
+
+
+def _competency_json(name: str, score: int) -> dict:
+    return {
+        "competency_name": name,
+        "overall_score": score,
+        "strengths": ["구체적 수치 제시"],
+        "weaknesses": ["주도성 부족"],
+        "key_observations": ["a", "b", "c"],
+        "perspectives": {},
+        "confidence": {"overall_confidence": 0.8},
+    }
+
+
+class FakeCompletions:
+    def __init__(self, drop=(), fail=()):
+        self.calls = []
+        self.drop = set(drop)
+        self.fail = set(fail)
+
+    async def create(self, **kwargs):
+        prompt = kwargs["messages"][-1]["content"]
+        self.calls.append(prompt)
+        names = [name for name, _, _ in COMPETENCY_CONFIGS if f"competency_name: {name} " in prompt]
+        if names:
+            payload = {"results": {name: _competency_json(name, 70) for name in names if name not in self.drop}}
+        else:
+            name = next(name for name, _, _ in COMPETENCY_CONFIGS if f"RUBRIC {name}" in prompt)
+            if name in self.fail:
+                raise ConnectionError("upstream timeout")
+            payload = _competency_json(name, 60)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(payload)))],
+            usage=None,
+        )
+
+
+def _agent(completions) -> CompetencyAgent:
+    client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return CompetencyAgent(client, cache=NullLLMCache())
+
+
+def _prompts() -> dict:
+    block = wrap_transcript_block("[segment_id: 1 | char_index: 0-10]\nanswer_text: 네 그렇습니다")
+    return {name: f"{block}\n\nRUBRIC {name}" for name, _, _ in COMPETENCY_CONFIGS}
+
+
+def test_resolve_competency_groups():
+    assert len(resolve_competency_groups("none")) == 10
+    assert [len(g) for g in resolve_competency_groups("category")] == [5, 5]
+
+    groups = resolve_competency_groups("growth_potential+problem_solving")
+    assert [c[0] for c in groups[0]] == ["growth_potential", "problem_solving"]
+    assert len(groups) == 9
+
+    with pytest.raises(ValueError):
+        resolve_competency_groups("unknown+problem_solving")
+
+
+@pytest.mark.asyncio
+async def test_category_grouping_sends_transcript_once_per_group():
+    completions = FakeCompletions()
+    results = await evaluate_all_competencies(_agent(completions), {"segments": []}, _prompts(), grouping="category")
+
+    assert len(completions.calls) == 2
+    assert all(call.count("[Interview Transcript]") == 1 for call in completions.calls)
+    assert all(results[name]["overall_score"] == 70 for name, _, _ in COMPETENCY_CONFIGS)
+    assert results["md_data_analysis"]["competency_category"] == "job"
+
+
+@pytest.mark.asyncio
+async def test_missing_competency_in_group_falls_back_to_single_call():
+    completions = FakeCompletions(drop={"problem_solving"})
+    results = await evaluate_all_competencies(_agent(completions), {"segments": []}, _prompts(), grouping="category")
+
+    assert len(completions.calls) == 3
+    assert results["problem_solving"]["overall_score"] == 60
+    assert results["growth_potential"]["overall_score"] == 70
+
+
+@pytest.mark.asyncio
+async def test_failed_fallback_yields_failed_result_for_pipelined_verifier():
+    completions = FakeCompletions(drop={"problem_solving"}, fail={"problem_solving"})
+    agent = _agent(completions)
+    agent.max_retries = 1
+    names = [name for name, _, _ in COMPETENCY_CONFIGS]
+    incremental = IncrementalResumeVerifier(
+        SimpleNamespace(chat=SimpleNamespace(completions=completions)),
+        {"projects": ["프로젝트 리드"]},
+        build_micro_batches(names, 3)
+    )
+    incremental.verifier.cache = NullLLMCache()
+
+    results = await evaluate_all_competencies(
+        agent, {"segments": []}, _prompts(), grouping="category", on_result=incremental.add
+    )
+    await incremental.finish(results)
+
+    assert results["problem_solving"]["overall_score"] == 0
+    assert "upstream timeout" in results["problem_solving"]["error"]
+    assert results["growth_potential"]["overall_score"] == 70
+    assert incremental.summary()["micro_batches"] == 4
@@ -0,0 +1,126 @@
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+# Ensure server package importable when running pytest from repo root
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from ai.agents.graph.checkpoint import (
+    SQLiteCheckpointStore,
+    apply_node_update,
+    checkpoint_run_key,
+    checkpointed,
+    deserialize_state,
+    serialize_state,
+)
+from ai.agents.graph.evaluation import create_evaluation_graph, plan_resume
+
+
+def _state():
+    return {
+        "interview_id": 7,
+        "checkpoint_key": "interview:7",
+        "context_key": "stale-context",
+        "openai_client": object(),
+        "progress_channel": object(),
+        "started_at": datetime(2025, 1, 2, 3, 4, 5),
+        "execution_logs": [{"node": "batch_evaluation"}],
+        "llm_spans": [],
+        "aggregated_competencies": {},
+    }
+
+
+def test_serialization_drops_clients_and_restores_datetimes():
+    client = object()
+    serialized = serialize_state(_state())
+    restored = deserialize_state(serialized, context_key="new-context", openai_client=client)
+
+    assert "stale-context" not in serialized
+    assert restored["context_key"] == "new-context"
+    assert restored["openai_client"] is client
+    assert restored["progress_channel"] is None
+    assert restored["started_at"] == datetime(2025, 1, 2, 3, 4, 5)
+    assert restored["execution_logs"] == [{"node": "batch_evaluation"}]
+
+
+def test_apply_node_update_appends_reducer_fields():
+    merged = apply_node_update(_state(), {
+        "execution_logs": [{"node": "aggregator"}],
+        "llm_spans": [{"label": "resume_verification"}],
+        "aggregated_competencies": {"problem_solving": {"overall_score": 80}},
+    })
+
+    assert [log["node"] for log in merged["execution_logs"]] == ["batch_evaluation", "aggregator"]
+    assert merged["llm_spans"] == [{"label": "resume_verification"}]
+    assert merged["aggregated_competencies"]["problem_solving"]["overall_score"] == 80
+
+
+@pytest.mark.asyncio
+async def test_checkpointed_node_saves_only_after_success(tmp_path):
+    store = SQLiteCheckpointStore(str(tmp_path / "checkpoints.sqlite3"))
+
+    async def aggregator(state):
+        return {"aggregated_competencies": {"a": {}}, "execution_logs": [{"node": "aggregator"}]}
+
+    async def final_integration(state):
+        raise RuntimeError("LLM 실패")
+
+    state = _state()
+    update = await checkpointed("aggregator", aggregator, store)(state)
+    assert update["aggregated_competencies"] == {"a": {}}
+    with pytest.raises(RuntimeError):
+        await checkpointed("final_integration", final_integration, store)(state)
+
+    checkpoints = await store.alist("interview:7")
+    assert [c["node"] for c in checkpoints] == ["aggregator"]
+    saved = deserialize_state(checkpoints[0]["state"])
+    assert saved["aggregated_competencies"] == {"a": {}}
+    assert len(saved["execution_logs"]) == 2
+
+    await store.aclear("interview:7")
+    assert await store.alist("interview:7") == []
+
+
+def test_plan_resume_picks_first_incomplete_node():
+    checkpoints = [
+        {"node": "batch_evaluation", "state": {"step": 1}},
+        {"node": "aggregator", "state": {"step": 2}},
+    ]
+
+    latest = plan_resume(checkpoints, "latest")
+    assert latest == {"entry_node": "final_integration", "state": {"step": 2}}
+    assert plan_resume(checkpoints, "aggregator") == {"entry_node": "aggregator", "state": {"step": 1}}
+    assert plan_resume(checkpoints, "batch_evaluation") is None
+    assert plan_resume([], "latest") is None
+
+    done = plan_resume(checkpoints + [{"node": "presentation_formatter", "state": {"step": 4}}], "latest")
+    assert done["entry_node"] is None
+
+
+def test_graph_compiles_from_any_entry_node(tmp_path):
+    store = SQLiteCheckpointStore(str(tmp_path / "checkpoints.sqlite3"))
+    for entry in ("batch_evaluation", "aggregator", "final_integration", "presentation_formatter"):
+        assert create_evaluation_graph(entry_node=entry, checkpoint_store=store) is not None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_runs_of_same_interview_keep_separate_checkpoints(tmp_path):
+    store = SQLiteCheckpointStore(str(tmp_path / "checkpoints.sqlite3"))
+
+    async def aggregator(state):
+        return {"aggregated_competencies": {state["checkpoint_key"]: {}}}
+
+    # 큐 재시도와 배치 재평가가 같은 interview를 동시에 실행
+    queue_key = checkpoint_run_key(7, "queue-run")
+    batch_key = checkpoint_run_key(7, "batch-1")
+    assert queue_key != batch_key != checkpoint_run_key(7)
+    for key in (queue_key, batch_key):
+        await checkpointed("aggregator", aggregator, store)({**_state(), "checkpoint_key": key})
+    await store.aclear(batch_key)
+
+    checkpoints = await store.alist(queue_key)
+    assert deserialize_state(checkpoints[0]["state"])["aggregated_competencies"] == {queue_key: {}}
@@ -0,0 +1,58 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure server package importable when running pytest from repo root
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from ai.agents.graph.checkpoint import serialize_state
+from ai.agents.graph.context import (
+    context_hash,
+    context_value,
+    get_context_store,
+    register_context,
+    release_context,
+)
+from ai.agents.graph.reevaluation import node_input_hash
+from ai.utils.llm_cache import hash_payload
+
+
+def test_state_carries_only_context_key():
+    transcript = {"segments": [{"segment_id": 1, "answer_text": "답변" * 1000}]}
+    prompts = {"problem_solving": "RUBRIC " + "답변" * 1000}
+    state = {"context_key": register_context(transcript=transcript, prompts=prompts), "final_score": 80.0}
+    try:
+        assert context_value(state, "transcript") is transcript
+        assert context_value(state, "resume_data", {}) == {}
+        assert len(serialize_state(state)) < 100
+        # State에 직접 넣은 값이 우선 (노드 단위 테스트 호환)
+        assert context_value({**state, "prompts": {"a": "b"}}, "prompts") == {"a": "b"}
+    finally:
+        release_context(state)
+
+    with pytest.raises(KeyError):
+        context_value(state, "transcript")
+
+
+def test_context_hash_is_cached_and_matches_inline_state():
+    prompts = {"problem_solving": "RUBRIC"}
+    key = register_context(prompts=prompts, resume_data={"projects": []})
+    state = {"context_key": key, "prompt_hashes": {"problem_solving": "h"}}
+    try:
+        assert context_hash(state, "resume_data") == hash_payload({"projects": []})
+        first = node_input_hash("batch_evaluation", state)
+
+        # 캐시된 해시를 사용하므로 등록 후의 in-place 변경은 해시에 반영되지 않음
+        prompts["problem_solving"] = "RUBRIC v2"
+        assert node_input_hash("batch_evaluation", state) == first
+
+        inline = {"prompts": {"problem_solving": "RUBRIC"}, "resume_data": {"projects": []}, "prompt_hashes": {"problem_solving": "h"}}
+        assert node_input_hash("batch_evaluation", inline) == first
+
+        get_context_store().update(key, prompts={"problem_solving": "RUBRIC v3"})
+        assert node_input_hash("batch_evaluation", state) != first
+    finally:
+        release_context(state)
@@ -0,0 +1,175 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Ensure server package importable when running pytest from repo root
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from api.evaluation_stream import stream_job_events
+from services.evaluation.evaluation_service import EvaluationService
+from services.evaluation.job_queue import SQLiteJobQueue, set_evaluation_queue
+from services.evaluation.progress_channel import HEARTBEAT, ProgressChannel
+from services.evaluation.worker_pool import EvaluationWorkerPool
+
+
+PAYLOAD = {"applicant_id": 7, "job_id": 1, "competency_weights": {"problem_solving": 1.0}}
+
+
+def test_enqueue_is_idempotent_per_interview_and_run(tmp_path):
+    queue = SQLiteJobQueue(str(tmp_path / "queue.sqlite3"))
+
+    job, created = queue.enqueue(1, PAYLOAD, run="r1")
+    again, created_again = queue.enqueue(1, PAYLOAD, run="r1")
+    other, created_other = queue.enqueue(1, PAYLOAD, run="r2")
+
+    assert created and not created_again and created_other
+    assert again["id"] == job["id"] and other["id"] != job["id"]
+
+
+def test_enqueue_without_run_dedups_only_pending_or_recent_jobs(tmp_path, monkeypatch):
+    queue = SQLiteJobQueue(str(tmp_path / "queue.sqlite3"))
+    job, _ = queue.enqueue(1, PAYLOAD)
+
+    # 진행 중이거나 방금 성공한 같은 요청은 같은 작업 (클라이언트 재시도)
+    assert queue.enqueue(1, dict(PAYLOAD)) == (job, False)
+    claimed = queue.claim("w1", visibility_timeout=60)
+    assert claimed["id"] == job["id"]
+    assert queue.enqueue(1, PAYLOAD)[0]["id"] == job["id"]
+    queue.complete(job["id"], "w1", {"final_score": 80})
+    assert queue.enqueue(1, PAYLOAD)[0]["id"] == job["id"]
+
+    # 중복 방지 시간이 지난 뒤 같은 요청을 다시 넣으면 새 평가
+    monkeypatch.setattr("services.evaluation.job_queue.EVALUATION_QUEUE_DEDUP_SECONDS", 0)
+    time.sleep(0.01)
+    rerun, created = queue.enqueue(1, PAYLOAD)
+    assert created and rerun["id"] != job["id"] and rerun["status"] == "queued"
+
+
+def test_claim_retry_backoff_and_visibility_timeout(tmp_path):
+    queue = SQLiteJobQueue(str(tmp_path / "queue.sqlite3"), max_attempts=2)
+    job, _ = queue.enqueue(1, PAYLOAD, run="r1")
+
+    claimed = queue.claim("w1", visibility_timeout=60)
+    assert claimed["id"] == job["id"] and claimed["attempts"] == 1
+    assert queue.claim("w2", visibility_timeout=60) is None
+
+    # 재시도 대기 중에는 가져가지 않음
+    assert queue.fail(job["id"], "w1", "LLM 실패", retry_delay=0.2) == "queued"
+    assert queue.claim("w2", visibility_timeout=60) is None
+    time.sleep(0.25)
+
+    # 워커가 연장 없이 멈추면 잠금 만료 후 다른 워커가 가져감
+    assert queue.claim("w2", visibility_timeout=0.05)["attempts"] == 2
+    time.sleep(0.1)
+    assert queue.extend(job["id"], "w3", 60) is False
+    assert queue.claim("w3", visibility_timeout=60) is None
+    assert queue.get(job["id"])["status"] == "failed"
+
+    # 최종 실패한 작업은 다시 등록 가능
+    requeued, created = queue.enqueue(1, PAYLOAD, run="r1")
+    assert created and requeued["status"] == "queued" and requeued["attempts"] == 0
+
+
+@pytest.mark.asyncio
+async def test_progress_channel_replays_from_last_event_id_and_heartbeats():
+    channel = ProgressChannel(1, max_events=3)
+    for i in range(5):
+        channel.publish("node_complete", {"i": i})
+
+    events = channel.events(last_event_id=1, heartbeat=0.01)
+    truncated = await events.__anext__()
+    assert truncated["event"] == "replay_truncated" and truncated["data"]["first_available_id"] == 3
+    assert [(await events.__anext__())["id"] for _ in range(3)] == [3, 4, 5]
+    assert await events.__anext__() is HEARTBEAT
+
+    channel.close()
+    assert [item["id"] async for item in channel.events(last_event_id=4)] == [5]
+
+
+class FakeService:
+    """graph 대신 진행 이벤트만 발행하는 평가 서비스 (첫 시도는 실패)"""
+
+    stream_evaluation = EvaluationService.stream_evaluation
+
+    def __init__(self):
+        self.calls = []
+        self.runs = []
+
+    def _load_job_weights(self, job_id):
+        return {"problem_solving": 1.0}
+
+    def load_interview_input(self, interview_id, applicant_id):
+        return {"transcript": {"segments": []}, "resume_data": None}
+
+    async def evaluate_interview(self, progress_channel=None, **kwargs):
+        self.calls.append(kwargs["resume_from"])
+        self.runs.append(kwargs["run"])
+        progress_channel.publish("node_start", {"stage": 1, "node": "batch_evaluation", "progress": 10})
+        await asyncio.sleep(0.01)
+        if len(self.calls) == 1:
+            raise RuntimeError("LLM 실패")
+        progress_channel.publish("competency_partial", {"stage": 1, "competency": "problem_solving"})
+        return {"evaluation_id": 3, "final_score": 81.5}
+
+
+@pytest.mark.asyncio
+async def test_worker_retries_from_checkpoint_and_stream_forwards_events(tmp_path, monkeypatch):
+    monkeypatch.setattr("services.evaluation.worker_pool.EVALUATION_QUEUE_RETRY_BASE_SECONDS", 0.05)
+    monkeypatch.setattr("api.evaluation_stream.EVALUATION_WORKER_POLL_INTERVAL", 0.01)
+    queue = SQLiteJobQueue(str(tmp_path / "queue.sqlite3"))
+    set_evaluation_queue(queue)
+    service = FakeService()
+    pool = EvaluationWorkerPool(queue, service, concurrency=1, visibility_timeout=30, poll_interval=0.01)
+    job, _ = queue.enqueue(1, PAYLOAD, run="r1")
+
+    pool.start()
+    try:
+        messages = [m async for m in stream_job_events(job["id"])]
+    finally:
+        await pool.stop()
+
+    stored = queue.get(job["id"])
+    assert stored["status"] == "succeeded" and stored["attempts"] == 2
+    assert stored["result"]["final_score"] == 81.5
+    # 두 번째 시도는 노드 체크포인트에서 재개
+    assert service.calls == [None, "latest"]
+    # 체크포인트는 작업의 run으로 구분 (재시도는 같은 키에서 재개)
+    assert service.runs == ["r1", "r1"]
+
+    events = [line.split(": ", 1)[1] for m in messages for line in m.splitlines() if line.startswith("event: ")]
+    assert events == ["node_start", "error", "node_start", "competency_partial", "complete"]
+    assert messages[1].startswith("id: 2\n") and '"status": "retrying"' in messages[1]
+
+    # 재연결: Last-Event-ID 이후 이벤트만 전송
+    resumed = [m async for m in stream_job_events(job["id"], last_event_id=3)]
+    assert [m.split("\n", 1)[0] for m in resumed] == ["id: 4", "id: 5"]
+
+
+class FakeBatchService:
+    def __init__(self):
+        self.calls = []
+
+    async def evaluate_job_batch(self, job_id, interview_ids, max_parallel=None, competency_weights=None, batch_id=None):
+        self.calls.append((job_id, interview_ids, max_parallel, batch_id))
+        return {"job_id": job_id, "batch_id": batch_id, "completed": len(interview_ids)}
+
+
+@pytest.mark.asyncio
+async def test_job_batch_is_enqueued_once_and_run_by_worker(tmp_path):
+    queue = SQLiteJobQueue(str(tmp_path / "queue.sqlite3"))
+    service = FakeBatchService()
+    pool = EvaluationWorkerPool(queue, service, concurrency=1, visibility_timeout=30, poll_interval=0.01)
+
+    job, created = queue.enqueue_job_batch(3, "b1", {"interview_ids": [1, 2], "max_parallel": 2})
+    again, created_again = queue.enqueue_job_batch(3, "b1", {"interview_ids": [1, 2], "max_parallel": 2})
+    assert created and not created_again and again["id"] == job["id"]
+
+    assert await pool.drain() == 1
+    stored = queue.get(job["id"])
+    assert stored["status"] == "succeeded" and stored["result"]["completed"] == 2
+    assert service.calls == [(3, [1, 2], 2, "b1")]
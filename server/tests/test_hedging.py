@@ -0,0 +1,74 @@
+import sys
+import asyncio
+from pathlib import Path
+
+import pytest
+
+# Ensure server package importable when running pytest from repo root
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from ai.utils.hedging import HedgeBudget, LatencyHistogram, get_latency_histogram, hedged_call
+
+
+def test_latency_histogram_percentile():
+    histogram = LatencyHistogram(window=5)
+    for seconds in (9.0, 1.0, 2.0, 3.0, 4.0, 5.0):
+        histogram.record(seconds)
+
+    assert histogram.percentile(0.5) == 3.0
+    assert histogram.percentile(1.0) == 5.0  # window 밖으로 밀려난 9.0은 제외
+
+
+def test_hedge_budget_caps_ratio():
+    budget = HedgeBudget(max_ratio=0.1, window=100)
+    for _ in range(20):
+        budget.record_request()
+
+    assert budget.try_acquire()
+    assert budget.try_acquire()
+    assert not budget.try_acquire()
+
+
+@pytest.mark.asyncio
+async def test_hedged_call_uses_faster_duplicate_and_cancels_straggler():
+    key = "test_straggler"
+    for _ in range(10):
+        get_latency_histogram(key).record(0.01)
+
+    calls = {"count": 0, "cancelled": 0}
+
+    async def call():
+        calls["count"] += 1
+        delay = 5.0 if calls["count"] == 1 else 0.01
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            calls["cancelled"] += 1
+            raise
+        return calls["count"]
+
+    result = await asyncio.wait_for(hedged_call(key, call, percentile=0.9, min_samples=10), timeout=2)
+    await asyncio.sleep(0)
+
+    assert result == 2
+    assert calls == {"count": 2, "cancelled": 1}
+
+
+@pytest.mark.asyncio
+async def test_hedged_call_respects_capacity_check():
+    key = "test_no_capacity"
+    for _ in range(10):
+        get_latency_histogram(key).record(0.01)
+    calls = {"count": 0}
+
+    async def call():
+        calls["count"] += 1
+        await asyncio.sleep(0.05)
+        return "primary"
+
+    result = await hedged_call(key, call, min_samples=10, can_hedge=lambda: False)
+
+    assert result == "primary"
+    assert calls["count"] == 1
@@ -0,0 +1,120 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Ensure server package importable when running pytest from repo root
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from ai.agents.aggregators.incremental_verifier import IncrementalResumeVerifier, build_micro_batches
+from ai.utils.llm_cache import NullLLMCache
+from ai.utils.rate_limiter import TokenBucketRateLimiter, set_rate_limiter
+
+
+def _result(name, segment_ids):
+    return {
+        "competency_name": name,
+        "overall_score": 80,
+        "confidence": {"overall_confidence": 0.7},
+        "perspectives": {
+            "evidence_details": [{"segment_id": sid, "text": f"{name} 프로젝트 경험 {sid}"} for sid in segment_ids],
+        },
+    }
+
+
+class VerifyingCompletions:
+    """프롬프트에 들어온 segment를 모두 high로 검증"""
+
+    def __init__(self):
+        self.batches = []
+
+    async def create(self, **kwargs):
+        prompt = kwargs["messages"][1]["content"]
+        segments = json.loads(prompt.split("## Segment Evaluations to Verify:")[1].split("```json")[1].split("```")[0])
+        self.batches.append(sorted({s["competency"] for s in segments}))
+        verifications = [
+            {
+                "competency": s["competency"],
+                "segment_id": s["segment_id"],
+                "resume_verified": True,
+                "verification_strength": "high",
+                "resume_matches": [{"resume_section": "projects", "matched_content": "x"}],
+            }
+            for s in segments
+        ]
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps({"verifications": verifications})))],
+            usage=None,
+        )
+
+
+@pytest.fixture(autouse=True)
+def unlimited_limiters():
+    for model in ("gpt-4o-mini", "gpt-4o"):
+        set_rate_limiter(model, TokenBucketRateLimiter(10**9, 10**6))
+
+
+def _verifier(completions, batches):
+    client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    incremental = IncrementalResumeVerifier(client, {"projects": ["프로젝트 리드"]}, batches)
+    incremental.verifier.cache = NullLLMCache()
+    return incremental
+
+
+def test_build_micro_batches_keeps_order():
+    assert build_micro_batches(["a", "b", "c", "d", "e"], 2) == [["a", "b"], ["c", "d"], ["e"]]
+    assert build_micro_batches(["a"], 0) == [["a"]]
+
+
+@pytest.mark.asyncio
+async def test_batch_starts_verification_before_stage1_ends():
+    completions = VerifyingCompletions()
+    incremental = _verifier(completions, [["a", "b"], ["c"]])
+
+    incremental.add("b", _result("b", [2]))
+    incremental.add("a", _result("a", [1, 3]))
+    await asyncio.sleep(0)
+    # c가 도착하기 전에 첫 묶음 검증이 이미 진행됨
+    assert completions.batches == [["a", "b"]]
+
+    incremental.add("c", _result("c", [1]))
+    all_results = {"a": _result("a", [1, 3]), "b": _result("b", [2]), "c": _result("c", [1])}
+    segments = await incremental.finish(all_results)
+
+    assert completions.batches == [["a", "b"], ["c"]]
+    assert [(s["competency"], s["segment_id"]) for s in segments] == [("a", 1), ("a", 3), ("b", 2), ("c", 1)]
+    assert all(s["resume_verification"]["strength"] == "high" for s in segments)
+    assert all("confidence_v2" in s for s in segments)
+    assert incremental.summary()["micro_batches"] == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_competencies_do_not_call_llm():
+    completions = VerifyingCompletions()
+    incremental = _verifier(completions, [["a"], ["b"]])
+    failed = {"error": "boom", "overall_score": 0, "confidence": {"overall_confidence": 0.3}}
+
+    incremental.add("a", failed)
+    segments = await incremental.finish({"a": failed, "b": _result("b", [4])})
+
+    assert completions.batches == [["b"]]
+    assert [s["segment_id"] for s in segments] == [4]
+
+
+@pytest.mark.asyncio
+async def test_non_dict_result_does_not_cancel_other_batches():
+    completions = VerifyingCompletions()
+    incremental = _verifier(completions, [["a", "b"], ["c"]])
+
+    incremental.add("a", RuntimeError("[a] 평가 실패"))
+    incremental.add("b", _result("b", [2]))
+    incremental.add("c", _result("c", [5]))
+    segments = await incremental.finish({"a": RuntimeError("[a] 평가 실패"), "b": _result("b", [2]), "c": _result("c", [5])})
+
+    assert completions.batches == [["b"], ["c"]]
+    assert [(s["competency"], s["segment_id"]) for s in segments] == [("b", 2), ("c", 5)]
@@ -0,0 +1,141 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure server package importable when running pytest from repo root
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from ai.agents.graph.checkpoint import SQLiteCheckpointStore
+from ai.utils.rate_limiter import TokenBucketRateLimiter
+from services.evaluation.job_batch import JobBatchProgress, run_job_batch
+
+
+class FakeEvaluator:
+    """지원자별 0.05초 평가, 동시 진행 수와 resume_from 기록"""
+
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def load_input(self, interview_id):
+        return {"applicant_id": interview_id * 10, "transcript": {}, "call_tokens": 1000}
+
+    async def evaluate(self, interview_id, inputs, resume_from):
+        self.calls.append((interview_id, resume_from))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.05)
+            if interview_id in self.fail:
+                raise RuntimeError("LLM 실패")
+            return {
+                "evaluation_id": interview_id,
+                "final_score": 70.0,
+                "llm_usage": {"total": {"calls": 13, "prompt_tokens": 9000, "completion_tokens": 1000, "cost_usd": 0.01}},
+            }
+        finally:
+            self.in_flight -= 1
+
+
+class FullLimiter:
+    tokens_per_minute = 30000
+
+    def has_capacity(self, tokens):
+        return False
+
+
+@pytest.mark.asyncio
+async def test_batch_runs_applicants_concurrently_and_reports_throughput(tmp_path):
+    store = SQLiteCheckpointStore(str(tmp_path / "checkpoints.sqlite3"))
+    evaluator = FakeEvaluator()
+
+    summary = await run_job_batch(
+        1, "b1", [1, 2, 3, 4, 5], evaluator.load_input, evaluator.evaluate,
+        JobBatchProgress(store, 1, "b1"), max_parallel=3, admission_interval=0.01
+    )
+
+    assert evaluator.max_in_flight == 3
+    assert summary["completed"] == 5 and summary["peak_parallel"] == 3
+    assert summary["tokens"] == 50000 and summary["tokens_per_minute"] > 0
+    assert [a["applicant_id"] for a in summary["applicants"]] == [10, 20, 30, 40, 50]
+    assert all(call[1] is None for call in evaluator.calls)
+
+
+@pytest.mark.asyncio
+async def test_batch_waits_for_limiter_budget_before_next_applicant():
+    evaluator = FakeEvaluator()
+
+    summary = await run_job_batch(
+        1, "b2", [1, 2, 3], evaluator.load_input, evaluator.evaluate,
+        JobBatchProgress(None, 1, "b2"), limiter=FullLimiter(), max_parallel=3, admission_interval=0.01
+    )
+
+    assert evaluator.max_in_flight == 1
+    assert summary["completed"] == 3
+    assert summary["tpm_budget"] == 30000
+
+
+class LimitedEvaluator(FakeEvaluator):
+    """지원자마다 Stage 1 호출 2건을 Limiter를 거쳐 동시에 보냄"""
+
+    def __init__(self, limiter):
+        super().__init__()
+        self.limiter = limiter
+
+    async def load_input(self, interview_id):
+        await asyncio.sleep(0.02)
+        return await super().load_input(interview_id)
+
+    async def evaluate(self, interview_id, inputs, resume_from):
+        async def call():
+            reserved = await self.limiter.acquire(1000)
+            await asyncio.sleep(0.05)
+            self.limiter.release(reserved)
+
+        await asyncio.gather(call(), call())
+        return {"evaluation_id": interview_id, "final_score": 70.0}
+
+
+@pytest.mark.asyncio
+async def test_in_flight_cap_gates_admission_without_token_budget():
+    # TPM/RPM 예산 없이 동시 호출 상한만 있는 기본 Limiter
+    limiter = TokenBucketRateLimiter(0, 0, max_in_flight=2)
+    evaluator = LimitedEvaluator(limiter)
+
+    summary = await run_job_batch(
+        1, "b4", [1, 2, 3], evaluator.load_input, evaluator.evaluate,
+        JobBatchProgress(None, 1, "b4"), limiter=limiter, max_parallel=3, admission_interval=0.01
+    )
+
+    # 앞 지원자의 호출이 Limiter에 도달해 상한이 찬 것을 보고 다음 지원자 시작을 미룸
+    # (한꺼번에 시작하면 호출 6건이 상한 2에서 대기열에 쌓임)
+    assert summary["completed"] == 3 and summary["peak_parallel"] <= 2
+    assert limiter.metrics()["max_wait_seconds"] < 0.03
+
+
+@pytest.mark.asyncio
+async def test_interrupted_batch_continues_where_it_stopped(tmp_path):
+    store = SQLiteCheckpointStore(str(tmp_path / "checkpoints.sqlite3"))
+    first = FakeEvaluator(fail={2})
+    summary = await run_job_batch(
+        1, "b3", [1, 2, 3], first.load_input, first.evaluate,
+        JobBatchProgress(store, 1, "b3"), max_parallel=2, admission_interval=0.01
+    )
+    assert summary["completed"] == 2 and summary["failed"] == 1
+
+    second = FakeEvaluator()
+    summary = await run_job_batch(
+        1, "b3", [1, 2, 3], second.load_input, second.evaluate,
+        JobBatchProgress(store, 1, "b3"), max_parallel=2, admission_interval=0.01
+    )
+
+    # 완료된 지원자는 건너뛰고 실패한 지원자만 노드 체크포인트에서 재개
+    assert second.calls == [(2, "latest")]
+    assert summary["completed"] == 3 and summary["skipped_already_completed"] == 2
+    assert summary["applicants"][1]["attempts"] == 2
@@ -0,0 +1,59 @@
+import json
+import sys
+from pathlib import Path
+
+# Ensure server package importable when running pytest from repo root
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+import lambda_evaluation_handler as handler
+
+
+class FakeService:
+    """interview 2는 transcript 없음, 평가 호출의 resume_from / run 기록"""
+
+    def __init__(self):
+        self.calls = []
+        self.runs = {}
+
+    def _load_job_weights(self, job_id):
+        return {"problem_solving": 1.0}
+
+    def load_interview_input(self, interview_id, applicant_id):
+        if interview_id == 2:
+            raise ValueError("Transcript를 찾을 수 없습니다")
+        return {"transcript": {"segments": []}, "resume_data": None}
+
+    async def evaluate_interview(self, **kwargs):
+        self.calls.append((kwargs["interview_id"], kwargs["resume_from"]))
+        self.runs[kwargs["interview_id"]] = kwargs["run"]
+        return {"evaluation_id": kwargs["interview_id"], "final_score": 75.0}
+
+
+def sqs_record(message_id, interview_id, receive_count=1):
+    return {
+        "messageId": message_id,
+        "body": json.dumps({"job_id": 1, "applicant_id": 9, "interview_id": interview_id}),
+        "attributes": {"ApproximateReceiveCount": str(receive_count)},
+    }
+
+
+def test_sqs_batch_reports_only_failed_records_and_resumes_redeliveries():
+    service = FakeService()
+    handler.set_service(service)
+    try:
+        response = handler.lambda_handler(
+            {"Records": [sqs_record("m1", 1), sqs_record("m2", 2), sqs_record("m3", 3, receive_count=2)]}, None
+        )
+        # 같은 컨테이너의 다음 호출도 같은 서비스 / 이벤트 루프 사용
+        direct = handler.lambda_handler({"detail": {"job_id": 1, "applicant_id": 9, "interview_id": 4}}, None)
+    finally:
+        handler.set_service(None)
+
+    assert response == {"batchItemFailures": [{"itemIdentifier": "m2"}]}
+    assert sorted(service.calls) == [(1, None), (3, "latest"), (4, None)]
+    # 재전달된 메시지는 같은 messageId의 체크포인트에서 재개
+    assert service.runs == {1: "m1", 3: "m3", 4: None}
+    assert direct["statusCode"] == 200 and direct["body"]["final_score"] == 75.0
+    assert handler.lambda_handler({"job_id": 1}, None)["statusCode"] == 400
@@ -0,0 +1,72 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure server package importable when running pytest from repo root
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from ai.utils.llm_cache import LLMResponseCache, build_cache_key
+
+
+def _messages(transcript: str):
+    return [
+        {"role": "system", "content": "You are an expert evaluator."},
+        {"role": "user", "content": f"Transcript: {transcript}"},
+    ]
+
+
+def test_cache_key_changes_with_transcript_and_prompt_version():
+    base = build_cache_key("competency_agent", "gpt-4o", 0.0, _messages("a"))
+
+    assert base == build_cache_key("competency_agent", "gpt-4o", 0.0, _messages("a"))
+    assert base != build_cache_key("competency_agent", "gpt-4o", 0.0, _messages("b"))
+    assert base != build_cache_key("competency_agent", "gpt-4o", 0.0, _messages("a"), prompt_version="v2")
+
+
+def test_cache_hit_across_instances(tmp_path):
+    path = str(tmp_path / "llm_cache.sqlite3")
+    key = build_cache_key("resume_verifier", "gpt-4o-mini", 0.3, _messages("a"))
+
+    LLMResponseCache(path).set(key, {"verifications": [{"segment_id": 1}]})
+    other = LLMResponseCache(path)
+
+    assert other.get(key) == {"verifications": [{"segment_id": 1}]}
+    assert other.stats()["hits"] == 1
+
+
+def test_cache_ttl_expiry(tmp_path, monkeypatch):
+    cache = LLMResponseCache(str(tmp_path / "llm_cache.sqlite3"), ttl_seconds=10)
+    now = {"t": 1000.0}
+    monkeypatch.setattr("ai.utils.llm_cache.time.time", lambda: now["t"])
+
+    cache.set("k", "value")
+    now["t"] += 11
+
+    assert cache.get("k") is None
+
+
+def test_cache_evicts_least_recently_used_over_max_bytes(tmp_path, monkeypatch):
+    cache = LLMResponseCache(str(tmp_path / "llm_cache.sqlite3"), max_bytes=250)
+    now = {"t": 1000.0}
+    monkeypatch.setattr("ai.utils.llm_cache.time.time", lambda: now["t"])
+
+    for key in ("a", "b"):
+        cache.set(key, "x" * 100)
+        now["t"] += 1
+    cache.get("a")  # a를 최근 접근으로 갱신
+    now["t"] += 1
+    cache.set("c", "x" * 100)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+@pytest.mark.asyncio
+async def test_async_accessors(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / "llm_cache.sqlite3"))
+    await cache.aset("k", {"score": 80})
+    assert await cache.aget("k") == {"score": 80}
@@ -0,0 +1,61 @@
+import sys
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+
+# Ensure server package importable when running pytest from repo root
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from ai.utils.llm_client import LLMClient, AsyncBedrockTransport
+
+
+def _make_client(monkeypatch, handler) -> LLMClient:
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "test")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "test")
+    transport = AsyncBedrockTransport(region_name="us-east-1", endpoint_url="http://bedrock.local")
+    transport._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return LLMClient(transport=transport)
+
+
+@pytest.mark.asyncio
+async def test_ainvoke_signs_request_and_extracts_text(monkeypatch):
+    seen = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen["path"] = request.url.raw_path.decode()
+        seen["auth"] = request.headers.get("authorization", "")
+        seen["body"] = json.loads(request.content)
+        return httpx.Response(200, json={"content": [{"type": "text", "text": "  안녕하세요  "}]})
+
+    client = _make_client(monkeypatch, handler)
+    text = await client.ainvoke("ping", temperature=0.1, max_tokens=32)
+
+    assert text == "안녕하세요"
+    assert seen["path"].endswith("/invoke")
+    assert "%3A" in seen["path"]  # model id ':' 인코딩
+    assert seen["auth"].startswith("AWS4-HMAC-SHA256")
+    assert seen["body"]["max_tokens"] == 32
+
+
+@pytest.mark.asyncio
+async def test_transport_retries_throttling(monkeypatch):
+    calls = {"count": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls["count"] += 1
+        if calls["count"] == 1:
+            return httpx.Response(429, json={"message": "ThrottlingException"})
+        return httpx.Response(200, json={"content": [{"text": "ok"}]})
+
+    async def no_sleep(_):
+        return None
+
+    monkeypatch.setattr("ai.utils.llm_client.asyncio.sleep", no_sleep)
+    client = _make_client(monkeypatch, handler)
+
+    assert await client.chat_completion([{"role": "user", "content": "hi"}]) == "ok"
+    assert calls["count"] == 2
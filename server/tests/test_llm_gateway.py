@@ -0,0 +1,217 @@
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from openai import APIConnectionError, BadRequestError, RateLimitError
+
+# Ensure server package importable when running pytest from repo root
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from ai.utils import llm_gateway
+from ai.utils.llm_gateway import (
+    BedrockChatProvider,
+    CircuitBreaker,
+    CircuitOpenError,
+    LLMGateway,
+    OpenAIChatProvider,
+    gateway_metrics,
+    set_circuit_breaker,
+)
+from ai.utils.rate_limiter import TokenBucketRateLimiter, limited_chat_completion, set_rate_limiter
+
+
+class ScriptedCompletions:
+    """호출 순서대로 예외 또는 응답 반환"""
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.models = []
+
+    async def create(self, **kwargs):
+        self.models.append(kwargs["model"])
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+class FakeBedrockTransport:
+    def __init__(self, text):
+        self.text = text
+        self.bodies = []
+
+    async def invoke_model(self, model_id, body):
+        self.bodies.append(json.loads(body))
+        return {"content": [{"type": "text", "text": self.text}], "usage": {"input_tokens": 20, "output_tokens": 5}}
+
+
+def _openai(outcomes):
+    completions = ScriptedCompletions(outcomes)
+    return OpenAIChatProvider(SimpleNamespace(chat=SimpleNamespace(completions=completions))), completions
+
+
+def _connection_error():
+    return APIConnectionError(request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions"))
+
+
+def _reply(content):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+@pytest.fixture(autouse=True)
+def fresh_breakers():
+    llm_gateway._breakers.clear()
+    llm_gateway.gateway_stats.update({"calls": 0, "failovers": 0, "short_circuited": 0, "by_route": {}})
+    for name in ("openai", "bedrock"):
+        set_circuit_breaker(name, CircuitBreaker(name, min_samples=2, cooldown_seconds=60))
+    yield
+    llm_gateway._breakers.clear()
+
+
+@pytest.mark.asyncio
+async def test_fails_over_and_opens_breaker_after_errors():
+    primary, completions = _openai([_connection_error(), _connection_error()])
+    transport = FakeBedrockTransport('"ok": true}')
+    gateway = LLMGateway(primary, BedrockChatProvider(transport, model_id="claude"))
+    request = {"model": "gpt-4o", "messages": [{"role": "user", "content": "hi"}]}
+
+    for _ in range(3):
+        response = await gateway.chat.completions.create(**request)
+        assert response.model == "claude"
+
+    # 2회 실패 후 open → 세 번째 호출은 OpenAI를 건너뜀
+    assert completions.models == ["gpt-4o", "gpt-4o"]
+    metrics = gateway_metrics()
+    assert metrics["breakers"]["openai"]["state"] == "open"
+    assert metrics["failovers"] == 3
+    assert metrics["short_circuited"] == 1
+    assert metrics["by_route"] == {"openai->bedrock": 3}
+
+
+@pytest.mark.asyncio
+async def test_request_errors_are_not_failed_over():
+    error = BadRequestError(
+        "bad request",
+        response=httpx.Response(400, request=httpx.Request("POST", "https://api.openai.com")),
+        body=None,
+    )
+    primary, _ = _openai([error])
+    transport = FakeBedrockTransport("unused")
+    gateway = LLMGateway(primary, BedrockChatProvider(transport, model_id="claude"))
+
+    with pytest.raises(BadRequestError):
+        await gateway.chat.completions.create(model="gpt-4o", messages=[{"role": "user", "content": "hi"}])
+    assert transport.bodies == []
+    assert gateway_metrics()["breakers"]["openai"]["samples"] == 0
+
+
+@pytest.mark.asyncio
+async def test_bedrock_json_mode_prefills_and_returns_json_only():
+    transport = FakeBedrockTransport('"score": 80, "evidence": []}\n추가 설명은 무시')
+    provider = BedrockChatProvider(transport, model_id="claude")
+    messages = [
+        {"role": "system", "content": "평가자"},
+        {"role": "user", "content": "transcript"},
+        {"role": "user", "content": "rubric"},
+    ]
+
+    completion = await provider.create(
+        "claude", messages, temperature=0.2, max_tokens=100, response_format={"type": "json_object"}
+    )
+
+    body = transport.bodies[0]
+    assert body["anthropic_version"] == "bedrock-2023-05-31"
+    assert body["system"].startswith("평가자")
+    assert "JSON" in body["system"]
+    assert body["messages"] == [
+        {"role": "user", "content": "transcript\n\nrubric"},
+        {"role": "assistant", "content": "{"},
+    ]
+    assert json.loads(completion.choices[0].message.content) == {"score": 80, "evidence": []}
+    assert completion.usage.total_tokens == 25
+
+    stream = await provider.create("claude", messages, response_format={"type": "json_object"}, stream=True)
+    text = ""
+    async for chunk in stream:
+        if chunk.choices:
+            text += chunk.choices[0].delta.content or ""
+    assert json.loads(text)["score"] == 80
+
+
+@pytest.mark.asyncio
+async def test_invalid_bedrock_json_fails_over_to_openai():
+    transport = FakeBedrockTransport("not json at all")
+    openai, completions = _openai([_reply('{"ok": true}')])
+    openai.failover_model = "gpt-4o"
+    gateway = LLMGateway(BedrockChatProvider(transport, model_id="claude"), openai)
+
+    response = await gateway.chat.completions.create(
+        model="claude", messages=[{"role": "user", "content": "hi"}], response_format={"type": "json_object"}
+    )
+
+    assert response.choices[0].message.content == '{"ok": true}'
+    assert completions.models == ["gpt-4o"]
+
+
+def test_half_open_probe_closes_or_reopens(monkeypatch):
+    now = {"t": 0.0}
+    monkeypatch.setattr(llm_gateway.time, "monotonic", lambda: now["t"])
+    breaker = CircuitBreaker("openai", min_samples=2, cooldown_seconds=10)
+    breaker.record(1.0, ok=False)
+    breaker.record(1.0, ok=False)
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    now["t"] = 11.0
+    assert breaker.allow()
+    assert not breaker.allow()  # probe는 1건만
+    breaker.record(1.0, ok=False)
+    assert breaker.state == "open"
+
+    now["t"] = 22.0
+    assert breaker.allow()
+    breaker.record(1.0, ok=True)
+    assert breaker.state == "closed"
+    assert breaker.health_score() == 1.0
+
+
+@pytest.mark.asyncio
+async def test_raises_when_every_breaker_is_open():
+    for name in ("openai", "bedrock"):
+        breaker = CircuitBreaker(name, min_samples=1, cooldown_seconds=60)
+        breaker.record(1.0, ok=False)
+        set_circuit_breaker(name, breaker)
+    primary, completions = _openai([])
+    gateway = LLMGateway(primary, BedrockChatProvider(FakeBedrockTransport("x"), model_id="claude"))
+
+    with pytest.raises(CircuitOpenError):
+        await gateway.chat.completions.create(model="gpt-4o", messages=[{"role": "user", "content": "hi"}])
+    assert completions.models == []
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_is_not_failed_over_and_reaches_limiter():
+    error = RateLimitError(
+        "rate limited",
+        response=httpx.Response(
+            429, headers={"retry-after": "0.01"}, request=httpx.Request("POST", "https://api.openai.com")
+        ),
+        body=None,
+    )
+    primary, _ = _openai([error])
+    transport = FakeBedrockTransport("unused")
+    gateway = LLMGateway(primary, BedrockChatProvider(transport, model_id="claude"))
+    limiter = TokenBucketRateLimiter(10 ** 9, 10 ** 6)
+    set_rate_limiter("gpt-4o", limiter)
+
+    with pytest.raises(RateLimitError):
+        await limited_chat_completion(gateway, model="gpt-4o", messages=[{"role": "user", "content": "hi"}])
+    # Bedrock으로 넘기지 않고 공용 Limiter가 보류
+    assert transport.bodies == []
+    assert limiter.metrics()["rate_limited"] == 1
+    assert gateway_metrics()["failovers"] == 0
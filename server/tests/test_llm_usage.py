@@ -0,0 +1,134 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from openai import RateLimitError
+
+# Ensure server package importable when running pytest from repo root
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from ai.utils.llm_usage import (
+    estimate_cost_usd,
+    llm_usage_scope,
+    merge_llm_usage,
+    summarize_llm_usage,
+)
+from ai.utils.rate_limiter import TokenBucketRateLimiter, limited_chat_completion, set_rate_limiter
+
+
+def _usage(prompt, completion, cached=0):
+    return SimpleNamespace(
+        prompt_tokens=prompt,
+        completion_tokens=completion,
+        total_tokens=prompt + completion,
+        prompt_tokens_details=SimpleNamespace(cached_tokens=cached),
+    )
+
+
+class ScriptedCompletions:
+    """호출 순서대로 예외 또는 응답 반환"""
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+
+    async def create(self, **kwargs):
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def _client(completions):
+    return SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+
+def _rate_limit_error():
+    response = httpx.Response(
+        429,
+        headers={"retry-after": "0"},
+        request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions"),
+    )
+    return RateLimitError("rate limited", response=response, body=None)
+
+
+@pytest.fixture(autouse=True)
+def unlimited_limiter():
+    set_rate_limiter("gpt-4o", TokenBucketRateLimiter(10**9, 10**6))
+
+
+def test_estimate_cost_matches_dated_model_names():
+    assert estimate_cost_usd("gpt-4o-2024-08-06", 1_000_000, 0, 0) == pytest.approx(2.5)
+    assert estimate_cost_usd("gpt-4o-mini", 1_000_000, 1_000_000, 0) == pytest.approx(0.075)
+    assert estimate_cost_usd("unknown-model", 1000, 0, 1000) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_scope_records_spans_with_retries_and_rate_limits():
+    response = SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content="{}"))],
+        usage=_usage(1000, 200, cached=400),
+    )
+    client = _client(ScriptedCompletions([_rate_limit_error(), response]))
+    messages = [{"role": "user", "content": "hello"}]
+
+    with llm_usage_scope("batch_evaluation") as recorder:
+        with pytest.raises(RateLimitError):
+            await limited_chat_completion(client, span_label="problem_solving", model="gpt-4o", messages=messages)
+        await limited_chat_completion(client, span_label="problem_solving", model="gpt-4o", messages=messages)
+
+    # scope 밖 호출은 기록하지 않음
+    await limited_chat_completion(_client(ScriptedCompletions([response])), model="gpt-4o", messages=messages)
+
+    assert [span["status"] for span in recorder.spans] == ["rate_limited", "ok"]
+    total = recorder.summary()
+    assert total["calls"] == 2
+    assert total["retries"] == 1
+    assert total["rate_limited"] == 1
+    assert total["prompt_tokens"] == 1000
+    assert total["cached_tokens"] == 400
+    assert total["cost_usd"] == pytest.approx((600 * 2.5 + 400 * 1.25 + 200 * 10.0) / 1_000_000)
+
+
+@pytest.mark.asyncio
+async def test_stream_span_finishes_with_final_usage_chunk():
+    async def chunks():
+        yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content="{}"))], usage=None)
+        yield SimpleNamespace(choices=[], usage=_usage(300, 50))
+
+    client = _client(ScriptedCompletions([chunks()]))
+
+    with llm_usage_scope("batch_evaluation") as recorder:
+        stream = await limited_chat_completion(
+            client, span_label="growth_potential", model="gpt-4o",
+            messages=[{"role": "user", "content": "hello"}], stream=True,
+        )
+        assert recorder.spans == []
+        async for _ in stream:
+            pass
+        await stream.close()
+
+    assert len(recorder.spans) == 1
+    assert recorder.spans[0]["status"] == "ok"
+    assert recorder.spans[0]["stream"] is True
+    assert recorder.spans[0]["completion_tokens"] == 50
+
+
+def test_merge_llm_usage_sums_evaluations_per_node():
+    spans = [
+        {"node": "batch_evaluation", "label": "a", "model": "gpt-4o", "status": "ok",
+         "prompt_tokens": 100, "completion_tokens": 10, "cost_usd": 0.01, "latency_seconds": 2.0},
+        {"node": "final_integration", "label": "b", "model": "gpt-4o-mini", "status": "ok",
+         "prompt_tokens": 50, "completion_tokens": 5, "cost_usd": 0.001, "latency_seconds": 1.0},
+    ]
+    summary = summarize_llm_usage(spans)
+    merged = merge_llm_usage([summary, summary, None])
+
+    assert merged["evaluations"] == 2
+    assert merged["total"]["calls"] == 4
+    assert merged["by_node"]["batch_evaluation"]["prompt_tokens"] == 200
+    assert merged["by_model"]["gpt-4o-mini"]["cost_usd"] == pytest.approx(0.002)
+    assert merged["total"]["max_latency_seconds"] == 2.0
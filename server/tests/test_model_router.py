@@ -0,0 +1,118 @@
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Ensure server package importable when running pytest from repo root
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from ai.utils.model_router import (
+    ModelRouter,
+    RoutingValidationError,
+    load_model_routes,
+    parse_json_response,
+    routed_chat_completion,
+    set_model_router,
+)
+from ai.utils.rate_limiter import TokenBucketRateLimiter, set_rate_limiter
+
+
+class ModelScriptedCompletions:
+    """모델별 고정 응답"""
+
+    def __init__(self, replies):
+        self.replies = replies
+        self.models = []
+
+    async def create(self, **kwargs):
+        self.models.append(kwargs["model"])
+        content = self.replies[kwargs["model"]]
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(total_tokens=10),
+        )
+
+
+def _client(completions):
+    return SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+
+ROUTES = {
+    "summarization": {
+        "models": ["small", "large"],
+        "latency_target_seconds": None,
+        "max_failure_rate": 0.3,
+        "min_samples": 3,
+    },
+}
+
+
+@pytest.fixture(autouse=True)
+def unlimited_limiters():
+    for model in ("small", "large"):
+        set_rate_limiter(model, TokenBucketRateLimiter(10**9, 10**6))
+    yield
+    set_model_router(ModelRouter())
+
+
+def test_route_override_merges_fields_per_task(tmp_path):
+    routes = load_model_routes(json.dumps({"summarization": {"models": ["gpt-4o"]}}))
+    assert routes["summarization"]["models"] == ["gpt-4o"]
+    assert routes["summarization"]["max_failure_rate"] == 0.3
+    assert routes["verification"]["models"] == ["gpt-4o-mini", "gpt-4o"]
+
+    path = tmp_path / "routes.json"
+    path.write_text(json.dumps({"new_task": {"models": ["small"]}}), encoding="utf-8")
+    assert load_model_routes(str(path))["new_task"]["models"] == ["small"]
+
+
+@pytest.mark.asyncio
+async def test_escalates_to_larger_model_when_validation_fails():
+    router = ModelRouter(ROUTES)
+    set_model_router(router)
+    completions = ModelScriptedCompletions({"small": "not json", "large": '{"ok": true}'})
+
+    value, model = await routed_chat_completion(
+        _client(completions), "summarization", [{"role": "user", "content": "hi"}],
+        validate=parse_json_response,
+    )
+
+    assert value == {"ok": True}
+    assert model == "large"
+    assert completions.models == ["small", "large"]
+    assert router.escalations == 1
+
+
+@pytest.mark.asyncio
+async def test_skips_cheap_model_with_high_failure_rate():
+    router = ModelRouter(ROUTES)
+    set_model_router(router)
+    for _ in range(3):
+        router.record("summarization", "small", 0.1, valid=False)
+
+    assert router.candidates("summarization") == ["large"]
+
+    completions = ModelScriptedCompletions({"small": "{}", "large": "{}"})
+    await routed_chat_completion(_client(completions), "summarization", [{"role": "user", "content": "hi"}])
+    assert completions.models == ["large"]
+
+
+@pytest.mark.asyncio
+async def test_raises_when_every_model_fails_validation():
+    set_model_router(ModelRouter(ROUTES))
+    completions = ModelScriptedCompletions({"small": "x", "large": "y"})
+
+    with pytest.raises(RoutingValidationError):
+        await routed_chat_completion(
+            _client(completions), "summarization", [{"role": "user", "content": "hi"}],
+            validate=parse_json_response,
+        )
+
+
+def test_unknown_task_is_rejected():
+    with pytest.raises(ValueError):
+        ModelRouter(ROUTES).candidates("rubric_scoring")
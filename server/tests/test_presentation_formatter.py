@@ -0,0 +1,78 @@
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Ensure server package importable when running pytest from repo root
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from ai.agents.graph.presentation_formatter_node import PresentationFormatter
+from ai.utils.llm_cache import NullLLMCache
+from ai.utils.rate_limiter import TokenBucketRateLimiter, set_rate_limiter
+
+
+@pytest.fixture(autouse=True)
+def unlimited_limiters():
+    for model in ("gpt-4o-mini", "gpt-4o"):
+        set_rate_limiter(model, TokenBucketRateLimiter(10**9, 10**6))
+
+
+class SlowCompletions:
+    """호출마다 0.05초 지연, 동시 실행 수 기록"""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def create(self, **kwargs):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.05)
+        self.in_flight -= 1
+        prompt = kwargs["messages"][-1]["content"]
+        name = prompt.split('"')[1]
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=f"연결된 문단: {name} 문단"))],
+            usage=None,
+        )
+
+
+@pytest.mark.asyncio
+async def test_connected_summaries_run_concurrently():
+    completions = SlowCompletions()
+    formatter = PresentationFormatter(SimpleNamespace(chat=SimpleNamespace(completions=completions)), cache=NullLLMCache())
+    details = {
+        f"comp_{i}": {"competency_display_name": f"역량{i}", "evidences": [{"summary": f"근거 {i}"}]}
+        for i in range(5)
+    }
+    details["empty"] = {"competency_display_name": "빈 역량", "evidences": []}
+
+    result = await formatter._add_connected_summaries(details)
+
+    assert completions.max_in_flight == 5
+    assert result["comp_3"]["connected_summary"] == "역량3 문단"
+    assert result["empty"]["connected_summary"] == ""
+    assert formatter.timings["connected_summary_calls"] == 5
+    assert formatter.timings["connected_summaries_seconds"] < formatter.timings["connected_summaries_sequential_seconds"]
+
+
+@pytest.mark.asyncio
+async def test_connected_summaries_respect_limiter_in_flight_cap():
+    for model in ("gpt-4o-mini", "gpt-4o"):
+        set_rate_limiter(model, TokenBucketRateLimiter(0, 0, max_in_flight=2))
+    completions = SlowCompletions()
+    formatter = PresentationFormatter(SimpleNamespace(chat=SimpleNamespace(completions=completions)), cache=NullLLMCache())
+    details = {
+        f"comp_{i}": {"competency_display_name": f"역량{i}", "evidences": [{"summary": f"근거 {i}"}]}
+        for i in range(6)
+    }
+
+    result = await formatter._add_connected_summaries(details)
+
+    # 역량 6개를 동시에 시작해도 발송은 Limiter 상한만큼
+    assert completions.max_in_flight == 2
+    assert all(result[f"comp_{i}"]["connected_summary"] == f"역량{i} 문단" for i in range(6))
@@ -0,0 +1,68 @@
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Ensure server package importable when running pytest from repo root
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from ai.agents.competency_agent import CompetencyAgent
+from ai.utils.transcript_renderer import TRANSCRIPT_REFERENCE, split_transcript_block
+from services.evaluation.evaluation_service import EvaluationService
+
+
+TRANSCRIPT = {
+    "segments": [
+        {
+            "segment_id": 1,
+            "question_text": "재고회전율을 개선한 경험이 있으신가요?",
+            "answer_text": "네, 재고회전율 개선 프로젝트에 참여했습니다.",
+            "char_index_start": 0,
+            "char_index_end": 25,
+        }
+    ]
+}
+
+
+def _service() -> EvaluationService:
+    return object.__new__(EvaluationService)
+
+
+def test_transcript_first_layout_shares_prefix(monkeypatch):
+    monkeypatch.setattr("core.config.PROMPT_LAYOUT", "transcript_first")
+    prompts = list(_service()._load_prompts(TRANSCRIPT).values())
+
+    prefix = os.path.commonprefix(prompts)
+    assert prefix.startswith("[Interview Transcript]\n")
+    assert "answer_text: 네, 재고회전율 개선 프로젝트에 참여했습니다." in prefix
+    assert all(TRANSCRIPT_REFERENCE in prompt for prompt in prompts)
+    assert all(prompt.count("재고회전율 개선 프로젝트") == 1 for prompt in prompts)
+
+    block, rubric = split_transcript_block(prompts[0])
+    assert block.endswith("[/Interview Transcript]")
+    assert "재고회전율 개선 프로젝트" not in rubric
+
+
+def test_inline_layout_keeps_transcript_inside_rubric(monkeypatch):
+    monkeypatch.setattr("core.config.PROMPT_LAYOUT", "inline")
+    prompts = list(_service()._load_prompts(TRANSCRIPT).values())
+
+    assert not os.path.commonprefix(prompts).startswith("[Interview Transcript]")
+    assert all(TRANSCRIPT_REFERENCE not in prompt for prompt in prompts)
+
+
+def test_prompt_cache_summary_records_cached_tokens():
+    agent = CompetencyAgent(openai_client=None, cache=object())
+    for name, cached in (("problem_solving", 0), ("growth_potential", 3072)):
+        agent._record_usage(name, SimpleNamespace(usage=SimpleNamespace(
+            prompt_tokens=4096,
+            completion_tokens=900,
+            prompt_tokens_details=SimpleNamespace(cached_tokens=cached),
+        )))
+
+    summary = agent.prompt_cache_summary()
+    assert summary["calls"] == 2
+    assert summary["cached_tokens"] == 3072
+    assert summary["cache_hit_ratio"] == 0.375
@@ -0,0 +1,202 @@
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from openai import RateLimitError
+
+# Ensure server package importable when running pytest from repo root
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from ai.utils.rate_limiter import (
+    DEFAULT_COMPLETION_TOKENS,
+    TokenBucketRateLimiter,
+    estimate_chat_tokens,
+    limited_chat_completion,
+    set_rate_limiter,
+)
+
+
+class FakeCompletions:
+    def __init__(self, usage_tokens=None, error=None, completion_tokens=None):
+        self.usage_tokens = usage_tokens
+        self.completion_tokens = completion_tokens
+        self.error = error
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content="{}"))],
+            usage=SimpleNamespace(total_tokens=self.usage_tokens, completion_tokens=self.completion_tokens),
+        )
+
+
+def _client(completions):
+    return SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+
+def test_estimate_chat_tokens_counts_korean_densely():
+    english = estimate_chat_tokens([{"role": "user", "content": "a" * 400}])
+    korean = estimate_chat_tokens([{"role": "user", "content": "가" * 400}])
+    assert korean > english
+
+
+@pytest.mark.asyncio
+async def test_acquire_waits_for_token_budget(monkeypatch):
+    limiter = TokenBucketRateLimiter(tokens_per_minute=600, requests_per_minute=1000)
+    slept = []
+
+    async def fake_sleep(seconds):
+        slept.append(seconds)
+        limiter._updated -= seconds  # 시간 경과 시뮬레이션
+
+    monkeypatch.setattr("ai.utils.rate_limiter.asyncio.sleep", fake_sleep)
+
+    await limiter.acquire(500)
+    await limiter.acquire(500)  # 400 토큰 부족 → 600 TPM 기준 40초 대기
+
+    assert slept and slept[0] == pytest.approx(40, rel=0.05)
+    assert limiter.metrics()["admitted"] == 2
+
+
+@pytest.mark.asyncio
+async def test_limited_chat_completion_refunds_unused_reservation():
+    limiter = TokenBucketRateLimiter(tokens_per_minute=10000, requests_per_minute=100)
+    set_rate_limiter("test-model", limiter)
+    completions = FakeCompletions(usage_tokens=100)
+
+    await limited_chat_completion(
+        _client(completions),
+        model="test-model",
+        messages=[{"role": "user", "content": "hello"}],
+        max_tokens=4000,
+    )
+
+    metrics = limiter.metrics()
+    assert metrics["available_tokens"] >= 9899
+    assert metrics["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_error_blocks_shared_limiter():
+    limiter = TokenBucketRateLimiter(tokens_per_minute=10000, requests_per_minute=100)
+    set_rate_limiter("test-model-429", limiter)
+    response = httpx.Response(
+        429,
+        headers={"retry-after": "7"},
+        request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions"),
+    )
+    completions = FakeCompletions(error=RateLimitError("rate limited", response=response, body=None))
+
+    with pytest.raises(RateLimitError):
+        await limited_chat_completion(
+            _client(completions),
+            model="test-model-429",
+            messages=[{"role": "user", "content": "hello"}],
+        )
+
+    assert limiter.metrics()["rate_limited"] == 1
+    assert limiter._seconds_until_available(1) == pytest.approx(7, abs=0.5)
+
+
+@pytest.mark.asyncio
+async def test_zero_budget_disables_limits_but_keeps_429_hold(monkeypatch):
+    limiter = TokenBucketRateLimiter(tokens_per_minute=0, requests_per_minute=0)
+    slept = []
+
+    async def fake_sleep(seconds):
+        slept.append(seconds)
+        limiter._blocked_until = 0.0
+
+    monkeypatch.setattr("ai.utils.rate_limiter.asyncio.sleep", fake_sleep)
+
+    # 예산 제한 없음: 큰 예약도 대기 없이 발송
+    for _ in range(20):
+        reserved = await limiter.acquire(20000)
+        limiter.release(reserved, used=100)
+    assert not slept and limiter.has_capacity(20000)
+    assert limiter.metrics()["admitted"] == 20 and limiter.metrics()["in_flight"] == 0
+
+    # 429 보류는 그대로 적용
+    limiter.penalize(5)
+    assert not limiter.has_capacity(1)
+    await limiter.acquire(100)
+    assert slept and slept[0] == pytest.approx(5, abs=0.5)
+
+
+class FakeStreamCompletions:
+    async def create(self, **kwargs):
+        async def chunks():
+            yield SimpleNamespace(usage=None)
+            yield SimpleNamespace(usage=SimpleNamespace(total_tokens=150))
+        return chunks()
+
+
+@pytest.mark.asyncio
+async def test_stream_settles_reservation_after_last_usage_chunk():
+    limiter = TokenBucketRateLimiter(tokens_per_minute=10000, requests_per_minute=100)
+    set_rate_limiter("test-model-stream", limiter)
+
+    stream = await limited_chat_completion(
+        _client(FakeStreamCompletions()),
+        model="test-model-stream",
+        messages=[{"role": "user", "content": "hello"}],
+        max_tokens=4000,
+        stream=True,
+        stream_options={"include_usage": True},
+    )
+    # 스트림을 소비하는 동안은 예약분(프롬프트 + 예상 응답) 그대로 in-flight
+    assert limiter.metrics()["in_flight"] == 1
+    assert limiter.metrics()["available_tokens"] < 10000 - DEFAULT_COMPLETION_TOKENS
+
+    async for _ in stream:
+        pass
+    await stream.close()
+
+    metrics = limiter.metrics()
+    assert metrics["in_flight"] == 0
+    # 실제 사용량(150)만 차감, close()가 한 번 더 정산하지 않음
+    assert 9849 <= metrics["available_tokens"] <= 9860
+
+
+@pytest.mark.asyncio
+async def test_in_flight_cap_applies_without_budget():
+    limiter = TokenBucketRateLimiter(tokens_per_minute=0, requests_per_minute=0, max_in_flight=2)
+    await limiter.acquire(100)
+    await limiter.acquire(100)
+    assert not limiter.has_capacity(1)
+
+    third = asyncio.ensure_future(limiter.acquire(100))
+    await asyncio.sleep(0.01)
+    # 자리가 날 때까지 대기
+    assert not third.done() and limiter.metrics()["queue_depth"] == 1
+
+    limiter.release(0)
+    await asyncio.wait_for(third, timeout=1)
+    assert limiter.metrics()["in_flight"] == 2 and limiter.metrics()["admitted"] == 3
+
+
+@pytest.mark.asyncio
+async def test_reservation_uses_expected_completion_instead_of_max_tokens():
+    limiter = TokenBucketRateLimiter(tokens_per_minute=100000, requests_per_minute=100)
+    set_rate_limiter("test-model-expected", limiter)
+    messages = [{"role": "user", "content": "hello"}]
+    prompt = estimate_chat_tokens(messages)
+
+    # 관측 전에는 기본 예상치, max_tokens보다 작으면 max_tokens
+    assert limiter.reservation_tokens(messages, 4000) == prompt + DEFAULT_COMPLETION_TOKENS
+    assert limiter.reservation_tokens(messages, 200) == prompt + 200
+
+    completions = FakeCompletions(usage_tokens=300, completion_tokens=200)
+    for _ in range(20):
+        await limited_chat_completion(_client(completions), model="test-model-expected", messages=messages, max_tokens=4000)
+
+    # 실제 응답 길이(200)에 수렴
+    assert limiter.reservation_tokens(messages, 4000) < prompt + 250
@@ -0,0 +1,146 @@
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Ensure server package importable when running pytest from repo root
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from ai.agents.competency_agent import COMPETENCY_CONFIGS, CompetencyAgent, evaluate_all_competencies
+from ai.agents.graph.reevaluation import (
+    build_reevaluation_snapshot,
+    changed_prompts,
+    compute_prompt_hashes,
+    reusable_presentation_details,
+    reusable_stage1,
+    tracked,
+)
+from ai.utils.llm_cache import NullLLMCache
+from ai.utils.rate_limiter import TokenBucketRateLimiter, set_rate_limiter
+
+
+NAMES = [name for name, _, _ in COMPETENCY_CONFIGS]
+
+
+@pytest.fixture(autouse=True)
+def unlimited_rate_limiter():
+    set_rate_limiter("gpt-4o", TokenBucketRateLimiter(10 ** 9, 10 ** 6))
+
+
+class RubricCompletions:
+    def __init__(self):
+        self.calls = []
+
+    async def create(self, **kwargs):
+        prompt = kwargs["messages"][-1]["content"]
+        name = next(name for name in NAMES if f"RUBRIC {name}" in prompt)
+        self.calls.append(name)
+        payload = {"overall_score": 60, "confidence": {"overall_confidence": 0.8}, "perspectives": {}}
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(payload)))],
+            usage=None,
+        )
+
+
+def _state(rubric_suffix="", resume=None):
+    prompts = {name: f"RUBRIC {name}" for name in NAMES}
+    prompts["seasonal_strategy_kpi"] += rubric_suffix
+    return {
+        "prompts": prompts,
+        "prompt_hashes": {name: f"h-{prompts[name]}" for name in NAMES},
+        "resume_data": resume,
+    }
+
+
+def _previous_run(state):
+    outputs = {f"{name}_result": {"overall_score": 70} for name in NAMES}
+    outputs["confidence_v2_calculated"] = True
+    outputs["segment_evaluations_with_resume"] = [{"competency": name, "segment_id": 1} for name in NAMES]
+    snapshot = build_reevaluation_snapshot({**state, "node_outputs": {"batch_evaluation": outputs}})
+    return json.loads(json.dumps(snapshot))
+
+
+def test_prompt_hash_changes_only_for_edited_rubric():
+    before = compute_prompt_hashes({"a": lambda t: f"A {t}", "b": lambda t: f"B {t}"})
+    after = compute_prompt_hashes({"a": lambda t: f"A {t}", "b": lambda t: f"B2 {t}"})
+
+    assert before["a"] == after["a"]
+    assert changed_prompts(before, after) == ["b"]
+    assert changed_prompts(None, after) == ["a", "b"]
+
+
+def test_reusable_stage1_keeps_unchanged_competencies_and_segments():
+    previous_run = _previous_run(_state())
+
+    results, segments = reusable_stage1({**_state(" v2"), "previous_run": previous_run})
+    assert "seasonal_strategy_kpi" not in results
+    assert len(results) == 9
+    assert {seg["competency"] for seg in segments} == set(results)
+
+    # Resume가 바뀌면 Stage 1 결과는 재사용하되 Resume 검증은 다시 수행
+    results, segments = reusable_stage1({**_state(" v2", resume={"projects": []}), "previous_run": previous_run})
+    assert len(results) == 9
+    assert segments is None
+
+
+@pytest.mark.asyncio
+async def test_evaluate_all_competencies_runs_only_changed():
+    completions = RubricCompletions()
+    agent = CompetencyAgent(SimpleNamespace(chat=SimpleNamespace(completions=completions)), cache=NullLLMCache())
+    reuse = {name: {"overall_score": 70} for name in NAMES if name != "seasonal_strategy_kpi"}
+    arrived = []
+
+    results = await evaluate_all_competencies(
+        agent, {"segments": []}, _state()["prompts"], grouping="category",
+        on_result=lambda name, result: arrived.append(name), reuse=reuse
+    )
+
+    assert completions.calls == ["seasonal_strategy_kpi"]
+    assert results["seasonal_strategy_kpi"]["overall_score"] == 60
+    assert results["problem_solving"] == {"overall_score": 70}
+    assert sorted(arrived) == sorted(NAMES)
+
+
+@pytest.mark.asyncio
+async def test_tracked_node_reuses_output_when_inputs_unchanged():
+    calls = []
+
+    async def final_integration(state):
+        calls.append(1)
+        return {"final_score": 80.0, "final_result": {"final_score": 80.0}, "execution_logs": [{"node": "final_integration"}]}
+
+    node = tracked("final_integration", final_integration)
+    state = {"aggregated_competencies": {"a": {"overall_score": 80}}, "competency_weights": {"a": 1.0}}
+    first = await node(state)
+    # 이후 노드가 in-place로 수정해도 스냅샷은 그대로
+    first["final_result"]["overall_evaluation_summary"] = "추가됨"
+
+    previous_run = {"node_input_hashes": first["node_input_hashes"], "node_outputs": first["node_outputs"]}
+    reused = await node({**state, "previous_run": previous_run})
+    assert calls == [1]
+    assert reused["final_result"] == {"final_score": 80.0}
+    assert reused["execution_logs"][0]["reused"] is True
+
+    await node({**state, "competency_weights": {"a": 0.5}, "previous_run": previous_run})
+    assert calls == [1, 1]
+
+
+def test_presentation_details_reused_only_for_identical_competencies():
+    previous_run = {
+        "node_outputs": {
+            "aggregator": {"aggregated_competencies": {"a": {"overall_score": 80}, "b": {"overall_score": 60}}},
+            "presentation_formatter": {
+                "presentation_result": {"competency_details": {"a": {"evidences": ["a"]}, "b": {"evidences": ["b"]}}}
+            },
+        }
+    }
+    state = {
+        "previous_run": previous_run,
+        "aggregated_competencies": {"a": {"overall_score": 80}, "b": {"overall_score": 65}},
+    }
+
+    assert reusable_presentation_details(state) == {"a": {"evidences": ["a"]}}
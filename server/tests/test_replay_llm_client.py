@@ -0,0 +1,108 @@
+import sys
+from pathlib import Path
+
+import pytest
+from openai import RateLimitError
+from openai.types.chat import ChatCompletion
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from ai.utils.rate_limiter import retry_after_seconds  # noqa: E402
+from ai.utils.replay_llm_client import RecordReplayOpenAI  # noqa: E402
+
+
+def _completion(content: str) -> ChatCompletion:
+    return ChatCompletion.model_validate({
+        "id": "chatcmpl-test",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-4o",
+        "choices": [{
+            "index": 0,
+            "finish_reason": "stop",
+            "message": {"role": "assistant", "content": content},
+        }],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+    })
+
+
+class _FakeRealClient:
+    def __init__(self, content: str):
+        self.calls = []
+        self.content = content
+        self.chat = self
+        self.completions = self
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        return _completion(self.content)
+
+
+REQUEST = {
+    "model": "gpt-4o",
+    "messages": [{"role": "user", "content": "평가해줘"}],
+    "temperature": 0.3,
+    "response_format": {"type": "json_object"},
+}
+
+
+@pytest.mark.asyncio
+async def test_record_then_replay_round_trip(tmp_path):
+    real = _FakeRealClient('{"overall_score": 80}')
+    recorder = RecordReplayOpenAI("record", str(tmp_path), real_client=real)
+    recorded = await recorder.chat.completions.create(**REQUEST)
+
+    replayer = RecordReplayOpenAI("replay", str(tmp_path), latency=0)
+    replayed = await replayer.chat.completions.create(**REQUEST)
+
+    assert len(real.calls) == 1
+    assert replayed.choices[0].message.content == recorded.choices[0].message.content
+    assert replayed.usage.total_tokens == 15
+    assert replayer.stats["replayed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_replay_streams_recorded_response_with_usage(tmp_path):
+    content = '{"overall_score": 80, "confidence": {"overall_confidence": 0.8}}'
+    await RecordReplayOpenAI("record", str(tmp_path), real_client=_FakeRealClient(content)) \
+        .chat.completions.create(**REQUEST)
+
+    replayer = RecordReplayOpenAI("replay", str(tmp_path), latency=0, stream_chunk_size=7)
+    stream = await replayer.chat.completions.create(
+        **REQUEST, stream=True, stream_options={"include_usage": True}
+    )
+    pieces, usage = [], None
+    async for chunk in stream:
+        if chunk.choices:
+            pieces.append(chunk.choices[0].delta.content)
+        if chunk.usage is not None:
+            usage = chunk.usage
+    await stream.close()
+
+    assert "".join(pieces) == content
+    assert len(pieces) > 1
+    assert usage.total_tokens == 15
+
+
+@pytest.mark.asyncio
+async def test_replay_injects_rate_limit_with_retry_after(tmp_path):
+    await RecordReplayOpenAI("record", str(tmp_path), real_client=_FakeRealClient("{}")) \
+        .chat.completions.create(**REQUEST)
+
+    replayer = RecordReplayOpenAI(
+        "replay", str(tmp_path), latency=0, rate_limit_probability=1.0, retry_after_seconds=2
+    )
+    with pytest.raises(RateLimitError) as exc_info:
+        await replayer.chat.completions.create(**REQUEST)
+
+    assert retry_after_seconds(exc_info.value) == 2
+    assert replayer.stats["injected_429"] == 1
+
+
+@pytest.mark.asyncio
+async def test_replay_missing_fixture_raises(tmp_path):
+    replayer = RecordReplayOpenAI("replay", str(tmp_path), latency=0)
+    with pytest.raises(FileNotFoundError):
+        await replayer.chat.completions.create(**REQUEST)
@@ -0,0 +1,118 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Ensure server package importable when running pytest from repo root
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from ai.agents.graph.final_integration_node import FinalIntegrator
+from services.evaluation.rescoring_service import RescoringService, rescore_aggregated, validate_weights
+
+
+AGGREGATED = {
+    "problem_solving": {"overall_score": 90, "confidence_v2": 0.8},
+    "organizational_fit": {"overall_score": 70, "confidence_v2": 0.6},
+    "md_data_analysis": {"overall_score": 60, "confidence_v2": 0.9},
+}
+
+
+class FakeQuery:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def filter(self, *conditions):
+        return self
+
+    def first(self):
+        return self.rows[0] if self.rows else None
+
+    def all(self):
+        return list(self.rows)
+
+
+class FakeSession:
+    def __init__(self, job, evaluations):
+        self.job = job
+        self.evaluations = evaluations
+        self.commits = 0
+
+    def query(self, model):
+        return FakeQuery([self.job] if model.__name__ == "Job" else self.evaluations)
+
+    def commit(self):
+        self.commits += 1
+
+
+def _evaluation(evaluation_id, aggregated):
+    return SimpleNamespace(
+        id=evaluation_id,
+        applicant_id=evaluation_id * 10,
+        match_score=75.0,
+        normalized_score=75.0,
+        weighted_score=75.0,
+        confidence_score=0.7,
+        individual_evaluations=aggregated,
+        validation_result={"low_confidence_list": []},
+        aggregated_evaluation={
+            "final_result": {
+                "final_score": 75.0,
+                "overall_evaluation_summary": "LLM 심사평",
+                "competency_details": {
+                    name: {"overall_score": data["overall_score"], "weight": 0.1, "weighted_contribution": 0}
+                    for name, data in AGGREGATED.items()
+                },
+            },
+            "analysis_summary": {"positive_keywords": ["논리"]},
+        },
+        match_result={"final_score": 75.0},
+        evaluation_metadata={"s3_paths": {}},
+        updated_at=None,
+    )
+
+
+def test_rescore_matches_final_integrator_scores():
+    weights = {"problem_solving": 0.5, "organizational_fit": 0.3, "md_data_analysis": 0.2}
+    result = rescore_aggregated(AGGREGATED, weights, final_result={"overall_evaluation_summary": "유지"})
+
+    expected_score, _ = FinalIntegrator._calculate_final_score(AGGREGATED, weights)
+    assert result["final_score"] == expected_score
+    assert result["avg_confidence"] == FinalIntegrator._calculate_avg_confidence(AGGREGATED, weights)
+    assert result["score_breakdown"]["job_score"] == 60.0
+    assert result["score_breakdown"]["common_score"] == 82.5
+    assert result["final_result"]["overall_evaluation_summary"] == "유지"
+
+
+def test_validate_weights_rejects_unknown_and_negative():
+    with pytest.raises(ValueError):
+        validate_weights({"leadership": 1.0})
+    with pytest.raises(ValueError):
+        validate_weights({"problem_solving": -0.1, "organizational_fit": 1.0})
+    assert validate_weights({"problem_solving": 1}) == {"problem_solving": 1.0}
+
+
+def test_rescore_job_updates_all_applicants_in_one_commit():
+    job = SimpleNamespace(id=1, competency_weights={"problem_solving": 1.0})
+    evaluations = [_evaluation(1, AGGREGATED), _evaluation(2, None)]
+    db = FakeSession(job, evaluations)
+    weights = {"problem_solving": 0.0, "organizational_fit": 0.0, "md_data_analysis": 1.0}
+
+    summary = RescoringService().rescore_job(db, 1, weights, save_weights=True)
+
+    assert db.commits == 1
+    assert [r["evaluation_id"] for r in summary["rescored"]] == [1]
+    assert [s["evaluation_id"] for s in summary["skipped"]] == [2]
+
+    updated = evaluations[0]
+    assert updated.match_score == 60.0
+    assert updated.match_result["final_score"] == 60.0
+    final_result = updated.aggregated_evaluation["final_result"]
+    assert final_result["overall_evaluation_summary"] == "LLM 심사평"
+    assert final_result["competency_details"]["md_data_analysis"]["weight"] == 1.0
+    assert final_result["score_breakdown"]["job_score"] == 60.0
+    assert updated.aggregated_evaluation["analysis_summary"] == {"positive_keywords": ["논리"]}
+    assert updated.evaluation_metadata["rescoring"]["previous_score"] == 75.0
+    assert job.competency_weights == weights
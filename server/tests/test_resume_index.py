@@ -0,0 +1,166 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Ensure server package importable when running pytest from repo root
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from ai.agents.aggregators.resume_index import ResumeIndex, tokenize
+from ai.agents.aggregators.resume_verifier import ResumeVerifier
+from ai.utils.llm_cache import NullLLMCache
+from ai.utils.rate_limiter import TokenBucketRateLimiter, set_rate_limiter
+
+
+RESUME = {
+    "applicant_name": "김지원",
+    "experience": [{
+        "company": "한섬 (현대백화점그룹)",
+        "position": "MD 어시스턴트",
+        "start_date": "2021-03",
+        "highlights": [
+            "재고회전율 0.8회 → 1.2회 개선 (50% 향상)",
+            "판매율 73% 달성, 주요 SKU 품절률 5% 이하 유지",
+            "디자인팀과 베이직:디자인 비율 협의 (데이터 기반 설득)",
+        ],
+    }],
+    "skills": {"data_analysis": ["Excel (고급: 피벗, VLOOKUP)", "Tableau (중급: 대시보드 구축)"]},
+}
+
+
+class VerifyingCompletions:
+    """프롬프트의 Segment 평가를 모두 medium으로 검증, 동시 호출 수 기록"""
+
+    def __init__(self):
+        self.prompts = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def create(self, **kwargs):
+        prompt = kwargs["messages"][1]["content"]
+        segments = json.loads(prompt.split("## Segment Evaluations to Verify:")[1].split("```json")[1].split("```")[0])
+        self.prompts.append([s["segment_id"] for s in segments])
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        verifications = [
+            {
+                "competency": s["competency"],
+                "segment_id": s["segment_id"],
+                "resume_verified": True,
+                "verification_strength": "medium",
+                "resume_matches": [{"resume_section": "experience", "matched_content": "x"}],
+            }
+            for s in segments
+        ]
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps({"verifications": verifications})))],
+            usage=None,
+        )
+
+
+@pytest.fixture(autouse=True)
+def unlimited_limiters():
+    for model in ("gpt-4o-mini", "gpt-4o"):
+        set_rate_limiter(model, TokenBucketRateLimiter(10**9, 10**6))
+
+
+def test_tokenize_strips_particles_and_keeps_figures():
+    words, grams = tokenize("판매율 73%를 달성했습니다, 비율은 4:6에서 5:5로")
+
+    assert words == ["판매율", "73%", "를", "달성", "비율", "4:6", "에서", "5:5", "로"]
+    assert "판매" in grams and "매율" in grams
+
+
+def test_classify_exact_match_zero_overlap_and_ambiguous():
+    index = ResumeIndex(RESUME)
+
+    exact = index.classify("결과적으로 판매율 73%를 달성하면서도 주요 SKU 품절률을 5% 이하로 유지했습니다.")
+    assert exact["decision"] == "verified"
+    assert exact["anchors"] == ["5%", "73%", "sku"]
+    assert exact["matches"][0]["matched_content"].startswith("한섬 (현대백화점그룹)")
+
+    assert index.classify("주말에는 축구 동호회 활동을 합니다")["decision"] == "rejected"
+    # 지원자 이름 등 식별 정보는 색인하지 않음
+    assert index.classify("김지원")["decision"] == "rejected"
+
+    # 관련은 있으나 Resume에 없는 수치 → AI 판단
+    conflicting = index.classify("재고회전율을 0.8회에서 2.5회로 개선했습니다")
+    assert conflicting["decision"] == "ambiguous" and conflicting["missing_anchors"] == ["2.5"]
+    assert index.classify("디자인팀을 데이터로 설득한 경험이 있습니다")["decision"] == "ambiguous"
+
+
+def _results(quotes_by_competency):
+    return {
+        name: {
+            "overall_score": 80,
+            "confidence": {"overall_confidence": 0.7},
+            "perspectives": {
+                "evidence_details": [{"segment_id": sid, "text": text} for sid, text in quotes],
+            },
+        }
+        for name, quotes in quotes_by_competency.items()
+    }
+
+
+@pytest.mark.asyncio
+async def test_verify_batch_sends_only_ambiguous_segments_in_concurrent_chunks():
+    completions = VerifyingCompletions()
+    client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    verifier = ResumeVerifier(client, cache=NullLLMCache(), batch_size=4)
+    results = _results({
+        "achievement_motivation": [(1, "판매율 73% 달성, 주요 SKU 품절률 5% 이하 유지했습니다")],
+        "customer_journey_marketing": [(2, "주말에는 축구 동호회 활동을 합니다")],
+        "stakeholder_management": [(sid, f"디자인팀을 데이터로 설득한 경험 {sid}") for sid in range(10, 20)],
+    })
+
+    segments = await verifier.verify_batch(results, RESUME)
+
+    # 애매한 10개만 4개씩 3회, 동시에 호출
+    assert sorted(sid for prompt in completions.prompts for sid in prompt) == list(range(10, 20))
+    assert len(completions.prompts) == 3 and completions.max_in_flight > 1
+
+    by_id = {s["segment_id"]: s["resume_verification"] for s in segments}
+    assert [s["segment_id"] for s in segments] == [1, 2] + list(range(10, 20))
+    assert by_id[1]["verified"] and by_id[1]["strength"] == "high"
+    assert by_id[1]["resume_matches"][0]["resume_section"] == "experience"
+    assert not by_id[2]["verified"] and by_id[2]["strength"] == "none"
+    assert all(by_id[sid]["strength"] == "medium" for sid in range(10, 20))
+
+    # 같은 Resume 객체면 색인 재사용
+    index = verifier._index
+    await verifier.verify_batch(_results({"achievement_motivation": [(1, "SKU 73% 5%")]}), RESUME)
+    assert verifier._index is index
+
+
+class FailingChunkCompletions(VerifyingCompletions):
+    """segment 10이 든 묶음만 호출 실패"""
+
+    async def create(self, **kwargs):
+        if '"segment_id": 10' in kwargs["messages"][1]["content"]:
+            raise ConnectionError("upstream timeout")
+        return await super().create(**kwargs)
+
+
+@pytest.mark.asyncio
+async def test_failed_chunk_does_not_discard_other_chunks():
+    completions = FailingChunkCompletions()
+    client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    verifier = ResumeVerifier(client, cache=NullLLMCache(), batch_size=4)
+    results = _results({
+        "stakeholder_management": [(sid, f"디자인팀을 데이터로 설득한 경험 {sid}") for sid in range(10, 20)],
+    })
+
+    segments = await verifier.verify_batch(results, RESUME)
+
+    # 실패한 묶음(10~13)만 검증 실패, 나머지 묶음 결과는 유지
+    by_id = {s["segment_id"]: s["resume_verification"] for s in segments}
+    assert [s["segment_id"] for s in segments] == list(range(10, 20))
+    assert all(not by_id[sid]["verified"] for sid in range(10, 14))
+    assert all(by_id[sid]["strength"] == "medium" for sid in range(14, 20))
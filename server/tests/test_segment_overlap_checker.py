@@ -0,0 +1,131 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Ensure server package importable when running pytest from repo root
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from ai.agents.aggregators.segment_overlap_checker import SegmentOverlapChecker
+from ai.utils.llm_cache import NullLLMCache
+from ai.utils.rate_limiter import TokenBucketRateLimiter, set_rate_limiter
+
+
+class MediatingCompletions:
+    """프롬프트의 Segment마다 낮은 점수 역량을 0.5(5점 척도) 올리는 조정, 동시 호출 수 기록"""
+
+    def __init__(self, broken_batches=()):
+        self.broken_batches = set(broken_batches)
+        self.prompts = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def create(self, **kwargs):
+        prompt = kwargs["messages"][1]["content"]
+        segments = json.loads(prompt.split("```json")[1].split("```")[0])
+        self.prompts.append([s["segment_id"] for s in segments])
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+
+        if segments[0]["segment_id"] in self.broken_batches:
+            content = "not json"
+        else:
+            content = json.dumps({"mediations": [
+                {
+                    "segment_id": s["segment_id"],
+                    "trust_agent": max(s["evaluations"], key=lambda e: e["score"])["competency"],
+                    "adjustments": [{
+                        "competency": min(s["evaluations"], key=lambda e: e["score"])["competency"],
+                        "adjustment_direction": "increase",
+                        "adjustment_amount": 0.5,
+                        "confidence_penalty": 0.05,
+                        "reason": "AI",
+                    }],
+                }
+                for s in segments
+            ]})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))], usage=None)
+
+
+@pytest.fixture(autouse=True)
+def unlimited_limiters():
+    for model in ("gpt-4o-mini", "gpt-4o"):
+        set_rate_limiter(model, TokenBucketRateLimiter(10**9, 10**6))
+
+
+def _checker(completions, batch_size=25):
+    client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return SegmentOverlapChecker(client, cache=NullLLMCache(), batch_size=batch_size)
+
+
+def _segment(competency, segment_id, score, confidence):
+    return {"competency": competency, "segment_id": segment_id, "score": score, "confidence_v2": confidence}
+
+
+@pytest.mark.asyncio
+async def test_rule_based_adjustment_only_touches_conflicting_segment():
+    completions = MediatingCompletions()
+    segments = [
+        _segment("a", 1, 40, 0.5),
+        _segment("b", 1, 90, 0.9),
+        _segment("a", 2, 70, 0.8),
+        _segment("c", 3, 60, 0.7),
+        {"competency": "d", "segment_id": None, "score": 10, "confidence_v2": 0.1},
+    ]
+
+    adjusted, logs = await _checker(completions).check_and_adjust(segments)
+
+    assert completions.prompts == []
+    assert logs == [{
+        "segment_id": 1,
+        "competencies": ["a", "b"],
+        "score_gap": 50,
+        "adjustment_type": "rule_based",
+        "adjustments": [{
+            "competency": "a",
+            "original_score": 40,
+            "adjusted_score": 55.0,
+            "original_confidence": 0.5,
+            "adjusted_confidence": 0.45,
+            "reason": "Adjusted towards Trust Agent (b, conf=0.90)",
+        }],
+    }]
+    assert adjusted[0]["score"] == 55.0 and adjusted[0]["adjusted"]
+    # 같은 역량의 다른 Segment는 그대로
+    assert adjusted[2] is segments[2] and adjusted[4] is segments[4]
+
+
+@pytest.mark.asyncio
+async def test_hundreds_of_ai_mediated_segments_use_concurrent_batches():
+    completions = MediatingCompletions(broken_batches={50})
+    segments = []
+    for segment_id in range(300):
+        # 짝수: Confidence 비슷 → AI 판단, 홀수: Confidence 차이 큼 → Rule-based
+        confidence = 0.75 if segment_id % 2 == 0 else 0.95
+        segments += [_segment("a", segment_id, 30, 0.7), _segment("b", segment_id, 80, confidence)]
+
+    adjusted, logs = await _checker(completions, batch_size=25).check_and_adjust(segments)
+
+    # AI 판단 150개 → 25개씩 6회, 동시에 호출
+    assert len(completions.prompts) >= 6 and len({tuple(p) for p in completions.prompts}) == 6
+    assert completions.max_in_flight > 1
+    assert [log["segment_id"] for log in logs] == list(range(300))
+
+    by_type = {}
+    for log in logs:
+        by_type.setdefault(log["adjustment_type"], []).append(log["segment_id"])
+    # 응답이 깨진 묶음(Segment 50~98 짝수)만 Rule-based로 폴백
+    fallback = list(range(50, 100, 2))
+    assert by_type["ai_mediated"] == [s for s in range(0, 300, 2) if s not in fallback]
+    assert sorted(by_type["rule_based"]) == sorted(list(range(1, 300, 2)) + fallback)
+
+    assert adjusted[0]["score"] == 40.0 and adjusted[0]["adjustment_reason"] == "AI"
+    assert adjusted[2 * 51]["score"] == 45.0
+    assert all(not item.get("adjusted") for item in adjusted[1::2])
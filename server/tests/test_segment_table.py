@@ -0,0 +1,111 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+# Ensure server package importable when running pytest from repo root
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from ai.agents.aggregators.confidence_calculator import ConfidenceCalculator
+from ai.agents.aggregators.segment_table import SegmentTable
+from ai.agents.graph.aggregator_node import aggregator_node
+
+
+def _segment(competency, segment_id, confidence, strength="none", score=70, **extra):
+    return {
+        "competency": competency,
+        "segment_id": segment_id,
+        "quote_text": f"{competency}-{segment_id}",
+        "score": score,
+        "interview_confidence": confidence,
+        "confidence_v2": confidence,
+        "resume_verification": {"verified": strength != "none", "strength": strength, "resume_matches": []},
+        **extra,
+    }
+
+
+def test_groupings_keep_original_order_and_skip_missing_segment_ids():
+    segments = [
+        _segment("a", 7, 0.5),
+        _segment("b", 3, 0.9),
+        _segment("a", None, 0.4),
+        _segment("b", 7, 0.9),
+        _segment("c", 3, 0.2),
+    ]
+    table = SegmentTable(segments)
+
+    assert table.segment_ids == [7, 3] and table.competencies == ["a", "b", "c"]
+    assert table.by_segment.counts.tolist() == [2, 2]
+    assert table.by_segment.group_rows(0).tolist() == [0, 3]
+    # 동률이면 원본에서 먼저 나온 행
+    assert table.by_segment.first_argmax(table.confidence).tolist() == [3, 1]
+    assert table.by_segment.gap(table.confidence).tolist() == pytest.approx([0.4, 0.7])
+
+    assert {name: rows.tolist() for name, rows in table.competency_rows().items()} == {"a": [0, 2], "b": [1, 3], "c": [4]}
+    assert table.by_competency.mean(table.confidence).tolist() == pytest.approx([0.45, 0.9, 0.2])
+
+    # 열은 한 번만 추출되고, 갱신한 값이 유지됨
+    table.confidence[0] = 0.1
+    assert table.confidence[0] == 0.1
+    assert SegmentTable([]).by_segment.first_argmax(np.empty(0)).tolist() == []
+
+
+def test_confidence_v2_column_matches_scalar_formula():
+    segments = [
+        {"interview_confidence": confidence, "resume_verification": {"strength": strength}}
+        for confidence in (0.0, 0.285, 0.5, 0.735, 1)
+        for strength in ("high", "medium", "low", "none", "unknown")
+    ] + [{"interview_confidence": 0.7}]
+
+    expected = [
+        ConfidenceCalculator.calculate_confidence_v2(
+            seg["interview_confidence"], seg.get("resume_verification", {}).get("strength", "none")
+        )
+        for seg in segments
+    ]
+
+    assert [seg["confidence_v2"] for seg in ConfidenceCalculator.calculate_for_segments(segments)] == expected
+
+
+@pytest.mark.asyncio
+async def test_aggregator_competency_stats_use_adjusted_table():
+    segments = [
+        _segment("problem_solving", 1, 0.9, "medium", score=90),
+        _segment("growth_potential", 1, 0.5, "none", score=40),
+        _segment("growth_potential", 2, 0.55, "high"),
+        _segment("problem_solving", 2, 0.8, "high", score=75),
+        _segment("problem_solving", None, 0.7, "low"),
+    ]
+    state = {
+        "segment_evaluations_with_resume": segments,
+        "confidence_v2_calculated": True,
+        "openai_client": SimpleNamespace(),
+        "problem_solving_result": {"overall_score": 80, "confidence": {"overall_confidence": 0.8}},
+        "growth_potential_result": {"overall_score": 60, "confidence": {"overall_confidence": 0.6}},
+        "md_data_analysis_result": {"overall_score": 70, "confidence": {"overall_confidence": 0.75}},
+    }
+
+    result = await aggregator_node(state)
+    competencies = result["aggregated_competencies"]
+
+    # Segment 1: Confidence 차이 0.4 → Rule-based, growth_potential confidence 0.5 → 0.45
+    assert [log["segment_id"] for log in result["segment_overlap_adjustments"]] == [1]
+    growth = competencies["growth_potential"]
+    assert growth["confidence_v2"] == 0.5 and growth["adjusted_by_overlap"]
+    assert growth["segment_count"] == 2 and growth["resume_verified_count"] == 1
+
+    solving = competencies["problem_solving"]
+    assert solving["confidence_v2"] == 0.8 and not solving["adjusted_by_overlap"]
+    assert solving["resume_verified_count"] == 3
+    # 검증 강도 순 (같은 강도는 원본 순서)
+    assert [e["segment_id"] for e in solving["resume_verification_summary"]["key_evidence"]] == [2, 1, None]
+    assert solving["resume_verification_summary"]["high_strength_count"] == 1
+
+    # Segment가 없는 역량은 원본 Confidence
+    assert competencies["md_data_analysis"]["confidence_v2"] == 0.75
+    assert competencies["md_data_analysis"]["segment_count"] == 0
+    assert [item["competency"] for item in result["low_confidence_list"]] == ["growth_potential"]
@@ -0,0 +1,109 @@
+import sys
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Ensure server package importable when running pytest from repo root
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from ai.agents.competency_agent import CompetencyAgent
+from ai.utils.llm_cache import NullLLMCache
+from ai.utils.rate_limiter import TokenBucketRateLimiter, set_rate_limiter
+from ai.utils.streaming_json import StreamingJSONFieldExtractor
+from services.evaluation.progress_channel import ProgressChannel
+
+
+RESPONSE = {
+    "competency_name": "problem_solving",
+    "perspectives": {
+        "evidence_score": 86,
+        "evidence_details": [
+            {"text": "문제 → 원인 [3가지] → 해결책 {구조}", "segment_id": 3, "char_index": 120},
+            {"text": "따옴표 \"인용\" 포함", "segment_id": 5, "char_index": 40},
+        ],
+    },
+    "overall_score": 86,
+    "strengths": ["구조적 분석"],
+    "weaknesses": ["실현 가능성 검토 부족"],
+    "key_observations": ["a", "b", "c"],
+    "confidence": {"overall_confidence": 0.85},
+}
+
+
+def _chunks(text: str, size: int = 7):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def test_extractor_emits_fields_as_soon_as_complete():
+    text = json.dumps(RESPONSE, ensure_ascii=False)
+    extractor = StreamingJSONFieldExtractor(("overall_score",), ("evidence_details",))
+
+    emitted = []
+    for index, chunk in enumerate(_chunks(text)):
+        for field, value in extractor.feed(chunk):
+            emitted.append((field, value, index))
+
+    assert [e[0] for e in emitted] == ["evidence_details", "overall_score"]
+    assert emitted[0][1] == RESPONSE["perspectives"]["evidence_details"]
+    assert emitted[1][1] == 86
+    # 전체 응답이 끝나기 전에 발행
+    assert emitted[1][2] < len(_chunks(text)) - 1
+    assert extractor.buffer == text
+
+
+class FakeStream:
+    def __init__(self, text: str):
+        self.chunks = [
+            SimpleNamespace(usage=None, choices=[SimpleNamespace(delta=SimpleNamespace(content=c))])
+            for c in _chunks(text)
+        ]
+        self.chunks.append(SimpleNamespace(
+            usage=SimpleNamespace(prompt_tokens=100, completion_tokens=50, prompt_tokens_details=None),
+            choices=[],
+        ))
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
+class FakeCompletions:
+    def __init__(self):
+        self.kwargs = None
+
+    async def create(self, **kwargs):
+        self.kwargs = kwargs
+        return FakeStream(json.dumps(RESPONSE, ensure_ascii=False))
+
+
+@pytest.mark.asyncio
+async def test_streaming_agent_publishes_partial_results():
+    set_rate_limiter("gpt-4o", TokenBucketRateLimiter(10 ** 9, 10 ** 6))
+    completions = FakeCompletions()
+    channel = ProgressChannel(1)
+    agent = CompetencyAgent(
+        SimpleNamespace(chat=SimpleNamespace(completions=completions)),
+        cache=NullLLMCache(),
+        progress=channel,
+        streaming=True,
+    )
+
+    result = await agent.evaluate("problem_solving", "문제해결력", "common", "prompt", {"segments": []})
+    channel.close()
+    events = [item async for item in channel.events()]
+
+    assert completions.kwargs["stream"] is True
+    assert result["overall_score"] == 86
+    assert [e["event"] for e in events] == [
+        "competency_start", "competency_partial", "competency_partial", "competency_complete"
+    ]
+    assert events[1]["data"]["field"] == "evidence_details"
+    assert events[2]["data"] == {"stage": 1, "competency": "problem_solving", "field": "overall_score", "value": 86}
+    assert agent.usage_log["problem_solving"]["prompt_tokens"] == 100
@@ -0,0 +1,129 @@
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Ensure server package importable when running pytest from repo root
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from ai.utils.rate_limiter import TokenBucketRateLimiter, limited_chat_completion, set_rate_limiter
+from ai.utils.tracing import Tracer, chrome_trace_to_speedscope, span, start_span, trace_scope, traced
+
+
+MODEL = "trace-test-model"
+
+
+@pytest.fixture(autouse=True)
+def unlimited_rate_limiter():
+    set_rate_limiter(MODEL, TokenBucketRateLimiter(10**9, 10**6))
+
+
+class FakeCompletions:
+    async def create(self, **kwargs):
+        await asyncio.sleep(0.01)
+        if kwargs.get("stream"):
+            return self._stream()
+        usage = SimpleNamespace(prompt_tokens=12, completion_tokens=3, total_tokens=15, prompt_tokens_details=None)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="{}"))], usage=usage)
+
+    async def _stream(self):
+        for _ in range(2):
+            await asyncio.sleep(0.01)
+            yield SimpleNamespace(usage=None)
+
+
+@pytest.mark.asyncio
+async def test_spans_nest_across_tasks_and_threads():
+    assert start_span("outside") is None
+
+    tracer = Tracer("evaluation", {"interview_id": 1})
+
+    def save(index: int):
+        with span(f"db_save{index}", "io"):
+            pass
+
+    async def worker(index: int):
+        with span(f"worker{index}", "agent"):
+            await asyncio.sleep(0.01)
+            await asyncio.to_thread(save, index)
+
+    async def node(state):
+        await asyncio.gather(worker(0), worker(1))
+        return state
+
+    with trace_scope(tracer):
+        with span("evaluate_interview", "evaluation"):
+            await traced("batch_evaluation", node)({})
+            pending = start_span("stream", "llm")
+
+    records = {record["name"]: record for record in tracer.records()}
+    by_id = {record["id"]: record for record in tracer.records()}
+    root = records["evaluate_interview"]
+    assert root["parent"] is None
+    assert records["batch_evaluation"]["parent"] == root["id"]
+    # gather로 만든 task / 스레드의 span도 부모를 이어받고, 각자 별도 lane에 기록됨
+    assert {by_id[records[f"worker{i}"]["parent"]]["name"] for i in range(2)} == {"batch_evaluation"}
+    assert records["worker0"]["lane"] != records["worker1"]["lane"] != root["lane"]
+    assert records["db_save0"]["parent"] == records["worker0"]["id"]
+    assert records["db_save0"]["lane"] not in (records["worker0"]["lane"], records["worker1"]["lane"])
+    # 닫지 않은 span은 unfinished로 내보냄
+    assert records["stream"]["args"]["unfinished"] and pending is not None
+    pending.end(status="ok")
+    assert "unfinished" not in {r["name"]: r for r in tracer.records()}["stream"]["args"]
+
+
+def test_chrome_trace_and_speedscope_export():
+    tracer = Tracer("evaluation", {"interview_id": 3})
+    with trace_scope(tracer):
+        with span("aggregator", "node"):
+            with span("confidence_v2", "substep", segments=4):
+                pass
+            with pytest.raises(ValueError):
+                with span("segment_overlap", "substep"):
+                    raise ValueError("boom")
+
+    trace = tracer.to_chrome_trace()
+    complete = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+    assert [event["name"] for event in complete] == ["aggregator", "confidence_v2", "segment_overlap"]
+    assert complete[1]["args"]["segments"] == 4 and complete[2]["args"]["error"] == "ValueError"
+    assert complete[0]["ts"] <= complete[1]["ts"] and complete[0]["ts"] + complete[0]["dur"] >= complete[2]["ts"]
+    assert trace["otherData"]["interview_id"] == 3
+
+    profile, = chrome_trace_to_speedscope(trace)["profiles"]
+    events = profile["events"]
+    frames = chrome_trace_to_speedscope(trace)["shared"]["frames"]
+    assert [(e["type"], frames[e["frame"]]["name"]) for e in events] == [
+        ("O", "aggregator"), ("O", "confidence_v2"), ("C", "confidence_v2"),
+        ("O", "segment_overlap"), ("C", "segment_overlap"), ("C", "aggregator"),
+    ]
+    assert [e["at"] for e in events] == sorted(e["at"] for e in events)
+
+
+@pytest.mark.asyncio
+async def test_llm_calls_recorded_until_response_or_stream_end():
+    client = SimpleNamespace(chat=SimpleNamespace(completions=FakeCompletions()))
+    messages = [{"role": "user", "content": "hi"}]
+    tracer = Tracer()
+
+    with trace_scope(tracer):
+        with span("final_integration", "node"):
+            await limited_chat_completion(client, span_label="summary", model=MODEL, messages=messages)
+            stream = await limited_chat_completion(client, model=MODEL, messages=messages, stream=True)
+            assert [r["name"] for r in tracer.spans] == ["summary"]
+            async for _ in stream:
+                pass
+
+    records = {record["name"]: record for record in tracer.records()}
+    summary = records["summary"]
+    assert summary["category"] == "llm" and summary["parent"] == records["final_integration"]["id"]
+    assert summary["args"]["status"] == "ok" and summary["args"]["prompt_tokens"] == 12
+    # 스트림은 마지막 청크까지 (응답 시작 10ms + 청크 20ms)
+    assert records["chat_completion"]["args"]["stream"] and records["chat_completion"]["duration_us"] >= 25_000
+
+    # scope 밖 호출은 기록하지 않음
+    await limited_chat_completion(client, span_label="untraced", model=MODEL, messages=messages)
+    assert "untraced" not in {r["name"] for r in tracer.records()}
@@ -0,0 +1,66 @@
+import sys
+import json
+from pathlib import Path
+
+# Ensure server package importable when running pytest from repo root
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from ai.utils.transcript_renderer import render_transcript_for_prompt, transcript_token_report
+
+
+TRANSCRIPT = {
+    "interview_id": 102,
+    "persona_meta": {"name": "삼성물산 패션부문 면접", "focus": ["데이터 기반 의사결정"]},
+    "weights": {"competency": {"problem_solving": 0.1}},
+    "segments": [
+        {
+            "segment_id": 2,
+            "segment_order": 2,
+            "turn_type": "follow_up",
+            "question_text": "안전재고 수준을\n어떻게 설정했나요?",
+            "answer_text": "선배님이 주로 결정하셨습니다.",
+            "char_index_start": 0,
+            "char_index_end": 16,
+            "weak_flags": ["선배 의존"],
+            "timestamp_start": "2025-11-22T10:01:20Z",
+        },
+        {
+            "segment_id": 1,
+            "segment_order": 1,
+            "turn_type": "main",
+            "question_text": "재고회전율을 개선한 경험이 있으신가요?",
+            "answer_text": "네, 재고회전율 개선 프로젝트에 참여했습니다.",
+            "char_index_start": 0,
+            "char_index_end": 25,
+        },
+    ],
+}
+
+
+def test_render_keeps_segment_contract_and_drops_unused_fields():
+    rendered = render_transcript_for_prompt(TRANSCRIPT)
+
+    assert rendered.index("[segment_id: 1 | main | char_index: 0-25]") < rendered.index("[segment_id: 2")
+    assert "answer_text: 선배님이 주로 결정하셨습니다." in rendered
+    assert "question_text: 안전재고 수준을 어떻게 설정했나요?" in rendered
+    for unused in ("persona_meta", "weights", "weak_flags", "timestamp_start", "선배 의존"):
+        assert unused not in rendered
+
+
+def test_render_is_stable():
+    assert render_transcript_for_prompt(TRANSCRIPT) == render_transcript_for_prompt(json.loads(json.dumps(TRANSCRIPT)))
+
+
+def test_render_without_segments_falls_back_to_compact_json():
+    transcript = {"interview_id": 1, "dialogue": [{"speaker": "A", "text": "안녕하세요"}]}
+    assert render_transcript_for_prompt(transcript) == json.dumps(transcript, ensure_ascii=False, separators=(",", ":"))
+
+
+def test_token_report_shows_reduction():
+    report = transcript_token_report(TRANSCRIPT)
+
+    assert report["segment_count"] == 2
+    assert report["compact_tokens"] < report["json_tokens"]
+    assert report["reduction_ratio"] > 0.3